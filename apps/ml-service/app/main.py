@@ -13,12 +13,18 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import logging
 
-from app.routes import predictions, interventions, analytics, its_routes, abab_routes
+from app.routes import predictions, interventions, analytics, its_routes, abab_routes, ingestion
 from app.services.database import prisma
 from app.utils.logging import setup_logging
 from app.utils.config import settings
 from app.utils.redis_cache import RedisCache
 from app.utils import redis_cache as redis_cache_module
+from app.utils.feature_cache import get_feature_cache
+from app.services.its_plot_service import get_its_plot_service
+from app.services.event_ingestion import get_event_ingestor
+from app.services.event_lake import get_event_lake
+from app.utils.file_lock import reader_lock
+from src.orchestration import get_session_history_store
 
 
 # Setup logging
@@ -49,15 +55,37 @@ async def lifespan(app: FastAPI):
     # Set the module-level global variable (fixes caching bug)
     redis_cache_module.redis_cache = cache_instance
 
+    # Share feature extraction cache across requests (Redis as second tier)
+    feature_cache = get_feature_cache()
+    feature_cache.namespace_ttls.update({
+        "profile": settings.CACHE_TTL_PROFILE,
+        "patterns": settings.CACHE_TTL_PATTERNS,
+        "metrics": settings.CACHE_TTL_METRICS,
+    })
+    feature_cache.redis = cache_instance
+
+    # Micro-batched event ingestion into the lake and DuckDB
+    await get_event_ingestor().start()
+
+    # Orchestration history reads the same lake and respects DuckDB writers
+    session_history = get_session_history_store()
+    session_history.lake = get_event_lake()
+    session_history.read_lock = reader_lock
+
     yield
 
     # Shutdown
     logger.info("Shutting down ML Service...")
 
+    # Flush queued events before the process exits
+    await get_event_ingestor().stop()
+
     if redis_cache_module.redis_cache:
         await redis_cache_module.redis_cache.close()
         logger.info("Redis cache disconnected")
 
+    get_its_plot_service().shutdown()
+
     await prisma.disconnect()
     logger.info("Prisma client disconnected")
 
@@ -108,6 +136,10 @@ app.include_router(
     abab_routes.router,
     tags=["ABAB Analysis"]
 )
+app.include_router(
+    ingestion.router,
+    tags=["Event Ingestion"]
+)
 
 
 @app.get("/health")
@@ -127,6 +159,18 @@ async def health_check():
     }
 
 
+@app.get("/cache/stats")
+async def cache_stats():
+    """
+    Redis cache metrics per key prefix (hit rate, latency, value size).
+
+    Returns:
+        dict: Per-prefix metrics, empty if the cache is unavailable
+    """
+    cache = redis_cache_module.get_redis_cache()
+    return cache.stats() if cache else {}
+
+
 @app.get("/")
 async def root():
     """
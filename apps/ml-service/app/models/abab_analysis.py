@@ -8,7 +8,7 @@ Created: 2025-10-27T10:50:00-07:00
 Part of: Day 7-8 Research Analytics Implementation (ADR-006)
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -56,6 +56,14 @@ class ABABAnalysisRequest(BaseModel):
         examples=[42, 12345],
     )
 
+    observation_unit: Literal["event", "day"] = Field(
+        default="event",
+        description=(
+            "Statistical unit of an observation: every scored event, or each "
+            "day's phase mean (changes n, the p-value and Cohen's d)"
+        ),
+    )
+
     @field_validator("outcome_metric")
     @classmethod
     def validate_outcome_metric(cls, v: str) -> str:
@@ -75,6 +83,7 @@ class ABABAnalysisRequest(BaseModel):
                 "outcome_metric": "sessionPerformanceScore",
                 "n_permutations": 10000,
                 "seed": 42,
+                "observation_unit": "event",
             }
         }
     }
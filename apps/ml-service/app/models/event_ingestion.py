@@ -0,0 +1,66 @@
+"""
+Pydantic models for behavioral event ingestion.
+
+Field names and enums follow the Prisma BehavioralEvent model (and
+BehavioralEventSchema), so ingested rows land in the same lake and DuckDB
+columns as the batch export.
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from app.schemas.enums import CompletionQuality, EngagementLevel, EventType
+
+CUID_PATTERN = r"^c[a-z0-9]{24}$"
+MAX_BATCH_EVENTS = 5000
+
+
+class BehavioralEventIn(BaseModel):
+    """One behavioral event as written by the app."""
+
+    model_config = ConfigDict(use_enum_values=True)
+
+    id: str = Field(..., pattern=CUID_PATTERN, description="Event ID (CUID)")
+    userId: str = Field(..., pattern=CUID_PATTERN, description="User ID (CUID)")
+    eventType: EventType = Field(..., description="Prisma EventType")
+    eventData: Dict[str, Any] = Field(default_factory=dict, description="Event payload")
+    timestamp: datetime = Field(..., description="When the event occurred (ISO 8601)")
+
+    completionQuality: Optional[CompletionQuality] = None
+    contentType: Optional[str] = None
+    dayOfWeek: Optional[int] = Field(default=None, ge=0, le=6)
+    difficultyLevel: Optional[str] = None
+    engagementLevel: Optional[EngagementLevel] = None
+    sessionPerformanceScore: Optional[int] = Field(default=None, ge=0, le=100)
+    timeOfDay: Optional[int] = Field(default=None, ge=0, le=23)
+    experimentPhase: Optional[str] = None
+    randomizationSeed: Optional[int] = None
+    contextMetadataId: Optional[str] = None
+
+    @field_validator("timestamp")
+    @classmethod
+    def to_naive_utc(cls, v: datetime) -> datetime:
+        """Store timestamps as naive UTC, like the export."""
+        if v.tzinfo is not None:
+            return v.astimezone(timezone.utc).replace(tzinfo=None)
+        return v
+
+
+class EventIngestRequest(BaseModel):
+    """Batch of events to ingest."""
+
+    events: List[BehavioralEventIn] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_EVENTS,
+        description=f"Events (1-{MAX_BATCH_EVENTS} per request)",
+    )
+
+
+class EventIngestResponse(BaseModel):
+    """Accepted batch."""
+
+    accepted: int = Field(..., description="Events queued for the next flush")
+    pending_rows: int = Field(..., description="Events queued or being written")
@@ -166,7 +166,7 @@ class ITSAnalysisResponse(BaseModel):
         counterfactual_effect: Overall effect vs counterfactual
         probability_of_benefit: P(any positive effect)
         mcmc_diagnostics: MCMC convergence diagnostics
-        plots: Base64-encoded PNG plots
+        plots: Plot kind -> URL of the on-demand plot endpoint
         mlflow_run_id: MLflow run ID for provenance
         computation_time_seconds: Total computation time
         n_observations_pre: Number of observations in pre-period
@@ -197,7 +197,7 @@ class ITSAnalysisResponse(BaseModel):
     )
     plots: Dict[str, str] = Field(
         ...,
-        description="Base64-encoded PNG plots",
+        description="Plot kind -> URL rendering it on demand (GET, ?format=svg|png)",
     )
     mlflow_run_id: str = Field(
         ...,
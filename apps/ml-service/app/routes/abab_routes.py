@@ -3,20 +3,21 @@ FastAPI routes for ABAB Randomization Analysis.
 
 Provides endpoints for:
 - POST /analytics/abab/analyze: Run ABAB permutation test
-- GET /analytics/abab/history/{user_id}: Fetch past analyses from MLflow
+- GET /analytics/abab/history/{user_id}: Fetch past analyses from the run index
 
 Created: 2025-10-27T10:55:00-07:00
 Part of: Day 7-8 Research Analytics Implementation (ADR-006)
 """
 
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
-import mlflow
 
 from app.models.abab_analysis import ABABAnalysisRequest, ABABAnalysisResponse
 from app.services.abab_engine import ABABRandomizationEngine
+from app.services.analysis_run_index import ABAB, get_analysis_run_index
 from app.utils.redis_cache import get_redis_cache
 
 
@@ -28,6 +29,11 @@ router = APIRouter(
 # Initialize ABAB engine
 abab_engine = ABABRandomizationEngine()
 
+# Cached results are fresh for 5 minutes, then served stale for up to
+# 15 more minutes while a single background run recomputes them
+CACHE_TTL = 300
+CACHE_STALE_TTL = 900
+
 
 @router.post(
     "/analyze",
@@ -157,41 +163,32 @@ async def analyze_abab(request: ABABAnalysisRequest) -> ABABAnalysisResponse:
     Raises:
         HTTPException: 400 for invalid data, 500 for computation errors
     """
-    # Try cache first (50-300x speedup on cache hit)
+    # Concurrent identical requests share one permutation test (single-flight);
+    # cache hits are 50-300x faster
     cache = get_redis_cache()
-    cache_key = None
-
-    if cache:
-        cache_key = cache.generate_key(
-            "abab:analyze",
-            user_id=request.user_id,
-            protocol_id=request.protocol_id,
-            outcome_metric=request.outcome_metric,
-            n_permutations=request.n_permutations,
-            seed=request.seed or 42,
-        )
-        cached_result = await cache.get(cache_key)
-        if cached_result:
-            # Return cached response (reconstructed from JSON)
-            return ABABAnalysisResponse(**cached_result)
 
-    # Cache miss or no cache - run expensive permutation test
     try:
-        result = abab_engine.run_analysis(
-            user_id=request.user_id,
-            protocol_id=request.protocol_id,
-            outcome_metric=request.outcome_metric,
-            n_permutations=request.n_permutations,
-            seed=request.seed,
-        )
-
-        response = ABABAnalysisResponse(**result)
-
-        # Store in cache for future requests (5-min TTL)
-        if cache and cache_key:
-            await cache.set(cache_key, response.model_dump(), ttl=300)
+        if cache:
+            cache_key = cache.generate_key(
+                "abab:analyze",
+                user_id=request.user_id,
+                protocol_id=request.protocol_id,
+                outcome_metric=request.outcome_metric,
+                n_permutations=request.n_permutations,
+                seed=request.seed or 42,
+                observation_unit=request.observation_unit,
+            )
+            result = await cache.get_or_compute(
+                cache_key,
+                lambda: _run_abab_analysis(request),
+                ttl=CACHE_TTL,
+                tags=[cache.user_tag("abab:analyze", request.user_id)],
+                stale_ttl=CACHE_STALE_TTL,
+            )
+        else:
+            result = await _run_abab_analysis(request)
 
-        return response
+        return ABABAnalysisResponse(**result)
 
     except ValueError as e:
         # Invalid data (missing phases, insufficient observations, etc.)
@@ -205,13 +202,28 @@ async def analyze_abab(request: ABABAnalysisRequest) -> ABABAnalysisResponse:
         )
 
 
+async def _run_abab_analysis(request: ABABAnalysisRequest) -> Dict[str, Any]:
+    """Run the permutation test off the event loop and return a cacheable dict."""
+    result = await run_in_threadpool(
+        abab_engine.run_analysis,
+        user_id=request.user_id,
+        protocol_id=request.protocol_id,
+        outcome_metric=request.outcome_metric,
+        n_permutations=request.n_permutations,
+        seed=request.seed,
+        observation_unit=request.observation_unit,
+    )
+    return ABABAnalysisResponse(**result).model_dump()
+
+
 @router.get(
     "/history/{user_id}",
     summary="Get ABAB Analysis History",
     description="""
-    Fetch past ABAB analyses for a user from MLflow.
+    Fetch past ABAB analyses for a user from the analysis run index
+    (written alongside MLflow logging, indexed by user and start time).
 
-    This endpoint queries MLflow to retrieve:
+    This endpoint retrieves:
     - Past analysis run IDs
     - Parameters (user_id, protocol_id, n_permutations)
     - Metrics (observed effect, p-value, Cohen's d, WWC rating)
@@ -228,7 +240,8 @@ async def analyze_abab(request: ABABAnalysisRequest) -> ABABAnalysisResponse:
     **Pagination:**
     - Default: 10 most recent runs
     - Max: 100 runs per request
-    - Use `offset` for pagination
+    - Pass the returned `next_cursor` as `cursor` for the next page
+      (`offset` is still accepted but scans skipped rows)
     """,
     responses={
         200: {
@@ -268,7 +281,8 @@ async def analyze_abab(request: ABABAnalysisRequest) -> ABABAnalysisResponse:
 async def get_abab_history(
     user_id: str,
     limit: int = Query(10, ge=1, le=100, description="Max runs to return"),
-    offset: int = Query(0, ge=0, description="Pagination offset"),
+    offset: int = Query(0, ge=0, description="Pagination offset (ignored with cursor)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
 ) -> JSONResponse:
     """
     Get ABAB analysis history for a user.
@@ -277,26 +291,21 @@ async def get_abab_history(
         user_id: User ID
         limit: Maximum number of runs to return (1-100)
         offset: Pagination offset
+        cursor: Keyset pagination cursor (next_cursor of the previous page)
 
     Returns:
         JSON response with past ABAB analyses
 
     Raises:
-        HTTPException: 404 if no analyses found
+        HTTPException: 404 if no analyses found, 400 for an invalid cursor
     """
     try:
-        # Query MLflow for past runs
-        client = mlflow.tracking.MlflowClient()
-
-        # Search for runs with user_id parameter
-        runs = client.search_runs(
-            experiment_ids=["0"],  # Default experiment
-            filter_string=f"params.user_id = '{user_id}' AND tags.analysis_type = 'ABAB_randomization'",
-            order_by=["start_time DESC"],
-            max_results=limit,
+        # Indexed lookup; MLflow is only needed for artifacts
+        page = get_analysis_run_index().list_runs(
+            user_id, ABAB, limit=limit, cursor=cursor, offset=offset
         )
-
-        if not runs:
+        runs = page.runs
+        if not runs and cursor is None:
             raise HTTPException(
                 status_code=404,
                 detail=f"No ABAB analyses found for user {user_id}",
@@ -306,17 +315,17 @@ async def get_abab_history(
         history = []
         for run in runs:
             run_data = {
-                "run_id": run.info.run_id,
-                "start_time": run.info.start_time,
-                "protocol_id": run.data.params.get("protocol_id"),
-                "outcome_metric": run.data.params.get("outcome_metric"),
-                "n_permutations": int(run.data.params.get("n_permutations", 0)),
-                "observed_effect": run.data.metrics.get("observed_effect"),
-                "p_value": run.data.metrics.get("p_value"),
-                "cohens_d": run.data.metrics.get("cohens_d"),
-                "wwc_rating": run.data.tags.get("wwc_rating"),
-                "passes_wwc": run.data.tags.get("passes_wwc") == "yes",
-                "computation_time": run.info.end_time - run.info.start_time if run.info.end_time else None,
+                "run_id": run.run_id,
+                "start_time": run.start_time,
+                "protocol_id": run.params.get("protocol_id"),
+                "outcome_metric": run.params.get("outcome_metric"),
+                "n_permutations": int(run.params.get("n_permutations", 0)),
+                "observed_effect": run.metrics.get("observed_effect"),
+                "p_value": run.metrics.get("p_value"),
+                "cohens_d": run.metrics.get("cohens_d"),
+                "wwc_rating": run.tags.get("wwc_rating"),
+                "passes_wwc": run.tags.get("passes_wwc") == "yes",
+                "computation_time": run.end_time - run.start_time if run.end_time else None,
             }
             history.append(run_data)
 
@@ -326,6 +335,7 @@ async def get_abab_history(
                 "total_runs": len(runs),
                 "limit": limit,
                 "offset": offset,
+                "next_cursor": page.next_cursor,
                 "runs": history,
             }
         )
@@ -333,6 +343,10 @@ async def get_abab_history(
     except HTTPException:
         raise
 
+    except ValueError as e:
+        # Malformed pagination cursor
+        raise HTTPException(status_code=400, detail=str(e))
+
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -347,7 +361,7 @@ async def get_abab_history(
     Clear all cached ABAB analysis results for a specific user.
 
     This endpoint:
-    - Clears all ABAB cache entries with keys matching the user pattern
+    - Clears only this user's ABAB cache entries (tracked in a per-user tag set)
     - Useful when user data is updated and cached results are stale
     - Does not affect ITS cache (separate key prefix)
 
@@ -369,6 +383,7 @@ async def get_abab_history(
                     "example": {
                         "message": "ABAB cache cleared for user user123",
                         "user_id": "user123",
+                        "keys_deleted": 3,
                         "status": "success",
                     }
                 }
@@ -397,11 +412,13 @@ async def clear_user_abab_cache(user_id: str) -> JSONResponse:
         )
 
     try:
-        await cache.clear_prefix("abab:analyze:")
+        # Only this user's entries (tracked in their tag set)
+        keys_deleted = await cache.invalidate_user("abab:analyze", user_id)
         return JSONResponse(
             content={
                 "message": f"ABAB cache cleared for user {user_id}",
                 "user_id": user_id,
+                "keys_deleted": keys_deleted,
                 "status": "success",
             }
         )
@@ -0,0 +1,83 @@
+"""
+FastAPI routes for behavioral event ingestion.
+
+Provides endpoints for:
+- POST /events/ingest: Queue a batch of events for the analytics store
+- GET /events/ingest/stats: Queue depth and flush counters
+"""
+
+import math
+
+import pandas as pd
+from fastapi import APIRouter, HTTPException
+
+from app.models.event_ingestion import EventIngestRequest, EventIngestResponse
+from app.schemas import ChunkedEventValidator
+from app.services.event_ingestion import (
+    IngestorNotRunningError,
+    IngestQueueFullError,
+    get_event_ingestor,
+)
+from app.services.event_lake import to_lake_table
+
+
+router = APIRouter(
+    prefix="/events",
+    tags=["Event Ingestion"],
+)
+
+
+@router.post(
+    "/ingest",
+    response_model=EventIngestResponse,
+    status_code=202,
+    summary="Ingest Behavioral Events",
+    description="""
+    Queue a batch of behavioral events for near-real-time analytics.
+
+    Events are validated against the Prisma EventType enum and
+    BehavioralEventSchema, queued in memory, and written to the event lake
+    and DuckDB (research.behavioral_events plus daily rollups) in
+    micro-batches every INGEST_FLUSH_ROWS rows or INGEST_FLUSH_MS ms.
+
+    **Responses:**
+    - 202: Batch queued (written by the next flush)
+    - 422: Batch failed validation; nothing was queued
+    - 429: Queue full; retry after the Retry-After header
+    - 503: Ingestion is not running
+    """,
+)
+async def ingest_events(request: EventIngestRequest) -> EventIngestResponse:
+    """
+    Validate and queue a batch of events.
+
+    Raises:
+        HTTPException: 422 for schema violations, 429 when the queue is full,
+            503 when ingestion is not running
+    """
+    ingestor = get_event_ingestor()
+
+    table = to_lake_table(pd.DataFrame.from_records([e.model_dump() for e in request.events]))
+    validator = ChunkedEventValidator()
+    validator.validate(table)
+    if not validator.report.passed:
+        raise HTTPException(status_code=422, detail=validator.report.to_dict()["errors"])
+
+    retry_after = str(max(1, math.ceil(ingestor.flush_ms / 1000)))
+    try:
+        pending = ingestor.submit(table)
+    except IngestQueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": retry_after})
+    except IngestorNotRunningError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": retry_after})
+
+    return EventIngestResponse(accepted=table.num_rows, pending_rows=pending)
+
+
+@router.get(
+    "/ingest/stats",
+    summary="Event Ingestion Stats",
+)
+async def ingestion_stats() -> dict:
+    """Queue depth, accepted/rejected rows and flush timings."""
+    return get_event_ingestor().stats()
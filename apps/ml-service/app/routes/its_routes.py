@@ -3,17 +3,21 @@ FastAPI routes for Bayesian Interrupted Time Series (ITS) analysis.
 
 This module provides endpoints for:
 - POST /analytics/its/analyze: Run ITS analysis
+- GET /analytics/its/{run_id}/plots/{kind}: Render one plot of an analysis
 - GET /analytics/its/history/{user_id}: Get past ITS analyses
 """
 
-from typing import List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from fastapi import APIRouter, HTTPException, Query
-from fastapi.responses import JSONResponse
-import mlflow
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, Response
 
 from app.models.its_analysis import ITSAnalysisRequest, ITSAnalysisResponse
 from app.services.its_engine import BayesianITSEngine
+from app.services.its_plot_service import MEDIA_TYPES, PlotNotFoundError, get_its_plot_service
+from app.utils.its_plots import PLOT_KINDS
+from app.services.analysis_run_index import ITS, get_analysis_run_index
 from app.utils.redis_cache import get_redis_cache
 
 
@@ -25,6 +29,11 @@ router = APIRouter(
 # Initialize ITS engine with correct database path
 its_engine = BayesianITSEngine(duckdb_path="data/behavioral_events.duckdb")
 
+# Cached results are fresh for 5 minutes, then served stale for up to
+# 15 more minutes while a single background run recomputes them
+CACHE_TTL = 300
+CACHE_STALE_TTL = 900
+
 
 @router.post(
     "/analyze",
@@ -138,33 +147,33 @@ async def analyze_its(request: ITSAnalysisRequest) -> ITSAnalysisResponse:
     Performance:
         - Cache hit: 50-500ms (10-100x faster than cold start)
         - Cache miss: 4.9-30s (depending on data size)
-        - TTL: 300 seconds (5 minutes)
+        - TTL: 300 seconds (5 minutes), then served stale for up to 900
+          seconds while one background run recomputes it
+        - Concurrent identical requests: one MCMC run, shared result
     """
-    # Try cache first (5-10x speedup on cache hit)
+    # Concurrent identical requests share one MCMC run (single-flight);
+    # cache hits are 5-10x faster
     cache = get_redis_cache()
-    cache_key = None
-
-    if cache:
-        cache_key = cache.generate_key(
-            "its:analyze",
-            user_id=request.user_id,
-            intervention_date=request.intervention_date.isoformat(),
-            outcome_metric=request.outcome_metric,
-        )
-        cached_result = await cache.get(cache_key)
-        if cached_result:
-            # Return cached response (reconstructed from JSON)
-            return ITSAnalysisResponse(**cached_result)
 
-    # Cache miss or no cache - run expensive MCMC analysis
     try:
-        result = its_engine.run_analysis(request)
-
-        # Store in cache for future requests (5-min TTL)
-        if cache and cache_key:
-            await cache.set(cache_key, result.model_dump(), ttl=300)
+        if cache:
+            cache_key = cache.generate_key(
+                "its:analyze",
+                user_id=request.user_id,
+                intervention_date=request.intervention_date.isoformat(),
+                outcome_metric=request.outcome_metric,
+            )
+            result = await cache.get_or_compute(
+                cache_key,
+                lambda: _run_its_analysis(request),
+                ttl=CACHE_TTL,
+                tags=[cache.user_tag("its:analyze", request.user_id)],
+                stale_ttl=CACHE_STALE_TTL,
+            )
+        else:
+            result = await _run_its_analysis(request)
 
-        return result
+        return ITSAnalysisResponse(**result)
 
     except ValueError as e:
         # Invalid data (insufficient observations, bad dates, etc.)
@@ -182,13 +191,81 @@ async def analyze_its(request: ITSAnalysisRequest) -> ITSAnalysisResponse:
         )
 
 
+async def _run_its_analysis(request: ITSAnalysisRequest) -> Dict[str, Any]:
+    """Run the MCMC analysis off the event loop and return a cacheable dict."""
+    result = await run_in_threadpool(its_engine.run_analysis, request)
+    return result.model_dump()
+
+
+@router.get(
+    "/{run_id}/plots/{kind}",
+    summary="Render ITS Plot",
+    description="""
+    Render one plot of a past ITS analysis on demand.
+
+    Plots are drawn from the posterior summary stored with the run (not the
+    full MCMC trace) in a worker process and cached per run, so analysis
+    responses only carry the plot URLs.
+
+    **Kinds:** observed_vs_counterfactual, posterior_predictive_check,
+    effect_distribution, mcmc_diagnostics
+
+    **Formats:**
+    - `svg` (default): vector, smallest for these charts
+    - `png`: raster downsampled to `width` pixels
+    """,
+    response_class=Response,
+    responses={
+        200: {"content": {"image/svg+xml": {}, "image/png": {}}},
+        404: {"description": "Unknown plot kind or run without a plot summary"},
+    },
+)
+async def get_its_plot(
+    run_id: str,
+    kind: str,
+    format: Literal["svg", "png"] = Query("svg", description="Image format"),
+    width: int = Query(800, ge=200, le=2000, description="PNG width in pixels"),
+) -> Response:
+    """
+    Render (or fetch from cache) one ITS plot.
+
+    Args:
+        run_id: MLflow run ID of the analysis (mlflow_run_id)
+        kind: Plot kind
+        format: "svg" or "png"
+        width: PNG width in pixels
+
+    Returns:
+        Image response (cacheable; a run's plots never change)
+
+    Raises:
+        HTTPException: 404 for unknown kinds or runs, 422 if the run lacks data for the kind
+    """
+    if kind not in PLOT_KINDS:
+        raise HTTPException(status_code=404, detail=f"Unknown plot kind: {kind}")
+
+    try:
+        image = await get_its_plot_service().render(run_id, kind, fmt=format, width=width)
+    except PlotNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    return Response(
+        content=image,
+        media_type=MEDIA_TYPES[format],
+        headers={"Cache-Control": "public, max-age=86400, immutable"},
+    )
+
+
 @router.get(
     "/history/{user_id}",
     summary="Get ITS Analysis History",
     description="""
-    Fetch past ITS analyses for a user from MLflow.
+    Fetch past ITS analyses for a user from the analysis run index
+    (written alongside MLflow logging, indexed by user and start time).
 
-    This endpoint queries MLflow to retrieve:
+    This endpoint retrieves:
     - Past analysis run IDs
     - Parameters (intervention dates, MCMC config)
     - Metrics (effects, probabilities, diagnostics)
@@ -205,7 +282,8 @@ async def analyze_its(request: ITSAnalysisRequest) -> ITSAnalysisResponse:
     **Pagination:**
     - Default: 10 most recent runs
     - Max: 100 runs per request
-    - Use `offset` for pagination
+    - Pass the returned `next_cursor` as `cursor` for the next page
+      (`offset` is still accepted but scans skipped rows)
     """,
     responses={
         200: {
@@ -242,7 +320,8 @@ async def analyze_its(request: ITSAnalysisRequest) -> ITSAnalysisResponse:
 async def get_its_history(
     user_id: str,
     limit: int = Query(10, ge=1, le=100, description="Max runs to return"),
-    offset: int = Query(0, ge=0, description="Pagination offset"),
+    offset: int = Query(0, ge=0, description="Pagination offset (ignored with cursor)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
 ) -> JSONResponse:
     """
     Get ITS analysis history for a user.
@@ -251,26 +330,21 @@ async def get_its_history(
         user_id: User ID
         limit: Maximum number of runs to return (1-100)
         offset: Pagination offset
+        cursor: Keyset pagination cursor (next_cursor of the previous page)
 
     Returns:
         JSON response with past ITS analyses
 
     Raises:
-        HTTPException: 404 if no analyses found
+        HTTPException: 404 if no analyses found, 400 for an invalid cursor
     """
     try:
-        # Query MLflow for past runs
-        client = mlflow.tracking.MlflowClient()
-
-        # Search for runs with user_id parameter
-        runs = client.search_runs(
-            experiment_ids=["0"],  # Default experiment
-            filter_string=f"params.user_id = '{user_id}'",
-            order_by=["start_time DESC"],
-            max_results=limit,
+        # Indexed lookup; MLflow is only needed for artifacts
+        page = get_analysis_run_index().list_runs(
+            user_id, ITS, limit=limit, cursor=cursor, offset=offset
         )
-
-        if not runs:
+        runs = page.runs
+        if not runs and cursor is None:
             raise HTTPException(
                 status_code=404,
                 detail=f"No ITS analyses found for user {user_id}",
@@ -280,18 +354,18 @@ async def get_its_history(
         history = []
         for run in runs:
             run_data = {
-                "run_id": run.info.run_id,
-                "start_time": run.info.start_time,
-                "intervention_date": run.data.params.get("intervention_date"),
-                "immediate_effect": run.data.metrics.get("immediate_effect"),
-                "sustained_effect": run.data.metrics.get("sustained_effect"),
-                "counterfactual_effect": run.data.metrics.get("counterfactual_effect"),
-                "probability_of_benefit": run.data.metrics.get("probability_of_benefit"),
-                "max_rhat": run.data.metrics.get("max_rhat"),
-                "converged": run.data.metrics.get("max_rhat", 2.0) < 1.01,
-                "computation_time": run.data.metrics.get("computation_time"),
-                "n_observations_pre": run.data.metrics.get("n_observations_pre"),
-                "n_observations_post": run.data.metrics.get("n_observations_post"),
+                "run_id": run.run_id,
+                "start_time": run.start_time,
+                "intervention_date": run.params.get("intervention_date"),
+                "immediate_effect": run.metrics.get("immediate_effect"),
+                "sustained_effect": run.metrics.get("sustained_effect"),
+                "counterfactual_effect": run.metrics.get("counterfactual_effect"),
+                "probability_of_benefit": run.metrics.get("probability_of_benefit"),
+                "max_rhat": run.metrics.get("max_rhat"),
+                "converged": run.metrics.get("max_rhat", 2.0) < 1.01,
+                "computation_time": run.metrics.get("computation_time"),
+                "n_observations_pre": run.metrics.get("n_observations_pre"),
+                "n_observations_post": run.metrics.get("n_observations_post"),
             }
             history.append(run_data)
 
@@ -301,6 +375,7 @@ async def get_its_history(
                 "total_runs": len(runs),
                 "limit": limit,
                 "offset": offset,
+                "next_cursor": page.next_cursor,
                 "runs": history,
             }
         )
@@ -308,6 +383,10 @@ async def get_its_history(
     except HTTPException:
         raise
 
+    except ValueError as e:
+        # Malformed pagination cursor
+        raise HTTPException(status_code=400, detail=str(e))
+
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -350,15 +429,14 @@ async def clear_user_cache(user_id: str) -> JSONResponse:
         )
 
     try:
-        # Clear all cache keys for this user
-        # Note: This requires scanning all ITS keys and checking user_id
-        # For now, we'll clear all ITS cache (simpler, still effective)
-        await cache.clear_prefix("its:analyze:")
+        # Only this user's entries (tracked in their tag set)
+        keys_deleted = await cache.invalidate_user("its:analyze", user_id)
 
         return JSONResponse(
             content={
                 "message": f"ITS cache cleared for user {user_id}",
                 "user_id": user_id,
+                "keys_deleted": keys_deleted,
                 "status": "success",
             }
         )
@@ -10,6 +10,10 @@ Usage:
 
     df = pd.read_parquet("data/raw/behavioral_events_latest.parquet")
     validated_df = validate_strict(df)
+
+    validator = ChunkedEventValidator(sample_rate=0.1)
+    for batch in pq.ParquetFile(path).iter_batches():
+        validator.validate(batch)
 """
 
 from .behavioral_events import (
@@ -17,6 +21,11 @@ from .behavioral_events import (
     validate_behavioral_events,
     validate_with_report,
 )
+from .chunked_validation import (
+    ChunkedEventValidator,
+    ChunkValidationError,
+    EventValidationReport,
+)
 from .enums import EventType, CompletionQuality, EngagementLevel
 
 __all__ = [
@@ -25,6 +34,10 @@ __all__ = [
     # Validators
     "validate_behavioral_events",
     "validate_with_report",
+    # Chunked validation
+    "ChunkedEventValidator",
+    "ChunkValidationError",
+    "EventValidationReport",
     # Enums
     "EventType",
     "CompletionQuality",
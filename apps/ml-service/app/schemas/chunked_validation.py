@@ -0,0 +1,370 @@
+"""
+Chunked BehavioralEvent validation with Arrow compute.
+
+Validates behavioral events one record batch at a time, so exports can check
+rows as they stream from the database instead of holding the full dataset
+for a single Pandera pass:
+
+- Checks are derived from BehavioralEventSchema (nullability, str_matches,
+  isin, ge/le) and evaluated as vectorized pyarrow.compute kernels
+- Custom schema checks (timestamp sanity, experiment phase metadata) have
+  Arrow equivalents in ARROW_CUSTOM_CHECKS
+- Expensive checks (regex matches) can be sampled at a configurable rate
+- Failures are aggregated across chunks into one EventValidationReport
+
+Usage:
+    validator = ChunkedEventValidator(sample_rate=0.1)
+    for batch in batches:
+        valid = validator.validate(batch)          # BooleanArray per row
+    validator.report.to_dict()                     # validate_with_report format
+
+ADR-006: Research Analytics Infrastructure
+"""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import date, datetime, time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from .behavioral_events import BehavioralEventSchema
+
+logger = logging.getLogger(__name__)
+
+# Built-in checks that are sampled when sample_rate < 1
+EXPENSIVE_CHECKS = ("str_matches",)
+
+# Example failure cases kept per check
+MAX_EXAMPLES = 5
+
+
+class ChunkValidationError(ValueError):
+    """Raised in strict mode when a chunk fails validation."""
+
+    def __init__(self, message: str, report: "EventValidationReport"):
+        super().__init__(message)
+        self.report = report
+
+
+# ==================== REPORT ====================
+
+
+@dataclass
+class CheckFailures:
+    """Aggregated failures of one check across all chunks"""
+
+    column: Optional[str]
+    check: str
+    checked_rows: int = 0
+    failed_rows: int = 0
+    examples: List[Tuple[int, Any]] = field(default_factory=list)
+
+
+@dataclass
+class EventValidationReport:
+    """
+    Validation results accumulated over every chunk.
+
+    Row indexes are positions in the stream (across chunks). With sampling,
+    invalid_rows counts the failures that were actually checked.
+    """
+
+    total_rows: int = 0
+    invalid_rows: int = 0
+    chunks: int = 0
+    checks: Dict[Tuple[Optional[str], str], CheckFailures] = field(default_factory=dict)
+
+    @property
+    def valid_rows(self) -> int:
+        return self.total_rows - self.invalid_rows
+
+    @property
+    def passed(self) -> bool:
+        return self.invalid_rows == 0
+
+    def failures(self) -> List[CheckFailures]:
+        """Checks with at least one failing row."""
+        return [c for c in self.checks.values() if c.failed_rows]
+
+    def to_dict(self) -> dict:
+        """Report in the validate_with_report() format."""
+        return {
+            "total_rows": self.total_rows,
+            "valid_rows": self.valid_rows,
+            "invalid_rows": self.invalid_rows,
+            "errors": [
+                {
+                    "column": c.column,
+                    "check": c.check,
+                    "index": index,
+                    "failure_case": _json_safe(value),
+                }
+                for c in self.failures()
+                for index, value in c.examples
+            ],
+            "checks": {
+                f"{c.column}:{c.check}" if c.column else c.check: {
+                    "checked_rows": c.checked_rows,
+                    "failed_rows": c.failed_rows,
+                }
+                for c in self.checks.values()
+            },
+        }
+
+
+def _json_safe(value: Any) -> Any:
+    """Failure case as a JSON-encodable value (reports end up in HTTP responses)."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    return str(value)
+
+
+# ==================== ARROW CHECKS ====================
+
+# A check returns a pass mask for its input; nulls count as passing
+# (nullability is checked separately, as Pandera does)
+ColumnCheck = Callable[[pa.Array], pa.Array]
+
+
+def _timestamp_bounds(values: pa.Array) -> Tuple[pa.Scalar, pa.Scalar]:
+    # Naive timestamps are stored as UTC (Postgres export, ingestion), so
+    # compare them against UTC now rather than the server's local time
+    if values.type.tz:
+        now = pd.Timestamp.now(tz=values.type.tz)
+    else:
+        now = pd.Timestamp.now(tz="UTC").tz_localize(None)
+    five_years_ago = now - pd.Timedelta(days=5 * 365)
+    return (
+        pa.scalar(now.to_pydatetime(), type=values.type),
+        pa.scalar(five_years_ago.to_pydatetime(), type=values.type),
+    )
+
+
+def _experiment_phase_requires_metadata(table: pa.Table) -> pa.Array:
+    if "experimentPhase" not in table.column_names:
+        return pa.nulls(table.num_rows, pa.bool_())
+    if "contextMetadataId" not in table.column_names:
+        return pc.is_null(table["experimentPhase"])
+    return pc.or_(pc.is_null(table["experimentPhase"]), pc.is_valid(table["contextMetadataId"]))
+
+
+# Arrow equivalents of the @pa.check / @pa.dataframe_check methods, by name
+ARROW_CUSTOM_CHECKS: Dict[str, Callable] = {
+    "timestamp_not_future": lambda values: pc.less_equal(values, _timestamp_bounds(values)[0]),
+    "timestamp_reasonable": lambda values: pc.greater_equal(values, _timestamp_bounds(values)[1]),
+    "experiment_phase_requires_metadata": _experiment_phase_requires_metadata,
+}
+
+
+def _arrow_check(check) -> ColumnCheck:
+    """Translate a Pandera check into an Arrow compute expression."""
+    stats = check.statistics or {}
+    if check.name == "str_matches":
+        pattern = stats["pattern"]
+        if not pattern.startswith("^"):
+            pattern = "^" + pattern  # Pandera's str_matches anchors at the start
+        return lambda values: pc.match_substring_regex(values, pattern)
+    if check.name == "isin":
+        value_set = pa.array(list(stats["allowed_values"]))
+        return lambda values: pc.is_in(values, value_set=value_set)
+    if check.name == "greater_than_or_equal_to":
+        return lambda values: pc.greater_equal(values, stats["min_value"])
+    if check.name == "less_than_or_equal_to":
+        return lambda values: pc.less_equal(values, stats["max_value"])
+    if check.name in ARROW_CUSTOM_CHECKS:
+        return ARROW_CUSTOM_CHECKS[check.name]
+    raise NotImplementedError(f"No Arrow equivalent for schema check: {check.name}")
+
+
+@dataclass
+class _ColumnRule:
+    column: str
+    nullable: bool
+    checks: List[Tuple[str, ColumnCheck]]
+    arrow_type: Optional[pa.DataType]
+
+
+def _column_rules(schema) -> List[_ColumnRule]:
+    rules = []
+    for name, column in schema.columns.items():
+        arrow_type = None
+        if "datetime" in str(column.dtype):
+            arrow_type = pa.timestamp("us")
+        elif "string" in str(column.dtype):
+            arrow_type = pa.string()
+        rules.append(_ColumnRule(
+            column=name,
+            nullable=column.nullable,
+            checks=[(check.name, _arrow_check(check)) for check in column.checks],
+            arrow_type=arrow_type,
+        ))
+    return rules
+
+
+# ==================== VALIDATOR ====================
+
+
+class ChunkedEventValidator:
+    """
+    Validate BehavioralEvent record batches with Arrow compute.
+
+    Checks mirror BehavioralEventSchema; constructing a validator fails if
+    the schema gains a check without an Arrow equivalent. Each validate()
+    call adds the batch's failures to `report`.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 1.0,
+        strict: bool = False,
+        max_examples: int = MAX_EXAMPLES,
+        seed: Optional[int] = 0,
+    ):
+        """
+        Args:
+            sample_rate: Fraction of rows checked by EXPENSIVE_CHECKS (0-1];
+                cheap checks always cover every row
+            strict: Raise ChunkValidationError on the first failing chunk
+            max_examples: Failure cases kept per check
+            seed: Seed for row sampling (None = nondeterministic)
+        """
+        if not 0 < sample_rate <= 1:
+            raise ValueError(f"sample_rate must be in (0, 1], got {sample_rate}")
+
+        schema = BehavioralEventSchema.to_schema()
+        self.rules = _column_rules(schema)
+        self.table_checks = [(check.name, _arrow_check(check)) for check in schema.checks]
+        self.sample_rate = sample_rate
+        self.strict = strict
+        self.max_examples = max_examples
+        self.report = EventValidationReport()
+        self._string_columns = {r.column for r in self.rules if r.arrow_type == pa.string()}
+        self._rng = np.random.default_rng(seed)
+
+    def validate(self, batch: Union[pa.RecordBatch, pa.Table, pd.DataFrame]) -> pa.BooleanArray:
+        """
+        Validate one chunk.
+
+        Args:
+            batch: Events (record batch, Arrow table or DataFrame); columns
+                missing from the batch are skipped like Pandera's optional
+                fields
+
+        Returns:
+            Per-row validity mask (rows not sampled for expensive checks are
+            judged by the cheap checks only)
+
+        Raises:
+            ChunkValidationError: In strict mode, if any row fails
+        """
+        table = _to_arrow(batch, self._string_columns)
+        offset = self.report.total_rows
+        n = table.num_rows
+        invalid = np.zeros(n, dtype=bool)
+
+        sample = None
+        if self.sample_rate < 1:
+            sample = np.flatnonzero(self._rng.random(n) < self.sample_rate)
+
+        for rule in self.rules:
+            if rule.column not in table.column_names:
+                continue
+            values = table[rule.column].combine_chunks()
+            if rule.arrow_type is not None and values.type != rule.arrow_type:
+                try:
+                    values = _coerce(values, rule.arrow_type)
+                except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                    failed = pc.is_valid(values)
+                    self._record(rule.column, f"coerce_dtype('{rule.arrow_type}')",
+                                 failed, values, None, offset, invalid)
+                    continue
+
+            if not rule.nullable:
+                self._record(rule.column, "not_nullable", pc.is_null(values), values, None, offset, invalid)
+
+            for name, check in rule.checks:
+                rows = sample if name in EXPENSIVE_CHECKS else None
+                checked = values.take(pa.array(rows)) if rows is not None else values
+                failed = pc.and_(pc.is_valid(checked), pc.invert(pc.fill_null(check(checked), True)))
+                self._record(rule.column, name, failed, checked, rows, offset, invalid)
+
+        for name, check in self.table_checks:
+            failed = pc.invert(pc.fill_null(check(table), True))
+            self._record(None, name, failed, None, None, offset, invalid)
+
+        chunk_invalid = int(invalid.sum())
+        self.report.total_rows += n
+        self.report.invalid_rows += chunk_invalid
+        self.report.chunks += 1
+
+        if chunk_invalid and self.strict:
+            failing = ", ".join(
+                f"{c.column or '<dataframe>'}:{c.check} ({c.failed_rows})" for c in self.report.failures()
+            )
+            raise ChunkValidationError(
+                f"{chunk_invalid} invalid rows in chunk {self.report.chunks}: {failing}",
+                self.report,
+            )
+
+        return pa.array(~invalid)
+
+    def _record(
+        self,
+        column: Optional[str],
+        check: str,
+        failed: pa.Array,
+        values: Optional[pa.Array],
+        rows: Optional[np.ndarray],
+        offset: int,
+        invalid: np.ndarray,
+    ) -> None:
+        """Add one check's failures to the report and the chunk's invalid mask."""
+        entry = self.report.checks.setdefault((column, check), CheckFailures(column, check))
+        mask = failed.to_numpy(zero_copy_only=False)
+        entry.checked_rows += len(mask)
+
+        positions = np.flatnonzero(mask)
+        if not len(positions):
+            return
+
+        entry.failed_rows += len(positions)
+        chunk_rows = rows[positions] if rows is not None else positions
+        invalid[chunk_rows] = True
+
+        room = self.max_examples - len(entry.examples)
+        for position, row in zip(positions[:room], chunk_rows[:room]):
+            value = values[int(position)].as_py() if values is not None else None
+            entry.examples.append((offset + int(row), value))
+
+
+def _coerce(values: pa.Array, arrow_type: pa.DataType) -> pa.Array:
+    """Cast like Pandera's coerce=True (timestamps keep their time zone)."""
+    if pa.types.is_timestamp(arrow_type) and pa.types.is_timestamp(values.type):
+        return values
+    if pa.types.is_string(arrow_type) and pa.types.is_large_string(values.type):
+        return values
+    return pc.cast(values, arrow_type)
+
+
+def _to_arrow(batch: Union[pa.RecordBatch, pa.Table, pd.DataFrame], string_columns: set) -> pa.Table:
+    if isinstance(batch, pa.Table):
+        return batch
+    if isinstance(batch, pa.RecordBatch):
+        return pa.Table.from_batches([batch])
+
+    # Object columns (eventData dicts) only need a null check; keep their
+    # null mask rather than converting arbitrary Python objects to Arrow
+    columns = {}
+    for name in batch.columns:
+        series = batch[name]
+        if series.dtype == object and name not in string_columns:
+            columns[name] = pa.array(np.ones(len(series), dtype=bool), mask=series.isna().to_numpy())
+        else:
+            columns[name] = pa.array(series, from_pandas=True)
+    return pa.table(columns)
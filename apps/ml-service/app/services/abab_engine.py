@@ -22,8 +22,17 @@ import numpy as np
 import pandas as pd
 from numpy.typing import NDArray
 
+from app.services.analysis_run_index import ABAB, now_ms, record_analysis_run
+from app.services.event_lake import get_event_lake
+from app.services.outcome_rollups import ROLLUP_TABLE
 from app.utils.sced_standards import check_sced_standards
 
+# Outcome column aggregated by research.daily_outcomes
+ROLLUP_OUTCOME_METRIC = "sessionPerformanceScore"
+
+# Statistical unit of an ABAB observation: one event, or a day's phase mean
+OBSERVATION_UNITS = ("event", "day")
+
 
 class ABABRandomizationEngine:
     """
@@ -66,18 +75,35 @@ class ABABRandomizationEngine:
         mlflow.set_tracking_uri(self.mlflow_tracking_uri)
 
     def fetch_abab_data(
-        self, user_id: str, protocol_id: str, outcome_metric: str = "sessionPerformanceScore"
+        self,
+        user_id: str,
+        protocol_id: str,
+        outcome_metric: str = "sessionPerformanceScore",
+        source: str = "events",
+        unit: str = "event",
     ) -> pd.DataFrame:
         """
         Fetch ABAB data from DuckDB.
 
-        Queries behavioral_events table for user's ABAB experiment data,
-        filtering by experimentPhase and ordering by timestamp.
+        Queries behavioral_events (or the user's lake partitions), filtering
+        by experimentPhase and ordering by timestamp. With unit="event" every
+        scored event is an observation; with unit="day" each day's phase mean
+        is (the SCED measurement occasion), aggregated from the same source.
+        The unit changes n, the p-value and Cohen's d, so it is always chosen
+        explicitly rather than by which tables exist.
+
+        source="rollup" reads research.daily_outcomes instead (unit="day",
+        sessionPerformanceScore only). The rollup is maintained from
+        research.behavioral_events by ingestion and the export, so it is only
+        equivalent when that is the table behavioral_events reads.
 
         Args:
             user_id: User ID
             protocol_id: Experiment protocol ID (for future use)
             outcome_metric: Column name for outcome variable
+            source: "events" (behavioral_events table), "lake" (the user's
+                Parquet lake partitions) or "rollup" (daily outcome rollup)
+            unit: "event" or "day" (see OBSERVATION_UNITS)
 
         Returns:
             DataFrame with columns: timestamp, experimentPhase, outcome
@@ -85,23 +111,70 @@ class ABABRandomizationEngine:
         Raises:
             ValueError: If insufficient data or missing phases
         """
-        conn = duckdb.connect(self.db_path, read_only=True)
-
-        query = f"""
-        SELECT
-            timestamp,
-            experimentPhase,
-            {outcome_metric} AS outcome
-        FROM behavioral_events
-        WHERE
-            userId = ?
-            AND experimentPhase IS NOT NULL
-            AND {outcome_metric} IS NOT NULL
-        ORDER BY timestamp ASC
-        """
-
-        df = conn.execute(query, [user_id]).df()
-        conn.close()
+        if unit not in OBSERVATION_UNITS:
+            raise ValueError(f"Unknown observation unit: {unit}. Use one of {OBSERVATION_UNITS}")
+        if source not in ("events", "lake", "rollup"):
+            raise ValueError(f"Unknown data source: {source}")
+
+        # The lake is read with an in-memory connection (no database file needed)
+        conn = duckdb.connect() if source == "lake" else duckdb.connect(self.db_path, read_only=True)
+        try:
+            params: List = []
+            if source == "rollup":
+                if outcome_metric != ROLLUP_OUTCOME_METRIC:
+                    raise ValueError(
+                        f"Daily rollups only cover {ROLLUP_OUTCOME_METRIC}, not {outcome_metric}"
+                    )
+                if unit != "day":
+                    raise ValueError("Daily rollups only provide unit='day' observations")
+                query = f"""
+                SELECT
+                    CAST(date AS TIMESTAMP) AS timestamp,
+                    phase AS experimentPhase,
+                    outcome_sum / outcome_count AS outcome
+                FROM {ROLLUP_TABLE}
+                WHERE
+                    user_id = ?
+                    AND phase IS NOT NULL
+                    AND outcome_count > 0
+                ORDER BY date ASC, phase ASC
+                """
+            else:
+                relation, params = "behavioral_events", []
+                if source == "lake":
+                    relation, params = get_event_lake().scan_sql(user_id)
+                if unit == "day":
+                    # Same (date, phase) grouping as research.daily_outcomes
+                    query = f"""
+                    SELECT
+                        CAST(CAST(timestamp AS DATE) AS TIMESTAMP) AS timestamp,
+                        experimentPhase,
+                        AVG({outcome_metric}) AS outcome
+                    FROM {relation}
+                    WHERE
+                        userId = ?
+                        AND experimentPhase IS NOT NULL
+                        AND {outcome_metric} IS NOT NULL
+                    GROUP BY 1, 2
+                    ORDER BY 1 ASC, 2 ASC
+                    """
+                else:
+                    query = f"""
+                    SELECT
+                        timestamp,
+                        experimentPhase,
+                        {outcome_metric} AS outcome
+                    FROM {relation}
+                    WHERE
+                        userId = ?
+                        AND experimentPhase IS NOT NULL
+                        AND {outcome_metric} IS NOT NULL
+                    ORDER BY timestamp ASC
+                    """
+
+            df = conn.execute(query, [*params, user_id]).df()
+        finally:
+            conn.close()
 
         if df.empty:
             raise ValueError(f"No ABAB data found for user {user_id}")
@@ -251,6 +324,7 @@ class ABABRandomizationEngine:
         outcome_metric: str,
         n_permutations: int,
         seed: Optional[int],
+        observation_unit: str = "event",
     ) -> Dict:
         """
         Cached wrapper for run_analysis (for repeated queries).
@@ -258,7 +332,7 @@ class ABABRandomizationEngine:
         LRU cache with 128 entry limit to avoid memory bloat.
         """
         return self._run_analysis_impl(
-            user_id, protocol_id, outcome_metric, n_permutations, seed
+            user_id, protocol_id, outcome_metric, n_permutations, seed, observation_unit
         )
 
     def run_analysis(
@@ -268,6 +342,7 @@ class ABABRandomizationEngine:
         outcome_metric: str = "sessionPerformanceScore",
         n_permutations: int = 10000,
         seed: Optional[int] = None,
+        observation_unit: str = "event",
     ) -> Dict:
         """
         Run complete ABAB randomization analysis.
@@ -287,6 +362,8 @@ class ABABRandomizationEngine:
             outcome_metric: Outcome variable column name
             n_permutations: Number of permutation iterations (1,000-50,000)
             seed: Random seed for reproducibility
+            observation_unit: "event" (each scored event) or "day" (daily
+                phase means)
 
         Returns:
             Dict with:
@@ -302,7 +379,7 @@ class ABABRandomizationEngine:
             ValueError: If data validation fails (missing phases, insufficient data)
         """
         return self._run_analysis_impl(
-            user_id, protocol_id, outcome_metric, n_permutations, seed
+            user_id, protocol_id, outcome_metric, n_permutations, seed, observation_unit
         )
 
     def _run_analysis_impl(
@@ -312,12 +389,13 @@ class ABABRandomizationEngine:
         outcome_metric: str,
         n_permutations: int,
         seed: Optional[int],
+        observation_unit: str = "event",
     ) -> Dict:
         """Internal implementation of run_analysis (for caching)."""
         start_time = time.time()
 
         # 1. Fetch data
-        df = self.fetch_abab_data(user_id, protocol_id, outcome_metric)
+        df = self.fetch_abab_data(user_id, protocol_id, outcome_metric, unit=observation_unit)
 
         # 2. Calculate observed effect
         observed_effect = self.calculate_observed_effect(df)
@@ -358,6 +436,7 @@ class ABABRandomizationEngine:
             wwc_rating=wwc_details["wwc_rating"],
             passes_wwc=passes_wwc,
             seed=seed,
+            observation_unit=observation_unit,
         )
 
         computation_time = time.time() - start_time
@@ -387,6 +466,7 @@ class ABABRandomizationEngine:
         wwc_rating: str,
         passes_wwc: bool,
         seed: Optional[int],
+        observation_unit: str = "event",
     ) -> str:
         """
         Log ABAB analysis to MLflow.
@@ -397,28 +477,44 @@ class ABABRandomizationEngine:
         Returns:
             MLflow run ID
         """
+        params = {
+            "user_id": user_id,
+            "protocol_id": protocol_id,
+            "outcome_metric": outcome_metric,
+            "n_permutations": n_permutations,
+            "seed": seed if seed is not None else "random",
+            "observation_unit": observation_unit,
+        }
+        metrics = {
+            "observed_effect": observed_effect,
+            "p_value": p_value,
+            "cohens_d": cohens_d,
+            # Phase sample sizes
+            **{f"n_{phase}": count for phase, count in phase_counts.items()},
+        }
+        tags = {
+            "analysis_type": "ABAB_randomization",
+            "user_id": user_id,
+            "significant": "yes" if p_value < 0.05 else "no",
+            "wwc_rating": wwc_rating,
+            "passes_wwc": "yes" if passes_wwc else "no",
+        }
+
         with mlflow.start_run() as run:
-            # Log parameters
-            mlflow.log_param("user_id", user_id)
-            mlflow.log_param("protocol_id", protocol_id)
-            mlflow.log_param("outcome_metric", outcome_metric)
-            mlflow.log_param("n_permutations", n_permutations)
-            mlflow.log_param("seed", seed if seed is not None else "random")
-
-            # Log metrics
-            mlflow.log_metric("observed_effect", observed_effect)
-            mlflow.log_metric("p_value", p_value)
-            mlflow.log_metric("cohens_d", cohens_d)
-
-            # Log phase sample sizes
-            for phase, count in phase_counts.items():
-                mlflow.log_metric(f"n_{phase}", count)
-
-            # Log tags
-            mlflow.set_tag("analysis_type", "ABAB_randomization")
-            mlflow.set_tag("user_id", user_id)
-            mlflow.set_tag("significant", "yes" if p_value < 0.05 else "no")
-            mlflow.set_tag("wwc_rating", wwc_rating)
-            mlflow.set_tag("passes_wwc", "yes" if passes_wwc else "no")
-
-            return run.info.run_id
+            mlflow.log_params(params)
+            mlflow.log_metrics(metrics)
+            mlflow.set_tags(tags)
+
+        # History endpoints read the index instead of searching MLflow
+        record_analysis_run(
+            run_id=run.info.run_id,
+            analysis_type=ABAB,
+            user_id=user_id,
+            start_time=run.info.start_time,
+            end_time=now_ms(),
+            params=params,
+            metrics=metrics,
+            tags=tags,
+        )
+
+        return run.info.run_id
@@ -0,0 +1,306 @@
+"""
+Analysis Run Index
+
+Lightweight SQLite index of ITS/ABAB analysis runs, written next to MLflow
+logging so the history endpoints don't call MlflowClient.search_runs (which
+scans every run directory of the file-based ./mlruns store per request).
+
+- One row per run: params, metrics and tags as logged to MLflow
+- Index on (user_id, analysis_type, start_time, run_id): history pages are
+  index range scans, independent of how many analyses exist overall
+- Keyset pagination via an opaque cursor (start_time, run_id)
+- MLflow remains the source of truth for artifacts; backfill_from_mlflow()
+  imports runs logged before the index existed
+
+SQLite (WAL mode) rather than DuckDB: every API worker process writes one
+row per analysis, and DuckDB allows only a single read-write process.
+"""
+
+import base64
+import json
+import logging
+import os
+import sqlite3
+import time
+from contextlib import closing
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ITS = "ITS"
+ABAB = "ABAB"
+
+# MLflow tag that identifies ABAB runs (ITS runs are the untagged ones)
+ABAB_TAG = ("analysis_type", "ABAB_randomization")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS analysis_runs (
+    run_id        TEXT PRIMARY KEY,
+    analysis_type TEXT NOT NULL,
+    user_id       TEXT NOT NULL,
+    start_time    INTEGER NOT NULL,  -- epoch ms (as MLflow)
+    end_time      INTEGER,
+    params        TEXT NOT NULL,     -- JSON objects
+    metrics       TEXT NOT NULL,
+    tags          TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_analysis_runs_user_time
+    ON analysis_runs (user_id, analysis_type, start_time DESC, run_id DESC);
+"""
+
+
+@dataclass
+class AnalysisRun:
+    """One indexed analysis run"""
+
+    run_id: str
+    analysis_type: str
+    user_id: str
+    start_time: int
+    end_time: Optional[int]
+    params: Dict[str, Any]
+    metrics: Dict[str, float]
+    tags: Dict[str, str]
+
+
+@dataclass
+class RunPage:
+    """One page of a user's runs (newest first)"""
+
+    runs: List[AnalysisRun]
+    next_cursor: Optional[str]
+
+
+class AnalysisRunIndex:
+    """
+    SQLite-backed index of analysis runs.
+
+    Usage:
+        index = get_analysis_run_index()
+        index.record(run_id, ITS, user_id, start_time, end_time, params, metrics)
+
+        page = index.list_runs(user_id, ITS, limit=10)
+        page = index.list_runs(user_id, ITS, limit=10, cursor=page.next_cursor)
+    """
+
+    def __init__(self, db_path: Optional[str] = None, timeout: float = 5.0):
+        """
+        Args:
+            db_path: SQLite file (default ANALYSIS_INDEX_PATH or data/analysis_runs.db)
+            timeout: Seconds to wait for another writer's lock
+        """
+        self.db_path = db_path or os.getenv("ANALYSIS_INDEX_PATH", "data/analysis_runs.db")
+        self.timeout = timeout
+        self._initialized = False
+
+    # ==================== WRITE ====================
+
+    def record(
+        self,
+        run_id: str,
+        analysis_type: str,
+        user_id: str,
+        start_time: int,
+        end_time: Optional[int],
+        params: Dict[str, Any],
+        metrics: Dict[str, float],
+        tags: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """Insert (or replace) one run."""
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO analysis_runs VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    run_id,
+                    analysis_type,
+                    user_id,
+                    int(start_time),
+                    None if end_time is None else int(end_time),
+                    json.dumps(params, default=str),
+                    json.dumps(metrics),
+                    json.dumps(tags or {}),
+                ),
+            )
+
+    def delete_user(self, user_id: str) -> int:
+        """Remove a user's runs from the index (MLflow runs are kept)."""
+        with closing(self._connect()) as conn, conn:
+            return conn.execute(
+                "DELETE FROM analysis_runs WHERE user_id = ?", (user_id,)
+            ).rowcount
+
+    # ==================== READ ====================
+
+    def list_runs(
+        self,
+        user_id: str,
+        analysis_type: str,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        offset: int = 0,
+    ) -> RunPage:
+        """
+        Get a page of a user's runs, newest first.
+
+        Args:
+            user_id: User ID
+            analysis_type: ITS or ABAB
+            limit: Page size
+            cursor: next_cursor of the previous page (keyset pagination)
+            offset: Rows to skip when no cursor is given (O(offset))
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        conditions = ["user_id = ?", "analysis_type = ?"]
+        params: List[Any] = [user_id, analysis_type]
+        if cursor is not None:
+            conditions.append("(start_time, run_id) < (?, ?)")
+            params.extend(_decode_cursor(cursor))
+            offset = 0
+
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                f"""
+                SELECT run_id, analysis_type, user_id, start_time, end_time, params, metrics, tags
+                FROM analysis_runs
+                WHERE {" AND ".join(conditions)}
+                ORDER BY start_time DESC, run_id DESC
+                LIMIT ? OFFSET ?
+                """,
+                [*params, limit + 1, offset],
+            ).fetchall()
+
+        runs = [_to_run(row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = _encode_cursor(runs[-1].start_time, runs[-1].run_id)
+        return RunPage(runs=runs, next_cursor=next_cursor)
+
+    def get(self, run_id: str) -> Optional[AnalysisRun]:
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                """
+                SELECT run_id, analysis_type, user_id, start_time, end_time, params, metrics, tags
+                FROM analysis_runs WHERE run_id = ?
+                """,
+                (run_id,),
+            ).fetchone()
+        return _to_run(row) if row else None
+
+    # ==================== BACKFILL ====================
+
+    def backfill_from_mlflow(self, experiment_ids: Optional[List[str]] = None) -> int:
+        """
+        Index runs logged to MLflow before the index existed.
+
+        Scans the MLflow store once; runs without a user_id param are skipped.
+
+        Returns:
+            Number of runs indexed
+        """
+        import mlflow
+
+        client = mlflow.tracking.MlflowClient()
+        count = 0
+        page_token = None
+        while True:
+            runs = client.search_runs(
+                experiment_ids=experiment_ids or ["0"],
+                max_results=1000,
+                page_token=page_token,
+            )
+            for run in runs:
+                user_id = run.data.params.get("user_id")
+                if user_id is None:
+                    continue
+                is_abab = run.data.tags.get(ABAB_TAG[0]) == ABAB_TAG[1]
+                self.record(
+                    run_id=run.info.run_id,
+                    analysis_type=ABAB if is_abab else ITS,
+                    user_id=user_id,
+                    start_time=run.info.start_time,
+                    end_time=run.info.end_time,
+                    params=dict(run.data.params),
+                    metrics=dict(run.data.metrics),
+                    tags={k: v for k, v in run.data.tags.items() if not k.startswith("mlflow.")},
+                )
+                count += 1
+
+            page_token = runs.token
+            if not page_token:
+                break
+
+        logger.info(f"Indexed {count} MLflow runs into {self.db_path}")
+        return count
+
+    # ==================== INTERNALS ====================
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout)
+        if not self._initialized:
+            # WAL lets API workers read while another process writes
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            self._initialized = True
+        return conn
+
+
+# ==================== HELPERS ====================
+
+
+def now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def _to_run(row: Tuple) -> AnalysisRun:
+    return AnalysisRun(
+        run_id=row[0],
+        analysis_type=row[1],
+        user_id=row[2],
+        start_time=row[3],
+        end_time=row[4],
+        params=json.loads(row[5]),
+        metrics=json.loads(row[6]),
+        tags=json.loads(row[7]),
+    )
+
+
+def _encode_cursor(start_time: int, run_id: str) -> str:
+    return base64.urlsafe_b64encode(f"{start_time}:{run_id}".encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[int, str]:
+    try:
+        start_time, run_id = base64.urlsafe_b64decode(cursor.encode()).decode().split(":", 1)
+        return int(start_time), run_id
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid pagination cursor")
+
+
+# Global index instance
+analysis_run_index = AnalysisRunIndex()
+
+
+def get_analysis_run_index() -> AnalysisRunIndex:
+    """Get global analysis run index instance."""
+    return analysis_run_index
+
+
+def record_analysis_run(**run: Any) -> None:
+    """
+    Index a run logged to MLflow (see AnalysisRunIndex.record).
+
+    Indexing failures are logged, not raised: the analysis itself succeeded
+    and the run can be re-indexed with backfill_from_mlflow().
+    """
+    try:
+        get_analysis_run_index().record(**run)
+    except Exception as e:
+        logger.warning(f"Failed to index analysis run {run.get('run_id')}: {e}")
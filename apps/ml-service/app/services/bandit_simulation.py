@@ -0,0 +1,451 @@
+"""
+Bandit Simulation Harness for Personalization Strategy Algorithms
+
+Benchmarks bandit policies over many independent, seeded replications:
+- Policies are vectorized over a replication axis (one NumPy op per round
+  advances every replication at once)
+- Replications can additionally be split across a process pool
+- Stationary, abruptly changing, drifting and contextual reward scenarios
+- Cumulative (pseudo-)regret curves with confidence bands and decisions/sec
+- Optional feedback transform, so policies can learn from the production
+  reward signal (e.g. StrategyOutcome.to_reward) instead of raw rewards
+
+Policies mirror the production algorithms:
+- epsilon_greedy: MultiArmedBandit epsilon-greedy (exploit best average reward)
+- thompson_sampling: MultiArmedBandit Beta-Bernoulli Thompson sampling
+- linucb: ContextualBandit LinUCB with Sherman-Morrison inverse updates
+
+Author: Americano ML Subsystem
+Story: 5.5 - Adaptive Personalization Engine (Task 9)
+"""
+
+import numpy as np
+from typing import Callable, Dict, List, Optional, Tuple, Any, Sequence
+from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor
+from enum import Enum
+import time
+
+from scipy.stats import norm
+
+
+POLICY_NAMES: Tuple[str, ...] = ("epsilon_greedy", "thompson_sampling", "linucb")
+
+# Maps observed rewards (array) to the reward signal policies learn from
+FeedbackFn = Callable[[np.ndarray], np.ndarray]
+
+
+@dataclass
+class RewardScenario:
+    """
+    Simulated reward environment for a set of arms.
+
+    The expected reward of arm k in round t for replication r is:
+        mean[r, k, t] = base_k(t) + drift[r, k, t] + x[r, t] . w_k
+    clipped to [0, 1], where:
+    - base_k(t): `means`, replaced at each round listed in `change_points`
+    - drift: Gaussian random walk with per-round std `drift_std`
+    - x[r, t]: context drawn from U(-0.5, 0.5)^d when `context_weights` is set
+
+    Observed rewards add Gaussian noise with per-arm `stds`.
+    """
+    arm_names: List[str]
+    means: np.ndarray  # (K,) base expected rewards
+    stds: np.ndarray  # (K,) observation noise
+    change_points: Dict[int, np.ndarray] = field(default_factory=dict)
+    drift_std: float = 0.0
+    context_weights: Optional[np.ndarray] = None  # (K, d) linear context effects
+
+    def __post_init__(self):
+        self.means = np.asarray(self.means, dtype=float)
+        self.stds = np.asarray(self.stds, dtype=float)
+        self.change_points = {
+            int(t): np.asarray(m, dtype=float) for t, m in self.change_points.items()
+        }
+        if self.context_weights is not None:
+            self.context_weights = np.asarray(self.context_weights, dtype=float)
+
+        n_arms = len(self.arm_names)
+        if self.means.shape != (n_arms,) or self.stds.shape != (n_arms,):
+            raise ValueError("means and stds must have one entry per arm")
+        for t, m in self.change_points.items():
+            if m.shape != (n_arms,):
+                raise ValueError(f"change point at round {t} must have one mean per arm")
+        if self.context_weights is not None and self.context_weights.shape[0] != n_arms:
+            raise ValueError("context_weights must have one row per arm")
+
+    @property
+    def n_arms(self) -> int:
+        return len(self.arm_names)
+
+    @property
+    def n_context_features(self) -> int:
+        """Context features observed by contextual policies (excluding bias)."""
+        return 0 if self.context_weights is None else self.context_weights.shape[1]
+
+    @property
+    def is_stationary(self) -> bool:
+        return not self.change_points and self.drift_std == 0.0
+
+    @classmethod
+    def from_distributions(
+        cls,
+        reward_distributions: Dict[Any, Any],
+        **kwargs: Any
+    ) -> 'RewardScenario':
+        """
+        Build a scenario from an {arm: (mean, std)} or {arm: mean} mapping.
+
+        Enum keys (e.g. StrategyType) are named by their value. A bare mean
+        uses a default std of 0.1, matching compare_algorithms.
+        """
+        names, means, stds = [], [], []
+        for arm, value in reward_distributions.items():
+            names.append(arm.value if isinstance(arm, Enum) else str(arm))
+            if isinstance(value, tuple):
+                mean, std = value
+            else:
+                mean, std = value, 0.1
+            means.append(mean)
+            stds.append(std)
+
+        return cls(arm_names=names, means=np.array(means), stds=np.array(stds), **kwargs)
+
+
+# ==================== VECTORIZED POLICIES ====================
+# Each policy holds state for R replications and selects/updates all of
+# them with array operations. Rewards are in [0, 1].
+
+class _Policy:
+    """Base policy tracking empirical reward averages per replication and arm."""
+
+    def __init__(self, n_reps: int, n_arms: int, rng: np.random.Generator):
+        self.rng = rng
+        self.counts = np.zeros((n_reps, n_arms))
+        self.sums = np.zeros((n_reps, n_arms))
+
+    def estimates(self) -> np.ndarray:
+        return np.divide(self.sums, self.counts, out=np.zeros_like(self.sums), where=self.counts > 0)
+
+    def select(self, contexts: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def update(self, arms: np.ndarray, rewards: np.ndarray, contexts: np.ndarray) -> None:
+        rows = np.arange(len(arms))
+        self.counts[rows, arms] += 1
+        self.sums[rows, arms] += rewards
+
+
+class _EpsilonGreedyPolicy(_Policy):
+    def __init__(self, n_reps: int, n_arms: int, rng: np.random.Generator, epsilon: float):
+        super().__init__(n_reps, n_arms, rng)
+        self.epsilon = epsilon
+
+    def select(self, contexts: np.ndarray) -> np.ndarray:
+        n_reps, n_arms = self.counts.shape
+        greedy = np.argmax(self.estimates(), axis=1)
+        explore = self.rng.random(n_reps) < self.epsilon
+        random_arms = self.rng.integers(0, n_arms, size=n_reps)
+        return np.where(explore, random_arms, greedy)
+
+
+class _ThompsonSamplingPolicy(_Policy):
+    def __init__(self, n_reps: int, n_arms: int, rng: np.random.Generator,
+                 success_threshold: float = 0.5):
+        super().__init__(n_reps, n_arms, rng)
+        self.success_threshold = success_threshold
+        self.alpha = np.ones((n_reps, n_arms))
+        self.beta = np.ones((n_reps, n_arms))
+
+    def select(self, contexts: np.ndarray) -> np.ndarray:
+        return np.argmax(self.rng.beta(self.alpha, self.beta), axis=1)
+
+    def update(self, arms: np.ndarray, rewards: np.ndarray, contexts: np.ndarray) -> None:
+        super().update(arms, rewards, contexts)
+        rows = np.arange(len(arms))
+        # Bernoulli treatment of reward, as in MultiArmedBandit.update
+        success = rewards > self.success_threshold
+        self.alpha[rows, arms] += success
+        self.beta[rows, arms] += ~success
+
+
+class _LinUCBPolicy(_Policy):
+    def __init__(self, n_reps: int, n_arms: int, rng: np.random.Generator,
+                 context_dim: int, alpha: float = 1.0, ridge_lambda: float = 1.0):
+        super().__init__(n_reps, n_arms, rng)
+        self.alpha = alpha
+        self.A_inv = np.tile(np.eye(context_dim) / ridge_lambda, (n_reps, n_arms, 1, 1))
+        self.b = np.zeros((n_reps, n_arms, context_dim))
+
+    def select(self, contexts: np.ndarray) -> np.ndarray:
+        A_inv_x = np.einsum('rkde,re->rkd', self.A_inv, contexts)
+        means = np.einsum('rkd,rkd->rk', A_inv_x, self.b)
+        variances = np.maximum(np.einsum('rkd,rd->rk', A_inv_x, contexts), 0.0)
+        return np.argmax(means + self.alpha * np.sqrt(variances), axis=1)
+
+    def update(self, arms: np.ndarray, rewards: np.ndarray, contexts: np.ndarray) -> None:
+        super().update(arms, rewards, contexts)
+        rows = np.arange(len(arms))
+        A_inv = self.A_inv[rows, arms]  # (R, d, d)
+        A_inv_x = np.einsum('rde,re->rd', A_inv, contexts)
+        denominator = 1.0 + np.einsum('rd,rd->r', A_inv_x, contexts)
+        self.A_inv[rows, arms] = (
+            A_inv - np.einsum('rd,re->rde', A_inv_x, A_inv_x) / denominator[:, None, None]
+        )
+        self.b[rows, arms] += rewards[:, None] * contexts
+
+
+def _make_policy(
+    name: str,
+    n_reps: int,
+    scenario: RewardScenario,
+    rng: np.random.Generator,
+    epsilon: float,
+    alpha: float
+) -> _Policy:
+    if name == "epsilon_greedy":
+        return _EpsilonGreedyPolicy(n_reps, scenario.n_arms, rng, epsilon)
+    if name == "thompson_sampling":
+        return _ThompsonSamplingPolicy(n_reps, scenario.n_arms, rng)
+    if name == "linucb":
+        return _LinUCBPolicy(
+            n_reps, scenario.n_arms, rng,
+            context_dim=scenario.n_context_features + 1, alpha=alpha
+        )
+    raise ValueError(f"Unknown policy '{name}'. Expected one of {POLICY_NAMES}")
+
+
+# ==================== SIMULATION ====================
+
+def _simulate_chunk(
+    scenario: RewardScenario,
+    policies: Sequence[str],
+    n_rounds: int,
+    n_reps: int,
+    seed: np.random.SeedSequence,
+    epsilon: float,
+    alpha: float,
+    feedback: Optional[FeedbackFn] = None
+) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Run `n_reps` replications of every policy for `n_rounds` rounds.
+
+    Policies share the environment trajectory and reward noise (common
+    random numbers), so differences between policies are not masked by
+    differences in luck. With `feedback`, policies are updated with
+    feedback(observed) instead of the observed reward.
+    """
+    env_seed, *policy_seeds = seed.spawn(len(policies) + 1)
+    env_rng = np.random.default_rng(env_seed)
+
+    agents = {
+        name: _make_policy(name, n_reps, scenario, np.random.default_rng(s), epsilon, alpha)
+        for name, s in zip(policies, policy_seeds)
+    }
+    regret = {name: np.zeros((n_reps, n_rounds)) for name in policies}
+    rewards = {name: np.zeros((n_reps, n_rounds)) for name in policies}
+    arms_played = {name: np.zeros((n_reps, n_rounds), dtype=int) for name in policies}
+    elapsed = dict.fromkeys(policies, 0.0)
+
+    rows = np.arange(n_reps)
+    base = np.broadcast_to(scenario.means, (n_reps, scenario.n_arms))
+    drift = np.zeros((n_reps, scenario.n_arms))
+    bias = np.ones((n_reps, 1))
+
+    for t in range(n_rounds):
+        if t in scenario.change_points:
+            base = np.broadcast_to(scenario.change_points[t], (n_reps, scenario.n_arms))
+        if scenario.drift_std > 0:
+            drift = drift + env_rng.normal(0.0, scenario.drift_std, size=drift.shape)
+
+        if scenario.context_weights is not None:
+            x = env_rng.uniform(-0.5, 0.5, size=(n_reps, scenario.n_context_features))
+            means = base + drift + x @ scenario.context_weights.T
+            contexts = np.hstack([x, bias])
+        else:
+            means = base + drift
+            contexts = bias
+        means = np.clip(means, 0.0, 1.0)
+
+        noise = env_rng.normal(0.0, 1.0, size=means.shape) * scenario.stds
+        observed = np.clip(means + noise, 0.0, 1.0)
+        signal = observed if feedback is None else feedback(observed)
+        optimal = means.max(axis=1)
+
+        for name, agent in agents.items():
+            start = time.perf_counter()
+            arms = agent.select(contexts)
+            agent.update(arms, signal[rows, arms], contexts)
+            elapsed[name] += time.perf_counter() - start
+
+            regret[name][:, t] = optimal - means[rows, arms]
+            rewards[name][:, t] = observed[rows, arms]
+            arms_played[name][:, t] = arms
+
+    return {
+        name: {
+            'cumulative_regret': np.cumsum(regret[name], axis=1),
+            'rewards': rewards[name],
+            'arms': arms_played[name],
+            'best_arm': np.argmax(agents[name].estimates(), axis=1),
+            'elapsed': np.array(elapsed[name]),
+        }
+        for name in policies
+    }
+
+
+def simulate_bandits(
+    scenario: RewardScenario,
+    policies: Sequence[str] = POLICY_NAMES,
+    n_rounds: int = 1000,
+    n_replications: int = 100,
+    seed: Optional[int] = None,
+    n_jobs: int = 1,
+    epsilon: float = 0.1,
+    alpha: float = 1.0,
+    confidence_level: float = 0.95,
+    feedback: Optional[FeedbackFn] = None
+) -> Dict[str, Any]:
+    """
+    Benchmark bandit policies over many independent replications.
+
+    Replications are vectorized within a process; with n_jobs > 1 they are
+    additionally split into chunks run on a process pool. Every chunk gets
+    an independent child of SeedSequence(seed), so results for a given
+    seed and n_jobs are reproducible.
+
+    Args:
+        scenario: Reward environment to simulate
+        policies: Policy names (subset of POLICY_NAMES)
+        n_rounds: Horizon (rounds per replication)
+        n_replications: Number of independent replications
+        seed: Root seed for reproducibility
+        n_jobs: Worker processes (1 = run in-process)
+        epsilon: Exploration rate for epsilon_greedy
+        alpha: Confidence width for linucb
+        confidence_level: Coverage of the regret confidence band
+        feedback: Optional transform of observed rewards into the signal
+            policies learn from (see _simulate_chunk); must be picklable
+            (a module-level function) when n_jobs > 1
+
+    Returns:
+        Per-policy regret curves (mean with confidence band), final regret,
+        average reward, best-arm identification rate and decisions/sec,
+        plus a 'summary' block with run metadata
+    """
+    if n_rounds < 1 or n_replications < 1:
+        raise ValueError("n_rounds and n_replications must be positive")
+    for name in policies:
+        if name not in POLICY_NAMES:
+            raise ValueError(f"Unknown policy '{name}'. Expected one of {POLICY_NAMES}")
+
+    n_chunks = max(1, min(n_jobs, n_replications))
+    chunk_sizes = [len(c) for c in np.array_split(np.arange(n_replications), n_chunks)]
+    chunk_seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+    args = [
+        (scenario, list(policies), n_rounds, size, chunk_seed, epsilon, alpha, feedback)
+        for size, chunk_seed in zip(chunk_sizes, chunk_seeds)
+    ]
+
+    start = time.perf_counter()
+    if n_chunks == 1:
+        chunks = [_simulate_chunk(*args[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=n_chunks) as executor:
+            chunks = list(executor.map(_simulate_chunk, *zip(*args)))
+    wall_time = time.perf_counter() - start
+
+    z = norm.ppf(0.5 + confidence_level / 2)
+    optimal_arm = int(np.argmax(scenario.means)) if scenario.is_stationary else None
+
+    results: Dict[str, Any] = {}
+    for name in policies:
+        cumulative = np.concatenate([c[name]['cumulative_regret'] for c in chunks])
+        rewards = np.concatenate([c[name]['rewards'] for c in chunks])
+        best_arm = np.concatenate([c[name]['best_arm'] for c in chunks])
+        policy_time = sum(float(c[name]['elapsed']) for c in chunks)
+
+        mean = cumulative.mean(axis=0)
+        if n_replications > 1:
+            sem = cumulative.std(axis=0, ddof=1) / np.sqrt(n_replications)
+        else:
+            sem = np.zeros_like(mean)
+
+        best_counts = np.bincount(best_arm, minlength=scenario.n_arms)
+        final = cumulative[:, -1]
+
+        results[name] = {
+            'cumulative_regret': {
+                'mean': mean.tolist(),
+                'lower': (mean - z * sem).tolist(),
+                'upper': (mean + z * sem).tolist(),
+            },
+            'final_regret': {
+                'mean': float(final.mean()),
+                'std': float(final.std(ddof=1)) if n_replications > 1 else 0.0,
+                'p5': float(np.percentile(final, 5)),
+                'p95': float(np.percentile(final, 95)),
+            },
+            'avg_reward': float(rewards.mean()),
+            'best_strategy_counts': {
+                arm: int(count) for arm, count in zip(scenario.arm_names, best_counts)
+            },
+            'best_strategy_rate': (
+                float(best_counts[optimal_arm] / n_replications)
+                if optimal_arm is not None else None
+            ),
+            'decisions_per_sec': (
+                n_rounds * n_replications / policy_time if policy_time > 0 else float('inf')
+            ),
+        }
+
+    results['summary'] = {
+        'n_rounds': n_rounds,
+        'n_replications': n_replications,
+        'n_jobs': n_chunks,
+        'seed': seed,
+        'confidence_level': confidence_level,
+        'feedback': getattr(feedback, '__name__', None),
+        'wall_time_seconds': wall_time,
+        'ranking': sorted(
+            policies, key=lambda name: results[name]['final_regret']['mean']
+        ),
+    }
+
+    return results
+
+
+def run_single_replication(
+    scenario: RewardScenario,
+    policies: Sequence[str],
+    n_rounds: int,
+    seed: Optional[int] = None,
+    epsilon: float = 0.1,
+    alpha: float = 1.0,
+    feedback: Optional[FeedbackFn] = None
+) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Run one replication and return raw per-round arrays for each policy.
+
+    Args:
+        feedback: Optional transform of observed rewards into the signal
+            policies learn from (see _simulate_chunk)
+
+    Returns:
+        Dictionary mapping policy to {'cumulative_regret', 'rewards', 'arms',
+        'best_arm'} (arrays for the single replication). cumulative_regret is
+        pseudo-regret: the gap between the best and the chosen arm's mean.
+    """
+    chunk = _simulate_chunk(
+        scenario, list(policies), n_rounds, 1, np.random.SeedSequence(seed), epsilon, alpha,
+        feedback
+    )
+    return {
+        name: {
+            'cumulative_regret': data['cumulative_regret'][0],
+            'rewards': data['rewards'][0],
+            'arms': data['arms'][0],
+            'best_arm': int(data['best_arm'][0]),
+        }
+        for name, data in chunk.items()
+    }
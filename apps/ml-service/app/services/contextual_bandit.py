@@ -0,0 +1,480 @@
+"""
+Contextual Bandit for Personalization Strategy Selection
+
+Implements linear contextual bandits over the same 4 personalization arms
+as MultiArmedBandit:
+- LinUCB (upper confidence bound on a ridge-regression reward model)
+- Linear Thompson sampling (Gaussian posterior over reward weights)
+
+Context is the 15-dimensional struggle FeatureVector plus a small set of
+learning-profile features, so a single model is shared across users and
+new users benefit from what earlier users taught it.
+
+Each arm keeps the inverse design matrix A^-1 directly and updates it with
+the Sherman-Morrison identity, making every update O(d^2) instead of a
+full O(d^3) matrix inversion.
+
+Author: Americano ML Subsystem
+Story: 5.5 - Adaptive Personalization Engine (Task 9)
+"""
+
+import numpy as np
+from typing import Dict, List, Optional, Tuple, Any, Union
+from dataclasses import dataclass
+from datetime import datetime
+import json
+
+from app.services.multi_armed_bandit import StrategyType, StrategyOutcome
+from app.services.struggle_feature_extractor import FeatureVector
+
+
+# Learning-profile features appended to the FeatureVector context
+PROFILE_FEATURE_NAMES: List[str] = [
+    'style_visual',
+    'style_auditory',
+    'style_kinesthetic',
+    'style_reading',
+    'optimal_session_duration',
+    'profile_data_quality',
+]
+
+# Ordered context features (FeatureVector + profile + bias term)
+CONTEXT_FEATURE_NAMES: List[str] = (
+    FeatureVector.feature_names() + PROFILE_FEATURE_NAMES + ['bias']
+)
+
+CONTEXT_DIM: int = len(CONTEXT_FEATURE_NAMES)
+
+# Session duration (minutes) mapped to 1.0 when normalizing profile context
+MAX_SESSION_DURATION_MINUTES = 120.0
+
+
+def build_context(
+    feature_vector: Union[FeatureVector, np.ndarray],
+    user_profile: Optional[Dict[str, Any]] = None
+) -> np.ndarray:
+    """
+    Build a bandit context vector from struggle features and profile data.
+
+    Profile values mirror the UserLearningProfile record as returned by the
+    feature extractor (camelCase keys). Missing profile data falls back to
+    neutral values so cold-start users still get a valid context.
+
+    Args:
+        feature_vector: FeatureVector or its 15-element array form
+        user_profile: Optional user learning profile dictionary
+
+    Returns:
+        Context array of length CONTEXT_DIM (all values 0-1, bias = 1)
+    """
+    if isinstance(feature_vector, FeatureVector):
+        features = feature_vector.to_array()
+    else:
+        features = np.asarray(feature_vector, dtype=float)
+
+    n_features = len(FeatureVector.feature_names())
+    if features.shape != (n_features,):
+        raise ValueError(
+            f"Expected {n_features} struggle features, got shape {features.shape}"
+        )
+
+    profile = user_profile or {}
+    learning_style = profile.get('learningStyleProfile') or {}
+
+    # VARK scores default to an even split when no profile exists
+    style = [
+        float(learning_style.get(key, 0.25))
+        for key in ('visual', 'auditory', 'kinesthetic', 'reading')
+    ]
+
+    optimal_duration = profile.get('optimalSessionDuration')
+    if optimal_duration is not None:
+        duration = min(1.0, max(0.0, optimal_duration / MAX_SESSION_DURATION_MINUTES))
+    else:
+        duration = 0.5  # Neutral if unknown
+
+    data_quality = float(profile.get('dataQualityScore', 0.0))
+
+    profile_features = np.clip(style + [duration, data_quality], 0.0, 1.0)
+
+    return np.concatenate([features, profile_features, [1.0]])
+
+
+@dataclass
+class LinearArmStats:
+    """
+    Ridge-regression state for one personalization strategy (arm).
+
+    Tracks:
+    - A_inv: Inverse of the regularized design matrix (lambda*I + sum x x^T)
+    - b: Reward-weighted context sum (sum r x)
+    - Empirical statistics for reporting
+    """
+    strategy_type: StrategyType
+    A_inv: np.ndarray
+    b: np.ndarray
+
+    # Empirical statistics
+    total_pulls: int = 0
+    total_reward: float = 0.0
+    avg_reward: float = 0.0
+
+    # Metadata
+    last_used_at: Optional[datetime] = None
+
+    @property
+    def theta(self) -> np.ndarray:
+        """Posterior mean reward weights (A^-1 b)."""
+        return self.A_inv @ self.b
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for serialization."""
+        return {
+            'strategy_type': self.strategy_type.value,
+            'A_inv': self.A_inv.tolist(),
+            'b': self.b.tolist(),
+            'total_pulls': self.total_pulls,
+            'total_reward': self.total_reward,
+            'avg_reward': self.avg_reward,
+            'last_used_at': self.last_used_at.isoformat() if self.last_used_at else None,
+        }
+
+
+class ContextualBandit:
+    """
+    Contextual bandit for personalization strategy selection.
+
+    Implements two algorithms over a shared linear reward model per arm:
+    1. LinUCB: Select arm maximizing x^T theta + alpha * sqrt(x^T A^-1 x)
+    2. Linear Thompson Sampling: Sample reward from N(x^T theta, v^2 x^T A^-1 x)
+
+    Unlike MultiArmedBandit, one instance is shared across all users: the
+    user's FeatureVector and learning profile form the context, so the
+    model generalizes between similar learners instead of exploring from
+    scratch for each user.
+
+    Usage:
+        # Shared bandit for all users
+        bandit = ContextualBandit()
+
+        # Build context and select strategy
+        context = build_context(feature_vector, user_profile)
+        strategy = bandit.select_strategy(context)
+
+        # Apply strategy, observe outcome
+        outcome = apply_personalization(strategy)
+
+        # Update with the same context
+        bandit.update(strategy, outcome, context)
+    """
+
+    def __init__(
+        self,
+        alpha: float = 1.0,
+        exploration_scale: float = 0.5,
+        ridge_lambda: float = 1.0,
+        context_dim: int = CONTEXT_DIM,
+        initial_arm_stats: Optional[Dict[StrategyType, LinearArmStats]] = None,
+        random_state: Optional[int] = None
+    ):
+        """
+        Initialize contextual bandit.
+
+        Args:
+            alpha: LinUCB exploration width (confidence bound multiplier)
+            exploration_scale: Posterior scale v for linear Thompson sampling
+            ridge_lambda: Ridge regularization (A starts as lambda * I)
+            context_dim: Context vector length (default CONTEXT_DIM)
+            initial_arm_stats: Pre-existing arm statistics (for loading)
+            random_state: Seed for reproducible sampling
+        """
+        if ridge_lambda <= 0:
+            raise ValueError("ridge_lambda must be positive")
+
+        self.alpha = alpha
+        self.exploration_scale = exploration_scale
+        self.ridge_lambda = ridge_lambda
+        self.context_dim = context_dim
+
+        if initial_arm_stats:
+            self.arms = initial_arm_stats
+        else:
+            self.arms = {
+                strategy_type: LinearArmStats(
+                    strategy_type=strategy_type,
+                    A_inv=np.eye(context_dim) / ridge_lambda,
+                    b=np.zeros(context_dim),
+                )
+                for strategy_type in StrategyType
+            }
+
+        # Algorithm selection
+        self.algorithm = "linucb"  # or "linear_thompson"
+
+        self.rng = np.random.default_rng(random_state)
+
+    # ==================== STRATEGY SELECTION ====================
+
+    def select_strategy(
+        self,
+        context: np.ndarray,
+        algorithm: str = "linucb"
+    ) -> StrategyType:
+        """
+        Select personalization strategy for a context.
+
+        Args:
+            context: Context vector (see build_context)
+            algorithm: "linucb" or "linear_thompson"
+
+        Returns:
+            Selected StrategyType
+        """
+        self.algorithm = algorithm
+        x = self._validate_context(context)
+
+        if algorithm == "linear_thompson":
+            scores = self._thompson_scores(x)
+        else:
+            scores = self._ucb_scores(x)
+
+        arm_types = list(self.arms.keys())
+        return arm_types[int(np.argmax(scores))]
+
+    def _ucb_scores(self, x: np.ndarray) -> np.ndarray:
+        """LinUCB score per arm: expected reward plus confidence width."""
+        means, variances = self._predict(x)
+        return means + self.alpha * np.sqrt(variances)
+
+    def _thompson_scores(self, x: np.ndarray) -> np.ndarray:
+        """
+        Sampled reward per arm for linear Thompson sampling.
+
+        Only x^T theta_tilde is needed to rank arms, and for
+        theta_tilde ~ N(theta, v^2 A^-1) it is distributed as
+        N(x^T theta, v^2 x^T A^-1 x). Sampling the scalar directly avoids
+        a per-arm Cholesky factorization.
+        """
+        means, variances = self._predict(x)
+        stds = self.exploration_scale * np.sqrt(variances)
+        return self.rng.normal(means, stds)
+
+    def _predict(self, x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Expected reward and x^T A^-1 x for every arm."""
+        A_inv = np.stack([arm.A_inv for arm in self.arms.values()])  # (K, d, d)
+        b = np.stack([arm.b for arm in self.arms.values()])  # (K, d)
+
+        A_inv_x = A_inv @ x  # (K, d)
+        # A^-1 is symmetric, so x^T theta = x^T A^-1 b = (A^-1 x)^T b
+        means = np.einsum('kd,kd->k', A_inv_x, b)
+        variances = np.maximum(A_inv_x @ x, 0.0)
+
+        return means, variances
+
+    # ==================== UPDATE METHODS ====================
+
+    def update(
+        self,
+        strategy_type: StrategyType,
+        outcome: Union[StrategyOutcome, float],
+        context: np.ndarray
+    ) -> None:
+        """
+        Update arm model with observed outcome for a context.
+
+        Uses the Sherman-Morrison identity to update A^-1 in O(d^2):
+            (A + x x^T)^-1 = A^-1 - (A^-1 x)(A^-1 x)^T / (1 + x^T A^-1 x)
+
+        Args:
+            strategy_type: Strategy that was applied
+            outcome: Observed outcome (or reward already in [0, 1])
+            context: Context the strategy was selected for
+        """
+        x = self._validate_context(context)
+        arm = self.arms[strategy_type]
+
+        if isinstance(outcome, StrategyOutcome):
+            reward = float(outcome.to_reward())
+        else:
+            reward = float(np.clip(outcome, 0, 1))
+
+        A_inv_x = arm.A_inv @ x
+        denominator = 1.0 + x @ A_inv_x
+        arm.A_inv -= np.outer(A_inv_x, A_inv_x) / denominator
+        arm.b += reward * x
+
+        # Update empirical statistics
+        arm.total_pulls += 1
+        arm.total_reward += reward
+        arm.avg_reward = arm.total_reward / arm.total_pulls
+
+        arm.last_used_at = datetime.utcnow()
+
+    def _validate_context(self, context: np.ndarray) -> np.ndarray:
+        """Coerce context to a float vector of the expected dimension."""
+        x = np.asarray(context, dtype=float)
+        if x.shape != (self.context_dim,):
+            raise ValueError(
+                f"Context must have shape ({self.context_dim},), got {x.shape}"
+            )
+        return x
+
+    # ==================== STATISTICS AND REPORTING ====================
+
+    def get_expected_rewards(self, context: np.ndarray) -> Dict[StrategyType, float]:
+        """
+        Get expected reward for each strategy in a context.
+
+        Args:
+            context: Context vector
+
+        Returns:
+            Dictionary mapping strategy to expected reward (x^T theta)
+        """
+        means, _ = self._predict(self._validate_context(context))
+        return {
+            strategy_type: float(mean)
+            for strategy_type, mean in zip(self.arms.keys(), means)
+        }
+
+    def get_strategy_ranking(
+        self,
+        context: np.ndarray
+    ) -> List[Tuple[StrategyType, float]]:
+        """
+        Get strategies ranked by expected reward for a context.
+
+        Args:
+            context: Context vector
+
+        Returns:
+            List of (StrategyType, expected_reward) tuples, sorted descending
+        """
+        expected = self.get_expected_rewards(context)
+        return sorted(expected.items(), key=lambda x: x[1], reverse=True)
+
+    def get_feature_weights(self) -> Dict[StrategyType, Dict[str, float]]:
+        """
+        Get learned reward weights (theta) per strategy.
+
+        Useful for interpreting which context features favour each strategy.
+
+        Returns:
+            Dictionary mapping strategy to {feature_name: weight}
+        """
+        names = (
+            CONTEXT_FEATURE_NAMES
+            if self.context_dim == CONTEXT_DIM
+            else [f'x{i}' for i in range(self.context_dim)]
+        )
+        return {
+            strategy_type: dict(zip(names, arm.theta.tolist()))
+            for strategy_type, arm in self.arms.items()
+        }
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get summary statistics for all strategies.
+
+        Returns:
+            Dictionary with per-arm pull counts and bandit metadata
+        """
+        return {
+            'algorithm': self.algorithm,
+            'alpha': self.alpha,
+            'exploration_scale': self.exploration_scale,
+            'ridge_lambda': self.ridge_lambda,
+            'context_dim': self.context_dim,
+            'strategies': {
+                strategy_type.value: {
+                    'total_pulls': arm.total_pulls,
+                    'avg_reward': arm.avg_reward,
+                    'last_used_at': arm.last_used_at.isoformat() if arm.last_used_at else None,
+                }
+                for strategy_type, arm in self.arms.items()
+            },
+            'total_pulls': sum(arm.total_pulls for arm in self.arms.values()),
+        }
+
+    # ==================== PERSISTENCE ====================
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serialize bandit state to dictionary.
+
+        Returns:
+            Dictionary representation of bandit state
+        """
+        return {
+            'alpha': self.alpha,
+            'exploration_scale': self.exploration_scale,
+            'ridge_lambda': self.ridge_lambda,
+            'context_dim': self.context_dim,
+            'algorithm': self.algorithm,
+            'arms': {
+                strategy_type.value: arm.to_dict()
+                for strategy_type, arm in self.arms.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ContextualBandit':
+        """
+        Deserialize bandit from dictionary.
+
+        Args:
+            data: Dictionary representation
+
+        Returns:
+            ContextualBandit instance
+        """
+        arms = {}
+        for strategy_name, arm_dict in data['arms'].items():
+            strategy_type = StrategyType(strategy_name)
+            last_used_at = arm_dict.get('last_used_at')
+
+            arms[strategy_type] = LinearArmStats(
+                strategy_type=strategy_type,
+                A_inv=np.array(arm_dict['A_inv'], dtype=float),
+                b=np.array(arm_dict['b'], dtype=float),
+                total_pulls=arm_dict['total_pulls'],
+                total_reward=arm_dict['total_reward'],
+                avg_reward=arm_dict['avg_reward'],
+                last_used_at=datetime.fromisoformat(last_used_at) if last_used_at else None,
+            )
+
+        bandit = cls(
+            alpha=data['alpha'],
+            exploration_scale=data['exploration_scale'],
+            ridge_lambda=data['ridge_lambda'],
+            context_dim=data['context_dim'],
+            initial_arm_stats=arms,
+        )
+        bandit.algorithm = data.get('algorithm', 'linucb')
+        return bandit
+
+    def save_json(self, filepath: str) -> None:
+        """
+        Save bandit state to JSON file.
+
+        Args:
+            filepath: Path to save file
+        """
+        with open(filepath, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2, default=str)
+
+    @classmethod
+    def load_json(cls, filepath: str) -> 'ContextualBandit':
+        """
+        Load bandit state from JSON file.
+
+        Args:
+            filepath: Path to saved file
+
+        Returns:
+            ContextualBandit instance
+        """
+        with open(filepath, 'r') as f:
+            data = json.load(f)
+
+        return cls.from_dict(data)
@@ -24,10 +24,11 @@ from prisma.enums import (
     MasteryLevel,
     ReviewRating
 )
+import asyncio
 import logging
 
 from app.services.struggle_feature_extractor import StruggleFeatureExtractor, FeatureVector
-from app.services.struggle_prediction_model import StrugglePredictionModel, PredictionResult
+from app.services.struggle_prediction_model import StrugglePredictionModel
 
 logger = logging.getLogger(__name__)
 
@@ -44,9 +45,16 @@ class StruggleDetectionEngine:
     5. Generate intervention recommendations
     """
 
-    def __init__(self, db: Prisma):
-        """Initialize with Prisma client."""
+    def __init__(self, db: Prisma, chunk_size: int = 500):
+        """
+        Initialize with Prisma client.
+
+        Args:
+            db: Prisma client
+            chunk_size: Objectives scored and inserted per pipeline step
+        """
         self.db = db
+        self.chunk_size = chunk_size
         self.feature_extractor = StruggleFeatureExtractor(db, cache_enabled=True)
         self.prediction_model = StrugglePredictionModel()
 
@@ -54,6 +62,13 @@ class StruggleDetectionEngine:
         """
         Run predictions for all upcoming objectives.
 
+        Objectives are processed in chunks: each chunk costs a fixed number
+        of feature queries, one predict_batch call and one create_many, and
+        the insert for a chunk overlaps with scoring of the next one. A chunk
+        that fails to score is split in half and retried until the failing
+        objectives are isolated, and a failed insert falls back to one row at
+        a time, so an error only drops the objectives that caused it.
+
         Args:
             user_id: User identifier
             days_ahead: Number of days to predict ahead (7-14)
@@ -91,20 +106,49 @@ class StruggleDetectionEngine:
         )
         objective_ids.extend([obj.id for obj in unscheduled])
 
-        # Remove duplicates
-        unique_objective_ids = list(set(objective_ids))
+        # Remove duplicates (preserving mission order)
+        unique_objective_ids = list(dict.fromkeys(objective_ids))
+        if not unique_objective_ids:
+            return []
 
-        # Run predictions
-        predictions = []
-        for objective_id in unique_objective_ids:
-            try:
-                prediction = await self._predict_for_objective(user_id, objective_id)
-                if prediction and prediction.predictedStruggleProbability > 0.5:
-                    predictions.append(prediction)
-            except Exception as e:
-                logger.error(f"Failed to predict for objective {objective_id}: {e}")
+        # Pipeline: score chunk i+1 while chunk i is being written.
+        # predictedAt is stored with millisecond precision and identifies
+        # this run's rows when they are read back.
+        now = datetime.utcnow()
+        predicted_at = now.replace(microsecond=now.microsecond // 1000 * 1000)
+        write_task: Optional[asyncio.Task] = None
+        written = 0
+
+        try:
+            for start in range(0, len(unique_objective_ids), self.chunk_size):
+                chunk = unique_objective_ids[start:start + self.chunk_size]
+                rows = await self._score_chunk(user_id, chunk, predicted_at)
+
+                if write_task is not None:
+                    written += await write_task
+                write_task = asyncio.create_task(self._write_predictions(rows))
+
+            if write_task is not None:
+                written += await write_task
+        finally:
+            # If scoring raised, let the insert already in flight finish
+            if write_task is not None:
+                await asyncio.gather(write_task, return_exceptions=True)
+
+        # Read back this run's records (create_many only returns a count)
+        predictions = await self.db.struggleprediction.find_many(
+            where={
+                "userId": user_id,
+                "learningObjectiveId": {"in": unique_objective_ids},
+                "predictedAt": predicted_at,
+                "predictedStruggleProbability": {"gt": 0.5}
+            },
+            order={"predictedStruggleProbability": "desc"}
+        )
 
-        logger.info(f"Generated {len(predictions)} predictions with probability >0.5")
+        logger.info(
+            f"Stored {written} predictions, {len(predictions)} with probability >0.5"
+        )
         return predictions
 
     async def detect_upcoming_struggles(
@@ -252,48 +296,102 @@ class StruggleDetectionEngine:
 
     # ==================== HELPER METHODS ====================
 
-    async def _predict_for_objective(
+    async def _score_chunk(
         self,
         user_id: str,
-        objective_id: str
-    ) -> Optional[StrugglePrediction]:
-        """Predict struggle for a specific objective."""
+        objective_ids: List[str],
+        predicted_at: datetime
+    ) -> List[Dict[str, Any]]:
+        """
+        Score a chunk, bisecting it if it fails.
+
+        A failing chunk is split in half and each half retried, so a single
+        bad objective costs about 2*log2(chunk_size) extra feature queries
+        rather than one per objective, and only loses its own prediction.
+        """
         try:
-            # Extract features
-            features = await self.feature_extractor.extract_features_for_objective(
-                user_id, objective_id
+            return await self._score_objectives(user_id, objective_ids, predicted_at)
+        except Exception as e:
+            if len(objective_ids) == 1:
+                logger.error(f"Failed to predict for objective {objective_ids[0]}: {e}")
+                return []
+            logger.warning(
+                f"Scoring {len(objective_ids)} objectives failed ({e}), retrying each half"
             )
 
-            # Run prediction
-            result: PredictionResult = self.prediction_model.predict(features)
+        middle = len(objective_ids) // 2
+        rows = await self._score_chunk(user_id, objective_ids[:middle], predicted_at)
+        rows.extend(await self._score_chunk(user_id, objective_ids[middle:], predicted_at))
+        return rows
 
-            # Get objective details
-            objective = await self.db.learningobjective.find_unique(
-                where={"id": objective_id},
-                include={"lecture": {"include": {"course": True}}}
-            )
+    async def _score_objectives(
+        self,
+        user_id: str,
+        objective_ids: List[str],
+        predicted_at: datetime
+    ) -> List[Dict[str, Any]]:
+        """
+        Extract features and predict for a chunk of objectives.
 
-            if not objective:
-                return None
+        Returns:
+            StrugglePrediction create payloads (objectives not found are skipped)
+        """
+        found_ids, X, data_quality, topic_ids = await self.feature_extractor.extract_feature_matrix(
+            user_id, objective_ids, return_topics=True
+        )
+        extracted_at = datetime.utcnow()
+        if not found_ids:
+            return []
 
-            # Create prediction record
-            prediction = await self.db.struggleprediction.create(
-                data={
-                    "userId": user_id,
-                    "learningObjectiveId": objective_id,
-                    "topicId": objective.lecture.courseId,
-                    "predictedStruggleProbability": result.probability,
-                    "predictionConfidence": result.confidence,
-                    "featureVector": features.to_dict(),
-                    "predictionStatus": PredictionStatus.PENDING
-                }
-            )
+        batch = self.prediction_model.predict_batch(X, data_quality=data_quality)
+        feature_names = FeatureVector.feature_names()
+
+        rows = []
+        for i, objective_id in enumerate(found_ids):
+            feature_vector = dict(zip(feature_names, X[i].tolist()))
+            feature_vector["data_quality"] = float(data_quality[i])
+            feature_vector["extracted_at"] = extracted_at.isoformat()
 
-            return prediction
+            rows.append({
+                "userId": user_id,
+                "learningObjectiveId": objective_id,
+                "topicId": topic_ids[i],
+                "predictedStruggleProbability": float(batch.probabilities[i]),
+                "predictionConfidence": float(batch.confidences[i]),
+                "featureVector": feature_vector,
+                "strugglingFactors": [
+                    {"feature": name, "contribution": value}
+                    for name, value in batch.contributing_features(i).items()
+                ],
+                "predictionStatus": PredictionStatus.PENDING,
+                "predictedAt": predicted_at
+            })
+
+        return rows
 
+    async def _write_predictions(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Insert a chunk of predictions in a single statement.
+
+        If the bulk insert fails, rows are inserted one by one so only the
+        failing ones are lost.
+        """
+        if not rows:
+            return 0
+
+        try:
+            return await self.db.struggleprediction.create_many(data=rows)
         except Exception as e:
-            logger.error(f"Prediction failed for objective {objective_id}: {e}")
-            return None
+            logger.warning(f"Bulk insert of {len(rows)} predictions failed ({e}), inserting one at a time")
+
+        written = 0
+        for row in rows:
+            try:
+                await self.db.struggleprediction.create(data=row)
+                written += 1
+            except Exception as e:
+                logger.error(f"Failed to store prediction for objective {row['learningObjectiveId']}: {e}")
+        return written
 
     def _calculate_alert_severity(self, indicators: List[Any]) -> Severity:
         """Calculate overall severity from indicators."""
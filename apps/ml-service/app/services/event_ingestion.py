@@ -0,0 +1,312 @@
+"""
+Behavioral Event Ingestion
+
+Near-real-time path from the app to the analytics store, next to the batch
+export (export_behavioral_events.py):
+
+- POST /events/ingest validates a batch and queues it as an Arrow table
+- A background task flushes queued events as one micro-batch every
+  INGEST_FLUSH_ROWS rows or INGEST_FLUSH_MS milliseconds, whichever first
+- Each flush appends one set of files to the event lake and inserts the
+  rows into research.behavioral_events with an Arrow scan (skipping ids
+  already there), then refreshes the daily rollups of the (user, day)
+  pairs it touched
+- The DuckDB leg runs under a cross-process lock file ({db}.lock), so API
+  workers and the export sync take turns as the single read-write process
+- A failed flush is retried without re-appending what already reached the
+  lake
+- The queue is bounded by INGEST_MAX_QUEUED_ROWS, counting rows that are
+  still being written; submissions beyond it are rejected so callers back
+  off instead of growing memory when writes fall behind
+
+Events the batch export later reads from Postgres are skipped by id in the
+lake, so the two paths can run side by side.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Union
+
+import duckdb
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from app.services.event_lake import EventLake, get_event_lake, to_lake_table
+from app.services.outcome_rollups import EVENTS_TABLE, refresh_daily_outcomes
+from app.utils.file_lock import file_lock, lock_path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_ROWS = 5000
+DEFAULT_FLUSH_MS = 1000
+DEFAULT_MAX_QUEUED_ROWS = 50000
+
+
+class IngestQueueFullError(RuntimeError):
+    """The ingestion queue has no room for the batch"""
+
+
+class IngestorNotRunningError(RuntimeError):
+    """The ingestion flush task is not running"""
+
+
+class EventIngestor:
+    """
+    Bounded in-memory queue of behavioral events flushed in micro-batches.
+
+    Usage:
+        ingestor = get_event_ingestor()
+        await ingestor.start()
+        queued = ingestor.submit(events)      # raises IngestQueueFullError
+        await ingestor.stop()                 # flushes what is queued
+    """
+
+    def __init__(
+        self,
+        lake: Optional[EventLake] = None,
+        duckdb_path: Optional[str] = None,
+        flush_rows: Optional[int] = None,
+        flush_ms: Optional[int] = None,
+        max_queued_rows: Optional[int] = None,
+    ):
+        """
+        Args:
+            lake: Event lake to append to (default: global lake)
+            duckdb_path: Analytics database (default DUCKDB_DB_PATH)
+            flush_rows: Flush once this many rows are queued (INGEST_FLUSH_ROWS)
+            flush_ms: Flush at least this often when rows are queued (INGEST_FLUSH_MS)
+            max_queued_rows: Queued plus in-flight rows before submissions
+                are rejected (INGEST_MAX_QUEUED_ROWS)
+        """
+        self._lake = lake
+        self.duckdb_path = duckdb_path or os.getenv("DUCKDB_DB_PATH", "./data/duckdb/analytics.duckdb")
+        self.flush_rows = flush_rows or int(os.getenv("INGEST_FLUSH_ROWS", DEFAULT_FLUSH_ROWS))
+        self.flush_ms = flush_ms or int(os.getenv("INGEST_FLUSH_MS", DEFAULT_FLUSH_MS))
+        self.max_queued_rows = max_queued_rows or int(
+            os.getenv("INGEST_MAX_QUEUED_ROWS", DEFAULT_MAX_QUEUED_ROWS)
+        )
+        self.lock_timeout = float(os.getenv("INGEST_LOCK_TIMEOUT", "10"))
+
+        self._queue: List[pa.Table] = []
+        self._retry: Optional[_FlushBatch] = None
+        self._queued_rows = 0      # waiting in _queue
+        self._pending_rows = 0     # waiting or being written
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._stopping = False
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {
+            "accepted_rows": 0,
+            "rejected_rows": 0,
+            "flushed_rows": 0,
+            "flushes": 0,
+            "flush_errors": 0,
+            "last_flush_ms": None,
+        }
+
+    @property
+    def lake(self) -> EventLake:
+        return self._lake or get_event_lake()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done() and not self._stopping
+
+    # ==================== QUEUE ====================
+
+    def submit(self, events: Union[pd.DataFrame, pa.Table]) -> int:
+        """
+        Queue validated events for the next flush.
+
+        Returns:
+            Rows pending after this batch
+
+        Raises:
+            IngestorNotRunningError: If start() has not been awaited
+            IngestQueueFullError: If the batch would exceed max_queued_rows
+        """
+        if not self.running:
+            raise IngestorNotRunningError("Event ingestion is not running")
+
+        table = to_lake_table(events)
+        if self._pending_rows + table.num_rows > self.max_queued_rows:
+            self._stats["rejected_rows"] += table.num_rows
+            raise IngestQueueFullError(
+                f"Ingestion queue full ({self._pending_rows}/{self.max_queued_rows} rows)"
+            )
+
+        self._queue.append(table)
+        self._queued_rows += table.num_rows
+        self._pending_rows += table.num_rows
+        self._stats["accepted_rows"] += table.num_rows
+        if self._queued_rows >= self.flush_rows:
+            self._wakeup.set()
+        return self._pending_rows
+
+    def stats(self) -> dict:
+        """Queue depth and flush counters."""
+        return {
+            **self._stats,
+            "queued_rows": self._queued_rows,
+            "pending_rows": self._pending_rows,
+            "max_queued_rows": self.max_queued_rows,
+            "running": self.running,
+        }
+
+    # ==================== LIFECYCLE ====================
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            f"Event ingestion started (flush every {self.flush_rows} rows / {self.flush_ms} ms, "
+            f"max {self.max_queued_rows} queued)"
+        )
+
+    async def stop(self) -> None:
+        """Stop accepting events and flush everything still queued."""
+        if self._task is None:
+            return
+        # Let an in-progress flush finish rather than cancelling its write
+        self._stopping = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+        if self._pending_rows:
+            logger.warning(f"Event ingestion stopped with {self._pending_rows} rows unflushed")
+        logger.info("Event ingestion stopped")
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_ms / 1000)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if self._queue or self._retry is not None:
+                await self.flush()
+
+        # Drain what is left, stopping at the first failed flush
+        while (self._queue or self._retry is not None) and await self.flush():
+            pass
+
+    # ==================== FLUSH ====================
+
+    async def flush(self) -> int:
+        """
+        Write everything queued as one micro-batch.
+
+        On failure the batch is kept and retried (alone) on the next flush;
+        it keeps counting against max_queued_rows, so persistent failures
+        turn into backpressure. Writes are idempotent by event id: lake
+        appends skip ids already stored in the touched partitions (so a
+        client re-posting a batch, or a retry after a partial append, adds
+        nothing twice), and DuckDB only inserts ids it lacks.
+
+        Returns:
+            Rows written
+        """
+        async with self._flush_lock:
+            if self._retry is not None:
+                batch, self._retry = self._retry, None
+            else:
+                if not self._queue:
+                    return 0
+                batch = _FlushBatch(pa.concat_tables(self._queue))
+                self._queue, self._queued_rows = [], 0
+            rows = batch.table.num_rows
+
+            started = time.perf_counter()
+            try:
+                await asyncio.to_thread(self._write, batch)
+            except Exception as e:
+                logger.error(f"Event ingestion flush of {rows} rows failed (will retry): {e}")
+                self._stats["flush_errors"] += 1
+                batch.attempts += 1
+                self._retry = batch
+                return 0
+
+            self._pending_rows -= rows
+            self._stats["flushes"] += 1
+            self._stats["flushed_rows"] += rows
+            self._stats["last_flush_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            return rows
+
+    def _write(self, batch: "_FlushBatch") -> None:
+        table = batch.table
+
+        # A client retry may put the same event in one micro-batch twice
+        ids = table["id"]
+        if pc.count_distinct(ids).as_py() < table.num_rows:
+            table = table.take(pc.index_in(pc.unique(ids), value_set=ids))
+
+        # De-duplicate against the touched partitions: a re-posted batch or
+        # a failed earlier append may already have stored some of these ids
+        if not batch.lake_written:
+            self.lake.append(table)
+            batch.lake_written = True
+
+        # One writer at a time across API workers and the export sync
+        Path(self.duckdb_path).parent.mkdir(parents=True, exist_ok=True)
+        with file_lock(lock_path(self.duckdb_path), timeout=self.lock_timeout):
+            conn = duckdb.connect(self.duckdb_path)
+            try:
+                insert_new_events(conn, table)
+                refresh_daily_outcomes(conn, changed="new_events")
+            finally:
+                conn.close()
+
+
+@dataclass
+class _FlushBatch:
+    """One micro-batch and how far its write got"""
+
+    table: pa.Table
+    lake_written: bool = False
+    attempts: int = 0
+
+
+def insert_new_events(conn, table: pa.Table) -> int:
+    """
+    Insert events into research.behavioral_events, skipping ids it has.
+
+    The id lookup is limited to the batch's time range, so row group zone
+    maps on timestamp skip most of the table. Registers the table as
+    new_events (e.g. for refresh_daily_outcomes).
+
+    Returns:
+        Rows inserted
+    """
+    conn.register("new_events", table)
+    conn.execute("CREATE SCHEMA IF NOT EXISTS research")
+    conn.execute(f"CREATE TABLE IF NOT EXISTS {EVENTS_TABLE} AS SELECT * FROM new_events LIMIT 0")
+    bounds = pc.min_max(table["timestamp"]).as_py()
+    return conn.execute(
+        f"""
+        INSERT INTO {EVENTS_TABLE} BY NAME
+        SELECT * FROM new_events n
+        WHERE n.id NOT IN (
+            SELECT id FROM {EVENTS_TABLE}
+            WHERE timestamp BETWEEN ? AND ?
+        )
+        """,
+        [bounds["min"], bounds["max"]],
+    ).fetchone()[0]
+
+
+# Global ingestor instance
+event_ingestor = EventIngestor()
+
+
+def get_event_ingestor() -> EventIngestor:
+    """Get the global event ingestor"""
+    return event_ingestor
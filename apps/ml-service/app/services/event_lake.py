@@ -0,0 +1,366 @@
+"""
+Behavioral Event Lake
+
+Hive-partitioned Parquet dataset of behavioral events, written by the export
+script (and other appenders) and read by the ITS/ABAB engines and the
+orchestration session history:
+
+    {lake}/date=2025-10-01/user_bucket=7/part-<uuid>-0.parquet
+
+- Append-only: each export adds new files; existing files are only replaced
+  by compaction
+- user_bucket = crc32(userId) % user_buckets, so a per-user query reads one
+  bucket directory per day
+- Rows sorted by (userId, timestamp) within every file, zstd-compressed with
+  column statistics: row group min/max prune within a partition
+- compact() merges a partition's small files into one sorted file
+- scan_sql() builds a read_parquet(..., hive_partitioning = true) relation that
+  globs only the user's bucket and filters on date, which DuckDB pushes down
+  to skip whole directories
+
+The bucket count is stored in {lake}/_lake.json when the lake is created, so
+readers and writers agree on it even if the configured default changes.
+"""
+
+import json
+import logging
+import os
+import uuid
+import zlib
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, List, Optional, Tuple, Union
+
+import duckdb
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+try:
+    import orjson
+    HAVE_ORJSON = True
+except Exception:
+    HAVE_ORJSON = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LAKE_PATH = "./data/lake/behavioral_events"
+DEFAULT_USER_BUCKETS = 16
+ROW_GROUP_ROWS = 64 * 1024
+SMALL_FILE_BYTES = 32 * 1024 * 1024
+METADATA_FILE = "_lake.json"
+
+# Storage schema (Prisma BehavioralEvent); eventData is stored as JSON text
+LAKE_SCHEMA = pa.schema([
+    ("id", pa.string()),
+    ("userId", pa.string()),
+    ("eventType", pa.string()),
+    ("eventData", pa.string()),
+    ("timestamp", pa.timestamp("us")),
+    ("completionQuality", pa.string()),
+    ("contentType", pa.string()),
+    ("dayOfWeek", pa.int32()),
+    ("difficultyLevel", pa.string()),
+    ("engagementLevel", pa.string()),
+    ("sessionPerformanceScore", pa.int32()),
+    ("timeOfDay", pa.int32()),
+    ("experimentPhase", pa.string()),
+    ("randomizationSeed", pa.int32()),
+    ("contextMetadataId", pa.string()),
+])
+
+PARTITION_SCHEMA = pa.schema([("date", pa.date32()), ("user_bucket", pa.int32())])
+SORT_KEYS = [("userId", "ascending"), ("timestamp", "ascending")]
+
+
+def user_bucket(user_id: str, user_buckets: int) -> int:
+    """Partition bucket of a user (stable across processes and Python versions)."""
+    return zlib.crc32(user_id.encode()) % user_buckets
+
+
+class EventLake:
+    """
+    Append-only, Hive-partitioned Parquet store of behavioral events.
+
+    Usage:
+        lake = get_event_lake()
+        lake.append(events_df)                      # new files only
+        relation, params = lake.scan_sql(user_id, start, end)
+        conn.execute(f"SELECT ... FROM {relation} WHERE ...", params + [...])
+        lake.compact()                              # merge small files
+    """
+
+    def __init__(self, path: Optional[str] = None, user_buckets: Optional[int] = None):
+        """
+        Args:
+            path: Lake root (default EVENT_LAKE_PATH or ./data/lake/behavioral_events)
+            user_buckets: Buckets for new lakes (default EVENT_LAKE_USER_BUCKETS or 16);
+                existing lakes keep the count they were created with
+        """
+        self.path = Path(path or os.getenv("EVENT_LAKE_PATH", DEFAULT_LAKE_PATH))
+        self._default_buckets = user_buckets or int(
+            os.getenv("EVENT_LAKE_USER_BUCKETS", str(DEFAULT_USER_BUCKETS))
+        )
+        self._user_buckets: Optional[int] = None
+
+    @property
+    def user_buckets(self) -> int:
+        if self._user_buckets is None:
+            metadata = self.path / METADATA_FILE
+            if metadata.exists():
+                self._user_buckets = int(json.loads(metadata.read_text())["user_buckets"])
+            else:
+                self._user_buckets = self._default_buckets
+        return self._user_buckets
+
+    def has_data(self) -> bool:
+        return self.path.exists() and next(self.path.glob("date=*/user_bucket=*/*.parquet"), None) is not None
+
+    # ==================== WRITE ====================
+
+    def append(self, events: Union[pd.DataFrame, pa.Table], dedupe: bool = True) -> pa.Table:
+        """
+        Append events as new files in their (date, user_bucket) partitions.
+
+        Args:
+            events: Behavioral events (DataFrame or Arrow table with the
+                BehavioralEvent columns; missing optional columns become null)
+            dedupe: Skip events whose id already exists in the affected
+                partitions (makes overlapping exports idempotent)
+
+        Returns:
+            The rows written (LAKE_SCHEMA), e.g. for syncing DuckDB
+        """
+        table = to_lake_table(events)
+        if table.num_rows == 0:
+            return table
+
+        self._ensure_metadata()
+        table = table.combine_chunks()
+        dates = pc.cast(table["timestamp"], pa.date32()).combine_chunks()
+        buckets = self._buckets(table["userId"])
+
+        if dedupe:
+            existing = self._existing_ids(dates, buckets, table["id"])
+            if len(existing):
+                keep = pc.invert(pc.is_in(table["id"], value_set=existing)).combine_chunks()
+                table, dates, buckets = table.filter(keep), dates.filter(keep), buckets.filter(keep)
+                if table.num_rows == 0:
+                    return table
+
+        partitioned = (
+            table.append_column("date", dates)
+            .append_column("user_bucket", buckets)
+            .sort_by([("date", "ascending"), ("user_bucket", "ascending"), *SORT_KEYS])
+        )
+        ds.write_dataset(
+            partitioned,
+            self.path,
+            format="parquet",
+            partitioning=ds.partitioning(PARTITION_SCHEMA, flavor="hive"),
+            basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+            file_options=_write_options(),
+            max_rows_per_group=ROW_GROUP_ROWS,
+            preserve_order=True,
+        )
+
+        logger.info(f"Appended {table.num_rows} events to {self.path}")
+        return table
+
+    def compact(self, small_file_bytes: int = SMALL_FILE_BYTES) -> int:
+        """
+        Merge each partition's small files into one sorted file.
+
+        The merged file is written under a temporary name and renamed before
+        the originals are removed, so a concurrent reader may briefly see
+        duplicates but never misses rows. Run it after exports, not during
+        analysis bursts.
+
+        Returns:
+            Number of files merged away
+        """
+        merged = 0
+        for partition in sorted(self.path.glob("date=*/user_bucket=*")):
+            files = sorted(
+                f for f in partition.glob("*.parquet") if f.stat().st_size < small_file_bytes
+            )
+            if len(files) < 2:
+                continue
+
+            table = pa.concat_tables([pq.read_table(f, schema=LAKE_SCHEMA) for f in files])
+            table = table.sort_by(SORT_KEYS)
+
+            name = f"part-{uuid.uuid4().hex}-0.parquet"
+            tmp = partition / f".{name}.tmp"
+            pq.write_table(
+                table,
+                tmp,
+                row_group_size=ROW_GROUP_ROWS,
+                compression="zstd",
+                write_statistics=True,
+                sorting_columns=_sorting_columns(),
+            )
+            os.replace(tmp, partition / name)
+            for f in files:
+                f.unlink()
+            merged += len(files)
+
+        logger.info(f"Compacted {merged} small files in {self.path}")
+        return merged
+
+    # ==================== READ ====================
+
+    def scan_sql(
+        self,
+        user_id: Optional[str] = None,
+        start: Optional[Union[datetime, date]] = None,
+        end: Optional[Union[datetime, date]] = None,
+    ) -> Tuple[str, List[Any]]:
+        """
+        DuckDB relation over the lake restricted to the relevant partitions.
+
+        Args:
+            user_id: Only this user's bucket (and rows)
+            start: First day (inclusive)
+            end: Last day (inclusive)
+
+        Returns:
+            (parenthesized SELECT usable in FROM, its parameters). Columns are
+            the event columns plus `date` and `user_bucket`.
+
+        Raises:
+            ValueError: If the lake has no data (for the user's bucket)
+        """
+        conditions: List[str] = []
+        params: List[Any] = []
+        bucket_dir = "user_bucket=*"
+        if user_id is not None:
+            # Globbing one bucket avoids listing the other buckets' files at all
+            bucket_dir = f"user_bucket={user_bucket(user_id, self.user_buckets)}"
+            conditions.append("userId = ?")
+            params.append(user_id)
+        if start is not None:
+            conditions.append("date >= ?")
+            params.append(_as_date(start))
+        if end is not None:
+            conditions.append("date <= ?")
+            params.append(_as_date(end))
+
+        if next(self.path.glob(f"date=*/{bucket_dir}/*.parquet"), None) is None:
+            raise ValueError(f"Event lake has no matching data: {self.path / bucket_dir}")
+
+        glob = str(self.path / "date=*" / bucket_dir / "*.parquet").replace("'", "''")
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        relation = f"""(
+            SELECT * FROM read_parquet('{glob}', hive_partitioning = true, union_by_name = true)
+            {where}
+        )"""
+        return relation, params
+
+    def watermark(self, user_id: Optional[str] = None) -> Optional[datetime]:
+        """Newest event timestamp in the lake (None if empty)."""
+        try:
+            relation, params = self.scan_sql(user_id)
+        except ValueError:
+            return None
+        conn = duckdb.connect()
+        try:
+            return conn.execute(f"SELECT MAX(timestamp) FROM {relation}", params).fetchone()[0]
+        finally:
+            conn.close()
+
+    # ==================== INTERNALS ====================
+
+    def _ensure_metadata(self) -> None:
+        metadata = self.path / METADATA_FILE
+        if not metadata.exists():
+            self.path.mkdir(parents=True, exist_ok=True)
+            metadata.write_text(json.dumps({
+                "user_buckets": self.user_buckets,
+                "partitioning": PARTITION_SCHEMA.names,
+            }))
+
+    def _buckets(self, user_ids: pa.ChunkedArray) -> pa.Array:
+        """user_bucket per row (hashing each distinct user once)."""
+        unique = pc.unique(user_ids)
+        unique_buckets = pa.array(
+            [user_bucket(u, self.user_buckets) for u in unique.to_pylist()], type=pa.int32()
+        )
+        return pc.take(unique_buckets, pc.index_in(user_ids, value_set=unique)).combine_chunks()
+
+    def _existing_ids(self, dates: pa.Array, buckets: pa.Array, ids: pa.Array) -> pa.Array:
+        """Which of `ids` are already stored in the partitions touched by an append."""
+        keys = pa.table({"date": dates, "user_bucket": buckets}).group_by(["date", "user_bucket"]).aggregate([])
+        files = [
+            str(f)
+            for d, b in zip(keys["date"].to_pylist(), keys["user_bucket"].to_pylist())
+            for f in (self.path / f"date={d}" / f"user_bucket={b}").glob("*.parquet")
+        ]
+        if not files:
+            return pa.array([], type=pa.string())
+        return (
+            ds.dataset(files, format="parquet")
+            .to_table(columns=["id"], filter=pc.field("id").isin(ids))["id"]
+            .combine_chunks()
+        )
+
+
+# ==================== HELPERS ====================
+
+
+def to_lake_table(events: Union[pd.DataFrame, pa.Table]) -> pa.Table:
+    """Conform events to LAKE_SCHEMA (JSON-encode eventData, add missing columns)."""
+    if isinstance(events, pa.Table):
+        if events.schema.equals(LAKE_SCHEMA):
+            return events
+        events = events.to_pandas()
+
+    df = events.copy()
+    if "eventData" in df.columns:
+        df["eventData"] = df["eventData"].map(_json_text)
+    if "timestamp" in df.columns:
+        timestamps = pd.to_datetime(df["timestamp"])
+        if timestamps.dt.tz is not None:
+            timestamps = timestamps.dt.tz_convert("UTC").dt.tz_localize(None)
+        df["timestamp"] = timestamps
+    for field in LAKE_SCHEMA:
+        if field.name not in df.columns:
+            df[field.name] = None
+
+    return pa.Table.from_pandas(df[LAKE_SCHEMA.names], schema=LAKE_SCHEMA, preserve_index=False)
+
+
+def _json_text(value: Any) -> Optional[str]:
+    if value is None or isinstance(value, str):
+        return value
+    if HAVE_ORJSON:
+        return orjson.dumps(value, default=str).decode()
+    return json.dumps(value, default=str)
+
+
+def _write_options() -> ds.FileWriteOptions:
+    return ds.ParquetFileFormat().make_write_options(
+        compression="zstd",
+        write_statistics=True,
+        sorting_columns=_sorting_columns(),
+    )
+
+
+def _sorting_columns() -> List[pq.SortingColumn]:
+    return [pq.SortingColumn(LAKE_SCHEMA.get_field_index(name)) for name, _ in SORT_KEYS]
+
+
+def _as_date(value: Union[datetime, date]) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+
+# Global lake instance
+event_lake = EventLake()
+
+
+def get_event_lake() -> EventLake:
+    """Get global event lake instance."""
+    return event_lake
@@ -25,6 +25,11 @@ from causalpy import InterruptedTimeSeries
 from causalpy.pymc_models import LinearRegression
 import arviz as az
 
+from app.services.analysis_run_index import ITS, now_ms, record_analysis_run
+from app.services.event_lake import get_event_lake
+from app.services.its_plot_service import PLOT_SUMMARY_ARTIFACT, plot_urls
+from app.services.outcome_rollups import EVENTS_TABLE, ROLLUP_TABLE, rollup_available
+from app.utils.its_plots import summarize_for_plots
 from app.models.its_analysis import (
     ITSAnalysisRequest,
     ITSAnalysisResponse,
@@ -61,6 +66,7 @@ class BayesianITSEngine:
         user_id: str,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
+        source: str = "auto",
     ) -> pd.DataFrame:
         """
         Fetch user behavioral data from DuckDB.
@@ -68,7 +74,11 @@ class BayesianITSEngine:
         Args:
             user_id: User ID
             start_date: Optional start date
-            end_date: Optional end date
+            end_date: Optional end date (inclusive)
+            source: "rollup" reads research.daily_outcomes (one row per day
+                and phase), "events" re-aggregates research.behavioral_events,
+                "lake" re-aggregates the user's Parquet lake partitions,
+                "auto" uses the rollup when the database has one
 
         Returns:
             DataFrame with columns:
@@ -87,31 +97,57 @@ class BayesianITSEngine:
         if start_date is None:
             start_date = end_date - timedelta(days=90)
 
-        conn = duckdb.connect(self.duckdb_path, read_only=True)
-
-        # Format dates as strings for SQL (use string interpolation with escaping)
-        start_str = start_date.strftime('%Y-%m-%d')
-        end_str = end_date.strftime('%Y-%m-%d')
-
-        query = f"""
-        SELECT
-            DATE_TRUNC('day', timestamp) AS date,
-            AVG(sessionPerformanceScore) AS outcome,
-            DAYOFWEEK(DATE_TRUNC('day', timestamp)) AS day_of_week,
-            AVG(HOUR(timestamp)) AS hour,
-            COUNT(*) AS n_sessions
-        FROM research.behavioral_events
-        WHERE userId = '{user_id.replace("'", "''")}'
-          AND timestamp >= TIMESTAMP '{start_str}'
-          AND timestamp <= TIMESTAMP '{end_str}'
-          AND eventType IN ('session_completed', 'session_performance')
-          AND sessionPerformanceScore IS NOT NULL
-        GROUP BY DATE_TRUNC('day', timestamp)
-        ORDER BY date
-        """
-
-        df = conn.execute(query).fetchdf()
-        conn.close()
+        # The lake is read with an in-memory connection (no database file needed)
+        conn = duckdb.connect() if source == "lake" else duckdb.connect(self.duckdb_path, read_only=True)
+        try:
+            if source == "auto":
+                source = "rollup" if rollup_available(conn) else "events"
+
+            if source == "rollup":
+                query = f"""
+                SELECT
+                    date,
+                    SUM(session_score_sum) / SUM(session_count) AS outcome,
+                    ISODOW(date) AS day_of_week,
+                    SUM(session_hour_sum) / SUM(session_count) AS hour,
+                    CAST(SUM(session_count) AS BIGINT) AS n_sessions
+                FROM {ROLLUP_TABLE}
+                WHERE user_id = ?
+                  AND date BETWEEN ? AND ?
+                  AND session_count > 0
+                GROUP BY date
+                ORDER BY date
+                """
+                params = [user_id, start_date.date(), end_date.date()]
+            elif source in ("events", "lake"):
+                relation, params = EVENTS_TABLE, []
+                if source == "lake":
+                    relation, params = get_event_lake().scan_sql(user_id, start_date, end_date)
+                query = f"""
+                SELECT
+                    DATE_TRUNC('day', timestamp) AS date,
+                    AVG(sessionPerformanceScore) AS outcome,
+                    ISODOW(DATE_TRUNC('day', timestamp)) AS day_of_week,
+                    AVG(HOUR(timestamp)) AS hour,
+                    COUNT(*) AS n_sessions
+                FROM {relation}
+                WHERE userId = ?
+                  AND timestamp >= ?
+                  AND timestamp < ?
+                  AND eventType IN ('session_completed', 'session_performance')
+                  AND sessionPerformanceScore IS NOT NULL
+                GROUP BY DATE_TRUNC('day', timestamp)
+                ORDER BY date
+                """
+                day_start = datetime.combine(start_date.date(), datetime.min.time())
+                day_after_end = datetime.combine(end_date.date() + timedelta(days=1), datetime.min.time())
+                params = [*params, user_id, day_start, day_after_end]
+            else:
+                raise ValueError(f"Unknown data source: {source}")
+
+            df = conn.execute(query, params).fetchdf()
+        finally:
+            conn.close()
 
         if len(df) < 16:  # Minimum 8 pre + 8 post observations
             raise ValueError(
@@ -121,7 +157,7 @@ class BayesianITSEngine:
         # Convert date to datetime
         df["date"] = pd.to_datetime(df["date"])
 
-        # Normalize day_of_week (DuckDB returns 1-7, we want 0-6)
+        # Normalize day_of_week (ISODOW returns 1=Monday..7=Sunday, we want 0-6)
         df["day_of_week"] = df["day_of_week"] - 1
 
         return df
@@ -411,6 +447,7 @@ class BayesianITSEngine:
         request: ITSAnalysisRequest,
         results: Dict[str, Any],
         model_result: Dict[str, Any],
+        plot_summary: Optional[Dict[str, Any]] = None,
     ) -> str:
         """
         Log ITS analysis to MLflow for provenance tracking.
@@ -419,55 +456,50 @@ class BayesianITSEngine:
             request: Original request
             results: Extracted results from extract_results()
             model_result: Model output from run_causalpy_its()
+            plot_summary: Posterior summary for on-demand plots (logged as artifact)
 
         Returns:
             MLflow run ID
         """
-        with mlflow.start_run(run_name=f"ITS_{request.user_id}") as run:
-            # Log parameters
-            mlflow.log_param("user_id", request.user_id)
-            mlflow.log_param("intervention_date", request.intervention_date.isoformat())
-            mlflow.log_param("outcome_metric", request.outcome_metric)
-            mlflow.log_param("mcmc_samples", request.mcmc_samples)
-            mlflow.log_param("mcmc_chains", request.mcmc_chains)
-
-            # Log metrics
-            mlflow.log_metric(
-                "immediate_effect",
-                results["immediate_effect"].point_estimate,
-            )
-            mlflow.log_metric(
-                "sustained_effect",
-                results["sustained_effect"].point_estimate,
-            )
-            mlflow.log_metric(
-                "counterfactual_effect",
-                results["counterfactual_effect"].point_estimate,
-            )
-            mlflow.log_metric(
-                "probability_of_benefit",
-                results["probability_of_benefit"],
-            )
-            mlflow.log_metric(
-                "computation_time",
-                model_result["computation_time"],
-            )
-
-            # Log diagnostics
-            mlflow.log_metric(
-                "max_rhat",
-                max(results["mcmc_diagnostics"].r_hat.values()),
-            )
-            mlflow.log_metric(
-                "divergent_transitions",
-                results["mcmc_diagnostics"].divergent_transitions,
-            )
+        params = {
+            "user_id": request.user_id,
+            "intervention_date": request.intervention_date.isoformat(),
+            "outcome_metric": request.outcome_metric,
+            "mcmc_samples": request.mcmc_samples,
+            "mcmc_chains": request.mcmc_chains,
+        }
+        metrics = {
+            "immediate_effect": results["immediate_effect"].point_estimate,
+            "sustained_effect": results["sustained_effect"].point_estimate,
+            "counterfactual_effect": results["counterfactual_effect"].point_estimate,
+            "probability_of_benefit": results["probability_of_benefit"],
+            "computation_time": model_result["computation_time"],
+            # Diagnostics
+            "max_rhat": max(results["mcmc_diagnostics"].r_hat.values()),
+            "divergent_transitions": results["mcmc_diagnostics"].divergent_transitions,
+            # Data sizes
+            "n_observations_pre": len(model_result["pre_data"]),
+            "n_observations_post": len(model_result["post_data"]),
+        }
 
-            # Log data sizes
-            mlflow.log_metric("n_observations_pre", len(model_result["pre_data"]))
-            mlflow.log_metric("n_observations_post", len(model_result["post_data"]))
+        with mlflow.start_run(run_name=f"ITS_{request.user_id}") as run:
+            mlflow.log_params(params)
+            mlflow.log_metrics(metrics)
+            if plot_summary is not None:
+                mlflow.log_dict(plot_summary, PLOT_SUMMARY_ARTIFACT)
+
+        # History endpoints read the index instead of searching MLflow
+        record_analysis_run(
+            run_id=run.info.run_id,
+            analysis_type=ITS,
+            user_id=request.user_id,
+            start_time=run.info.start_time,
+            end_time=now_ms(),
+            params=params,
+            metrics=metrics,
+        )
 
-            return run.info.run_id
+        return run.info.run_id
 
     @lru_cache(maxsize=32)
     def _get_cached_result(self, cache_key: str) -> Optional[Dict[str, Any]]:
@@ -541,16 +573,12 @@ class BayesianITSEngine:
         # 4. Extract results
         results = self.extract_results(model_result)
 
-        # 5. Log to MLflow
-        mlflow_run_id = self.log_to_mlflow(request, results, model_result)
+        # 5. Log to MLflow (with the posterior summary plots are rendered from)
+        plot_summary = summarize_for_plots(model_result, results)
+        mlflow_run_id = self.log_to_mlflow(request, results, model_result, plot_summary)
 
-        # 6. Generate plots (placeholder - will implement in its_plots.py)
-        plots = {
-            "observed_vs_counterfactual": "",
-            "posterior_predictive_check": "",
-            "effect_distribution": "",
-            "mcmc_diagnostics": "",
-        }
+        # 6. Plots are rendered on demand by GET /analytics/its/{run_id}/plots/{kind}
+        plots = plot_urls(mlflow_run_id)
 
         # Build response
         response = ITSAnalysisResponse(
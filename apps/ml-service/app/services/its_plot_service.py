@@ -0,0 +1,145 @@
+"""
+ITS Plot Service
+
+Renders ITS plots on demand instead of inline with every analysis:
+- The analysis logs a compact posterior summary (plot_summary.json) as an
+  MLflow artifact of its run
+- GET /analytics/its/{run_id}/plots/{kind} renders one plot from that
+  summary in a worker process (matplotlib stays off the event loop and out
+  of the API process)
+- Rendered images are cached by (run ID, kind, format, width); runs are
+  immutable, so entries only expire to bound memory. Without Redis a
+  per-process LRU of PLOT_CACHE_MAX_ENTRIES images is used instead
+"""
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional
+
+from app.utils.its_plots import PLOT_KINDS, render_plot
+from app.utils.redis_cache import get_redis_cache
+
+logger = logging.getLogger(__name__)
+
+PLOT_SUMMARY_ARTIFACT = "plot_summary.json"
+PLOT_CACHE_PREFIX = "its:plot"
+PLOT_CACHE_TTL = 7 * 86400
+PLOT_CACHE_MAX_ENTRIES = int(os.getenv("PLOT_CACHE_MAX_ENTRIES", "64"))
+MEDIA_TYPES = {"svg": "image/svg+xml", "png": "image/png"}
+
+
+class PlotNotFoundError(LookupError):
+    """No plot summary is stored for the run"""
+
+
+def plot_urls(run_id: str) -> Dict[str, str]:
+    """Relative URLs of every plot kind for a run (for analysis responses)."""
+    return {kind: f"/analytics/its/{run_id}/plots/{kind}" for kind in PLOT_KINDS}
+
+
+class ITSPlotService:
+    """
+    On-demand ITS plot rendering with a worker pool and result cache.
+
+    Usage:
+        service = get_its_plot_service()
+        image = await service.render(run_id, "observed_vs_counterfactual", fmt="svg")
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_cached: int = PLOT_CACHE_MAX_ENTRIES):
+        """
+        Args:
+            max_workers: Render processes (default PLOT_RENDER_WORKERS or 1)
+            max_cached: Images kept in the in-process cache used without Redis
+        """
+        self.max_workers = max_workers or int(os.getenv("PLOT_RENDER_WORKERS", "1"))
+        self.max_cached = max_cached
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # cache key -> image; order = recency
+        self._local: "OrderedDict[str, bytes]" = OrderedDict()
+
+    async def render(self, run_id: str, kind: str, fmt: str = "svg", width: int = 800) -> bytes:
+        """
+        Render (or fetch from cache) one plot of a run.
+
+        Raises:
+            PlotNotFoundError: If the run has no stored plot summary
+            ValueError: Unknown kind/format, or data missing for the kind
+        """
+        key = f"{PLOT_CACHE_PREFIX}:{run_id}:{kind}:{fmt}"
+        if fmt == "png":
+            key += f":{width}"
+
+        cache = get_redis_cache()
+        if cache is None:
+            return await self._render_local(key, run_id, kind, fmt, width)
+
+        return await cache.get_or_compute(
+            key,
+            lambda: self._render(run_id, kind, fmt, width),
+            ttl=PLOT_CACHE_TTL,
+        )
+
+    async def _render_local(self, key: str, run_id: str, kind: str, fmt: str, width: int) -> bytes:
+        """Render through the in-process LRU (no TTL needed: runs are immutable)."""
+        image = self._local.get(key)
+        if image is not None:
+            self._local.move_to_end(key)
+            return image
+
+        image = await self._render(run_id, kind, fmt, width)
+        self._local[key] = image
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_cached:
+            self._local.popitem(last=False)
+        return image
+
+    async def _render(self, run_id: str, kind: str, fmt: str, width: int) -> bytes:
+        summary = await asyncio.to_thread(load_plot_summary, run_id)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor(), functools.partial(render_plot, kind, summary, fmt=fmt, width=width)
+        )
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: forking a threaded server process with matplotlib loaded is unsafe
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._pool
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+def load_plot_summary(run_id: str) -> Dict[str, Any]:
+    """
+    Load a run's plot summary from MLflow artifacts.
+
+    Raises:
+        PlotNotFoundError: If the run or its summary does not exist
+    """
+    import mlflow
+
+    try:
+        return mlflow.artifacts.load_dict(f"runs:/{run_id}/{PLOT_SUMMARY_ARTIFACT}")
+    except Exception as e:
+        raise PlotNotFoundError(f"No plot summary for run {run_id}") from e
+
+
+# Global service instance
+its_plot_service = ITSPlotService()
+
+
+def get_its_plot_service() -> ITSPlotService:
+    """Get global ITS plot service instance."""
+    return its_plot_service
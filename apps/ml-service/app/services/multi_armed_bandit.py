@@ -21,6 +21,8 @@ from enum import Enum
 import json
 from scipy.stats import beta
 
+from app.services.bandit_simulation import RewardScenario, run_single_replication
+
 
 class StrategyType(Enum):
     """
@@ -535,19 +537,49 @@ class MultiArmedBandit:
 
 # ==================== HELPER FUNCTIONS ====================
 
+def _simulated_outcome(rewards: np.ndarray) -> StrategyOutcome:
+    """Outcome for simulated rewards in [0, 1] (works elementwise on arrays)."""
+    return StrategyOutcome(
+        retention_improvement=rewards * 2 - 1,
+        performance_improvement=rewards * 2 - 1,
+        completion_rate=rewards
+    )
+
+
+def outcome_feedback(rewards: np.ndarray) -> np.ndarray:
+    """
+    Reward signal MultiArmedBandit.update learns from for simulated rewards.
+
+    Pass as `feedback` to the simulation harness to benchmark policies on
+    the production learning signal rather than the raw reward.
+    """
+    return _simulated_outcome(rewards).to_reward()
+
+
 def compare_algorithms(
     n_rounds: int = 1000,
-    reward_distributions: Optional[Dict[StrategyType, Tuple[float, float]]] = None
+    reward_distributions: Optional[Dict[StrategyType, Tuple[float, float]]] = None,
+    random_state: Optional[int] = None
 ) -> Dict[str, Any]:
     """
     Compare epsilon-greedy vs Thompson sampling on simulated data.
 
-    Useful for understanding algorithm behavior and tuning parameters.
+    Arms are selected by a single replication of the vectorized simulation
+    harness, learning from StrategyOutcome.to_reward() like production
+    (so Thompson sampling counts a success when that reward exceeds 0.5).
+    Each round is then replayed into a MultiArmedBandit, which reports the
+    regret curve (MultiArmedBandit.calculate_regret: realized regret of the
+    outcome reward against the best mean) and the best strategy.
+
+    For multi-seed benchmarks with confidence bands, pseudo-regret,
+    non-stationary scenarios or contextual policies use
+    app.services.bandit_simulation.simulate_bandits directly.
 
     Args:
         n_rounds: Number of simulation rounds
         reward_distributions: Mean/std for each strategy's reward distribution
                              Can be dict of tuples (mean, std) or dict of floats (mean only)
+        random_state: Seed for reproducible comparisons
 
     Returns:
         Comparison results with regret curves
@@ -561,80 +593,40 @@ def compare_algorithms(
             StrategyType.CONSERVATIVE: (0.50, 0.12),
         }
 
-    # Normalize reward_distributions to tuple format
-    normalized_distributions = {}
-    for strategy, value in reward_distributions.items():
-        if isinstance(value, tuple):
-            normalized_distributions[strategy] = value
-        else:
-            # If just a float, use default std of 0.1
-            normalized_distributions[strategy] = (value, 0.1)
-
-    reward_distributions = normalized_distributions
-
-    # Initialize MABs
-    mab_epsilon = MultiArmedBandit(user_id="sim_epsilon", epsilon=0.1)
-    mab_thompson = MultiArmedBandit(user_id="sim_thompson", epsilon=0.1)
-
-    # Track results
-    results = {
-        'epsilon_greedy': {'rewards': [], 'regrets': []},
-        'thompson_sampling': {'rewards': [], 'regrets': []},
-    }
-
-    optimal_reward = max(mean for mean, _ in reward_distributions.values())
-
-    for i in range(n_rounds):
-        # Epsilon-greedy
-        strategy_eps = mab_epsilon.select_strategy("epsilon_greedy")
-        mean, std = reward_distributions[strategy_eps]
-        reward_eps = np.clip(np.random.normal(mean, std), 0, 1)
-
-        outcome_eps = StrategyOutcome(
-            retention_improvement=reward_eps * 2 - 1,
-            performance_improvement=reward_eps * 2 - 1,
-            completion_rate=reward_eps
-        )
-        mab_epsilon.update(strategy_eps, outcome_eps)
-
-        results['epsilon_greedy']['rewards'].append(reward_eps)
-        results['epsilon_greedy']['regrets'].append(
-            mab_epsilon.calculate_regret(optimal_reward)
-        )
-
-        # Thompson sampling
-        strategy_ts = mab_thompson.select_strategy("thompson_sampling")
-        mean, std = reward_distributions[strategy_ts]
-        reward_ts = np.clip(np.random.normal(mean, std), 0, 1)
-
-        outcome_ts = StrategyOutcome(
-            retention_improvement=reward_ts * 2 - 1,
-            performance_improvement=reward_ts * 2 - 1,
-            completion_rate=reward_ts
-        )
-        mab_thompson.update(strategy_ts, outcome_ts)
-
-        results['thompson_sampling']['rewards'].append(reward_ts)
-        results['thompson_sampling']['regrets'].append(
-            mab_thompson.calculate_regret(optimal_reward)
-        )
+    scenario = RewardScenario.from_distributions(reward_distributions)
+    strategies = list(reward_distributions)
+    optimal_reward = float(scenario.means.max())
+
+    algorithms = ['epsilon_greedy', 'thompson_sampling']
+    runs = run_single_replication(
+        scenario, algorithms, n_rounds, seed=random_state, epsilon=0.1,
+        feedback=outcome_feedback
+    )
+
+    results: Dict[str, Any] = {}
+    summary: Dict[str, Any] = {}
+    for algorithm in algorithms:
+        run = runs[algorithm]
+
+        mab = MultiArmedBandit(user_id=f"sim_{algorithm}", epsilon=0.1)
+        regrets = []
+        for arm, reward in zip(run['arms'], run['rewards']):
+            mab.update(strategies[arm], _simulated_outcome(reward))
+            regrets.append(float(mab.calculate_regret(optimal_reward)))
+
+        results[algorithm] = {
+            'rewards': run['rewards'].tolist(),
+            'regrets': regrets,
+        }
+        summary[algorithm] = {
+            'total_reward': float(run['rewards'].sum()),
+            'avg_reward': float(run['rewards'].mean()),
+            'final_regret': regrets[-1],
+            'best_strategy': mab.get_strategy_ranking()[0][0].value,
+        }
 
-    # Summary statistics
-    results['summary'] = {
-        'epsilon_greedy': {
-            'total_reward': sum(results['epsilon_greedy']['rewards']),
-            'avg_reward': np.mean(results['epsilon_greedy']['rewards']),
-            'final_regret': results['epsilon_greedy']['regrets'][-1],
-            'best_strategy': mab_epsilon.get_strategy_ranking()[0][0].value,
-        },
-        'thompson_sampling': {
-            'total_reward': sum(results['thompson_sampling']['rewards']),
-            'avg_reward': np.mean(results['thompson_sampling']['rewards']),
-            'final_regret': results['thompson_sampling']['regrets'][-1],
-            'best_strategy': mab_thompson.get_strategy_ranking()[0][0].value,
-        },
-        'optimal_reward': optimal_reward,
-        'n_rounds': n_rounds,
-    }
+    summary['optimal_reward'] = optimal_reward
+    summary['n_rounds'] = n_rounds
+    results['summary'] = summary
 
     return results
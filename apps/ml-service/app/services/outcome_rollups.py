@@ -0,0 +1,217 @@
+"""
+Daily Outcome Rollups
+
+Pre-aggregated per-user, per-day outcomes in the DuckDB analytics database,
+so ITS and ABAB analyses read tens of rows per user instead of re-aggregating
+research.behavioral_events on every request:
+
+- research.daily_outcomes: one row per (user_id, date, phase)
+- Sums and counts rather than averages, so days and phases combine exactly
+- Refreshed incrementally for the (user, day) pairs a sync touched; an
+  incremental refresh deletes and appends only those rows
+- Written sorted by (user_id, date) so row group zone maps let a per-user
+  read skip every other user's rows. Incremental appends are sorted within
+  themselves; compact_daily_outcomes() re-sorts the whole table and runs
+  with full rebuilds and export compaction
+- The raw event table is unchanged and remains available for ad-hoc queries
+
+Usage:
+    conn = duckdb.connect(path)
+    refresh_daily_outcomes(conn)                               # full rebuild
+    refresh_daily_outcomes(conn, changed="new_events")         # touched days only
+    refresh_daily_outcomes(conn, user_ids=["user123"])         # whole users
+    compact_daily_outcomes(conn)                               # re-sort
+"""
+
+import logging
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_TABLE = "research.daily_outcomes"
+EVENTS_TABLE = "research.behavioral_events"
+
+# Event types whose sessionPerformanceScore is a session outcome (ITS)
+SESSION_OUTCOME_EVENTS = ("session_completed", "session_performance")
+
+ROLLUP_SCHEMA = f"""
+CREATE SCHEMA IF NOT EXISTS research;
+CREATE TABLE IF NOT EXISTS {ROLLUP_TABLE} (
+    user_id           VARCHAR NOT NULL,
+    date              DATE NOT NULL,
+    phase             VARCHAR,   -- experimentPhase (NULL outside experiments)
+    session_score_sum DOUBLE,    -- session outcome events (ITS)
+    session_count     BIGINT,
+    session_hour_sum  BIGINT,
+    outcome_sum       DOUBLE,    -- every scored event (ABAB)
+    outcome_count     BIGINT,
+    event_count       BIGINT
+);
+"""
+
+_SESSION_EVENTS_SQL = ", ".join(f"'{event}'" for event in SESSION_OUTCOME_EVENTS)
+
+
+def _aggregate_sql(conn, source: str, join: str) -> str:
+    """
+    SELECT producing rollup rows from `source` (restricted by `join`).
+
+    Older or synthetic event tables may lack eventType / experimentPhase;
+    their rows then count as non-session events / outside experiments.
+    """
+    columns = {row[0] for row in conn.execute(f"DESCRIBE SELECT * FROM {source}").fetchall()}
+    phase = "e.experimentPhase" if "experimentPhase" in columns else "CAST(NULL AS VARCHAR)"
+    session = (
+        f"e.eventType IN ({_SESSION_EVENTS_SQL}) AND e.sessionPerformanceScore IS NOT NULL"
+        if "eventType" in columns
+        else "FALSE"
+    )
+    return f"""
+    SELECT
+        e.userId AS user_id,
+        CAST(e.timestamp AS DATE) AS date,
+        {phase} AS phase,
+        SUM(e.sessionPerformanceScore) FILTER (WHERE {session}) AS session_score_sum,
+        COUNT(*) FILTER (WHERE {session}) AS session_count,
+        SUM(HOUR(e.timestamp)) FILTER (WHERE {session}) AS session_hour_sum,
+        SUM(e.sessionPerformanceScore) AS outcome_sum,
+        COUNT(e.sessionPerformanceScore) AS outcome_count,
+        COUNT(*) AS event_count
+    FROM {source} e
+    {join}
+    GROUP BY ALL
+    """
+
+
+def ensure_rollup_table(conn) -> None:
+    """Create research.daily_outcomes if missing."""
+    conn.execute(ROLLUP_SCHEMA)
+
+
+def rollup_available(conn) -> bool:
+    """Whether the database has a rollup table (older databases may not)."""
+    schema, table = ROLLUP_TABLE.split(".")
+    row = conn.execute(
+        """
+        SELECT COUNT(*) FROM information_schema.tables
+        WHERE table_schema = ? AND table_name = ?
+        """,
+        [schema, table],
+    ).fetchone()
+    return row[0] > 0
+
+
+def refresh_daily_outcomes(
+    conn,
+    source: str = EVENTS_TABLE,
+    changed: Optional[str] = None,
+    user_ids: Optional[Iterable[str]] = None,
+) -> int:
+    """
+    Recompute rollup rows from the event table.
+
+    Args:
+        conn: Read-write DuckDB connection
+        source: Event table to aggregate (research.behavioral_events)
+        changed: Table/view of new or changed events; only the (user, day)
+            pairs it contains are recomputed
+        user_ids: Recompute these users entirely (e.g. after their events
+            were deleted and re-imported)
+
+    With neither changed nor user_ids, the rollup is rebuilt from scratch
+    (written fully sorted). Otherwise only the affected rows are deleted and
+    re-appended; see compact_daily_outcomes for restoring the sort order.
+
+    Returns:
+        Number of rollup rows written
+    """
+    ensure_rollup_table(conn)
+
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        if changed is None and user_ids is None:
+            conn.execute(f"DELETE FROM {ROLLUP_TABLE}")
+            join = ""
+        else:
+            _stage_keys(conn, changed, user_ids)
+            if changed is not None:
+                conn.execute(
+                    f"""
+                    DELETE FROM {ROLLUP_TABLE} r USING _rollup_keys k
+                    WHERE r.user_id = k.user_id AND r.date = k.date
+                    """
+                )
+                join = (
+                    "JOIN _rollup_keys k "
+                    "ON e.userId = k.user_id AND CAST(e.timestamp AS DATE) = k.date"
+                )
+            else:
+                conn.execute(
+                    f"DELETE FROM {ROLLUP_TABLE} WHERE user_id IN (SELECT user_id FROM _rollup_keys)"
+                )
+                join = "SEMI JOIN _rollup_keys k ON e.userId = k.user_id"
+
+        written = conn.execute(
+            f"""
+            INSERT INTO {ROLLUP_TABLE}
+            SELECT * FROM ({_aggregate_sql(conn, source, join)})
+            ORDER BY user_id, date, phase
+            """
+        ).fetchone()[0]
+        conn.execute("DROP TABLE IF EXISTS _rollup_keys")
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+    logger.info(f"Refreshed {written} daily outcome rows from {source}")
+    return written
+
+
+def compact_daily_outcomes(conn) -> int:
+    """
+    Rewrite the rollup sorted by (user_id, date, phase).
+
+    Incremental refreshes append each batch's rows at the end of the table,
+    so a user's days drift across row groups and zone maps prune less. The
+    rollup is small (one row per user, day and phase), so a periodic
+    rewrite is cheap; it is not worth doing on every refresh.
+
+    Returns:
+        Number of rollup rows
+    """
+    ensure_rollup_table(conn)
+
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        conn.execute(
+            f"""
+            CREATE OR REPLACE TEMP TABLE _rollup_sorted AS
+            SELECT * FROM {ROLLUP_TABLE} ORDER BY user_id, date, phase
+            """
+        )
+        conn.execute(f"DELETE FROM {ROLLUP_TABLE}")
+        rows = conn.execute(f"INSERT INTO {ROLLUP_TABLE} SELECT * FROM _rollup_sorted").fetchone()[0]
+        conn.execute("DROP TABLE _rollup_sorted")
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+    logger.info(f"Compacted {rows} daily outcome rows")
+    return rows
+
+
+def _stage_keys(conn, changed: Optional[str], user_ids: Optional[Iterable[str]]) -> None:
+    """Materialize the (user_id, date) pairs or users to recompute."""
+    if changed is not None:
+        conn.execute(
+            f"""
+            CREATE OR REPLACE TEMP TABLE _rollup_keys AS
+            SELECT DISTINCT userId AS user_id, CAST(timestamp AS DATE) AS date
+            FROM {changed}
+            """
+        )
+    else:
+        conn.execute("CREATE OR REPLACE TEMP TABLE _rollup_keys (user_id VARCHAR)")
+        conn.executemany("INSERT INTO _rollup_keys VALUES (?)", [[u] for u in user_ids])
@@ -10,12 +10,31 @@ Story: 5.2 - Predictive Analytics for Learning Struggles (Task 2)
 
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Callable, Awaitable
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 from functools import lru_cache
+import asyncio
 import json
 
+from app.utils.feature_cache import FeatureCache, get_feature_cache
+
+
+# Content complexity (BASIC=0.3, INTERMEDIATE=0.6, ADVANCED=0.9)
+COMPLEXITY_SCORES = {'BASIC': 0.3, 'INTERMEDIATE': 0.6, 'ADVANCED': 0.9}
+
+# Mastery level as 0-1 score (prerequisite gaps, user ability)
+MASTERY_SCORES = {
+    'NOT_STARTED': 0.0,
+    'BEGINNER': 0.25,
+    'INTERMEDIATE': 0.5,
+    'ADVANCED': 0.75,
+    'MASTERED': 1.0,
+}
+
+# Prerequisites below this mastery count as gaps
+MASTERY_GAP_THRESHOLD = 0.7
+
 
 @dataclass
 class FeatureVector:
@@ -110,10 +129,10 @@ class StruggleFeatureExtractor:
     """
     Production-grade feature extractor for learning struggle prediction.
 
-    Implements 3-tier caching strategy:
-    - L1: User learning profile (1 hour TTL)
-    - L2: Behavioral patterns (12 hour TTL)
-    - L3: Performance metrics (30 minute TTL)
+    Uses the process-wide FeatureCache with 3 namespaces:
+    - profile: User learning profile (1 hour TTL)
+    - patterns: Behavioral patterns (12 hour TTL)
+    - metrics: Performance metrics (30 minute TTL)
 
     Usage:
         extractor = StruggleFeatureExtractor(db_client)
@@ -121,22 +140,24 @@ class StruggleFeatureExtractor:
         importance = extractor.calculate_feature_importance(training_data)
     """
 
-    def __init__(self, db_client: Any, cache_enabled: bool = True):
+    def __init__(
+        self,
+        db_client: Any,
+        cache_enabled: bool = True,
+        cache: Optional[FeatureCache] = None
+    ):
         """
         Initialize feature extractor.
 
         Args:
             db_client: Database client (e.g., Prisma client) for data access
             cache_enabled: Enable caching for performance optimization
+            cache: Feature cache (defaults to the process-wide instance, so
+                   extractors created per request still share entries)
         """
         self.db = db_client
         self.cache_enabled = cache_enabled
-        self._cache: Dict[str, Tuple[Any, datetime]] = {}
-
-        # Cache TTLs
-        self.TTL_PROFILE = timedelta(hours=1)
-        self.TTL_PATTERNS = timedelta(hours=12)
-        self.TTL_METRICS = timedelta(minutes=30)
+        self.cache = cache if cache is not None else get_feature_cache()
 
     # ==================== PUBLIC API ====================
 
@@ -235,26 +256,61 @@ class StruggleFeatureExtractor:
             # Return default features if no objectives
             return self._create_default_feature_vector()
 
-        # Extract features for each objective and aggregate
-        feature_vectors = []
-        for obj in objectives:
-            features = await self.extract_features_for_objective(user_id, obj['id'])
-            feature_vectors.append(features.to_array())
+        # Extract features for all objectives in one bulk pass and aggregate
+        objective_ids, X, data_quality = await self.extract_feature_matrix(
+            user_id, [obj['id'] for obj in objectives]
+        )
 
-        # Aggregate (mean) across objectives
-        aggregated = np.mean(feature_vectors, axis=0)
+        if not objective_ids:
+            return self._create_default_feature_vector()
 
-        # Create feature vector from aggregated values
-        feature_dict = dict(zip(FeatureVector.feature_names(), aggregated))
+        # Aggregate (mean) across objectives
+        aggregated = X.mean(axis=0)
+        feature_dict = dict(zip(FeatureVector.feature_names(), aggregated.tolist()))
 
         return FeatureVector(
             **feature_dict,
             extracted_at=datetime.utcnow(),
-            data_quality=np.mean([fv.data_quality for fv in
-                                  [self._deserialize_feature_vector(fv)
-                                   for fv in feature_vectors]])
+            data_quality=float(data_quality.mean()),
         )
 
+    async def extract_features_for_objectives(
+        self,
+        user_id: str,
+        objective_ids: List[str]
+    ) -> Dict[str, FeatureVector]:
+        """
+        Extract feature vectors for many objectives in one bulk pass.
+
+        Set-based counterpart of extract_features_for_objective: every table
+        is queried once for the whole batch, so the query count does not
+        grow with the number of objectives.
+
+        Args:
+            user_id: User identifier
+            objective_ids: Learning objective identifiers
+
+        Returns:
+            Dictionary mapping objective ID to FeatureVector (objectives
+            not found in the database are omitted)
+        """
+        found_ids, X, data_quality = await self.extract_feature_matrix(
+            user_id, objective_ids
+        )
+        extracted_at = datetime.utcnow()
+        feature_names = FeatureVector.feature_names()
+
+        return {
+            objective_id: FeatureVector(
+                **dict(zip(feature_names, row)),
+                extracted_at=extracted_at,
+                data_quality=quality,
+            )
+            for objective_id, row, quality in zip(
+                found_ids, X.tolist(), data_quality.tolist()
+            )
+        }
+
     def calculate_feature_importance(
         self,
         training_data: List[Tuple[FeatureVector, bool]]
@@ -358,8 +414,9 @@ class StruggleFeatureExtractor:
             mastery_levels.append(mastery)
 
         # Calculate gap metrics
-        threshold = 0.7  # 70% mastery threshold
-        gap_count = sum(1 for m in mastery_levels if m < threshold) / len(mastery_levels)
+        gap_count = sum(
+            1 for m in mastery_levels if m < MASTERY_GAP_THRESHOLD
+        ) / len(mastery_levels)
         mastery_gap = 1.0 - np.mean(mastery_levels)
 
         return {
@@ -375,8 +432,7 @@ class StruggleFeatureExtractor:
     ) -> Dict[str, float]:
         """Extract content complexity features."""
         # Content complexity (BASIC=0.3, INTERMEDIATE=0.6, ADVANCED=0.9)
-        complexity_map = {'BASIC': 0.3, 'INTERMEDIATE': 0.6, 'ADVANCED': 0.9}
-        content_complexity = complexity_map.get(
+        content_complexity = COMPLEXITY_SCORES.get(
             objective.get('complexity', 'INTERMEDIATE'),
             0.6
         )
@@ -456,6 +512,279 @@ class StruggleFeatureExtractor:
             'workload_level': workload_level,
         }
 
+    # ==================== BULK EXTRACTION ====================
+
+    async def extract_feature_matrix(
+        self,
+        user_id: str,
+        objective_ids: List[str],
+        return_topics: bool = False
+    ) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """
+        Build the 15-feature matrix for many objectives with set-based queries.
+
+        Issues a fixed number of queries (IN lists over the batch) in two
+        concurrent waves, then computes each feature as a NumPy column.
+        Feature definitions and neutral defaults match the per-objective
+        extraction methods.
+
+        Args:
+            user_id: User identifier
+            objective_ids: Learning objective identifiers
+            return_topics: Also return each found objective's topic (course ID)
+
+        Returns:
+            Tuple of (found objective IDs, feature matrix (n, 15) in
+            FeatureVector.feature_names() order, data quality per row),
+            plus the topic IDs in found order when return_topics is set
+        """
+        n_features = len(FeatureVector.feature_names())
+        unique_ids = list(dict.fromkeys(objective_ids))
+        empty = ([], np.empty((0, n_features)), np.empty(0))
+        if not unique_ids:
+            return empty + ([],) if return_topics else empty
+
+        now = pd.Timestamp.now(tz='UTC')
+        since = datetime.utcnow() - timedelta(days=30)
+
+        # Wave 1: everything keyed by user or objective IDs
+        (
+            objectives,
+            prerequisites,
+            reviews,
+            user_objectives,
+            user_profile,
+            behavioral_patterns,
+            cognitive_load,
+        ) = await asyncio.gather(
+            self.db.learningobjective.find_many(
+                where={"id": {"in": unique_ids}},
+                include={"lecture": True},
+            ),
+            self.db.objectiveprerequisite.find_many(
+                where={"objectiveId": {"in": unique_ids}},
+                include={"prerequisite": True},
+            ),
+            self.db.review.find_many(
+                where={
+                    "userId": user_id,
+                    "card": {"is": {"objectiveId": {"in": unique_ids}}},
+                },
+                include={"card": True},
+            ),
+            self.db.learningobjective.find_many(
+                where={"lecture": {"is": {"userId": user_id}}},
+                include={"lecture": True},
+            ),
+            self._get_user_learning_profile(user_id),
+            self._get_behavioral_patterns(user_id),
+            self._get_cognitive_load_indicator(user_id),
+        )
+
+        if not objectives:
+            return empty + ([],) if return_topics else empty
+
+        # Preserve request order
+        by_id = {obj.id: obj for obj in objectives}
+        objectives = [by_id[oid] for oid in unique_ids if oid in by_id]
+        found_ids = [obj.id for obj in objectives]
+        row_of = {oid: i for i, oid in enumerate(found_ids)}
+        n = len(found_ids)
+
+        topics = [obj.lecture.courseId for obj in objectives]
+        unique_topics = list(dict.fromkeys(topics))
+
+        # Wave 2: everything keyed by topic (course)
+        retention_metrics, exams = await asyncio.gather(
+            self.db.performancemetric.find_many(
+                where={
+                    "userId": user_id,
+                    "date": {"gte": since},
+                    "learningObjective": {
+                        "is": {"lecture": {"is": {"courseId": {"in": unique_topics}}}}
+                    },
+                },
+                order={"date": "asc"},
+            ),
+            self.db.exam.find_many(
+                where={
+                    "userId": user_id,
+                    "courseId": {"in": unique_topics},
+                    "date": {"gte": datetime.utcnow()},
+                },
+                order={"date": "asc"},
+            ),
+        )
+
+        # User objectives as a frame: topic, mastery, last study
+        user_obj_df = pd.DataFrame({
+            'id': [o.id for o in user_objectives],
+            'topic': [o.lecture.courseId for o in user_objectives],
+            'mastery': [
+                MASTERY_SCORES.get(_enum_value(o.masteryLevel), 0.5)
+                for o in user_objectives
+            ],
+            'last_studied': pd.to_datetime(
+                [o.lastStudiedAt for o in user_objectives], utc=True
+            ),
+        })
+        topic_of_objective = dict(zip(user_obj_df['id'], user_obj_df['topic']))
+        topic_of_objective.update(zip(found_ids, topics))
+        topic_groups = user_obj_df.groupby('topic')
+
+        topic_index = pd.Index(unique_topics)
+        topic_pos = topic_index.get_indexer(topics)
+
+        # ---- Performance: retention per topic ----
+        retention_score = np.full(n, 0.5)
+        retention_decline_rate = np.zeros(n)
+        if retention_metrics:
+            metrics_df = pd.DataFrame({
+                'topic': [topic_of_objective.get(m.learningObjectiveId) for m in retention_metrics],
+                'score': [m.retentionScore for m in retention_metrics],
+            }).dropna(subset=['topic'])
+            grouped = metrics_df.groupby('topic', sort=False)['score']
+            means = grouped.mean().reindex(topic_index)
+            slopes = self._grouped_slopes(metrics_df).reindex(topic_index)
+
+            has_metrics = means.notna().to_numpy()[topic_pos]
+            retention_score = np.where(has_metrics, means.to_numpy()[topic_pos], 0.5)
+            decline = np.clip(-slopes.fillna(0.0).to_numpy(), 0.0, None) * 10
+            retention_decline_rate = np.minimum(1.0, decline[topic_pos])
+
+        # ---- Performance: review lapse rate per objective ----
+        review_lapse_rate = np.full(n, 0.5)
+        reviews = [r for r in reviews if r.card.objectiveId in row_of]
+        if reviews:
+            review_rows = np.array([row_of[r.card.objectiveId] for r in reviews])
+            lapses = np.array([_enum_value(r.rating) == 'AGAIN' for r in reviews], dtype=float)
+            review_counts = np.bincount(review_rows, minlength=n)
+            lapse_counts = np.bincount(review_rows, weights=lapses, minlength=n)
+            review_lapse_rate = np.divide(
+                lapse_counts, review_counts,
+                out=review_lapse_rate, where=review_counts > 0
+            )
+
+        # Session performance and validation have no data source yet
+        session_performance_score = np.full(n, 0.5)
+        validation_score = np.full(n, 0.5)
+
+        # ---- Prerequisites ----
+        prerequisite_gap_count = np.zeros(n)
+        prerequisite_mastery_gap = np.zeros(n)
+        if prerequisites:
+            prereq_rows = np.array([row_of[p.objectiveId] for p in prerequisites])
+            prereq_mastery = np.array([
+                MASTERY_SCORES.get(_enum_value(p.prerequisite.masteryLevel), 0.5)
+                for p in prerequisites
+            ])
+            prereq_counts = np.bincount(prereq_rows, minlength=n)
+            has_prereqs = prereq_counts > 0
+            gap_counts = np.bincount(
+                prereq_rows, weights=(prereq_mastery < MASTERY_GAP_THRESHOLD), minlength=n
+            )
+            mastery_sums = np.bincount(prereq_rows, weights=prereq_mastery, minlength=n)
+            np.divide(gap_counts, prereq_counts, out=prerequisite_gap_count, where=has_prereqs)
+            mean_mastery = np.divide(
+                mastery_sums, prereq_counts, out=np.ones(n), where=has_prereqs
+            )
+            prerequisite_mastery_gap = np.maximum(0.0, 1.0 - mean_mastery)
+
+        # ---- Complexity ----
+        content_complexity = np.array([
+            COMPLEXITY_SCORES.get(_enum_value(obj.complexity), 0.6) for obj in objectives
+        ])
+        ability = topic_groups['mastery'].mean().reindex(topic_index).fillna(0.6)
+        complexity_mismatch = np.maximum(0.0, content_complexity - ability.to_numpy()[topic_pos])
+
+        # ---- Behavioral ----
+        struggle_by_topic: Dict[str, List[float]] = {}
+        for pattern in behavioral_patterns:
+            if pattern['patternType'] == 'STRUGGLE_TOPIC':
+                topic_area = (pattern.get('patternData') or {}).get('topicArea')
+                struggle_by_topic.setdefault(topic_area, []).append(pattern['confidence'])
+        historical_struggle_score = np.array([
+            float(np.mean(struggle_by_topic[t])) if t in struggle_by_topic else 0.0
+            for t in topics
+        ])
+
+        preferred_type = self._get_preferred_content_type(user_profile)
+        content_type_mismatch = np.array([
+            0.6 if self._infer_content_type({'objective': obj.objective}) != preferred_type else 0.0
+            for obj in objectives
+        ])
+        cognitive_load_indicator = np.full(n, cognitive_load)
+
+        # ---- Contextual ----
+        days_until_exam = np.full(n, 0.5)
+        if exams:
+            next_exam = (
+                pd.Series(pd.to_datetime([e.date for e in exams], utc=True),
+                          index=[e.courseId for e in exams])
+                .groupby(level=0).min()
+                .reindex(topic_index)
+            )
+            days = (next_exam - now).dt.days.to_numpy(dtype=float)[topic_pos]
+            has_exam = ~np.isnan(days)
+            days_until_exam[has_exam] = 1.0 - np.clip(days[has_exam] / 90.0, 0.0, 1.0)
+
+        last_study = topic_groups['last_studied'].max().reindex(topic_index)
+        days_since = (now - last_study).dt.days.to_numpy(dtype=float)[topic_pos]
+        days_since_last_study = np.where(
+            np.isnan(days_since), 0.5, np.minimum(1.0, days_since / 30.0)
+        )
+
+        pending_count = int((user_obj_df['mastery'] < MASTERY_SCORES['MASTERED']).sum())
+        workload_level = np.full(n, min(1.0, pending_count / 50.0))
+
+        X = np.column_stack([
+            retention_score,
+            retention_decline_rate,
+            review_lapse_rate,
+            session_performance_score,
+            validation_score,
+            prerequisite_gap_count,
+            prerequisite_mastery_gap,
+            content_complexity,
+            complexity_mismatch,
+            historical_struggle_score,
+            content_type_mismatch,
+            cognitive_load_indicator,
+            days_until_exam,
+            days_since_last_study,
+            workload_level,
+        ])
+
+        # Same rule as _calculate_data_quality: non-neutral values count as real data
+        data_quality = (np.abs(X - 0.5) > 0.01).mean(axis=1)
+
+        if return_topics:
+            return found_ids, X, data_quality, topics
+        return found_ids, X, data_quality
+
+    @staticmethod
+    def _grouped_slopes(metrics_df: pd.DataFrame) -> pd.Series:
+        """
+        Least-squares slope of score vs. observation index per topic.
+
+        Vectorized equivalent of np.polyfit(arange(n), scores, 1)[0] for
+        each topic group (rows must already be in date order). Topics with
+        fewer than 2 observations get NaN.
+        """
+        df = metrics_df.copy()
+        df['x'] = df.groupby('topic', sort=False).cumcount().astype(float)
+        grouped = df.groupby('topic', sort=False)
+        x_centered = df['x'] - grouped['x'].transform('mean')
+        y_centered = df['score'] - grouped['score'].transform('mean')
+
+        sums = pd.DataFrame({
+            'topic': df['topic'],
+            'sxy': x_centered * y_centered,
+            'sxx': x_centered ** 2,
+        }).groupby('topic', sort=False).sum()
+
+        return (sums['sxy'] / sums['sxx']).where(sums['sxx'] > 0)
+
     # ==================== HELPER METHODS ====================
 
     def _calculate_average_retention(
@@ -608,37 +937,27 @@ class StruggleFeatureExtractor:
         self,
         user_id: str
     ) -> Optional[Dict[str, Any]]:
-        """Fetch user learning profile with L1 caching."""
-        cache_key = f"profile:{user_id}"
+        """Fetch user learning profile (cached in 'profile' namespace)."""
+        async def load() -> Optional[Dict[str, Any]]:
+            profile = await self.db.userlearningprofile.find_unique(
+                where={"userId": user_id}
+            )
+            return profile.model_dump(mode='json') if profile else None
 
-        if self.cache_enabled:
-            cached = self._get_from_cache(cache_key, self.TTL_PROFILE)
-            if cached is not None:
-                return cached
-
-        # TODO: Implement Prisma query
-        # profile = await self.db.userLearningProfile.findUnique(...)
-        # self._set_cache(cache_key, profile)
-        # return profile
-        raise NotImplementedError("Database integration pending")
+        return await self._cached('profile', user_id, load, owner=user_id)
 
     async def _get_behavioral_patterns(
         self,
         user_id: str
     ) -> List[Dict[str, Any]]:
-        """Fetch behavioral patterns with L2 caching."""
-        cache_key = f"patterns:{user_id}"
-
-        if self.cache_enabled:
-            cached = self._get_from_cache(cache_key, self.TTL_PATTERNS)
-            if cached is not None:
-                return cached
+        """Fetch behavioral patterns (cached in 'patterns' namespace)."""
+        async def load() -> List[Dict[str, Any]]:
+            patterns = await self.db.behavioralpattern.find_many(
+                where={"userId": user_id}
+            )
+            return [pattern.model_dump(mode='json') for pattern in patterns]
 
-        # TODO: Implement Prisma query
-        # patterns = await self.db.behavioralPattern.findMany(...)
-        # self._set_cache(cache_key, patterns)
-        # return patterns
-        raise NotImplementedError("Database integration pending")
+        return await self._cached('patterns', user_id, load, owner=user_id)
 
     async def _get_retention_data(
         self,
@@ -709,9 +1028,18 @@ class StruggleFeatureExtractor:
         return 0.6  # Placeholder
 
     async def _get_cognitive_load_indicator(self, user_id: str) -> float:
-        """Get current cognitive load indicator."""
-        # TODO: Calculate from recent session patterns
-        return 0.5  # Placeholder
+        """Get current cognitive load indicator (cached in 'metrics' namespace)."""
+        async def load() -> float:
+            latest = await self.db.cognitiveloadmetric.find_first(
+                where={"userId": user_id},
+                order={"timestamp": "desc"},
+            )
+            if latest is None:
+                return 0.5  # Neutral if never measured
+
+            return min(1.0, max(0.0, latest.loadScore / 100.0))
+
+        return await self._cached('metrics', f"cognitive_load:{user_id}", load, owner=user_id)
 
     async def _get_next_exam_for_topic(
         self,
@@ -746,27 +1074,32 @@ class StruggleFeatureExtractor:
 
     # ==================== CACHE METHODS ====================
 
-    def _get_from_cache(
+    async def _cached(
         self,
+        namespace: str,
         key: str,
-        ttl: timedelta
-    ) -> Optional[Any]:
-        """Get value from cache if not expired."""
-        if key not in self._cache:
-            return None
-
-        value, timestamp = self._cache[key]
-        if datetime.utcnow() - timestamp > ttl:
-            # Expired
-            del self._cache[key]
-            return None
-
-        return value
-
-    def _set_cache(self, key: str, value: Any) -> None:
-        """Set cache value with current timestamp."""
-        self._cache[key] = (value, datetime.utcnow())
-
-    def clear_cache(self) -> None:
-        """Clear all cached data."""
-        self._cache.clear()
+        loader: Callable[[], Awaitable[Any]],
+        owner: Optional[str] = None
+    ) -> Any:
+        """Load through the shared feature cache (or directly if disabled)."""
+        if not self.cache_enabled:
+            return await loader()
+
+        return await self.cache.get_or_load(namespace, key, loader, owner=owner)
+
+    async def clear_cache(self, user_id: Optional[str] = None) -> None:
+        """
+        Clear cached data in process memory and the shared Redis tier.
+
+        Args:
+            user_id: Only drop this user's entries (default: clear everything)
+        """
+        if user_id is None:
+            await self.cache.clear()
+        else:
+            await self.cache.invalidate_owner(user_id)
+
+
+def _enum_value(value: Any) -> Any:
+    """Return the raw value of a Prisma enum field (plain values pass through)."""
+    return getattr(value, 'value', value)
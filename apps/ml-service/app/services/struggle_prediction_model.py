@@ -56,6 +56,53 @@ class PredictionResult:
         return result
 
 
+@dataclass
+class BatchPredictionResult:
+    """
+    Vectorized prediction results for n feature rows.
+
+    Contributing features are stored as (n, k) index/value matrices sorted by
+    contribution (descending). Unused slots have index -1 (rule-based rows
+    where fewer than k risk conditions fired).
+    """
+    probabilities: np.ndarray  # (n,) probability of struggle
+    confidences: np.ndarray  # (n,) confidence in prediction
+    risk_levels: np.ndarray  # (n,) "LOW", "MEDIUM", "HIGH"
+    top_feature_indices: np.ndarray  # (n, k) indices into FeatureVector.feature_names()
+    top_feature_values: np.ndarray  # (n, k) contribution values
+    model_version: str
+    predicted_at: datetime
+
+    def __len__(self) -> int:
+        return len(self.probabilities)
+
+    def contributing_features(self, i: int) -> Dict[str, float]:
+        """Top contributing features for row i (same shape as PredictionResult)."""
+        names = FeatureVector.feature_names()
+        return {
+            names[idx]: float(value)
+            for idx, value in zip(self.top_feature_indices[i], self.top_feature_values[i])
+            if idx >= 0
+        }
+
+    def to_results(self) -> List[PredictionResult]:
+        """Expand into per-row PredictionResult objects (adds reasoning text)."""
+        results = []
+        for i in range(len(self)):
+            contributing = self.contributing_features(i)
+            risk_level = str(self.risk_levels[i])
+            results.append(PredictionResult(
+                probability=float(self.probabilities[i]),
+                confidence=float(self.confidences[i]),
+                risk_level=risk_level,
+                contributing_features=contributing,
+                reasoning=_reasoning_text(contributing, risk_level),
+                model_version=self.model_version,
+                predicted_at=self.predicted_at,
+            ))
+        return results
+
+
 @dataclass
 class ModelMetrics:
     """
@@ -111,6 +158,10 @@ class StrugglePredictionModel:
         metrics = model.train(training_data)
         prediction = model.predict(feature_vector)
         model.save("model_v1.pkl")
+
+        # Batch scoring (feature matrix from extract_feature_matrix)
+        batch = model.predict_batch(X, data_quality=quality)
+        results = batch.to_results()
     """
 
     def __init__(self, model_version: str = "v1.0"):
@@ -156,6 +207,152 @@ class StrugglePredictionModel:
         else:
             return self._predict_rule_based(feature_vector)
 
+    def predict_batch(
+        self,
+        X: np.ndarray,
+        data_quality: Optional[np.ndarray] = None,
+        top_k: int = 5
+    ) -> BatchPredictionResult:
+        """
+        Predict struggle probabilities for many feature rows at once.
+
+        Vectorized equivalent of predict(): the ML path makes a single
+        predict_proba call and both paths rank contributing features with
+        argpartition instead of per-row sorting.
+
+        Args:
+            X: Feature matrix (n, 15) in FeatureVector.feature_names() order
+            data_quality: Per-row data quality (n,), defaults to 1.0
+            top_k: Number of contributing features to keep per row
+
+        Returns:
+            BatchPredictionResult with per-row probabilities and confidences
+        """
+        X = np.asarray(X, dtype=float)
+        if X.ndim != 2 or X.shape[1] != len(FeatureVector.feature_names()):
+            raise ValueError(
+                f"Expected feature matrix of shape (n, {len(FeatureVector.feature_names())}), "
+                f"got {X.shape}"
+            )
+
+        quality = np.ones(len(X)) if data_quality is None else np.asarray(data_quality, dtype=float)
+
+        if self.model_type == "logistic_regression" and self.classifier is not None:
+            return self._predict_batch_ml(X, quality, top_k)
+        else:
+            return self._predict_batch_rule_based(X, quality, top_k)
+
+    def _predict_batch_rule_based(
+        self,
+        X: np.ndarray,
+        quality: np.ndarray,
+        top_k: int
+    ) -> BatchPredictionResult:
+        """Vectorized rule-based prediction (same rules as _predict_rule_based)."""
+        col = {name: X[:, i] for i, name in enumerate(FeatureVector.feature_names())}
+        retention = col['retention_score']
+        prereq_gap = col['prerequisite_gap_count']
+        complexity_mismatch = col['complexity_mismatch']
+        history = col['historical_struggle_score']
+        content_mismatch = col['content_type_mismatch']
+        cognitive_load = col['cognitive_load_indicator']
+
+        high_risk = (
+            (retention < 0.5) | (prereq_gap > 0.5) |
+            (complexity_mismatch > 0.6) | (history > 0.7)
+        )
+        medium_risk = (
+            ((retention >= 0.5) & (retention < 0.7)) | (prereq_gap > 0.2) |
+            (content_mismatch > 0.5) | (cognitive_load > 0.7)
+        )
+
+        high_prob = np.minimum(1.0, 0.7 + (
+            (1 - retention) * 0.3 + prereq_gap * 0.3 +
+            complexity_mismatch * 0.2 + history * 0.2
+        ))
+        medium_prob = np.minimum(0.7, 0.4 + (
+            (1 - retention) * 0.4 + prereq_gap * 0.3 +
+            content_mismatch * 0.2 + cognitive_load * 0.1
+        ) * 0.3)
+        low_prob = np.maximum(0.0, 0.1 + (
+            (1 - retention) * 0.3 + col['days_since_last_study'] * 0.3 +
+            col['workload_level'] * 0.2 + (1 - col['session_performance_score']) * 0.2
+        ) * 0.3)
+
+        probabilities = np.select([high_risk, medium_risk], [high_prob, medium_prob], low_prob)
+        risk_levels = np.select([high_risk, medium_risk], ["HIGH", "MEDIUM"], "LOW")
+
+        # Prerequisite bonus always applies (gap ratio is never negative)
+        confidences = np.minimum(1.0, quality * 0.6 + 0.2 * (history > 0) + 0.2)
+
+        # Contributions only for features whose risk condition fired
+        names = FeatureVector.feature_names()
+        contributions = np.zeros_like(X)
+        contributions[:, names.index('retention_score')] = np.where(retention < 0.5, 1 - retention, 0.0)
+        for name, threshold in (
+            ('prerequisite_gap_count', 0.5),
+            ('complexity_mismatch', 0.6),
+            ('historical_struggle_score', 0.7),
+            ('content_type_mismatch', 0.5),
+            ('cognitive_load_indicator', 0.7),
+        ):
+            values = col[name]
+            contributions[:, names.index(name)] = np.where(values > threshold, values, 0.0)
+
+        indices, values = _top_k_contributions(contributions, top_k)
+        indices[values <= 0] = -1
+
+        return BatchPredictionResult(
+            probabilities=probabilities,
+            confidences=confidences,
+            risk_levels=risk_levels,
+            top_feature_indices=indices,
+            top_feature_values=values,
+            model_version=f"{self.model_version}-rule_based",
+            predicted_at=datetime.utcnow(),
+        )
+
+    def _predict_batch_ml(
+        self,
+        X: np.ndarray,
+        quality: np.ndarray,
+        top_k: int
+    ) -> BatchPredictionResult:
+        """Vectorized ML prediction (one predict_proba call for all rows)."""
+        if self.classifier is None or self.scaler is None:
+            raise ValueError("Model not trained. Call train() first.")
+
+        probabilities = self.classifier.predict_proba(self.scaler.transform(X))[:, 1]
+        risk_levels = np.select([probabilities >= 0.7, probabilities >= 0.4], ["HIGH", "MEDIUM"], "LOW")
+
+        if self.training_samples >= 100:
+            sample_bonus = 0.2
+        elif self.training_samples >= 50:
+            sample_bonus = 0.1
+        else:
+            sample_bonus = 0.0
+        certainty = np.abs(probabilities - 0.5) * 2
+        confidences = np.minimum(1.0, quality * 0.5 + certainty * 0.3 + sample_bonus)
+
+        if self.feature_importance is None:
+            indices = np.full((len(X), 0), -1, dtype=int)
+            values = np.zeros((len(X), 0))
+        else:
+            importance = np.array([
+                self.feature_importance.get(name, 0) for name in FeatureVector.feature_names()
+            ])
+            indices, values = _top_k_contributions(np.abs(X * importance), top_k)
+
+        return BatchPredictionResult(
+            probabilities=probabilities.astype(float),
+            confidences=confidences,
+            risk_levels=risk_levels,
+            top_feature_indices=indices,
+            top_feature_values=values,
+            model_version=f"{self.model_version}-ml",
+            predicted_at=datetime.utcnow(),
+        )
+
     def _predict_rule_based(self, features: FeatureVector) -> PredictionResult:
         """
         Rule-based prediction (MVP implementation).
@@ -644,31 +841,7 @@ class StrugglePredictionModel:
         risk_level: str
     ) -> str:
         """Generate human-readable explanation for prediction."""
-        if not contributing_features:
-            return f"{risk_level} risk prediction based on overall patterns."
-
-        # Get top feature
-        top_feature = list(contributing_features.keys())[0]
-
-        # Create readable explanations
-        explanations = {
-            'retention_score': "low retention in this topic area",
-            'prerequisite_gap_count': "missing prerequisite knowledge",
-            'complexity_mismatch': "content difficulty exceeds current level",
-            'historical_struggle_score': "past struggles with similar topics",
-            'content_type_mismatch': "learning style mismatch with content format",
-            'cognitive_load_indicator': "high cognitive load detected",
-            'review_lapse_rate': "high frequency of review lapses",
-            'days_until_exam': "exam approaching soon",
-            'workload_level': "high current workload",
-        }
-
-        reason = explanations.get(
-            top_feature,
-            f"{top_feature.replace('_', ' ')}"
-        )
-
-        return f"{risk_level} risk primarily due to {reason}."
+        return _reasoning_text(contributing_features, risk_level)
 
     # ==================== PERSISTENCE METHODS ====================
 
@@ -715,3 +888,57 @@ class StrugglePredictionModel:
         model.training_samples = model_data['training_samples']
 
         return model
+
+
+def _reasoning_text(contributing_features: Dict[str, float], risk_level: str) -> str:
+    """Generate human-readable explanation from the top contributing feature."""
+    if not contributing_features:
+        return f"{risk_level} risk prediction based on overall patterns."
+
+    # Get top feature
+    top_feature = list(contributing_features.keys())[0]
+
+    # Create readable explanations
+    explanations = {
+        'retention_score': "low retention in this topic area",
+        'prerequisite_gap_count': "missing prerequisite knowledge",
+        'complexity_mismatch': "content difficulty exceeds current level",
+        'historical_struggle_score': "past struggles with similar topics",
+        'content_type_mismatch': "learning style mismatch with content format",
+        'cognitive_load_indicator': "high cognitive load detected",
+        'review_lapse_rate': "high frequency of review lapses",
+        'days_until_exam': "exam approaching soon",
+        'workload_level': "high current workload",
+    }
+
+    reason = explanations.get(
+        top_feature,
+        f"{top_feature.replace('_', ' ')}"
+    )
+
+    return f"{risk_level} risk primarily due to {reason}."
+
+
+def _top_k_contributions(
+    contributions: np.ndarray,
+    k: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Select the k largest contributions per row, sorted descending.
+
+    Uses argpartition (O(n·d)) and only sorts the k selected columns.
+
+    Returns:
+        (indices, values) matrices of shape (n, min(k, d))
+    """
+    k = min(k, contributions.shape[1])
+    if k <= 0:
+        return (np.empty((len(contributions), 0), dtype=int),
+                np.empty((len(contributions), 0)))
+
+    top = np.argpartition(-contributions, k - 1, axis=1)[:, :k]
+    top_values = np.take_along_axis(contributions, top, axis=1)
+    order = np.argsort(-top_values, axis=1, kind='stable')
+
+    return (np.take_along_axis(top, order, axis=1),
+            np.take_along_axis(top_values, order, axis=1))
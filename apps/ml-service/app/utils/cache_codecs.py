@@ -0,0 +1,299 @@
+"""
+Cache value codecs for RedisCache.
+
+Compact binary encoding for cached ITS/ABAB results:
+- msgpack or orjson for the structure (stdlib json if neither is installed)
+- Long float lists (e.g. ABAB permutation distributions) stored as raw
+  float64 buffers instead of decimal text; bytes values (e.g. rendered
+  plots) stored as-is
+- zstd or lz4 compression above a size threshold (zlib if neither is installed)
+
+Frame Layout:
+    b"\\x00" | serializer id | compression id | body
+    body (before compression) = u32 structure length | structure | raw buffers
+
+Values cached before codecs were introduced are plain JSON text; they never
+start with a NUL byte and are still decoded.
+"""
+
+import json
+import logging
+import struct
+import zlib
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from pydantic import BaseModel
+
+try:
+    import orjson
+    HAVE_ORJSON = True
+except Exception:
+    HAVE_ORJSON = False
+
+try:
+    import msgpack
+    HAVE_MSGPACK = True
+except Exception:
+    HAVE_MSGPACK = False
+
+try:
+    import zstandard
+    HAVE_ZSTD = True
+except Exception:
+    HAVE_ZSTD = False
+
+try:
+    import lz4.frame
+    HAVE_LZ4 = True
+except Exception:
+    HAVE_LZ4 = False
+
+logger = logging.getLogger(__name__)
+
+FRAME_MAGIC = 0
+SERIALIZER_IDS = {"json": 1, "orjson": 2, "msgpack": 3}
+COMPRESSION_IDS = {"none": 0, "zlib": 1, "zstd": 2, "lz4": 3}
+
+# Placeholder keys for buffers: {ARRAY_KEY: [offset, count]}, {BYTES_KEY: [offset, length]}
+ARRAY_KEY = "__f8__"
+BYTES_KEY = "__bytes__"
+FLOAT64 = np.dtype("<f8")
+_LENGTH = struct.Struct("<I")
+
+
+def _default(value: Any) -> Any:
+    """Fallback for types the serializers don't handle natively."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    raise TypeError(f"Object of type {type(value).__name__} is not serializable")
+
+
+# ==================== SERIALIZERS ====================
+
+
+def _dumps_json(value: Any) -> bytes:
+    return json.dumps(value, default=_default, separators=(",", ":")).encode()
+
+
+def _dumps_orjson(value: Any) -> bytes:
+    return orjson.dumps(value, default=_default, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def _dumps_msgpack(value: Any) -> bytes:
+    return msgpack.packb(value, default=_default, use_bin_type=True)
+
+
+def _loads_msgpack(data: bytes) -> Any:
+    return msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+
+_SERIALIZERS = {
+    "json": (_dumps_json, json.loads),
+    "orjson": (_dumps_orjson, orjson.loads if HAVE_ORJSON else None),
+    "msgpack": (_dumps_msgpack, _loads_msgpack),
+}
+
+
+# ==================== COMPRESSION ====================
+
+
+def _compressor(name: str, level: Optional[int]):
+    if name == "zstd":
+        return zstandard.ZstdCompressor(level=level or 3).compress
+    if name == "lz4":
+        return lambda data: lz4.frame.compress(data, compression_level=level or 0)
+    if name == "zlib":
+        return lambda data: zlib.compress(data, level or 1)
+    raise ValueError(f"Unknown compression: {name}")
+
+
+def _decompress(compression_id: int, data: bytes) -> bytes:
+    if compression_id == COMPRESSION_IDS["none"]:
+        return data
+    if compression_id == COMPRESSION_IDS["zlib"]:
+        return zlib.decompress(data)
+    if compression_id == COMPRESSION_IDS["zstd"]:
+        return zstandard.ZstdDecompressor().decompress(data)
+    if compression_id == COMPRESSION_IDS["lz4"]:
+        return lz4.frame.decompress(data)
+    raise ValueError(f"Unknown compression id: {compression_id}")
+
+
+# ==================== CODEC ====================
+
+
+@dataclass
+class EncodeStats:
+    """Sizes of one encoded value"""
+
+    raw_bytes: int
+    stored_bytes: int
+    compressed: bool
+
+
+class CacheCodec:
+    """
+    Encode cache values to compact bytes and back.
+
+    Usage:
+        codec = CacheCodec()                      # best available backends
+        data, stats = codec.encode(result.model_dump())
+        value = codec.decode(data)
+
+    Decoding reads the serializer and compression from the frame header,
+    so entries written with other settings (or legacy JSON text) remain
+    readable after a configuration change. Float buffers are decoded back
+    to lists, so cached dicts validate into Pydantic models as before.
+    """
+
+    def __init__(
+        self,
+        serializer: str = "auto",
+        compression: str = "auto",
+        compress_min_bytes: int = 1024,
+        compression_level: Optional[int] = None,
+        array_min_items: int = 64,
+    ):
+        """
+        Args:
+            serializer: "msgpack", "orjson", "json" or "auto" (best installed)
+            compression: "zstd", "lz4", "zlib", "none" or "auto" (best installed)
+            compress_min_bytes: Smaller payloads are stored uncompressed
+            compression_level: Backend-specific level (None = fast default)
+            array_min_items: Float lists at least this long become raw buffers
+        """
+        if serializer == "auto":
+            serializer = "msgpack" if HAVE_MSGPACK else "orjson" if HAVE_ORJSON else "json"
+        if compression == "auto":
+            compression = "zstd" if HAVE_ZSTD else "lz4" if HAVE_LZ4 else "zlib"
+
+        available = {"json": True, "orjson": HAVE_ORJSON, "msgpack": HAVE_MSGPACK}
+        if not available.get(serializer, False):
+            raise ValueError(f"Serializer not available: {serializer}")
+        if compression not in COMPRESSION_IDS:
+            raise ValueError(f"Unknown compression: {compression}")
+        if compression == "zstd" and not HAVE_ZSTD or compression == "lz4" and not HAVE_LZ4:
+            raise ValueError(f"Compression not available: {compression}")
+
+        self.serializer = serializer
+        self.compression = compression
+        self.compress_min_bytes = compress_min_bytes
+        self.array_min_items = array_min_items
+        self._dumps = _SERIALIZERS[serializer][0]
+        self._compress = (
+            _compressor(compression, compression_level) if compression != "none" else None
+        )
+
+    def encode(self, value: Any) -> Tuple[bytes, EncodeStats]:
+        """
+        Encode a value (Pydantic models are dumped first).
+
+        Returns:
+            (frame bytes, EncodeStats)
+        """
+        if isinstance(value, BaseModel):
+            value = value.model_dump()
+
+        buffers: List[bytes] = []
+        structure = self._dumps(self._extract_arrays(value, buffers, [0]))
+        body = b"".join([_LENGTH.pack(len(structure)), structure, *buffers])
+
+        compression_id = COMPRESSION_IDS["none"]
+        if self._compress is not None and len(body) >= self.compress_min_bytes:
+            compressed = self._compress(body)
+            if len(compressed) < len(body):
+                body = compressed
+                compression_id = COMPRESSION_IDS[self.compression]
+
+        raw_bytes = _LENGTH.size + len(structure) + sum(len(b) for b in buffers)
+        header = bytes((FRAME_MAGIC, SERIALIZER_IDS[self.serializer], compression_id))
+        data = header + body
+        return data, EncodeStats(
+            raw_bytes=raw_bytes,
+            stored_bytes=len(data),
+            compressed=compression_id != COMPRESSION_IDS["none"],
+        )
+
+    def decode(self, data: bytes) -> Any:
+        """Decode a frame (or a legacy JSON string) back to Python objects."""
+        if isinstance(data, str) or not data or data[0] != FRAME_MAGIC:
+            return json.loads(data)
+
+        serializer_id, compression_id = data[1], data[2]
+        body = _decompress(compression_id, memoryview(data)[3:])
+        (length,) = _LENGTH.unpack_from(body)
+        structure = bytes(memoryview(body)[_LENGTH.size:_LENGTH.size + length])
+        arrays = memoryview(body)[_LENGTH.size + length:]
+
+        loads = _loader(serializer_id)
+        value = loads(structure)
+        if len(arrays):
+            value = _restore_arrays(value, arrays)
+        return value
+
+    def _extract_arrays(self, value: Any, buffers: List[bytes], offset: List[int]) -> Any:
+        """Replace long float lists / float ndarrays / bytes with buffer placeholders."""
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            data = bytes(value)
+            buffers.append(data)
+            offset[0] += len(data)
+            return {BYTES_KEY: [offset[0] - len(data), len(data)]}
+
+        if isinstance(value, dict):
+            return {k: self._extract_arrays(v, buffers, offset) for k, v in value.items()}
+
+        if isinstance(value, np.ndarray):
+            if value.dtype.kind == "f" and value.ndim == 1 and len(value) >= self.array_min_items:
+                return self._add_buffer(value.astype(FLOAT64, copy=False), buffers, offset)
+            return self._extract_arrays(value.tolist(), buffers, offset)
+
+        if isinstance(value, (list, tuple)):
+            if (
+                len(value) >= self.array_min_items
+                and isinstance(value[0], float)
+                and all(isinstance(x, float) for x in value)
+            ):
+                return self._add_buffer(np.asarray(value, dtype=FLOAT64), buffers, offset)
+            return [self._extract_arrays(v, buffers, offset) for v in value]
+
+        return value
+
+    @staticmethod
+    def _add_buffer(array: np.ndarray, buffers: List[bytes], offset: List[int]) -> Dict[str, List[int]]:
+        buffers.append(array.tobytes())
+        placeholder = {ARRAY_KEY: [offset[0], len(array)]}
+        offset[0] += array.nbytes
+        return placeholder
+
+
+def _loader(serializer_id: int):
+    for name, sid in SERIALIZER_IDS.items():
+        if sid == serializer_id:
+            loads = _SERIALIZERS[name][1]
+            if name == "msgpack" and not HAVE_MSGPACK or loads is None:
+                raise ValueError(f"Cached value needs unavailable serializer: {name}")
+            return loads
+    raise ValueError(f"Unknown serializer id: {serializer_id}")
+
+
+def _restore_arrays(value: Any, arrays: memoryview) -> Any:
+    if isinstance(value, dict):
+        if len(value) == 1 and ARRAY_KEY in value:
+            start, count = value[ARRAY_KEY]
+            return np.frombuffer(arrays, dtype=FLOAT64, count=count, offset=start).tolist()
+        if len(value) == 1 and BYTES_KEY in value:
+            start, length = value[BYTES_KEY]
+            return bytes(arrays[start:start + length])
+        return {k: _restore_arrays(v, arrays) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_restore_arrays(v, arrays) for v in value]
+    return value
@@ -0,0 +1,271 @@
+"""
+Process-wide feature cache for struggle feature extraction.
+
+Replaces the per-extractor dict cache:
+- Size-bounded LRU (least recently used entries are evicted first)
+- Per-namespace TTLs (profile / patterns / metrics) on a monotonic clock
+- Request coalescing: concurrent misses for the same key share one load
+- Hit / miss / eviction / coalescing counters for monitoring
+- Optional second tier in RedisCache, shared across worker processes
+
+Entries live in this process's memory. When a RedisCache is attached,
+L1 misses fall through to Redis before calling the loader, and loaded
+values are written back to Redis with the namespace TTL. Missing values
+(None) are stored as a marker so cold users don't reach the database on
+every request, and entries loaded for an owner (user ID) are registered in
+that owner's Redis tag set so invalidate_owner() clears every worker's copy.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from app.utils.redis_cache import RedisCache
+
+
+# Default TTLs in seconds (match CACHE_TTL_* settings)
+DEFAULT_NAMESPACE_TTLS: Dict[str, float] = {
+    "profile": 3600,  # 1 hour
+    "patterns": 43200,  # 12 hours
+    "metrics": 1800,  # 30 minutes
+}
+
+# Stored in Redis for a loaded None (Redis itself returns None on a miss)
+_REDIS_NONE = {"__feature_cache_none__": True}
+
+
+class FeatureCache:
+    """
+    Bounded LRU + TTL cache with single-flight loading.
+
+    Usage:
+        cache = FeatureCache(max_entries=10_000)
+
+        profile = await cache.get_or_load(
+            "profile", user_id, lambda: fetch_profile(user_id)
+        )
+
+        await cache.invalidate_owner(user_id)  # Drop a user's entries everywhere
+        cache.stats()                          # {'hits': ..., 'misses': ..., ...}
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        namespace_ttls: Optional[Dict[str, float]] = None,
+        redis: Optional[RedisCache] = None,
+        redis_prefix: str = "features",
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+        self.max_entries = max_entries
+        self.namespace_ttls = dict(DEFAULT_NAMESPACE_TTLS)
+        if namespace_ttls:
+            self.namespace_ttls.update(namespace_ttls)
+        self.redis = redis
+        self.redis_prefix = redis_prefix
+        self._clock = clock
+
+        # (namespace, key) -> (expires_at, value, owner); order = recency
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[float, Any, Optional[str]]]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, Hashable], asyncio.Future] = {}
+
+        self._counters = dict.fromkeys(
+            ("hits", "misses", "evictions", "expirations", "coalesced", "redis_hits", "load_errors"),
+            0,
+        )
+
+    # ==================== LOOKUP ====================
+
+    def get(self, namespace: str, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Look up an entry in process memory.
+
+        Returns:
+            (found, value) - value may legitimately be None when found
+        """
+        entry_key = (namespace, key)
+        entry = self._entries.get(entry_key)
+
+        if entry is None:
+            return False, None
+
+        expires_at, value, _ = entry
+        if self._clock() >= expires_at:
+            del self._entries[entry_key]
+            self._counters["expirations"] += 1
+            return False, None
+
+        self._entries.move_to_end(entry_key)
+        return True, value
+
+    def set(self, namespace: str, key: Hashable, value: Any, owner: Optional[str] = None) -> None:
+        """Store an entry with the namespace TTL, evicting LRU entries if full."""
+        entry_key = (namespace, key)
+        self._entries[entry_key] = (self._clock() + self._ttl(namespace), value, owner)
+        self._entries.move_to_end(entry_key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    async def get_or_load(
+        self,
+        namespace: str,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        owner: Optional[str] = None,
+    ) -> Any:
+        """
+        Return a cached value, loading it at most once across concurrent callers.
+
+        Lookup order: process memory, then Redis (if attached), then loader.
+        If another coroutine is already loading the same key, this call
+        awaits that load instead of starting a second one. Loader errors
+        propagate to every waiter and are not cached.
+
+        Args:
+            namespace: Cache namespace (determines TTL)
+            key: Entry key within namespace (e.g., user ID)
+            loader: Zero-argument coroutine factory producing the value
+            owner: User ID the entry belongs to (see invalidate_owner)
+        """
+        found, value = self.get(namespace, key)
+        if found:
+            self._counters["hits"] += 1
+            return value
+
+        entry_key = (namespace, key)
+        inflight = self._inflight.get(entry_key)
+        if inflight is not None:
+            self._counters["coalesced"] += 1
+            return await asyncio.shield(inflight)
+
+        self._counters["misses"] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[entry_key] = future
+
+        try:
+            value = await self._load(namespace, key, loader, owner)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            self._counters["load_errors"] += 1
+            future.set_exception(e)
+            # Mark retrieved so failures without waiters don't log warnings
+            future.exception()
+            raise
+        else:
+            self.set(namespace, key, value, owner)
+            future.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(entry_key, None)
+
+    async def _load(
+        self,
+        namespace: str,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        owner: Optional[str] = None,
+    ) -> Any:
+        """Load from Redis tier if available, otherwise from loader (and write back)."""
+        redis_key = self._redis_key(namespace, key)
+
+        if self.redis is not None:
+            value = await self.redis.get(redis_key)
+            if value is not None:
+                self._counters["redis_hits"] += 1
+                return None if value == _REDIS_NONE else value
+
+        value = await loader()
+
+        if self.redis is not None:
+            tags = [self.owner_tag(owner)] if owner is not None else None
+            await self.redis.set(
+                redis_key,
+                _REDIS_NONE if value is None else value,
+                ttl=int(self._ttl(namespace)),
+                tags=tags,
+            )
+
+        return value
+
+    # ==================== INVALIDATION ====================
+
+    async def invalidate(self, namespace: str, key: Hashable) -> None:
+        """Drop a single entry from process memory and Redis."""
+        self._entries.pop((namespace, key), None)
+        if self.redis is not None:
+            await self.redis.delete(self._redis_key(namespace, key))
+
+    async def invalidate_key(self, key: Hashable) -> None:
+        """Drop entries for a key across all namespaces, in process memory and Redis."""
+        for entry_key in [k for k in self._entries if k[1] == key]:
+            del self._entries[entry_key]
+        if self.redis is not None:
+            for namespace in self.namespace_ttls:
+                await self.redis.delete(self._redis_key(namespace, key))
+
+    async def invalidate_owner(self, owner: str) -> None:
+        """
+        Drop every entry loaded for an owner (e.g., user ID), whatever its key.
+
+        Process memory is scanned; Redis entries are removed through the
+        owner's tag set, so other workers reload on their next L1 miss.
+        """
+        for entry_key in [k for k, entry in self._entries.items() if entry[2] == owner]:
+            del self._entries[entry_key]
+        if self.redis is not None:
+            await self.redis.invalidate_user(self.redis_prefix, owner)
+
+    async def clear(self) -> None:
+        """Drop all entries from process memory and Redis (counters are kept)."""
+        self._entries.clear()
+        if self.redis is not None:
+            await self.redis.clear_prefix(f"{self.redis_prefix}:")
+
+    def owner_tag(self, owner: str) -> str:
+        """Redis tag set of an owner's entries."""
+        return RedisCache.user_tag(self.redis_prefix, owner)
+
+    # ==================== MONITORING ====================
+
+    def stats(self) -> Dict[str, Any]:
+        """Return counters, current size and hit rate."""
+        lookups = self._counters["hits"] + self._counters["misses"] + self._counters["coalesced"]
+        served_without_load = self._counters["hits"] + self._counters["coalesced"]
+        return {
+            **self._counters,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "inflight": len(self._inflight),
+            "hit_rate": served_without_load / lookups if lookups else 0.0,
+        }
+
+    def reset_stats(self) -> None:
+        """Zero all counters."""
+        for name in self._counters:
+            self._counters[name] = 0
+
+    def _redis_key(self, namespace: str, key: Hashable) -> str:
+        return f"{self.redis_prefix}:{namespace}:{key}"
+
+    def _ttl(self, namespace: str) -> float:
+        try:
+            return self.namespace_ttls[namespace]
+        except KeyError:
+            raise ValueError(f"Unknown cache namespace: {namespace}") from None
+
+
+# Global process-wide instance (Redis tier attached in FastAPI lifespan)
+feature_cache = FeatureCache()
+
+
+def get_feature_cache() -> FeatureCache:
+    """Get global feature cache instance."""
+    return feature_cache
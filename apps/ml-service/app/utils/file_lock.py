@@ -0,0 +1,77 @@
+"""
+Cross-process file locks.
+
+DuckDB allows one read-write process per database file, and read-only
+connections fail while a writer has the file open. Processes that share an
+analytics database (API workers flushing ingested events, the export sync,
+session-history readers) coordinate through an advisory lock file next to
+it: writers hold it exclusively for the duration of their connection,
+readers hold it shared.
+
+Usage:
+    with file_lock(f"{duckdb_path}.lock", timeout=10):
+        conn = duckdb.connect(duckdb_path)
+        ...
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+try:
+    import fcntl
+    HAVE_FCNTL = True
+except Exception:  # Windows: no advisory locks, callers run unlocked
+    HAVE_FCNTL = False
+
+POLL_INTERVAL = 0.05
+
+
+def lock_path(path: str) -> str:
+    """Lock file that guards `path`."""
+    return f"{path}.lock"
+
+
+@contextmanager
+def file_lock(path: str, timeout: float = 10.0, shared: bool = False) -> Iterator[None]:
+    """
+    Hold an advisory lock on `path` (created if missing).
+
+    Args:
+        path: Lock file
+        timeout: Seconds to wait for the lock
+        shared: Take a shared (reader) lock instead of an exclusive one
+
+    Raises:
+        TimeoutError: If the lock is not acquired within timeout
+    """
+    if not HAVE_FCNTL:
+        yield
+        return
+
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        mode = (fcntl.LOCK_SH if shared else fcntl.LOCK_EX) | fcntl.LOCK_NB
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                fcntl.flock(fd, mode)
+                break
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"Timed out waiting for lock {path}")
+                time.sleep(POLL_INTERVAL)
+        try:
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
+
+
+def reader_lock(path: str, timeout: float = 10.0):
+    """Shared lock on the lock file guarding database `path` (see file_lock)."""
+    return file_lock(lock_path(path), timeout=timeout, shared=True)
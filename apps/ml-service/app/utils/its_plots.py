@@ -8,11 +8,15 @@ This module provides publication-ready plots for:
 4. MCMC Diagnostics (trace plots, R-hat, ESS)
 
 All plots are returned as base64-encoded PNG strings for JSON API responses.
+
+For the API, plots are rendered on demand instead: summarize_for_plots()
+reduces a fit to a small posterior summary stored with the run, and
+render_plot() draws any plot kind from it as SVG or PNG.
 """
 
 import base64
 from io import BytesIO
-from typing import Dict, Any
+from typing import Any, Dict, List, Optional
 
 import matplotlib.pyplot as plt
 import seaborn as sns
@@ -343,3 +347,315 @@ def generate_all_plots(
         "effect_distribution": plot_effect_distribution(results),
         "mcmc_diagnostics": plot_mcmc_diagnostics(model_result, results),
     }
+
+
+# ==================== ON-DEMAND RENDERING FROM POSTERIOR SUMMARIES ====================
+#
+# The analysis stores a compact, JSON-serializable summary of the posterior
+# (summarize_for_plots); plots are rendered from it later, on request, by
+# render_plot - typically in a worker process - as SVG or PNG bytes.
+
+PLOT_KINDS = (
+    "observed_vs_counterfactual",
+    "posterior_predictive_check",
+    "effect_distribution",
+    "mcmc_diagnostics",
+)
+
+# Posterior predictive draws and trace points kept per summary
+PPC_DRAWS = 100
+PPC_BINS = 40
+TRACE_POINTS = 200
+TRACE_MAX_COMPONENTS = 8
+
+
+def summarize_for_plots(
+    model_result: Dict[str, Any],
+    results: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Reduce an ITS fit to the data needed to draw every plot kind.
+
+    Keeps per-time-point summaries instead of the full trace:
+    - Observed series and counterfactual mean/HDI (CausalPy plot data)
+    - Histogram of observed data and quantile band of posterior predictive densities
+    - Effect point estimates and credible intervals
+    - Thinned traces of low-dimensional parameters, R-hat and ESS
+
+    Args:
+        model_result: Output from BayesianITSEngine.run_causalpy_its()
+        results: Output from BayesianITSEngine.extract_results()
+
+    Returns:
+        Dictionary of plain lists/floats (a few tens of KB)
+    """
+    pre_data = model_result["pre_data"]
+    post_data = model_result["post_data"]
+    idata = model_result["idata"]
+
+    summary: Dict[str, Any] = {
+        "observed": {
+            "pre_time": pre_data["time"].astype(float).tolist(),
+            "pre_outcome": pre_data["outcome"].astype(float).tolist(),
+            "post_time": post_data["time"].astype(float).tolist(),
+            "post_outcome": post_data["outcome"].astype(float).tolist(),
+        },
+        "counterfactual": _counterfactual_summary(model_result["model"], len(post_data)),
+        "ppc": _ppc_summary(idata),
+        "effects": {
+            name: results[name].model_dump()
+            for name in ("immediate_effect", "counterfactual_effect")
+        },
+        "traces": _trace_summary(idata),
+        "r_hat": dict(results["mcmc_diagnostics"].r_hat),
+        "effective_sample_size": dict(results["mcmc_diagnostics"].effective_sample_size),
+    }
+    return summary
+
+
+def _counterfactual_summary(model: Any, n_post: int) -> Optional[Dict[str, List[float]]]:
+    """Counterfactual mean and HDI for the post period (None if unavailable)."""
+    try:
+        plot_data = model.get_plot_data()
+    except Exception:
+        return None
+
+    lower = [c for c in plot_data.columns if c.startswith("pred_hdi_lower")]
+    upper = [c for c in plot_data.columns if c.startswith("pred_hdi_upper")]
+    if "prediction" not in plot_data.columns or not lower or not upper:
+        return None
+
+    post = plot_data.iloc[-n_post:]
+    return {
+        "mean": post["prediction"].astype(float).tolist(),
+        "lower": post[lower[0]].astype(float).tolist(),
+        "upper": post[upper[0]].astype(float).tolist(),
+        "label": lower[0].rsplit("_", 1)[-1] + "% HDI",
+    }
+
+
+def _ppc_summary(idata: Any) -> Optional[Dict[str, List[float]]]:
+    """Observed density and 5/50/95% band of posterior predictive densities."""
+    if not hasattr(idata, "posterior_predictive") or not hasattr(idata, "observed_data"):
+        return None
+
+    names = [v for v in idata.observed_data.data_vars if v in idata.posterior_predictive]
+    if not names:
+        return None
+
+    observed = np.asarray(idata.observed_data[names[0]].values, dtype=float).ravel()
+    draws = np.asarray(idata.posterior_predictive[names[0]].values, dtype=float)
+    draws = draws.reshape(-1, observed.size)
+    draws = draws[np.linspace(0, len(draws) - 1, min(PPC_DRAWS, len(draws))).astype(int)]
+
+    edges = np.histogram_bin_edges(np.concatenate([observed, draws.ravel()]), bins=PPC_BINS)
+    observed_density, _ = np.histogram(observed, bins=edges, density=True)
+    draw_densities = np.array([np.histogram(d, bins=edges, density=True)[0] for d in draws])
+    band = np.percentile(draw_densities, [5, 50, 95], axis=0)
+
+    return {
+        "edges": edges.tolist(),
+        "observed": observed_density.tolist(),
+        "lower": band[0].tolist(),
+        "median": band[1].tolist(),
+        "upper": band[2].tolist(),
+    }
+
+
+def _trace_summary(idata: Any) -> Dict[str, List[List[float]]]:
+    """Thinned per-chain traces of parameters with few components."""
+    traces: Dict[str, List[List[float]]] = {}
+    posterior = idata.posterior
+    for name, values in posterior.data_vars.items():
+        array = np.asarray(values.values, dtype=float)
+        n_chains, n_draws = array.shape[:2]
+        components = array.reshape(n_chains, n_draws, -1)
+        if components.shape[2] > TRACE_MAX_COMPONENTS:
+            continue  # per-observation quantities (e.g. mu)
+
+        keep = np.linspace(0, n_draws - 1, min(TRACE_POINTS, n_draws)).astype(int)
+        for i in range(components.shape[2]):
+            label = name if components.shape[2] == 1 else f"{name}[{i}]"
+            traces[label] = components[:, keep, i].tolist()
+    return traces
+
+
+def render_plot(
+    kind: str,
+    summary: Dict[str, Any],
+    fmt: str = "svg",
+    width: int = 800,
+) -> bytes:
+    """
+    Render one plot kind from a posterior summary.
+
+    Args:
+        kind: One of PLOT_KINDS
+        summary: Output of summarize_for_plots()
+        fmt: "svg" or "png"
+        width: PNG width in pixels (resolution is scaled down to fit)
+
+    Returns:
+        Encoded image bytes
+
+    Raises:
+        ValueError: Unknown kind or format, or data missing for the kind
+    """
+    renderers = {
+        "observed_vs_counterfactual": _draw_observed_vs_counterfactual,
+        "posterior_predictive_check": _draw_posterior_predictive_check,
+        "effect_distribution": _draw_effect_distribution,
+        "mcmc_diagnostics": _draw_mcmc_diagnostics,
+    }
+    if kind not in renderers:
+        raise ValueError(f"Unknown plot kind: {kind}")
+    if fmt not in ("svg", "png"):
+        raise ValueError(f"Unsupported plot format: {fmt}")
+
+    fig = renderers[kind](summary)
+    return _fig_to_bytes(fig, fmt, width)
+
+
+def _fig_to_bytes(fig: Figure, fmt: str, width: int) -> bytes:
+    buffer = BytesIO()
+    try:
+        if fmt == "svg":
+            with plt.rc_context({"svg.fonttype": "none"}):  # text as text, not paths
+                fig.savefig(buffer, format="svg", bbox_inches="tight")
+        else:
+            dpi = max(width / fig.get_figwidth(), 20)
+            fig.savefig(buffer, format="png", bbox_inches="tight", dpi=dpi)
+    finally:
+        plt.close(fig)
+    return buffer.getvalue()
+
+
+def _draw_observed_vs_counterfactual(summary: Dict[str, Any]) -> Figure:
+    fig, ax = plt.subplots(figsize=(12, 6))
+    observed = summary["observed"]
+
+    ax.scatter(observed["pre_time"], observed["pre_outcome"], color="steelblue",
+               alpha=0.6, label="Pre-intervention", s=50)
+    ax.scatter(observed["post_time"], observed["post_outcome"], color="darkorange",
+               alpha=0.6, label="Post-intervention", s=50)
+
+    counterfactual = summary.get("counterfactual")
+    if counterfactual:
+        ax.plot(observed["post_time"], counterfactual["mean"], "r--", linewidth=2,
+                label="Counterfactual (no intervention)")
+        ax.fill_between(observed["post_time"], counterfactual["lower"], counterfactual["upper"],
+                        color="red", alpha=0.2, label=counterfactual["label"])
+
+    if observed["pre_time"]:
+        ax.axvline(max(observed["pre_time"]), color="black", linestyle="--", linewidth=2,
+                   label="Intervention")
+
+    ax.set_xlabel("Days Since Start", fontsize=12)
+    ax.set_ylabel("Outcome (Performance Score)", fontsize=12)
+    ax.set_title("Bayesian ITS: Observed vs Counterfactual", fontsize=14, fontweight="bold")
+    ax.legend(loc="best", frameon=True, shadow=True)
+    ax.grid(True, alpha=0.3)
+    return fig
+
+
+def _draw_posterior_predictive_check(summary: Dict[str, Any]) -> Figure:
+    ppc = summary.get("ppc")
+    if not ppc:
+        raise ValueError("Posterior predictive samples were not recorded for this run")
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    edges = np.asarray(ppc["edges"])
+    centers = (edges[:-1] + edges[1:]) / 2
+
+    ax.fill_between(centers, ppc["lower"], ppc["upper"], color="steelblue", alpha=0.25,
+                    label="Posterior predictive (90% band)")
+    ax.plot(centers, ppc["median"], color="steelblue", linewidth=1.5,
+            label="Posterior predictive (median)")
+    ax.stairs(ppc["observed"], edges, color="black", linewidth=2, label="Observed")
+
+    ax.set_title("Posterior Predictive Check", fontsize=14, fontweight="bold")
+    ax.set_xlabel("Outcome (Performance Score)", fontsize=12)
+    ax.set_ylabel("Density", fontsize=12)
+    ax.legend(loc="best")
+    ax.grid(True, alpha=0.3)
+    return fig
+
+
+def _draw_effect_distribution(summary: Dict[str, Any]) -> Figure:
+    fig, axes = plt.subplots(1, 2, figsize=(14, 6))
+    panels = [
+        ("immediate_effect", "Immediate Effect", "steelblue", "orange"),
+        ("counterfactual_effect", "Counterfactual Effect", "darkorange", "blue"),
+    ]
+
+    for ax, (name, title, fill, ci_color) in zip(axes, panels):
+        effect = summary["effects"][name]
+        mean = effect["point_estimate"]
+        # Normal approximation from the 95% CI (the posterior summary has no samples)
+        std = max((effect["ci_upper"] - effect["ci_lower"]) / (2 * 1.96), 1e-9)
+        x = np.linspace(mean - 4 * std, mean + 4 * std, 200)
+        density = np.exp(-0.5 * ((x - mean) / std) ** 2) / (std * np.sqrt(2 * np.pi))
+
+        ax.fill_between(x, density, alpha=0.7, color=fill)
+        ax.axvline(mean, color="red", linestyle="--", linewidth=2, label="Mean")
+        ax.axvline(effect["ci_lower"], color=ci_color, linestyle="--", linewidth=1.5, label="95% CI")
+        ax.axvline(effect["ci_upper"], color=ci_color, linestyle="--", linewidth=1.5)
+        ax.axvline(0, color="black", linestyle="-", linewidth=1, alpha=0.5)
+
+        ax.set_xlabel(title, fontsize=12)
+        ax.set_ylabel("Density", fontsize=12)
+        ax.set_title(f"{title}\nP(benefit) = {effect['probability_positive']:.2%}",
+                     fontsize=12, fontweight="bold")
+        ax.legend(loc="best")
+        ax.grid(True, alpha=0.3)
+
+    plt.tight_layout()
+    return fig
+
+
+def _draw_mcmc_diagnostics(summary: Dict[str, Any]) -> Figure:
+    fig, axes = plt.subplots(2, 2, figsize=(14, 10))
+
+    # 1. Thinned trace plots (one line per chain)
+    ax = axes[0, 0]
+    for label, chains in summary["traces"].items():
+        for chain in chains:
+            ax.plot(chain, linewidth=0.8, alpha=0.7)
+    ax.set_title("Trace Plots (thinned)", fontsize=12, fontweight="bold")
+    ax.set_xlabel("Draw (thinned)", fontsize=10)
+
+    # 2. Marginal densities per parameter
+    ax = axes[0, 1]
+    for label, chains in summary["traces"].items():
+        values = np.concatenate([np.asarray(c) for c in chains])
+        ax.hist(values, bins=30, density=True, histtype="step", linewidth=1.5, label=label)
+    ax.set_title("Posterior Marginals", fontsize=12, fontweight="bold")
+    if summary["traces"]:
+        ax.legend(loc="best", fontsize=8)
+
+    # 3. R-hat values
+    ax = axes[1, 0]
+    rhat_labels = list(summary["r_hat"].keys())
+    rhat_values = list(summary["r_hat"].values())
+    ax.barh(rhat_labels, rhat_values, alpha=0.7,
+            color=["green" if r < 1.01 else "red" for r in rhat_values])
+    ax.axvline(1.01, color="red", linestyle="--", linewidth=2, label="Threshold (1.01)")
+    ax.set_xlabel("R-hat", fontsize=12)
+    ax.set_title("R-hat Convergence Diagnostic", fontsize=12, fontweight="bold")
+    ax.legend(loc="best")
+    ax.grid(True, alpha=0.3, axis="x")
+
+    # 4. Effective sample size
+    ax = axes[1, 1]
+    ess_labels = list(summary["effective_sample_size"].keys())
+    ess_values = list(summary["effective_sample_size"].values())
+    ax.barh(ess_labels, ess_values, alpha=0.7,
+            color=["green" if e > 1000 else "orange" for e in ess_values])
+    ax.axvline(1000, color="orange", linestyle="--", linewidth=2, label="Target (1000)")
+    ax.set_xlabel("Effective Sample Size", fontsize=12)
+    ax.set_title("Effective Sample Size (ESS)", fontsize=12, fontweight="bold")
+    ax.legend(loc="best")
+    ax.grid(True, alpha=0.3, axis="x")
+
+    plt.tight_layout()
+    return fig
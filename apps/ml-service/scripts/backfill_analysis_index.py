@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Backfill the analysis run index from MLflow.
+
+ITS/ABAB runs are indexed as they are logged; run this once to import runs
+logged before the index existed (safe to re-run, rows are replaced).
+
+Usage:
+    python scripts/backfill_analysis_index.py [--experiment-id 0 ...] [--db data/analysis_runs.db]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.analysis_run_index import AnalysisRunIndex  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Index MLflow ITS/ABAB runs for the history endpoints")
+    parser.add_argument("--experiment-id", action="append", dest="experiment_ids",
+                        help="MLflow experiment ID (repeatable, default: 0)")
+    parser.add_argument("--db", default=None, help="Index path (default: ANALYSIS_INDEX_PATH)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    count = AnalysisRunIndex(args.db).backfill_from_mlflow(args.experiment_ids)
+    print(f"Indexed {count} runs")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
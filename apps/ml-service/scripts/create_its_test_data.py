@@ -8,8 +8,12 @@ Generates behavioral events for a test user with pre/post intervention periods.
 import duckdb
 from datetime import datetime, timedelta
 import random
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from app.services.outcome_rollups import refresh_daily_outcomes
+
 
 def create_its_test_data():
     """Generate synthetic behavioral events for ITS testing."""
@@ -91,6 +95,9 @@ def create_its_test_data():
     """, [(e['userId'], e['eventType'], e['timestamp'], e['sessionPerformanceScore'], e['intervention_active'])
           for e in all_events])
 
+    # Rebuild the user's daily outcome rollup (read by the ITS engine)
+    refresh_daily_outcomes(conn, user_ids=[user_id])
+
     # Verify insertion
     result = conn.execute("""
         SELECT
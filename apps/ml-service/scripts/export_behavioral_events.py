@@ -1,16 +1,24 @@
 #!/usr/bin/env python3
 """
-Export BehavioralEvent table to Parquet for DVC versioning.
+Export BehavioralEvent table to the Parquet event lake for DVC versioning.
 
 Enhanced with:
-- Pandera schema validation (fail-fast data quality)
-- DuckDB sync capability (automatic analytics database update)
+- Streaming export: rows are fetched, validated and appended in chunks
+- Schema validation per chunk: vectorized Arrow checks derived from the
+  Pandera schema (optionally sampling regex checks), or Pandera itself
+- Append-only, Hive-partitioned Parquet lake (date=/user_bucket=): each run
+  exports events since the lake's watermark and adds new files only
+- Compaction of small lake files (--compact)
+- DuckDB sync capability (incremental analytics database update)
+- Incremental daily outcome rollups (research.daily_outcomes) for ITS/ABAB
 - Comprehensive error handling and logging
 - Support for both SQLAlchemy and Prisma Python client
 
 Usage:
     python scripts/export_behavioral_events.py [--days 90] [--user-id USER_ID]
     python scripts/export_behavioral_events.py --sync-duckdb  # Sync to DuckDB after export
+    python scripts/export_behavioral_events.py --compact      # Merge small lake files
+    python scripts/export_behavioral_events.py --sample-rate 0.1  # Regex-check 10% of rows
 
 ADR-006: Research Analytics Infrastructure
 """
@@ -19,17 +27,34 @@ import argparse
 import logging
 import os
 import sys
+from collections import Counter
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 import duckdb
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 from sqlalchemy import create_engine, text
 
 # Import Pandera validation from app.schemas
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from app.schemas import validate_behavioral_events, validate_with_report
+from app.schemas import (
+    ChunkedEventValidator,
+    ChunkValidationError,
+    validate_behavioral_events,
+    validate_with_report,
+)
+from app.services.event_lake import LAKE_SCHEMA, EventLake, get_event_lake, to_lake_table
+from app.services.event_ingestion import insert_new_events
+from app.services.outcome_rollups import (
+    ROLLUP_TABLE,
+    compact_daily_outcomes,
+    refresh_daily_outcomes,
+)
+from app.utils.file_lock import file_lock, lock_path
 
 
 # Configure logging
@@ -51,24 +76,53 @@ REPO_ROOT = Path(__file__).parent.parent.parent.parent
 DATA_DIR = REPO_ROOT / "data" / "raw"
 DUCKDB_PATH = Path(os.getenv("DUCKDB_DB_PATH", "./data/duckdb/analytics.duckdb"))
 
+# Incremental exports re-read this much before the lake watermark to pick up
+# late-arriving events (duplicates are skipped by id)
+LATE_ARRIVAL_WINDOW = timedelta(days=1)
+
+# Seconds to wait for another DuckDB writer (e.g. an ingestion flush)
+DUCKDB_LOCK_TIMEOUT = float(os.getenv("DUCKDB_LOCK_TIMEOUT", "300"))
+
+# Rows fetched, validated and appended at a time
+EXPORT_CHUNK_ROWS = int(os.getenv("EXPORT_CHUNK_ROWS", "50000"))
+
 
 def export_behavioral_events(
     days: int = 90,
     user_id: Optional[str] = None,
     validate: bool = True,
-    strict_validation: bool = True
-) -> tuple[pd.DataFrame, Path]:
+    strict_validation: bool = True,
+    incremental: bool = True,
+    snapshot: bool = False,
+    lake: Optional[EventLake] = None,
+    chunk_size: int = EXPORT_CHUNK_ROWS,
+    validation: str = "arrow",
+    sample_rate: float = 1.0,
+) -> tuple[dict, pa.Table]:
     """
-    Export BehavioralEvent table to Parquet file with validation.
+    Export BehavioralEvent table to the Parquet event lake with validation.
+
+    Rows are streamed from the database in chunks; each chunk is validated
+    and appended to the lake before the next is read, so memory is bounded
+    by chunk_size rather than the export window.
 
     Args:
         days: Number of days to look back (default: 90)
         user_id: Optional user ID to filter by (for single-user export)
-        validate: Whether to run Pandera validation (default: True)
+        validate: Whether to validate chunks (default: True)
         strict_validation: If True, fail on validation errors (default: True)
+        incremental: Only export events since the lake watermark (minus
+            LATE_ARRIVAL_WINDOW); the first export covers `days`
+        snapshot: Also write a single timestamped Parquet file (legacy layout)
+        lake: Event lake to append to (default: global lake)
+        chunk_size: Rows fetched, validated and appended per chunk
+        validation: "arrow" (ChunkedEventValidator, vectorized checks) or
+            "pandera" (BehavioralEventSchema per chunk)
+        sample_rate: Fraction of rows regex-checked in "arrow" validation
 
     Returns:
-        Tuple of (DataFrame, output_path)
+        Tuple of (validation report in validate_with_report() format, rows
+        appended to the lake)
 
     Raises:
         ValueError: If database connection fails
@@ -77,6 +131,9 @@ def export_behavioral_events(
     logger.info(f"📊 Exporting BehavioralEvent data (last {days} days)...")
     logger.info(f"🔗 Database: {DATABASE_URL.split('@')[1]}")  # Hide credentials
 
+    if validation not in ("arrow", "pandera"):
+        raise ValueError(f"Unknown validation mode: {validation}")
+
     # Create database connection
     try:
         engine = create_engine(DATABASE_URL)
@@ -84,9 +141,16 @@ def export_behavioral_events(
         logger.error(f"❌ Database connection failed: {e}")
         raise ValueError(f"Cannot connect to database: {e}")
 
+    lake = lake or get_event_lake()
+
     # Calculate date range
     end_date = datetime.now()
     start_date = end_date - timedelta(days=days)
+    if incremental:
+        watermark = lake.watermark(user_id)
+        if watermark is not None:
+            start_date = max(start_date, watermark - LATE_ARRIVAL_WINDOW)
+            logger.info(f"⏩ Incremental export from lake watermark {watermark}")
 
     # Build query - select from BehavioralEvent table (Prisma naming)
     query = """
@@ -115,7 +179,11 @@ def export_behavioral_events(
     if user_id:
         query += ' AND "userId" = :user_id'
 
-    # Execute query and load into DataFrame
+    # Chunks arrive in time order, so the lake watermark only covers rows
+    # whose predecessors were appended (an interrupted export resumes cleanly)
+    query += " ORDER BY timestamp"
+
+    # Execute query and stream chunks
     params = {"start_date": start_date, "end_date": end_date}
     if user_id:
         params["user_id"] = user_id
@@ -124,119 +192,211 @@ def export_behavioral_events(
     if user_id:
         logger.info(f"👤 User filter: {user_id}")
 
+    # Server-side cursor: the driver fetches chunk_size rows at a time
+    connection = engine.connect().execution_options(stream_results=True)
     try:
-        df = pd.read_sql(text(query), engine, params=params)
+        chunks = pd.read_sql(text(query), connection, params=params, chunksize=chunk_size)
     except Exception as e:
         logger.error(f"❌ Query execution failed: {e}")
         # Try fallback to lowercase table name (in case of migration differences)
         try:
+            connection.rollback()
             query_fallback = query.replace('"BehavioralEvent"', 'behavioral_events')
             logger.info("🔄 Attempting fallback to lowercase table name...")
-            df = pd.read_sql(text(query_fallback), engine, params=params)
+            chunks = pd.read_sql(text(query_fallback), connection, params=params, chunksize=chunk_size)
         except Exception as e2:
             logger.error(f"❌ Fallback query also failed: {e2}")
+            connection.close()
             raise
 
-    row_count = len(df)
+    validator = ChunkedEventValidator(sample_rate=sample_rate, strict=strict_validation)
+    pandera_report = {"total_rows": 0, "valid_rows": 0, "invalid_rows": 0, "errors": []}
+    summary = _ExportSummary()
+    snapshot_writer = _SnapshotWriter() if snapshot else None
+    appended: List[pa.Table] = []
+
+    if validate:
+        logger.info(f"🔍 Validating chunks of {chunk_size:,} rows ({validation})...")
+
+    try:
+        for df in chunks:
+            # ==================== VALIDATION ====================
+            if validate and validation == "pandera":
+                df = _validate_chunk_pandera(df, strict_validation, pandera_report)
+            table = to_lake_table(df)
+            if validate and validation == "arrow":
+                validator.validate(table)
+
+            # ==================== APPEND TO LAKE ====================
+            appended.append(lake.append(table))
+            summary.add(table)
+            if snapshot_writer:
+                snapshot_writer.write(table)
+    except ChunkValidationError as e:
+        logger.error(f"❌ Validation failed: {e}")
+        raise
+    except Exception as e:
+        logger.error(f"❌ Failed to export to event lake: {e}")
+        raise
+    finally:
+        connection.close()
+        if snapshot_writer:
+            snapshot_writer.close()
+
+    row_count = summary.rows
+    appended_table = pa.concat_tables(appended) if appended else to_lake_table(pd.DataFrame())
+    report = pandera_report if validation == "pandera" else validator.report.to_dict()
     logger.info(f"✅ Loaded {row_count:,} rows from database")
+    logger.info(f"✅ Appended {appended_table.num_rows:,} new events to {lake.path} "
+                f"({row_count - appended_table.num_rows:,} already in lake)")
 
     if row_count == 0:
         logger.warning("⚠️  No data found for specified date range")
-        # Still create empty parquet file for pipeline consistency
-        df = pd.DataFrame(columns=[
-            "id", "userId", "eventType", "eventData", "timestamp",
-            "completionQuality", "contentType", "dayOfWeek", "difficultyLevel",
-            "engagementLevel", "sessionPerformanceScore", "timeOfDay",
-            "experimentPhase", "randomizationSeed", "contextMetadataId"
-        ])
-
-    # ==================== VALIDATION ====================
+
     if validate and row_count > 0:
-        logger.info("🔍 Running Pandera validation...")
-        try:
-            if strict_validation:
-                df = validate_behavioral_events(df, strict=True, raise_on_error=True)
-                logger.info("✅ Strict validation passed")
-            else:
-                df, report = validate_with_report(df)
-                logger.info(f"✅ Validation complete: {report['valid_rows']}/{report['total_rows']} valid rows")
-                if report['errors']:
-                    logger.warning(f"⚠️  Found {len(report['errors'])} validation errors")
-                    for error in report['errors'][:5]:  # Show first 5 errors
-                        logger.warning(f"   - {error['column']}: {error['check']}")
-        except Exception as e:
-            logger.error(f"❌ Validation failed: {e}")
-            if strict_validation:
-                raise
-            else:
-                logger.warning("⚠️  Continuing with unvalidated data (strict_validation=False)")
+        logger.info(f"✅ Validation complete: {report['valid_rows']}/{report['total_rows']} valid rows")
+        if report["errors"]:
+            logger.warning(f"⚠️  Found {report['invalid_rows']} invalid rows")
+            for error in report["errors"][:5]:  # Show first 5 errors
+                logger.warning(f"   - {error['column']}: {error['check']}")
 
-    # Generate filename with timestamp
-    timestamp_str = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"behavioral_events_{timestamp_str}.parquet"
-    output_path = DATA_DIR / filename
+    # ==================== SUMMARY STATISTICS ====================
+    if row_count > 0:
+        summary.log()
 
-    # Ensure output directory exists
-    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    logger.info("\n✅ Export complete!")
+    logger.info("\n📝 Next steps:")
+    logger.info(f"   1. Track with DVC: dvc add {lake.path}")
+    logger.info(f"   2. Commit .dvc file: git add {lake.path}.dvc")
+    logger.info(f"   3. Sync to DuckDB: python scripts/export_behavioral_events.py --sync-duckdb")
 
-    # ==================== WRITE TO PARQUET ====================
-    logger.info(f"💾 Writing to {output_path}...")
-    try:
-        df.to_parquet(output_path, engine="pyarrow", compression="snappy", index=False)
-        file_size_mb = output_path.stat().st_size / (1024 * 1024)
-        logger.info(f"✅ Parquet file created: {file_size_mb:.2f} MB")
-    except Exception as e:
-        logger.error(f"❌ Failed to write Parquet file: {e}")
-        raise
+    return report, appended_table
 
-    # Create/update symlink to latest
-    symlink_path = DATA_DIR / "behavioral_events_latest.parquet"
+
+def _validate_chunk_pandera(df: pd.DataFrame, strict: bool, report: dict) -> pd.DataFrame:
+    """Validate one chunk with BehavioralEventSchema, accumulating into report."""
     try:
-        if symlink_path.exists() or symlink_path.is_symlink():
-            symlink_path.unlink()
-        # Create relative symlink
-        symlink_path.symlink_to(filename)
-        logger.info(f"🔗 Symlink updated: behavioral_events_latest.parquet → {filename}")
+        if strict:
+            df = validate_behavioral_events(df, strict=True, raise_on_error=True)
+            chunk_report = {"total_rows": len(df), "valid_rows": len(df), "invalid_rows": 0, "errors": []}
+        else:
+            df, chunk_report = validate_with_report(df)
     except Exception as e:
-        logger.warning(f"⚠️  Failed to create symlink: {e}")
-
-    # ==================== SUMMARY STATISTICS ====================
-    if row_count > 0:
+        logger.error(f"❌ Validation failed: {e}")
+        if strict:
+            raise
+        logger.warning("⚠️  Continuing with unvalidated data (strict_validation=False)")
+        return df
+
+    offset = report["total_rows"]
+    for key in ("total_rows", "valid_rows", "invalid_rows"):
+        report[key] += chunk_report[key]
+    report["errors"].extend(
+        {**error, "index": offset + error["index"]} if error["index"] is not None else error
+        for error in chunk_report["errors"]
+    )
+    return df
+
+
+class _ExportSummary:
+    """Summary statistics accumulated over exported chunks."""
+
+    def __init__(self):
+        self.rows = 0
+        self.users = set()
+        self.event_types = set()
+        self.earliest = None
+        self.latest = None
+        self.phases = Counter()
+
+    def add(self, table: pa.Table) -> None:
+        if table.num_rows == 0:
+            return
+        self.rows += table.num_rows
+        self.users.update(pc.unique(table["userId"]).to_pylist())
+        self.event_types.update(pc.unique(table["eventType"]).to_pylist())
+        bounds = pc.min_max(table["timestamp"]).as_py()
+        self.earliest = min(filter(None, [self.earliest, bounds["min"]]), default=None)
+        self.latest = max(filter(None, [self.latest, bounds["max"]]), default=None)
+        phases = pc.value_counts(pc.drop_null(table["experimentPhase"]))
+        self.phases.update({p["values"]: p["counts"] for p in phases.to_pylist()})
+
+    def log(self) -> None:
         logger.info("\n📈 Summary Statistics:")
-        logger.info(f"   Total rows: {row_count:,}")
-        logger.info(f"   Unique users: {df['userId'].nunique()}")
-        logger.info(f"   Event types: {df['eventType'].nunique()}")
-        logger.info(f"   Date range: {df['timestamp'].min()} to {df['timestamp'].max()}")
+        logger.info(f"   Total rows: {self.rows:,}")
+        logger.info(f"   Unique users: {len(self.users)}")
+        logger.info(f"   Event types: {len(self.event_types)}")
+        logger.info(f"   Date range: {self.earliest} to {self.latest}")
 
         # Experiment phase distribution (if exists)
-        if df["experimentPhase"].notna().any():
+        if self.phases:
             logger.info("\n🔬 Experiment Phase Distribution:")
-            phase_counts = df["experimentPhase"].value_counts()
-            for phase, count in phase_counts.items():
+            for phase, count in self.phases.most_common():
                 logger.info(f"   {phase}: {count:,} events")
 
-    logger.info("\n✅ Export complete!")
-    logger.info("\n📝 Next steps:")
-    logger.info(f"   1. Track with DVC: dvc add {output_path}")
-    logger.info(f"   2. Commit .dvc file: git add {output_path}.dvc data/raw/.gitignore")
-    logger.info(f"   3. Sync to DuckDB: python scripts/export_behavioral_events.py --sync-duckdb")
 
-    return df, output_path
+class _SnapshotWriter:
+    """Single timestamped Parquet file (legacy layout), written chunk by chunk."""
+
+    def __init__(self):
+        # Generate filename with timestamp
+        timestamp_str = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.filename = f"behavioral_events_{timestamp_str}.parquet"
+        self.output_path = DATA_DIR / self.filename
+
+        # Ensure output directory exists
+        DATA_DIR.mkdir(parents=True, exist_ok=True)
+
+        logger.info(f"💾 Writing snapshot to {self.output_path}...")
+        self.writer = pq.ParquetWriter(self.output_path, LAKE_SCHEMA, compression="snappy")
+
+    def write(self, table: pa.Table) -> None:
+        self.writer.write_table(table)
+
+    def close(self) -> Path:
+        """Finish the file and point the latest symlink at it."""
+        self.writer.close()
+        file_size_mb = self.output_path.stat().st_size / (1024 * 1024)
+        logger.info(f"✅ Parquet file created: {file_size_mb:.2f} MB")
+
+        # Create/update symlink to latest
+        symlink_path = DATA_DIR / "behavioral_events_latest.parquet"
+        try:
+            if symlink_path.exists() or symlink_path.is_symlink():
+                symlink_path.unlink()
+            # Create relative symlink
+            symlink_path.symlink_to(self.filename)
+            logger.info(f"🔗 Symlink updated: behavioral_events_latest.parquet → {self.filename}")
+        except Exception as e:
+            logger.warning(f"⚠️  Failed to create symlink: {e}")
 
+        return self.output_path
 
-def sync_to_duckdb(parquet_path: Path) -> None:
+
+def sync_to_duckdb(
+    appended: Optional[pa.Table] = None,
+    lake: Optional[EventLake] = None,
+    rebuild: bool = False,
+    compact: bool = False,
+) -> None:
     """
-    Sync Parquet file to DuckDB analytics database.
+    Sync the event lake to the DuckDB analytics database.
 
     Args:
-        parquet_path: Path to Parquet file to sync
+        appended: Rows the export just appended to the lake; they are
+            inserted into research.behavioral_events and only their days'
+            rollups are refreshed
+        lake: Event lake (default: global lake)
+        rebuild: Recreate research.behavioral_events and the rollups from
+            the whole lake (also done when the table doesn't exist yet)
+        compact: Re-sort the rollups after an incremental refresh (runs
+            with --compact)
 
     Raises:
-        FileNotFoundError: If Parquet file doesn't exist
+        FileNotFoundError: If a rebuild is needed but the lake is empty
         Exception: If DuckDB sync fails
     """
-    if not parquet_path.exists():
-        raise FileNotFoundError(f"Parquet file not found: {parquet_path}")
+    lake = lake or get_event_lake()
 
     logger.info(f"🦆 Syncing to DuckDB: {DUCKDB_PATH}")
 
@@ -244,75 +404,97 @@ def sync_to_duckdb(parquet_path: Path) -> None:
     DUCKDB_PATH.parent.mkdir(parents=True, exist_ok=True)
 
     try:
-        # Connect to DuckDB
-        con = duckdb.connect(str(DUCKDB_PATH))
-
-        # Create research schema (avoiding "analytics" due to DuckDB built-in conflicts)
-        con.execute("CREATE SCHEMA IF NOT EXISTS research")
-        logger.info("✅ Research schema ready")
-
-        # Create or replace table from Parquet (ordered by timestamp for performance)
-        # Note: We don't order empty tables to avoid errors
-        parquet_df = con.execute("SELECT COUNT(*) FROM read_parquet(?)", [str(parquet_path)]).fetchone()[0]
-
-        if parquet_df > 0:
-            con.execute("""
-                CREATE OR REPLACE TABLE research.behavioral_events AS
-                SELECT * FROM read_parquet(?)
-                ORDER BY timestamp
-            """, [str(parquet_path)])
-        else:
-            # For empty tables, don't use ORDER BY
-            con.execute("""
-                CREATE OR REPLACE TABLE research.behavioral_events AS
-                SELECT * FROM read_parquet(?)
-            """, [str(parquet_path)])
-
-        # Get row count
-        row_count = con.execute("SELECT COUNT(*) FROM research.behavioral_events").fetchone()[0]
-        logger.info(f"✅ Synced {row_count:,} rows to DuckDB")
-
-        # Create indexes for common query patterns (only if we have data)
-        if row_count > 0:
-            logger.info("📊 Creating performance indexes...")
-            try:
-                con.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_events_user_time
-                    ON research.behavioral_events(userId, timestamp)
-                """)
-                con.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_events_type
-                    ON research.behavioral_events(eventType)
-                """)
-                con.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_events_phase
-                    ON research.behavioral_events(experimentPhase)
-                """)
-                logger.info("✅ Indexes created")
-            except Exception as e:
-                logger.warning(f"⚠️  Index creation failed (non-fatal): {e}")
-
-        # Quick validation query
-        if row_count > 0:
-            summary = con.execute("""
-                SELECT
-                    COUNT(*) as total_events,
-                    COUNT(DISTINCT userId) as unique_users,
-                    COUNT(DISTINCT eventType) as event_types,
-                    MIN(timestamp) as earliest,
-                    MAX(timestamp) as latest
-                FROM research.behavioral_events
-            """).fetchdf()
-
-            logger.info("\n📊 DuckDB Summary:")
-            logger.info(f"   Total events: {summary['total_events'].iloc[0]:,}")
-            logger.info(f"   Unique users: {summary['unique_users'].iloc[0]}")
-            logger.info(f"   Event types: {summary['event_types'].iloc[0]}")
-            logger.info(f"   Date range: {summary['earliest'].iloc[0]} to {summary['latest'].iloc[0]}")
-        else:
-            logger.info("\n📊 DuckDB Summary: Empty table (0 rows)")
+        # API workers flushing ingested events write the same file; take
+        # turns as DuckDB's single read-write process
+        with file_lock(lock_path(str(DUCKDB_PATH)), timeout=DUCKDB_LOCK_TIMEOUT):
+            # Connect to DuckDB
+            con = duckdb.connect(str(DUCKDB_PATH))
+
+            # Create research schema (avoiding "analytics" due to DuckDB built-in conflicts)
+            con.execute("CREATE SCHEMA IF NOT EXISTS research")
+            logger.info("✅ Research schema ready")
+
+            table_exists = con.execute("""
+                SELECT COUNT(*) FROM information_schema.tables
+                WHERE table_schema = 'research' AND table_name = 'behavioral_events'
+            """).fetchone()[0] > 0
+
+            if rebuild or appended is None or not table_exists:
+                if not lake.has_data():
+                    raise FileNotFoundError(f"Event lake is empty: {lake.path}")
+
+                # Ordered by (userId, timestamp) so per-user reads hit few row groups
+                relation, params = lake.scan_sql()
+                con.execute(f"""
+                    CREATE OR REPLACE TABLE research.behavioral_events AS
+                    SELECT * EXCLUDE (date, user_bucket) FROM {relation}
+                    ORDER BY userId, timestamp
+                """, params)
+                changed = None
+                logger.info(f"✅ Rebuilt research.behavioral_events from {lake.path}")
+            else:
+                # Skips ids the ingestion endpoint already inserted
+                inserted = insert_new_events(con, appended)
+                changed = "new_events"
+                logger.info(f"✅ Inserted {inserted:,} new events")
+
+            # Get row count
+            row_count = con.execute("SELECT COUNT(*) FROM research.behavioral_events").fetchone()[0]
+            logger.info(f"✅ Synced {row_count:,} rows to DuckDB")
+
+            # Create indexes for common query patterns (only if we have data)
+            if row_count > 0:
+                logger.info("📊 Creating performance indexes...")
+                try:
+                    con.execute("""
+                        CREATE INDEX IF NOT EXISTS idx_events_user_time
+                        ON research.behavioral_events(userId, timestamp)
+                    """)
+                    con.execute("""
+                        CREATE INDEX IF NOT EXISTS idx_events_type
+                        ON research.behavioral_events(eventType)
+                    """)
+                    con.execute("""
+                        CREATE INDEX IF NOT EXISTS idx_events_phase
+                        ON research.behavioral_events(experimentPhase)
+                    """)
+                    logger.info("✅ Indexes created")
+                except Exception as e:
+                    logger.warning(f"⚠️  Index creation failed (non-fatal): {e}")
+
+                # Daily outcome rollups read by ITS/ABAB: recompute only the
+                # (user, day) pairs in this export (everything after a rebuild)
+                logger.info("📊 Refreshing daily outcome rollups...")
+                rollup_rows = refresh_daily_outcomes(con, changed=changed)
+                logger.info(f"✅ {rollup_rows:,} rows refreshed in {ROLLUP_TABLE}")
+
+                # Incremental refreshes append out of order; a rebuild is
+                # already sorted
+                if compact and changed is not None:
+                    compact_daily_outcomes(con)
+                    logger.info(f"✅ Re-sorted {ROLLUP_TABLE}")
+
+            # Quick validation query
+            if row_count > 0:
+                summary = con.execute("""
+                    SELECT
+                        COUNT(*) as total_events,
+                        COUNT(DISTINCT userId) as unique_users,
+                        COUNT(DISTINCT eventType) as event_types,
+                        MIN(timestamp) as earliest,
+                        MAX(timestamp) as latest
+                    FROM research.behavioral_events
+                """).fetchdf()
+
+                logger.info("\n📊 DuckDB Summary:")
+                logger.info(f"   Total events: {summary['total_events'].iloc[0]:,}")
+                logger.info(f"   Unique users: {summary['unique_users'].iloc[0]}")
+                logger.info(f"   Event types: {summary['event_types'].iloc[0]}")
+                logger.info(f"   Date range: {summary['earliest'].iloc[0]} to {summary['latest'].iloc[0]}")
+            else:
+                logger.info("\n📊 DuckDB Summary: Empty table (0 rows)")
 
-        con.close()
+            con.close()
         logger.info(f"\n✅ DuckDB sync complete: {DUCKDB_PATH}")
 
     except Exception as e:
@@ -338,6 +520,12 @@ Examples:
 
   # Skip validation (for debugging)
   python scripts/export_behavioral_events.py --no-validate
+
+  # Merge small lake files after the export
+  python scripts/export_behavioral_events.py --compact
+
+  # Regex-check a 10% sample of rows (other checks still cover every row)
+  python scripts/export_behavioral_events.py --sample-rate 0.1
         """
     )
     parser.add_argument(
@@ -354,13 +542,52 @@ Examples:
     parser.add_argument(
         "--sync-duckdb",
         action="store_true",
-        help="Sync Parquet to DuckDB after export"
+        help="Sync new lake rows to DuckDB after export"
+    )
+    parser.add_argument(
+        "--rebuild-duckdb",
+        action="store_true",
+        help="Recreate the DuckDB table and rollups from the whole lake"
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Export the whole --days window instead of since the lake watermark"
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Merge small lake files into one file per partition after export "
+             "(and re-sort the DuckDB rollups when syncing)"
+    )
+    parser.add_argument(
+        "--snapshot",
+        action="store_true",
+        help="Also write a single timestamped Parquet file to data/raw"
     )
     parser.add_argument(
         "--no-validate",
         action="store_true",
         help="Skip Pandera validation (for debugging)"
     )
+    parser.add_argument(
+        "--validation",
+        choices=["arrow", "pandera"],
+        default="arrow",
+        help="Chunk validator: vectorized Arrow checks (default) or Pandera"
+    )
+    parser.add_argument(
+        "--sample-rate",
+        type=float,
+        default=1.0,
+        help="Fraction of rows checked by regex (CUID) checks (default: 1.0)"
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=EXPORT_CHUNK_ROWS,
+        help=f"Rows fetched, validated and appended per chunk (default: {EXPORT_CHUNK_ROWS})"
+    )
     parser.add_argument(
         "--non-strict",
         action="store_true",
@@ -371,16 +598,24 @@ Examples:
 
     try:
         # Run export
-        df, output_path = export_behavioral_events(
+        report, appended = export_behavioral_events(
             days=args.days,
             user_id=args.user_id,
             validate=not args.no_validate,
-            strict_validation=not args.non_strict
+            strict_validation=not args.non_strict,
+            incremental=not args.full,
+            snapshot=args.snapshot,
+            chunk_size=args.chunk_size,
+            validation=args.validation,
+            sample_rate=args.sample_rate,
         )
 
+        if args.compact:
+            get_event_lake().compact()
+
         # Optionally sync to DuckDB
-        if args.sync_duckdb:
-            sync_to_duckdb(output_path)
+        if args.sync_duckdb or args.rebuild_duckdb:
+            sync_to_duckdb(appended, rebuild=args.rebuild_duckdb, compact=args.compact)
 
     except KeyboardInterrupt:
         logger.warning("\n⚠️  Export interrupted by user")
@@ -54,6 +54,9 @@ except Exception as e:  # pragma: no cover
     )
     sys.exit(1)
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from app.services.outcome_rollups import refresh_daily_outcomes  # noqa: E402
+
 
 DB_RELATIVE = Path(__file__).resolve().parents[1] / "data" / "behavioral_events.duckdb"
 TABLE_NAME = "behavioral_events"
@@ -324,6 +327,9 @@ def main() -> None:
         rows = generate_rows()
         insert_rows(conn, rows)
 
+        # Rebuild the user's daily outcome rollup (read by the ABAB engine)
+        refresh_daily_outcomes(conn, source=TABLE_NAME, user_ids=[TEST_USER_ID])
+
         total = conn.execute(
             f"SELECT COUNT(*) FROM {TABLE_NAME} WHERE userId = $1",
             [TEST_USER_ID],
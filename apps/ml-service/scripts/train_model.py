@@ -8,7 +8,9 @@ and generates comprehensive evaluation report.
 
 Usage:
     python scripts/train_model.py --tune  # With hyperparameter tuning
+    python scripts/train_model.py --tune --search grid  # Exhaustive grid search
     python scripts/train_model.py         # Default hyperparameters
+    python scripts/train_model.py --tune --warm-start  # Nightly: update the latest model
 
 Requirements:
     - Prisma database with struggle_predictions table
@@ -36,6 +38,9 @@ from app.utils.logging import setup_logging
 setup_logging()
 logger = logging.getLogger(__name__)
 
+# Lineage of the training data (scopes the best-configuration cache)
+TRAINING_LINEAGE = "struggle_predictions"
+
 
 async def extract_training_data() -> tuple[pd.DataFrame, pd.DataFrame]:
     """
@@ -81,6 +86,7 @@ async def extract_training_data() -> tuple[pd.DataFrame, pd.DataFrame]:
             'predictedStruggleProbability': pred.predictedStruggleProbability,
             'predictionConfidence': pred.predictionConfidence,
             'predictionDate': pred.predictionDate,
+            'actualOutcomeRecordedAt': pred.actualOutcomeRecordedAt,
         })
 
         # Extract feature vector (JSON to dict)
@@ -130,6 +136,29 @@ async def main():
         action='store_true',
         help='Enable hyperparameter tuning (slower but better results)'
     )
+    parser.add_argument(
+        '--search',
+        choices=['halving_random', 'halving_grid', 'grid'],
+        default='halving_random',
+        help='Hyperparameter search strategy (default: halving_random)'
+    )
+    parser.add_argument(
+        '--no-param-cache',
+        action='store_true',
+        help='Ignore cached best hyperparameters and search again'
+    )
+    parser.add_argument(
+        '--warm-start',
+        action='store_true',
+        help='Update the latest saved model on outcomes labeled since it was trained '
+             '(full retrain once they exceed --retune-growth)'
+    )
+    parser.add_argument(
+        '--retune-growth',
+        type=float,
+        default=0.2,
+        help='Dataset growth that triggers a new search / full retrain (default: 0.2)'
+    )
     parser.add_argument(
         '--cv-folds',
         type=int,
@@ -148,7 +177,7 @@ async def main():
     logger.info("=" * 80)
     logger.info("STRUGGLE PREDICTION MODEL TRAINING PIPELINE")
     logger.info("=" * 80)
-    logger.info(f"Hyperparameter tuning: {args.tune}")
+    logger.info(f"Hyperparameter tuning: {args.tune} ({args.search})")
     logger.info(f"Cross-validation folds: {args.cv_folds}")
     logger.info(f"Model name: {args.model_name}")
     logger.info("=" * 80)
@@ -168,11 +197,28 @@ async def main():
 
     # Step 3: Train model
     logger.info("\n[Step 3/4] Training model...")
-    performance = model.train(
-        X, y,
+    train_kwargs = dict(
         hyperparameter_tuning=args.tune,
-        cv_folds=args.cv_folds
+        cv_folds=args.cv_folds,
+        search=args.search,
+        use_param_cache=not args.no_param_cache,
+        retune_growth=args.retune_growth,
+        lineage=TRAINING_LINEAGE,
     )
+    previous = latest_model_path(model.model_dir, args.model_name) if args.warm_start else None
+
+    if previous is None:
+        performance = model.train(X, y, **train_kwargs)
+    else:
+        model.load_model(previous)
+        is_new = new_outcomes_mask(predictions_df, model.metadata)
+        logger.info(f"Warm start from {previous.name}: {int(is_new.sum())} new outcomes")
+        performance = model.retrain(X, y, is_new, **train_kwargs)
+
+        if performance is None:
+            model_path = model.save_model(args.model_name)
+            logger.info(f"Warm-start update saved: {model_path}")
+            return
 
     # Step 4: Save model and generate report
     logger.info("\n[Step 4/4] Saving model and generating report...")
@@ -201,6 +247,23 @@ async def main():
     logger.info("=" * 80)
 
 
+def latest_model_path(model_dir: Path, model_name: str) -> Path | None:
+    """Most recently saved model file for model_name (timestamps sort lexically)."""
+    paths = sorted(model_dir.glob(f"{model_name}_*.joblib"))
+    return paths[-1] if paths else None
+
+
+def new_outcomes_mask(predictions_df: pd.DataFrame, metadata) -> np.ndarray:
+    """Rows whose outcome was recorded after the loaded model was trained."""
+    if metadata is None:
+        return np.ones(len(predictions_df), dtype=bool)
+
+    # training_date is naive local time (datetime.now()); outcome timestamps are UTC
+    trained_at = pd.Timestamp(metadata.training_date.astimezone())
+    recorded_at = pd.to_datetime(predictions_df['actualOutcomeRecordedAt'], utc=True)
+    return (recorded_at > trained_at).to_numpy()
+
+
 def generate_training_report(
     model: StrugglePredictionModel,
     performance,
@@ -3,21 +3,25 @@ FastAPI Routes for Orchestration ML Service
 Story 5.3: Optimal Study Timing & Session Orchestration
 
 Exposes Python ML models as REST API endpoints for TypeScript frontend consumption.
+Session and event histories accept row-oriented JSON or a columnar encoding
+(column arrays, base64 Arrow IPC or Parquet), and the session table can be
+the raw Arrow/Parquet request body; see table_payloads. When they
+are omitted, the service loads them from the event lake (or the DuckDB
+analytics store); see session_history.
 """
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, Field
 from typing import List, Dict, Any, Optional
 from datetime import datetime
-import pandas as pd
 import logging
 
 from ..orchestration import (
-    StudyTimeRecommender,
-    SessionDurationOptimizer,
-    CognitiveLoadAnalyzer,
     ContentSequencer,
+    get_model_registry,
+    get_session_history_store,
 )
+from .table_payloads import TablePayload, table_request, table_request_openapi, to_dataframe
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +32,8 @@ router = APIRouter(prefix="/api/v1/orchestration", tags=["orchestration"])
 class TimeSlotRequest(BaseModel):
     user_id: str
     target_date: datetime
-    historical_sessions: List[Dict[str, Any]]
+    historical_sessions: Optional[TablePayload] = None
+    history_days: int = Field(default=90, ge=1, le=365)
     calendar_events: List[Dict[str, Any]]
     user_profile: Dict[str, Any]
     mission_id: Optional[str] = None
@@ -41,10 +46,12 @@ class TimeSlotResponse(BaseModel):
 
 class CognitiveLoadRequest(BaseModel):
     user_id: str
-    recent_sessions: List[Dict[str, Any]]
-    validation_scores: List[float]
-    behavioral_events: List[Dict[str, Any]]
-    baseline_metrics: Dict[str, float]
+    recent_sessions: Optional[TablePayload] = None
+    validation_scores: List[float] = Field(default_factory=list)
+    behavioral_events: Optional[TablePayload] = None
+    baseline_metrics: Dict[str, float] = Field(default_factory=dict)
+    recent_days: int = Field(default=7, ge=1, le=365)
+    trend_days: int = Field(default=7, ge=1, le=90)
 
 
 class CognitiveLoadResponse(BaseModel):
@@ -61,8 +68,9 @@ class DurationRequest(BaseModel):
     mission_complexity: str
     time_of_day_hour: int
     user_profile: Dict[str, Any]
-    recent_sessions: List[Dict[str, Any]]
+    recent_sessions: Optional[TablePayload] = None
     cognitive_load: float
+    recent_days: int = Field(default=7, ge=1, le=365)
 
 
 class DurationResponse(BaseModel):
@@ -92,21 +100,36 @@ class ContentSequenceResponse(BaseModel):
 
 
 # Endpoints
-@router.post("/recommendations", response_model=TimeSlotResponse)
-async def generate_time_recommendations(request: TimeSlotRequest):
+@router.post(
+    "/recommendations",
+    response_model=TimeSlotResponse,
+    openapi_extra=table_request_openapi(TimeSlotRequest),
+)
+async def generate_time_recommendations(
+    request: TimeSlotRequest = Depends(table_request(TimeSlotRequest, "historical_sessions")),
+):
     """
     Generate ML-powered study time recommendations
 
     Uses ensemble Random Forest + Gradient Boosting models to predict
     optimal study times based on historical performance patterns.
+    Models come from the registry (retrained in the background), so the
+    request only runs inference.
     """
 
     try:
-        # Initialize recommender
-        recommender = StudyTimeRecommender()
-
-        # Convert to DataFrame
-        sessions_df = pd.DataFrame(request.historical_sessions)
+        # Uploaded history, or the user's completed sessions from the analytics store
+        if request.historical_sessions is not None:
+            sessions_df = to_dataframe(request.historical_sessions)
+        else:
+            sessions_df = await get_session_history_store().get_sessions(
+                request.user_id, days=request.history_days, completed_only=True
+            )
+
+        # Get user's trained recommender (heuristics until one exists)
+        recommender = await get_model_registry().get_study_time_recommender(
+            request.user_id, sessions_df
+        )
 
         # Generate recommendations
         recommendations = await recommender.generate_recommendations(
@@ -134,8 +157,14 @@ async def generate_time_recommendations(request: TimeSlotRequest):
         )
 
 
-@router.post("/cognitive-load", response_model=CognitiveLoadResponse)
-async def assess_cognitive_load(request: CognitiveLoadRequest):
+@router.post(
+    "/cognitive-load",
+    response_model=CognitiveLoadResponse,
+    openapi_extra=table_request_openapi(CognitiveLoadRequest),
+)
+async def assess_cognitive_load(
+    request: CognitiveLoadRequest = Depends(table_request(CognitiveLoadRequest, "recent_sessions")),
+):
     """
     Assess cognitive load using ML models
 
@@ -144,12 +173,27 @@ async def assess_cognitive_load(request: CognitiveLoadRequest):
     """
 
     try:
-        # Initialize analyzer
-        analyzer = CognitiveLoadAnalyzer()
-
-        # Convert to DataFrames
-        sessions_df = pd.DataFrame(request.recent_sessions)
-        events_df = pd.DataFrame(request.behavioral_events)
+        # Shared analyzer (trained version if one is registered)
+        analyzer = get_model_registry().get_or_default("cognitive_load")
+
+        # Uploaded history, or the user's recent history from the analytics store
+        history = get_session_history_store()
+        if request.recent_sessions is not None:
+            sessions_df = to_dataframe(request.recent_sessions)
+        else:
+            sessions_df = await history.get_sessions(request.user_id, days=request.recent_days)
+        if request.behavioral_events is not None:
+            events_df = to_dataframe(request.behavioral_events)
+        else:
+            events_df = await history.get_events(request.user_id, days=request.recent_days)
+
+        # A trend window longer than recent_days needs the older history too
+        trend_sessions_df = trend_events_df = None
+        if request.trend_days > request.recent_days:
+            if request.recent_sessions is None:
+                trend_sessions_df = await history.get_sessions(request.user_id, days=request.trend_days)
+            if request.behavioral_events is None:
+                trend_events_df = await history.get_events(request.user_id, days=request.trend_days)
 
         # Assess load
         assessment = await analyzer.assess_cognitive_load(
@@ -158,6 +202,9 @@ async def assess_cognitive_load(request: CognitiveLoadRequest):
             validation_scores=request.validation_scores,
             behavioral_events=events_df,
             baseline_metrics=request.baseline_metrics,
+            trend_days=request.trend_days,
+            trend_sessions=trend_sessions_df,
+            trend_events=trend_events_df,
         )
 
         return CognitiveLoadResponse(
@@ -177,8 +224,14 @@ async def assess_cognitive_load(request: CognitiveLoadRequest):
         )
 
 
-@router.post("/session-duration", response_model=DurationResponse)
-async def recommend_session_duration(request: DurationRequest):
+@router.post(
+    "/session-duration",
+    response_model=DurationResponse,
+    openapi_extra=table_request_openapi(DurationRequest),
+)
+async def recommend_session_duration(
+    request: DurationRequest = Depends(table_request(DurationRequest, "recent_sessions")),
+):
     """
     Recommend optimal session duration with break schedule
 
@@ -187,11 +240,16 @@ async def recommend_session_duration(request: DurationRequest):
     """
 
     try:
-        # Initialize optimizer
-        optimizer = SessionDurationOptimizer()
-
-        # Convert to DataFrame
-        sessions_df = pd.DataFrame(request.recent_sessions)
+        # Shared optimizer (trained version if one is registered)
+        optimizer = get_model_registry().get_or_default("session_duration")
+
+        # Uploaded history, or the user's recent sessions from the analytics store
+        if request.recent_sessions is not None:
+            sessions_df = to_dataframe(request.recent_sessions)
+        else:
+            sessions_df = await get_session_history_store().get_sessions(
+                request.user_id, days=request.recent_days
+            )
 
         # Recommend duration
         recommendation = await optimizer.recommend_duration(
@@ -0,0 +1,223 @@
+"""
+Columnar Table Payloads for Orchestration Requests
+Story 5.3: Optimal Study Timing & Session Orchestration
+
+Session and event histories can be sent to the orchestration endpoints
+either as the original row-oriented JSON (list of objects) or in a
+columnar encoding that decodes straight into a DataFrame without building
+a dict per row. Column names are the ones the models read (started_at,
+completed_at, duration_ms, performance_score for sessions; event_type,
+timestamp, event_data or time_spent_ms for events):
+
+- {"format": "columns", "columns": {"started_at": [...], "duration_ms": [...]}}
+- {"format": "arrow", "data": "<base64 Arrow IPC stream or file>"}
+- {"format": "parquet", "data": "<base64 Parquet file>"}
+
+An endpoint's session table can also be the raw request body, without
+base64, with Content-Type application/vnd.apache.arrow.stream (or
+.arrow.file) or application/vnd.apache.parquet. The other request fields
+then go in the query string, JSON-encoded where they are not plain
+strings (see table_request):
+
+    POST /api/v1/orchestration/cognitive-load?user_id=u1&trend_days=30
+    Content-Type: application/vnd.apache.arrow.stream
+
+    <Arrow IPC stream of recent_sessions>
+"""
+
+from typing import Any, Awaitable, Callable, Dict, List, Literal, Optional, Type, TypeVar, Union
+import base64
+import binascii
+import io
+import json
+import logging
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from fastapi import HTTPException, Request, status
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, PrivateAttr, ValidationError, model_validator
+
+logger = logging.getLogger(__name__)
+
+PARQUET_MAGIC = b"PAR1"
+ARROW_FILE_MAGIC = b"ARROW1"
+
+# Raw request body content types and the table format they carry
+TABLE_CONTENT_TYPES = {
+    "application/vnd.apache.arrow.stream": "arrow",
+    "application/vnd.apache.arrow.file": "arrow",
+    "application/vnd.apache.parquet": "parquet",
+}
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+class ColumnarTable(BaseModel):
+    """
+    Column-oriented table payload
+
+    The table is decoded once during request validation, so malformed
+    payloads are rejected with a 422 like any other invalid field.
+    """
+
+    format: Literal["columns", "arrow", "parquet"]
+    columns: Optional[Dict[str, List[Any]]] = None
+    data: Optional[str] = None
+
+    _frame: pd.DataFrame = PrivateAttr(default=None)
+
+    @model_validator(mode="after")
+    def _decode(self) -> "ColumnarTable":
+        if self.format == "columns":
+            if self.columns is None:
+                raise ValueError("'columns' is required for format 'columns'")
+            lengths = {len(values) for values in self.columns.values()}
+            if len(lengths) > 1:
+                raise ValueError("All columns must have the same length")
+            self._frame = pd.DataFrame(self.columns)
+        else:
+            if self.data is None:
+                raise ValueError(f"'data' is required for format '{self.format}'")
+            try:
+                raw = base64.b64decode(self.data, validate=True)
+            except (binascii.Error, ValueError):
+                raise ValueError("'data' must be base64-encoded")
+            self._frame = decode_table_bytes(raw, self.format)
+
+            # Drop the encoded copy; only the DataFrame is needed from here on
+            self.data = None
+
+        return self
+
+    @classmethod
+    def from_bytes(cls, raw: bytes, table_format: str) -> "ColumnarTable":
+        """Wrap an undecoded Arrow IPC / Parquet buffer (e.g. a raw request body)"""
+        table = cls.model_construct(format=table_format)
+        table._frame = decode_table_bytes(raw, table_format)
+        return table
+
+    def to_dataframe(self) -> pd.DataFrame:
+        return self._frame
+
+
+# Row-oriented JSON or a columnar table
+TablePayload = Union[ColumnarTable, List[Dict[str, Any]]]
+
+
+def decode_table_bytes(raw: bytes, table_format: str) -> pd.DataFrame:
+    """
+    Decode an Arrow IPC (stream or file) or Parquet buffer into a DataFrame
+
+    Raises:
+        ValueError: If the buffer is not a valid table in the given format
+    """
+    try:
+        if table_format == "parquet":
+            if not raw.startswith(PARQUET_MAGIC):
+                raise ValueError("missing Parquet header")
+            table = pq.read_table(io.BytesIO(raw))
+        elif table_format == "arrow":
+            reader = pa.ipc.open_file if raw.startswith(ARROW_FILE_MAGIC) else pa.ipc.open_stream
+            table = reader(pa.BufferReader(raw)).read_all()
+        else:
+            raise ValueError(f"Unsupported table format: {table_format}")
+    except (pa.ArrowException, OSError) as e:
+        raise ValueError(f"Invalid {table_format} payload: {e}")
+
+    return table.to_pandas()
+
+
+def to_dataframe(payload: TablePayload) -> pd.DataFrame:
+    """Convert a row-oriented or columnar payload to a DataFrame"""
+    if isinstance(payload, ColumnarTable):
+        return payload.to_dataframe()
+    return pd.DataFrame(payload)
+
+
+def table_request(model: Type[ModelT], table_field: str) -> Callable[[Request], Awaitable[ModelT]]:
+    """
+    FastAPI dependency parsing `model` from JSON or from a raw table body
+
+    With a JSON body this is the usual request model. With an Arrow or
+    Parquet body (TABLE_CONTENT_TYPES), the body becomes `table_field` and
+    the remaining fields are read from the query string; values of
+    non-string fields are parsed as JSON (e.g. validation_scores=[80,90]).
+
+    Raises:
+        RequestValidationError: Invalid fields or table (422)
+        HTTPException: Unsupported content type (415)
+    """
+    string_fields = {
+        name for name, field in model.model_fields.items()
+        if field.annotation in (str, Optional[str])
+    }
+
+    async def parse(request: Request) -> ModelT:
+        content_type = request.headers.get("content-type", "application/json")
+        media_type = content_type.split(";")[0].strip().lower()
+        body = await request.body()
+
+        try:
+            if media_type in TABLE_CONTENT_TYPES:
+                fields: Dict[str, Any] = {
+                    name: value if name in string_fields else _json_or_text(value)
+                    for name, value in request.query_params.items()
+                }
+                fields.pop(table_field, None)
+                try:
+                    table = ColumnarTable.from_bytes(body, TABLE_CONTENT_TYPES[media_type])
+                except ValueError as e:
+                    raise RequestValidationError(
+                        [{"type": "value_error", "loc": ("body",), "msg": str(e), "input": None}]
+                    )
+                parsed = model.model_validate(fields)
+                setattr(parsed, table_field, table)  # already decoded, skip re-validation
+                return parsed
+            if media_type == "application/json" or media_type.endswith("+json"):
+                return model.model_validate_json(body)
+        except ValidationError as e:
+            raise RequestValidationError(
+                [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)]
+            )
+
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Unsupported content type: {media_type}",
+        )
+
+    return parse
+
+
+def table_request_openapi(model: Type[BaseModel]) -> Dict[str, Any]:
+    """openapi_extra documenting the body a table_request dependency accepts"""
+    schema = model.model_json_schema()
+    definitions = schema.pop("$defs", {})
+
+    def inline(node: Any) -> Any:
+        if isinstance(node, dict):
+            if "$ref" in node:
+                return inline(definitions[node["$ref"].rsplit("/", 1)[-1]])
+            return {key: inline(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [inline(value) for value in node]
+        return node
+
+    binary = {"schema": {"type": "string", "format": "binary"}}
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": inline(schema)},
+                **{content_type: binary for content_type in TABLE_CONTENT_TYPES},
+            },
+        }
+    }
+
+
+def _json_or_text(value: str) -> Any:
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value  # e.g. an ISO datetime
@@ -10,10 +10,16 @@ from .study_time_recommender import StudyTimeRecommender
 from .session_duration_optimizer import SessionDurationOptimizer
 from .cognitive_load_analyzer import CognitiveLoadAnalyzer
 from .content_sequencer import ContentSequencer
+from .model_registry import ModelRegistry, get_model_registry
+from .session_history import SessionHistoryStore, get_session_history_store
 
 __all__ = [
     "StudyTimeRecommender",
     "SessionDurationOptimizer",
     "CognitiveLoadAnalyzer",
     "ContentSequencer",
+    "ModelRegistry",
+    "get_model_registry",
+    "SessionHistoryStore",
+    "get_session_history_store",
 ]
@@ -9,7 +9,7 @@ Research-grade implementation following cognitive load theory (Sweller, 1988).
 """
 
 from typing import Dict, List, Optional, Tuple
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from dataclasses import dataclass
 import numpy as np
 import pandas as pd
@@ -21,6 +21,34 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+def _response_times(events: pd.DataFrame, default_ms: float = 5000.0) -> np.ndarray:
+    """
+    Per-event response times in ms
+
+    Reads a numeric `time_spent_ms` column when present (server-side
+    history), otherwise `timeSpentMs` from the `event_data` dicts.
+    """
+    if "time_spent_ms" in events.columns:
+        return events["time_spent_ms"].fillna(default_ms).to_numpy(dtype=float)
+    return events["event_data"].map(
+        lambda x: x.get("timeSpentMs", default_ms) if isinstance(x, dict) else default_ms
+    ).to_numpy(dtype=float)
+
+
+def _calendar_days(values: pd.Series) -> np.ndarray:
+    """
+    Naive midnight of each timestamp's calendar date
+
+    Time-zone-aware input (ISO "Z" strings, Arrow/DuckDB timestamptz) keeps
+    its wall-clock date, as .dt.date would, so days line up with the naive
+    pd.date_range windows they are reindexed against.
+    """
+    timestamps = pd.to_datetime(values)
+    if timestamps.dt.tz is not None:
+        timestamps = timestamps.dt.tz_localize(None)
+    return timestamps.dt.normalize().to_numpy()
+
+
 @dataclass
 class CognitiveLoadAssessment:
     """Cognitive load assessment result with confidence"""
@@ -114,6 +142,9 @@ class CognitiveLoadAnalyzer:
         validation_scores: List[float],
         behavioral_events: pd.DataFrame,
         baseline_metrics: Dict[str, float],
+        trend_days: int = 7,
+        trend_sessions: Optional[pd.DataFrame] = None,
+        trend_events: Optional[pd.DataFrame] = None,
     ) -> CognitiveLoadAssessment:
         """
         Assess current cognitive load for a user
@@ -124,6 +155,11 @@ class CognitiveLoadAnalyzer:
             validation_scores: Recent validation prompt scores (0-100)
             behavioral_events: Behavioral events (pauses, abandonments, etc.)
             baseline_metrics: User's baseline metrics for comparison
+            trend_days: Daily trend window (7, 30 or 90 days)
+            trend_sessions: Sessions covering the trend window when it is
+                longer than recent_sessions (default: recent_sessions)
+            trend_events: Behavioral events covering the trend window
+                (default: behavioral_events)
 
         Returns:
             CognitiveLoadAssessment with load score, level, and recommendations
@@ -152,8 +188,14 @@ class CognitiveLoadAnalyzer:
         # 6. Generate recommendation
         recommendation = self._generate_recommendation(load_score, load_level, contributing_factors)
 
-        # 7. Calculate 7-day trend (optional)
-        trend = self._calculate_load_trend(recent_sessions, validation_scores, behavioral_events, baseline_metrics)
+        # 7. Calculate daily trend (optional)
+        trend = self._calculate_load_trend(
+            recent_sessions if trend_sessions is None else trend_sessions,
+            validation_scores,
+            behavioral_events if trend_events is None else trend_events,
+            baseline_metrics,
+            trend_days,
+        )
 
         return CognitiveLoadAssessment(
             load_score=round(load_score, 1),
@@ -241,9 +283,7 @@ class CognitiveLoadAnalyzer:
         if not behavioral_events.empty:
             review_events = behavioral_events[behavioral_events["event_type"] == "CARD_REVIEWED"]
             if len(review_events) > 0:
-                recent_response_time = review_events["event_data"].apply(
-                    lambda x: x.get("timeSpentMs", 5000) if isinstance(x, dict) else 5000
-                ).mean()
+                recent_response_time = _response_times(review_events).mean()
                 baseline_response_time = baseline_metrics.get("baseline_response_time_ms", 5000)
                 response_time_ratio = recent_response_time / baseline_response_time if baseline_response_time > 0 else 1.0
             else:
@@ -295,6 +335,11 @@ class CognitiveLoadAnalyzer:
         return float(np.clip(load_score, 0, 100))
 
     def _calculate_heuristic_load(self, features: np.ndarray) -> float:
+        """Calculate heuristic cognitive load for one feature vector"""
+
+        return float(self._calculate_heuristic_load_batch(features.reshape(1, -1))[0])
+
+    def _calculate_heuristic_load_batch(self, features: np.ndarray) -> np.ndarray:
         """
         Calculate heuristic cognitive load when model not trained
 
@@ -303,6 +348,12 @@ class CognitiveLoadAnalyzer:
         - Performance Decline: 25% weight
         - Stress Indicators: 25% weight
         - Validation Comprehension: 20% weight
+
+        Args:
+            features: (n, 10) matrix in self.feature_names order
+
+        Returns:
+            (n,) load scores 0-100
         """
 
         (
@@ -316,11 +367,10 @@ class CognitiveLoadAnalyzer:
             consecutive_days,
             completion_rate,
             error_rate_trend,
-        ) = features
+        ) = features[:, :10].astype(float).T
 
         # Volume load (>1.0 ratio means studying more than baseline)
-        volume_load = min(100, (study_volume_ratio - 0.7) / 1.0 * 100) if study_volume_ratio > 0.7 else 0
-        volume_load = max(0, volume_load)
+        volume_load = np.clip((study_volume_ratio - 0.7) / 1.0 * 100, 0, 100)
 
         # Performance load (declining performance = high load)
         performance_load = 100 - avg_performance_last_5
@@ -344,7 +394,7 @@ class CognitiveLoadAnalyzer:
             + comprehension_load * 0.20
         )
 
-        return float(np.clip(total_load, 0, 100))
+        return np.clip(total_load, 0, 100)
 
     def _classify_load_level(self, load_score: float) -> str:
         """Classify cognitive load into LOW/MEDIUM/HIGH"""
@@ -521,38 +571,152 @@ class CognitiveLoadAnalyzer:
         validation_scores: List[float],
         behavioral_events: pd.DataFrame,
         baseline_metrics: Dict[str, float],
+        days: int = 7,
     ) -> List[float]:
         """
-        Calculate 7-day cognitive load trend
+        Calculate daily cognitive load trend
 
-        Returns array of 7 load scores (most recent last)
+        Args:
+            days: Trend window (e.g. 7, 30 or 90 days)
+
+        Returns array of `days` load scores (most recent last, 0.0 for days
+        without study)
         """
 
         if recent_sessions.empty:
             return []
 
-        # Group sessions by day
-        recent_sessions["date"] = recent_sessions["started_at"].dt.date
-        daily_sessions = recent_sessions.groupby("date")
+        daily_features = self._extract_daily_features(
+            recent_sessions, validation_scores, behavioral_events, baseline_metrics, days
+        )
+        daily_load = self._calculate_heuristic_load_batch(daily_features.to_numpy())
 
-        trend = []
+        # No study on this day
+        daily_load[daily_features["session_count"].to_numpy() == 0] = 0.0
 
-        # Calculate load for each of last 7 days
-        for date in pd.date_range(end=datetime.now().date(), periods=7).date:
-            day_sessions = recent_sessions[recent_sessions["date"] == date]
+        return np.round(daily_load, 1).tolist()
 
-            if not day_sessions.empty:
-                # Extract features for this day
-                day_features = self._extract_features(
-                    day_sessions, validation_scores, behavioral_events, baseline_metrics
-                )
-                day_load = self._calculate_heuristic_load(day_features)
-            else:
-                day_load = 0.0  # No study on this day
+    def _extract_daily_features(
+        self,
+        recent_sessions: pd.DataFrame,
+        validation_scores: List[float],
+        behavioral_events: pd.DataFrame,
+        baseline_metrics: Dict[str, float],
+        days: int = 7,
+        end_date: Optional[date] = None,
+    ) -> pd.DataFrame:
+        """
+        Per-day cognitive load features for a window in one pass
+
+        The feature columns of _extract_features, but each value describes a
+        single calendar day: study volume, performance, abandonment and
+        completion come from that day's sessions, pauses and response times
+        from that day's behavioral events (events without a timestamp apply
+        to every day), and consecutive_study_days is the streak ending on
+        that day. Only validation_score_avg is taken from the whole window.
+        Computed with groupby aggregations instead of filtering the frames
+        once per day. Input frames are not modified.
+
+        Values therefore differ from the baseline features: study volume is a
+        day's hours over the weekly baseline hours, and performance_trend_7d /
+        error_rate_trend are always 0 because a slope is undefined within a
+        day (all sessions share day offset 0).
+
+        Returns:
+            DataFrame indexed by date (oldest first) with self.feature_names
+            columns plus session_count
+        """
+
+        end_date = end_date or datetime.now().date()
+        window = pd.date_range(end=pd.Timestamp(end_date), periods=days, freq="D")
+
+        started_at = pd.to_datetime(recent_sessions["started_at"])
+        order = np.argsort(started_at.to_numpy(), kind="stable")
+        sessions = pd.DataFrame({
+            "day": _calendar_days(started_at)[order],
+            "hours": recent_sessions["duration_ms"].to_numpy()[order] / (1000 * 60 * 60),
+            "performance_score": recent_sessions["performance_score"].to_numpy()[order],
+            "abandoned": recent_sessions["completed_at"].isna().to_numpy()[order],
+        })
+
+        by_day = sessions.groupby("day")
+        daily = pd.DataFrame({
+            "session_count": by_day.size(),
+            "hours": by_day["hours"].sum(),
+            "avg_performance_last_5": by_day["performance_score"].apply(lambda s: s.tail(5).mean()),
+            "abandonment_rate": by_day["abandoned"].mean(),
+        }).reindex(window)
+        daily["session_count"] = daily["session_count"].fillna(0).astype(int)
+        studied = daily["session_count"] > 0
+
+        # 1. Study Volume Ratio
+        baseline_hours = baseline_metrics.get("baseline_weekly_hours", 10.0)
+        hours = daily["hours"].fillna(0.0)
+        study_volume_ratio = hours / baseline_hours if baseline_hours > 0 else studied.astype(float)
 
-            trend.append(round(day_load, 1))
+        # 6-7. Pause frequency / response time ratio from events
+        pauses, response_time_ratio = self._daily_event_features(
+            behavioral_events, window, baseline_metrics
+        )
+        pause_frequency = np.where(hours > 0, pauses / hours.where(hours > 0, 1.0), 0.0)
+
+        # 8. Consecutive Study Days (streak ending on each day)
+        streak_id = (~studied).cumsum()
+        consecutive_days = studied.astype(int).groupby(streak_id).cumsum()
+
+        return pd.DataFrame({
+            "study_volume_ratio": study_volume_ratio,
+            "performance_trend_7d": 0.0,
+            "avg_performance_last_5": daily["avg_performance_last_5"].fillna(75.0),
+            "validation_score_avg": np.mean(validation_scores) if validation_scores else 75.0,
+            "session_abandonment_rate": daily["abandonment_rate"].fillna(0.0),
+            "pause_frequency": pause_frequency,
+            "avg_response_time_ratio": response_time_ratio,
+            "consecutive_study_days": consecutive_days,
+            "session_completion_rate": 1.0 - daily["abandonment_rate"].fillna(0.0),
+            "error_rate_trend": 0.0,
+            "session_count": daily["session_count"],
+        }, index=window)[self.feature_names + ["session_count"]]
+
+    def _daily_event_features(
+        self,
+        behavioral_events: pd.DataFrame,
+        window: pd.DatetimeIndex,
+        baseline_metrics: Dict[str, float],
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Daily pause counts and response time ratios
+
+        Events are bucketed by their `timestamp` column; frames without one
+        apply the whole-frame values to every day.
+        """
+
+        n_days = len(window)
+        if behavioral_events.empty:
+            return np.zeros(n_days), np.ones(n_days)
+
+        baseline_response_time = baseline_metrics.get("baseline_response_time_ms", 5000)
+        is_pause = (behavioral_events["event_type"] == "SESSION_PAUSED").to_numpy()
+        is_review = (behavioral_events["event_type"] == "CARD_REVIEWED").to_numpy()
+        response_times = _response_times(behavioral_events)
+
+        if "timestamp" in behavioral_events.columns:
+            day = _calendar_days(behavioral_events["timestamp"])
+            pauses = pd.Series(is_pause.astype(int)).groupby(day).sum().reindex(window, fill_value=0)
+            review_times = pd.Series(np.where(is_review, response_times, np.nan)).groupby(day).mean()
+            mean_response = review_times.reindex(window).to_numpy()
+        else:
+            pauses = pd.Series(is_pause.sum(), index=window)
+            mean_response = np.full(n_days, response_times[is_review].mean() if is_review.any() else np.nan)
+
+        if baseline_response_time > 0:
+            response_time_ratio = np.where(
+                np.isnan(mean_response), 1.0, mean_response / baseline_response_time
+            )
+        else:
+            response_time_ratio = np.ones(n_days)
 
-        return trend
+        return pauses.to_numpy(dtype=float), response_time_ratio
 
     def detect_burnout_risk(
         self, assessment: CognitiveLoadAssessment
@@ -0,0 +1,145 @@
+"""
+Model Evaluation - single-fit multi-metric cross-validation
+Story 5.3: Optimal Study Timing & Session Orchestration
+
+Shared by the orchestration models and scripts/validate_model.py:
+- One fit per fold; every metric is scored from that fit
+- Folds run in parallel without oversubscribing multi-threaded estimators
+- Per-stage timings (fit, score, wall clock)
+"""
+
+from typing import Any, Dict, Iterable, Mapping, Optional, Union
+from dataclasses import dataclass
+import logging
+import os
+import time
+
+import numpy as np
+from joblib import effective_n_jobs
+from sklearn.base import clone, is_classifier
+from sklearn.model_selection import check_cv, cross_validate
+
+logger = logging.getLogger(__name__)
+
+# Default fold parallelism (override with CV_N_JOBS)
+DEFAULT_CV_N_JOBS = int(os.getenv("CV_N_JOBS", "-1"))
+
+
+@dataclass
+class CrossValidationResult:
+    """Per-fold scores and timings of one cross-validation run"""
+
+    scores: Dict[str, np.ndarray]
+    fit_time: np.ndarray
+    score_time: np.ndarray
+    wall_time: float
+    n_jobs: int
+
+    def mean(self, metric: str) -> float:
+        return float(self.scores[metric].mean())
+
+    def summary(self) -> Dict[str, float]:
+        """Mean, std, min and max per metric"""
+        summary: Dict[str, float] = {}
+        for metric, values in self.scores.items():
+            summary[f"{metric}_mean"] = float(values.mean())
+            summary[f"{metric}_std"] = float(values.std())
+            summary[f"{metric}_min"] = float(values.min())
+            summary[f"{metric}_max"] = float(values.max())
+        return summary
+
+    def timings(self) -> Dict[str, float]:
+        """Seconds spent fitting and scoring (summed over folds) and in total"""
+        return {
+            "fit_seconds": float(self.fit_time.sum()),
+            "score_seconds": float(self.score_time.sum()),
+            "wall_seconds": self.wall_time,
+            "n_jobs": self.n_jobs,
+        }
+
+
+def cross_validate_metrics(
+    estimator: Any,
+    X: np.ndarray,
+    y: np.ndarray,
+    scoring: Union[Iterable[str], Mapping[str, Any]],
+    cv: Any = 5,
+    n_jobs: Optional[int] = None,
+    groups: Optional[np.ndarray] = None,
+) -> CrossValidationResult:
+    """
+    Cross-validate an estimator once per fold and score every metric
+
+    Args:
+        estimator: Unfitted sklearn-compatible estimator
+        X: Feature matrix
+        y: Targets
+        scoring: Metric names (sklearn scorer strings) or name -> scorer
+        cv: Number of folds or a splitter
+        n_jobs: Folds fitted in parallel (-1 = all cores, default CV_N_JOBS)
+        groups: Optional group labels for group-aware splitters
+
+    Returns:
+        CrossValidationResult keyed by metric name
+    """
+    splitter = check_cv(cv, y, classifier=is_classifier(estimator))
+    n_splits = splitter.get_n_splits(X, y, groups)
+    fold_jobs = min(effective_n_jobs(DEFAULT_CV_N_JOBS if n_jobs is None else n_jobs), n_splits)
+
+    estimator = _limit_estimator_threads(estimator, fold_jobs)
+
+    started = time.perf_counter()
+    results = cross_validate(
+        estimator,
+        X,
+        y,
+        groups=groups,
+        cv=splitter,
+        scoring=scoring if isinstance(scoring, Mapping) else list(scoring),
+        n_jobs=fold_jobs,
+        error_score="raise",
+    )
+    wall_time = time.perf_counter() - started
+
+    result = CrossValidationResult(
+        scores={
+            key[len("test_"):]: np.asarray(values)
+            for key, values in results.items()
+            if key.startswith("test_")
+        },
+        fit_time=np.asarray(results["fit_time"]),
+        score_time=np.asarray(results["score_time"]),
+        wall_time=wall_time,
+        n_jobs=fold_jobs,
+    )
+
+    timings = result.timings()
+    logger.info(
+        f"{n_splits}-fold CV of {type(estimator).__name__}: "
+        f"fit {timings['fit_seconds']:.2f}s, score {timings['score_seconds']:.2f}s, "
+        f"wall {wall_time:.2f}s ({fold_jobs} parallel folds)"
+    )
+    return result
+
+
+def _limit_estimator_threads(estimator: Any, fold_jobs: int) -> Any:
+    """
+    Split the cores between parallel folds
+
+    Estimators with their own n_jobs (random forests, XGBoost) would
+    otherwise each start one thread per core inside every fold worker.
+    """
+    if fold_jobs <= 1:
+        return estimator
+
+    params = estimator.get_params(deep=True)
+    per_fold = max(1, effective_n_jobs(-1) // fold_jobs)
+    limits = {
+        name: per_fold
+        for name, value in params.items()
+        if name == "n_jobs" or name.endswith("__n_jobs")
+        if value is not None and (value < 0 or value > per_fold)
+    }
+    if not limits:
+        return estimator
+    return clone(estimator).set_params(**limits)
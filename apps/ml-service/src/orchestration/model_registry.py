@@ -0,0 +1,395 @@
+"""
+Orchestration Model Registry - trained-model lifecycle off the request path
+Story 5.3: Optimal Study Timing & Session Orchestration
+
+Keeps trained orchestration models (per-user or global) so API requests only
+run inference:
+- Versioned persistence (joblib + manifest.json per model)
+- LRU of loaded models in memory, and of each model's latest version so
+  requests don't re-read manifest.json
+- Background (re)training when enough sessions newer than the current
+  version's training data have accumulated
+
+Only study_time models are trained by the registry (per user, from session
+history). cognitive_load and session_duration have no session-based
+training: requests share one untrained instance per kind (heuristics)
+unless a trained model is registered for them offline with register().
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from concurrent.futures import Executor, ThreadPoolExecutor
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from pathlib import Path
+import asyncio
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+import joblib
+import pandas as pd
+
+from .study_time_recommender import StudyTimeRecommender
+from .session_duration_optimizer import SessionDurationOptimizer
+from .cognitive_load_analyzer import CognitiveLoadAnalyzer
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_OWNER = "global"
+
+# Model kinds and their (untrained) factories; only study_time is trained
+# in the background (see _train_and_register)
+MODEL_FACTORIES: Dict[str, Callable[[], Any]] = {
+    "study_time": lambda: StudyTimeRecommender(train_on_request=False),
+    "session_duration": SessionDurationOptimizer,
+    "cognitive_load": CognitiveLoadAnalyzer,
+}
+
+
+@dataclass
+class ModelVersion:
+    """Metadata for one persisted model version"""
+
+    kind: str
+    owner: str
+    version: int
+    n_sessions: int
+    trained_at: str
+    file: str
+    # Start of the newest session in the training data (ISO, naive UTC)
+    data_until: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class ModelRegistry:
+    """
+    Registry of trained orchestration models
+
+    Layout on disk:
+        {model_dir}/{kind}/{owner}/manifest.json
+        {model_dir}/{kind}/{owner}/v{version}.joblib
+
+    Usage:
+        registry = get_model_registry()
+
+        # Inference-only; schedules retraining in the background if needed
+        recommender = await registry.get_study_time_recommender(user_id, sessions_df)
+
+        # Offline training (scripts / jobs)
+        registry.register("cognitive_load", GLOBAL_OWNER, trained_analyzer, n_sessions)
+    """
+
+    def __init__(
+        self,
+        model_dir: Optional[Path] = None,
+        max_loaded: int = 128,
+        retrain_threshold: int = 20,
+        min_sessions: int = 10,
+        max_versions: int = 3,
+        executor: Optional[Executor] = None,
+        manifest_ttl: float = 300.0,
+        clock=time.monotonic,
+    ):
+        """
+        Args:
+            model_dir: Root directory for persisted models
+            max_loaded: Maximum models kept in memory (LRU)
+            retrain_threshold: Sessions newer than the current version's
+                training data required before retraining
+            min_sessions: Sessions required for a first per-user model
+            max_versions: Versions kept on disk per model
+            executor: Executor for background training (default: 1 thread)
+            manifest_ttl: Seconds a cached latest version is trusted before
+                manifest.json is read again (picks up versions registered
+                by other processes, e.g. offline training jobs)
+            clock: Monotonic clock (injectable for tests)
+        """
+        self.model_dir = Path(
+            model_dir or os.getenv("ORCHESTRATION_MODEL_DIR", "./models/orchestration")
+        )
+        self.max_loaded = max_loaded
+        self.retrain_threshold = retrain_threshold
+        self.min_sessions = min_sessions
+        self.max_versions = max_versions
+        self.manifest_ttl = manifest_ttl
+        self._clock = clock
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="model-training"
+        )
+
+        # (kind, owner) -> (model, ModelVersion or None for untrained defaults)
+        self._loaded: "OrderedDict[Tuple[str, str], Tuple[Any, Optional[ModelVersion]]]" = OrderedDict()
+        # (kind, owner) -> (latest ModelVersion or None, read at clock time)
+        self._latest: "OrderedDict[Tuple[str, str], Tuple[Optional[ModelVersion], float]]" = OrderedDict()
+        self._training: Dict[Tuple[str, str], asyncio.Future] = {}
+        self._lock = threading.Lock()
+
+    # ==================== LOOKUP ====================
+
+    def get(self, kind: str, owner: str = GLOBAL_OWNER) -> Optional[Any]:
+        """
+        Get the latest trained model (memory first, then disk)
+
+        Returns:
+            Trained model, or None if no version has been registered
+        """
+        model, _ = self._get_entry(kind, owner)
+        return model
+
+    def get_or_default(self, kind: str, owner: str = GLOBAL_OWNER) -> Any:
+        """
+        Get the latest trained model, or a shared untrained instance
+
+        Untrained instances fall back to each model's heuristics. This is
+        what cognitive_load and session_duration requests get unless a
+        trained version was registered offline.
+        """
+        model = self.get(kind, owner)
+        if model is not None:
+            return model
+
+        key = (kind, owner)
+        with self._lock:
+            if key not in self._loaded:
+                self._remember(key, MODEL_FACTORIES[kind](), None)
+            return self._loaded[key][0]
+
+    def latest_version(self, kind: str, owner: str = GLOBAL_OWNER) -> Optional[ModelVersion]:
+        """
+        Metadata of the latest persisted version
+
+        Served from memory; manifest.json is read on a miss, after
+        manifest_ttl, or after invalidate().
+        """
+        key = (kind, owner)
+        with self._lock:
+            cached = self._latest.get(key)
+            if cached is not None and self._clock() - cached[1] < self.manifest_ttl:
+                self._latest.move_to_end(key)
+                return cached[0]
+
+        versions = self._read_manifest(kind, owner)
+        latest = versions[-1] if versions else None
+        with self._lock:
+            self._remember_latest(key, latest)
+        return latest
+
+    def invalidate(self, kind: str, owner: str = GLOBAL_OWNER) -> None:
+        """Forget the cached version and loaded model for (kind, owner)"""
+        with self._lock:
+            self._latest.pop((kind, owner), None)
+            self._loaded.pop((kind, owner), None)
+
+    def needs_training(self, kind: str, owner: str, historical_sessions: pd.DataFrame) -> bool:
+        """
+        Check whether enough sessions arrived since the last training
+
+        Counts sessions that started after the newest session the current
+        version was trained on, not the change in history size: history is
+        a fixed-length window, so a steady user's session count plateaus
+        while the sessions themselves keep changing. Versions registered
+        without data_until fall back to their training time.
+        """
+        latest = self.latest_version(kind, owner)
+        if latest is None:
+            return len(historical_sessions) >= self.min_sessions
+        if historical_sessions.empty:
+            return False
+
+        cutoff = pd.Timestamp(latest.data_until or latest.trained_at)
+        started = _session_starts(historical_sessions)
+        return int((started > cutoff).sum()) >= self.retrain_threshold
+
+    async def get_study_time_recommender(
+        self, user_id: str, historical_sessions: pd.DataFrame
+    ) -> StudyTimeRecommender:
+        """
+        Get a user's study time recommender without training inline
+
+        If the user has accumulated enough new sessions, retraining is
+        scheduled in the background; this request uses the current model
+        (or heuristics if none exists yet).
+        """
+        if self.needs_training("study_time", user_id, historical_sessions):
+            self.schedule_training("study_time", user_id, historical_sessions)
+
+        model = self.get("study_time", user_id)
+        return model if model is not None else StudyTimeRecommender(train_on_request=False)
+
+    # ==================== TRAINING ====================
+
+    def schedule_training(
+        self, kind: str, owner: str, historical_sessions: pd.DataFrame
+    ) -> Optional[asyncio.Future]:
+        """
+        Train and register a new version in the background executor
+
+        At most one training job runs per (kind, owner). Only study_time
+        models can be trained from sessions.
+
+        Returns:
+            Future resolving to the new ModelVersion (None if training failed)
+
+        Raises:
+            ValueError: For kinds without session-based training
+        """
+        if kind != "study_time":
+            raise ValueError(f"No session-based training for model kind: {kind}")
+
+        key = (kind, owner)
+        if key in self._training:
+            return self._training[key]
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            self._executor, self._train_and_register, kind, owner, historical_sessions.copy()
+        )
+        self._training[key] = future
+        future.add_done_callback(lambda _: self._training.pop(key, None))
+        return future
+
+    def _train_and_register(
+        self, kind: str, owner: str, historical_sessions: pd.DataFrame
+    ) -> Optional[ModelVersion]:
+        model = MODEL_FACTORIES[kind]()
+        try:
+            trained = model.train(historical_sessions)
+        except Exception as e:
+            logger.error(f"Training {kind} model for {owner} failed: {e}")
+            return None
+
+        if not trained:
+            return None
+
+        data_until = _session_starts(historical_sessions).max()
+        return self.register(kind, owner, model, len(historical_sessions), data_until)
+
+    def register(
+        self,
+        kind: str,
+        owner: str,
+        model: Any,
+        n_sessions: int,
+        data_until: Optional[datetime] = None,
+    ) -> ModelVersion:
+        """
+        Persist a trained model as a new version and make it current
+
+        Args:
+            kind: Model kind (see MODEL_FACTORIES)
+            owner: User ID or GLOBAL_OWNER
+            model: Trained model instance
+            n_sessions: Number of sessions it was trained on
+            data_until: Start of the newest training session (retraining
+                counts sessions after it)
+
+        Returns:
+            ModelVersion metadata
+        """
+        if kind not in MODEL_FACTORIES:
+            raise ValueError(f"Unknown model kind: {kind}")
+
+        with self._lock:
+            versions = self._read_manifest(kind, owner)
+            version_number = versions[-1].version + 1 if versions else 1
+            model_path = self._model_path(kind, owner) / f"v{version_number}.joblib"
+            model_path.parent.mkdir(parents=True, exist_ok=True)
+
+            joblib.dump(model, model_path)
+
+            version = ModelVersion(
+                kind=kind,
+                owner=owner,
+                version=version_number,
+                n_sessions=n_sessions,
+                trained_at=datetime.now().isoformat(),
+                file=model_path.name,
+                data_until=pd.Timestamp(data_until).isoformat() if data_until is not None else None,
+            )
+            versions.append(version)
+
+            # Prune old versions
+            for old in versions[:-self.max_versions]:
+                (model_path.parent / old.file).unlink(missing_ok=True)
+            versions = versions[-self.max_versions:]
+
+            self._write_manifest(kind, owner, versions)
+            self._remember((kind, owner), model, version)
+            self._remember_latest((kind, owner), version)
+
+        logger.info(f"Registered {kind} model v{version_number} for {owner} ({n_sessions} sessions)")
+        return version
+
+    # ==================== INTERNALS ====================
+
+    def _get_entry(self, kind: str, owner: str) -> Tuple[Optional[Any], Optional[ModelVersion]]:
+        key = (kind, owner)
+        latest = self.latest_version(kind, owner)
+        if latest is None:
+            return None, None
+
+        with self._lock:
+            entry = self._loaded.get(key)
+            if entry is not None and entry[1] is not None and entry[1].version >= latest.version:
+                self._loaded.move_to_end(key)
+                return entry
+
+        model = joblib.load(self._model_path(kind, owner) / latest.file)
+        with self._lock:
+            self._remember(key, model, latest)
+        return model, latest
+
+    def _remember(self, key: Tuple[str, str], model: Any, version: Optional[ModelVersion]) -> None:
+        """Insert into the LRU (caller holds the lock)"""
+        self._loaded[key] = (model, version)
+        self._loaded.move_to_end(key)
+        while len(self._loaded) > self.max_loaded:
+            self._loaded.popitem(last=False)
+
+    def _remember_latest(self, key: Tuple[str, str], version: Optional[ModelVersion]) -> None:
+        """Cache the latest version, None included (caller holds the lock)"""
+        self._latest[key] = (version, self._clock())
+        self._latest.move_to_end(key)
+        while len(self._latest) > self.max_loaded * 8:
+            self._latest.popitem(last=False)
+
+    def _model_path(self, kind: str, owner: str) -> Path:
+        # Owner IDs become directory names
+        safe_owner = re.sub(r"[^A-Za-z0-9_-]", "_", owner)
+        return self.model_dir / kind / safe_owner
+
+    def _read_manifest(self, kind: str, owner: str) -> List[ModelVersion]:
+        manifest_path = self._model_path(kind, owner) / "manifest.json"
+        if not manifest_path.exists():
+            return []
+
+        with open(manifest_path, "r") as f:
+            return [ModelVersion(**v) for v in json.load(f)["versions"]]
+
+    def _write_manifest(self, kind: str, owner: str, versions: List[ModelVersion]) -> None:
+        manifest_path = self._model_path(kind, owner) / "manifest.json"
+        tmp_path = manifest_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"versions": [v.to_dict() for v in versions]}, f, indent=2)
+        os.replace(tmp_path, manifest_path)
+
+
+def _session_starts(historical_sessions: pd.DataFrame) -> pd.Series:
+    """started_at as naive UTC (uploaded histories may carry an offset)"""
+    started = pd.to_datetime(historical_sessions["started_at"], utc=True)
+    return started.dt.tz_localize(None)
+
+
+# Global registry instance
+model_registry = ModelRegistry()
+
+
+def get_model_registry() -> ModelRegistry:
+    """Get global model registry instance"""
+    return model_registry
@@ -0,0 +1,472 @@
+"""
+Session History Store - server-side history lookup for orchestration models
+Story 5.3: Optimal Study Timing & Session Orchestration
+
+Loads a user's sessions and behavioral events from the Parquet event lake
+(default) or the DuckDB analytics store (research.behavioral_events) so
+orchestration requests only need to carry a user ID:
+- Per-user cache of the event window, LRU across users
+- Incremental refresh: only events newer than the cached watermark (minus a
+  short overlap for late arrivals, de-duplicated by event ID) are read
+- Derived sessions are cached too; new lifecycle events only re-derive the
+  sessions they belong to
+- Reading the lake never contends with writers. DuckDB reads take the
+  database's shared lock; while a writer holds it, refreshes keep serving
+  the cached window
+
+The event lake and the DuckDB reader lock are injected (attached at service
+startup), so this package does not depend on the API service modules.
+"""
+
+from typing import Callable, ContextManager, Dict, Optional, Tuple
+from collections import OrderedDict
+from contextlib import ExitStack, nullcontext
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+import asyncio
+import logging
+import os
+import time
+
+import duckdb
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+SESSION_STARTED = "SESSION_STARTED"
+SESSION_ENDED = "SESSION_ENDED"
+
+EVENT_COLUMNS = [
+    "event_type",
+    "timestamp",
+    "session_id",
+    "duration_ms",
+    "performance_score",
+    "time_spent_ms",
+]
+
+SESSION_COLUMNS = ["session_id", "started_at", "completed_at", "duration_ms", "performance_score"]
+
+# Cached rows also keep the event ID for de-duplicating overlapping refreshes
+HISTORY_COLUMNS = ["event_id", *EVENT_COLUMNS]
+
+# (duckdb_path, timeout) -> context manager holding a shared (reader) lock
+ReadLock = Callable[[str, float], ContextManager]
+
+
+@dataclass
+class UserHistory:
+    """Cached event window for one user"""
+
+    events: pd.DataFrame
+    window_start: datetime
+    watermark: Optional[pd.Timestamp]
+    refreshed_at: float
+    sessions: Optional[pd.DataFrame] = None
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
+
+
+class SessionHistoryStore:
+    """
+    Per-user session and event history backed by DuckDB
+
+    Usage:
+        store = get_session_history_store()
+        sessions_df = await store.get_sessions(user_id, days=90)
+        events_df = await store.get_events(user_id, days=7)
+
+    Session rows are derived from SESSION_STARTED / SESSION_ENDED events
+    linked by eventData.sessionId. Sessions without an end event are
+    returned with a null completed_at (abandoned).
+    """
+
+    def __init__(
+        self,
+        duckdb_path: Optional[str] = None,
+        max_users: int = 256,
+        max_days: int = 365,
+        refresh_interval: float = 30.0,
+        clock=time.monotonic,
+        source: Optional[str] = None,
+        lake=None,
+        lock_timeout: Optional[float] = None,
+        read_lock: Optional[ReadLock] = None,
+        refresh_overlap: Optional[timedelta] = None,
+    ):
+        """
+        Args:
+            duckdb_path: Path to the DuckDB analytics database
+            max_users: Maximum users kept in memory (LRU)
+            max_days: Longest history window that can be requested
+            refresh_interval: Seconds between incremental refreshes per user
+            clock: Monotonic clock (injectable for tests)
+            source: "lake" (Parquet event lake) or "events" (DuckDB table);
+                default SESSION_HISTORY_SOURCE or "lake"
+            lake: Event lake to read with source="lake" (anything with the
+                EventLake.scan_sql interface); required for that source
+            lock_timeout: Seconds to wait for the DuckDB shared lock with
+                source="events" (SESSION_HISTORY_LOCK_TIMEOUT, default 2)
+            read_lock: Factory for the shared lock DuckDB writers respect,
+                called as read_lock(duckdb_path, lock_timeout); without one,
+                source="events" reads unlocked
+            refresh_overlap: How far before the watermark refreshes re-read,
+                so events arriving late are still picked up
+                (SESSION_HISTORY_REFRESH_OVERLAP seconds, default 900)
+        """
+        self.duckdb_path = duckdb_path or os.getenv(
+            "DUCKDB_DB_PATH", "./data/duckdb/analytics.duckdb"
+        )
+        self.source = source or os.getenv("SESSION_HISTORY_SOURCE", "lake")
+        if self.source not in ("events", "lake"):
+            raise ValueError(f"Unknown session history source: {self.source}")
+        self.lake = lake
+        self.read_lock = read_lock
+        self.lock_timeout = (
+            lock_timeout if lock_timeout is not None
+            else float(os.getenv("SESSION_HISTORY_LOCK_TIMEOUT", "2"))
+        )
+        self.refresh_overlap = (
+            refresh_overlap if refresh_overlap is not None
+            else timedelta(seconds=float(os.getenv("SESSION_HISTORY_REFRESH_OVERLAP", "900")))
+        )
+        self.max_users = max_users
+        self.max_days = max_days
+        self.refresh_interval = refresh_interval
+        self._clock = clock
+
+        self._users: "OrderedDict[str, UserHistory]" = OrderedDict()
+        self._event_data_sql: Optional[str] = None
+        self._stats: Dict[str, int] = {
+            "full_loads": 0,
+            "incremental_loads": 0,
+            "rows_loaded": 0,
+            "stale_reads": 0,
+        }
+
+    # ==================== LOOKUP ====================
+
+    async def get_sessions(
+        self, user_id: str, days: int = 90, completed_only: bool = False
+    ) -> pd.DataFrame:
+        """
+        Get a user's study sessions started within the last `days` days
+
+        Args:
+            user_id: User ID
+            days: History window in days
+            completed_only: Drop abandoned sessions and sessions without a score
+
+        Returns:
+            DataFrame with columns [session_id, started_at, completed_at,
+            duration_ms, performance_score], ordered by started_at. Missing
+            scores of abandoned sessions are 0.
+        """
+        history = await self._history(user_id, days)
+        if history.sessions is None:
+            history.sessions = _derive_sessions(history.events)
+
+        sessions = history.sessions
+        sessions = sessions[sessions["started_at"] >= _window_start(days)]
+        if completed_only:
+            return sessions.dropna(subset=["completed_at", "performance_score"]).reset_index(drop=True)
+        return sessions.fillna({"performance_score": 0.0}).reset_index(drop=True)
+
+    async def get_events(self, user_id: str, days: int = 7) -> pd.DataFrame:
+        """
+        Get a user's behavioral events within the last `days` days
+
+        Returns:
+            DataFrame with columns [event_type, timestamp, session_id,
+            duration_ms, performance_score, time_spent_ms]
+        """
+        history = await self._history(user_id, days)
+        events = history.events
+        return events.loc[events["timestamp"] >= _window_start(days), EVENT_COLUMNS].reset_index(drop=True)
+
+    def invalidate(self, user_id: Optional[str] = None) -> None:
+        """Drop cached history for one user (or everyone)"""
+        if user_id is None:
+            self._users.clear()
+        else:
+            self._users.pop(user_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        return {**self._stats, "users": len(self._users)}
+
+    # ==================== CACHE MAINTENANCE ====================
+
+    async def _history(self, user_id: str, days: int) -> UserHistory:
+        if not 1 <= days <= self.max_days:
+            raise ValueError(f"History window must be between 1 and {self.max_days} days")
+
+        window_start = _window_start(days)
+        history = self._users.get(user_id)
+        if history is None:
+            history = UserHistory(
+                events=_empty_events(),
+                window_start=window_start,
+                watermark=None,
+                refreshed_at=-np.inf,
+            )
+            self._users[user_id] = history
+            self._evict()
+        self._users.move_to_end(user_id)
+
+        async with history.lock:
+            if history.watermark is None or window_start < history.window_start:
+                await self._extend_window(user_id, history, window_start)
+            elif self._clock() - history.refreshed_at >= self.refresh_interval:
+                await self._refresh(user_id, history)
+
+        return history
+
+    async def _extend_window(self, user_id: str, history: UserHistory, window_start: datetime) -> None:
+        """Load events between the requested and the cached window start"""
+        if history.watermark is None:
+            older = await asyncio.to_thread(self._query, user_id, window_start, None)
+            history.events = older
+            self._stats["full_loads"] += 1
+        else:
+            older = await asyncio.to_thread(
+                self._query, user_id, window_start, None, history.window_start
+            )
+            history.events = pd.concat([older, history.events], ignore_index=True)
+            self._stats["incremental_loads"] += 1
+
+        history.window_start = window_start
+        history.watermark = _max_timestamp(history.events, history.watermark, window_start)
+        history.refreshed_at = self._clock()
+        history.sessions = None
+        self._stats["rows_loaded"] += len(older)
+
+    async def _refresh(self, user_id: str, history: UserHistory) -> None:
+        """
+        Append events newer than the watermark and roll the window forward
+
+        Events are stored by client timestamp, so an event flushed late can
+        land just below the watermark. Each refresh re-reads refresh_overlap
+        before it and drops rows already cached (by event ID).
+        """
+        after = max(history.watermark - self.refresh_overlap, pd.Timestamp(history.window_start))
+        try:
+            newer = await asyncio.to_thread(self._query, user_id, None, after)
+        except (TimeoutError, duckdb.Error) as e:
+            # A writer has the database; serve the cached window and retry
+            # after the next refresh interval
+            logger.warning(f"Session history refresh for {user_id} skipped, serving cached data: {e}")
+            history.refreshed_at = self._clock()
+            self._stats["stale_reads"] += 1
+            return
+        history.refreshed_at = self._clock()
+        self._stats["incremental_loads"] += 1
+
+        # Keep at most max_days of history as the window rolls forward
+        oldest_allowed = _window_start(self.max_days)
+        if history.window_start < oldest_allowed:
+            history.events = history.events[history.events["timestamp"] >= oldest_allowed]
+            history.window_start = oldest_allowed
+
+        cached = history.events
+        known_ids = cached.loc[cached["timestamp"] > after, "event_id"].dropna()
+        newer = newer[~newer["event_id"].isin(known_ids)]
+        if newer.empty:
+            return
+
+        history.events = pd.concat([cached, newer], ignore_index=True)
+        if not cached.empty and newer["timestamp"].min() < cached["timestamp"].max():
+            history.events = history.events.sort_values("timestamp", kind="stable", ignore_index=True)
+        history.watermark = _max_timestamp(newer, history.watermark, history.window_start)
+        self._stats["rows_loaded"] += len(newer)
+
+        # Re-derive only the sessions the new lifecycle events belong to
+        is_lifecycle = newer["event_type"].isin([SESSION_STARTED, SESSION_ENDED])
+        if history.sessions is not None and is_lifecycle.any():
+            changed = newer.loc[is_lifecycle, "session_id"].dropna().unique()
+            updated = _derive_sessions(history.events[history.events["session_id"].isin(changed)])
+            kept = history.sessions[~history.sessions["session_id"].isin(changed)]
+            history.sessions = (
+                pd.concat([kept, updated], ignore_index=True)
+                .sort_values("started_at", kind="stable")
+                .reset_index(drop=True)
+            )
+
+    def _evict(self) -> None:
+        while len(self._users) > self.max_users:
+            self._users.popitem(last=False)
+
+    # ==================== DUCKDB ====================
+
+    def _query(
+        self,
+        user_id: str,
+        start: Optional[datetime],
+        after: Optional[pd.Timestamp],
+        before: Optional[datetime] = None,
+    ) -> pd.DataFrame:
+        """
+        Read one user's events with start <= timestamp (> after) (< before)
+
+        Uses the (userId, timestamp) index created by the export sync, or
+        the lake's bucket/date partitions.
+        """
+        conditions = ["userId = ?"]
+        params = [user_id]
+        if start is not None:
+            conditions.append("timestamp >= ?")
+            params.append(start)
+        if after is not None:
+            conditions.append("timestamp > ?")
+            params.append(after.to_pydatetime())
+        if before is not None:
+            conditions.append("timestamp < ?")
+            params.append(before)
+
+        with ExitStack() as stack:
+            if self.source == "lake":
+                # Only the user's bucket and the days in range are read
+                if self.lake is None:
+                    raise RuntimeError("No event lake configured for session history (source='lake')")
+                first_day = start or (after.to_pydatetime() if after is not None else None)
+                try:
+                    relation, relation_params = self.lake.scan_sql(user_id, first_day, before)
+                except ValueError:
+                    return _empty_events()  # nothing in the lake for this user yet
+                params = [*relation_params, *params]
+                conn = duckdb.connect()
+                event_data = "TRY_CAST(eventData AS JSON)"  # the lake stores JSON text
+            else:
+                # Ingestion flushes and the export sync hold this lock while
+                # they have the file open read-write
+                read_lock = self.read_lock(self.duckdb_path, self.lock_timeout) if self.read_lock else nullcontext()
+                stack.enter_context(read_lock)
+                relation = "research.behavioral_events"
+                conn = duckdb.connect(self.duckdb_path, read_only=True)
+                event_data = None
+            stack.callback(conn.close)
+
+            event_data = event_data or self._event_data_expression(conn)
+            df = conn.execute(
+                f"""
+                SELECT
+                    id AS event_id,
+                    eventType AS event_type,
+                    timestamp,
+                    json_extract_string({event_data}, '$.sessionId') AS session_id,
+                    TRY_CAST(json_extract_string({event_data}, '$.duration') AS DOUBLE) AS duration_ms,
+                    CAST(sessionPerformanceScore AS DOUBLE) AS performance_score,
+                    TRY_CAST(json_extract_string({event_data}, '$.timeSpentMs') AS DOUBLE) AS time_spent_ms
+                FROM {relation}
+                WHERE {" AND ".join(conditions)}
+                ORDER BY timestamp
+                """,
+                params,
+            ).fetchdf()
+
+        return df[HISTORY_COLUMNS]
+
+    def _event_data_expression(self, conn) -> str:
+        """
+        SQL expression yielding eventData as JSON
+
+        The export writes eventData either as a JSON string or, when pyarrow
+        infers it from dicts, as a STRUCT/MAP column.
+        """
+        if self._event_data_sql is None:
+            row = conn.execute(
+                """
+                SELECT data_type FROM information_schema.columns
+                WHERE table_schema = 'research'
+                  AND table_name = 'behavioral_events'
+                  AND column_name = 'eventData'
+                """
+            ).fetchone()
+            if row is None:
+                self._event_data_sql = "CAST(NULL AS JSON)"
+            elif row[0].startswith(("STRUCT", "MAP")):
+                self._event_data_sql = "to_json(eventData)"
+            else:
+                self._event_data_sql = "TRY_CAST(eventData AS JSON)"
+        return self._event_data_sql
+
+
+# ==================== HELPERS ====================
+
+
+def _window_start(days: int) -> datetime:
+    """Naive UTC, like the stored event timestamps"""
+    return datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=days)
+
+
+def _empty_events() -> pd.DataFrame:
+    return pd.DataFrame({
+        "event_id": pd.Series(dtype=object),
+        "event_type": pd.Series(dtype=object),
+        "timestamp": pd.Series(dtype="datetime64[us]"),
+        "session_id": pd.Series(dtype=object),
+        "duration_ms": pd.Series(dtype=float),
+        "performance_score": pd.Series(dtype=float),
+        "time_spent_ms": pd.Series(dtype=float),
+    })
+
+
+def _max_timestamp(
+    events: pd.DataFrame, current: Optional[pd.Timestamp], window_start: datetime
+) -> pd.Timestamp:
+    """Newest loaded timestamp (window start if nothing was loaded yet)"""
+    candidates = [pd.Timestamp(window_start)]
+    if current is not None:
+        candidates.append(current)
+    if not events.empty:
+        candidates.append(events["timestamp"].max())
+    return max(candidates)
+
+
+def _derive_sessions(events: pd.DataFrame) -> pd.DataFrame:
+    """
+    Build one row per session from its lifecycle events
+
+    started_at is the first SESSION_STARTED; completed_at, duration and
+    score come from the last SESSION_ENDED (pauses also emit SESSION_ENDED,
+    so the final one wins). Missing start or duration is inferred from the
+    other two values.
+    """
+    lifecycle = events[events["session_id"].notna()]
+    is_start = lifecycle["event_type"] == SESSION_STARTED
+    is_end = lifecycle["event_type"] == SESSION_ENDED
+    if not (is_start.any() or is_end.any()):
+        return pd.DataFrame({
+            "session_id": pd.Series(dtype=object),
+            "started_at": pd.Series(dtype="datetime64[us]"),
+            "completed_at": pd.Series(dtype="datetime64[us]"),
+            "duration_ms": pd.Series(dtype=float),
+            "performance_score": pd.Series(dtype=float),
+        })
+
+    started = lifecycle[is_start].groupby("session_id")["timestamp"].min().rename("started_at")
+    ended = (
+        lifecycle[is_end]
+        .sort_values("timestamp", kind="stable")
+        .groupby("session_id")[["timestamp", "duration_ms", "performance_score"]]
+        .last()
+        .rename(columns={"timestamp": "completed_at"})
+    )
+    sessions = pd.concat([started, ended], axis=1)
+
+    elapsed_ms = (sessions["completed_at"] - sessions["started_at"]).dt.total_seconds() * 1000
+    sessions["duration_ms"] = sessions["duration_ms"].fillna(elapsed_ms)
+    sessions["started_at"] = sessions["started_at"].fillna(
+        sessions["completed_at"] - pd.to_timedelta(sessions["duration_ms"], unit="ms")
+    )
+
+    sessions = sessions.dropna(subset=["started_at"]).sort_values("started_at", kind="stable")
+    return sessions.rename_axis("session_id").reset_index()[SESSION_COLUMNS]
+
+
+# Global store instance (lake and reader lock attached at service startup)
+session_history_store = SessionHistoryStore()
+
+
+def get_session_history_store() -> SessionHistoryStore:
+    """Get global session history store instance"""
+    return session_history_store
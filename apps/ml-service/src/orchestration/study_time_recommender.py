@@ -9,16 +9,17 @@ Research-grade implementation with statistical rigor.
 """
 
 from typing import List, Dict, Any, Optional, Tuple
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import numpy as np
 import pandas as pd
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
+from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor, VotingRegressor
 from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import cross_val_score
 from scipy.stats import norm, pearsonr
 from scipy.optimize import minimize
 import logging
 
+from .model_evaluation import cross_validate_metrics
+
 logger = logging.getLogger(__name__)
 
 
@@ -79,7 +80,18 @@ class StudyTimeRecommender:
     - Precision@K for top-K recommendations
     """
 
-    def __init__(self):
+    def __init__(self, train_on_request: bool = True, cv_n_jobs: Optional[int] = None):
+        """
+        Args:
+            train_on_request: Fit models inside generate_recommendations when
+                untrained (disable when models are trained off the request
+                path, e.g. by ModelRegistry)
+            cv_n_jobs: Cross-validation folds fitted in parallel (default CV_N_JOBS)
+        """
+        self.train_on_request = train_on_request
+        self.cv_n_jobs = cv_n_jobs
+        self.cv_metrics: Dict[str, float] = {}
+
         self.rf_model = RandomForestRegressor(
             n_estimators=100,
             max_depth=10,
@@ -122,10 +134,16 @@ class StudyTimeRecommender:
         calendar_events: List[Dict[str, Any]],
         user_profile: Dict[str, Any],
         mission_id: Optional[str] = None,
+        slot_minutes: int = 60,
+        slot_duration_minutes: int = 60,
     ) -> List[TimeSlotRecommendation]:
         """
         Generate ML-powered time slot recommendations
 
+        All candidate slots are scored at once: one feature matrix, one
+        predict call per model and one calendar sweep, so finer slot
+        granularity only grows array sizes. Returned slots do not overlap.
+
         Args:
             user_id: User identifier
             target_date: Target date for recommendations
@@ -133,6 +151,8 @@ class StudyTimeRecommender:
             calendar_events: List of calendar events with [start, end, summary]
             user_profile: User learning profile with preferences
             mission_id: Optional mission context
+            slot_minutes: Spacing between candidate slot start times (e.g. 15)
+            slot_duration_minutes: Length of each candidate slot
 
         Returns:
             List of TimeSlotRecommendation sorted by predicted performance DESC
@@ -148,76 +168,93 @@ class StudyTimeRecommender:
             return self._generate_default_recommendations(target_date, calendar_events)
 
         # 2. Train model if not trained
-        if not self.is_trained and len(historical_sessions) >= 10:
-            self._train_model(historical_sessions)
+        if self.train_on_request and not self.is_trained and len(features_df) >= 10:
+            self._train_model(features_df)
+
+        # 3. Candidate slots: 6 AM to 10 PM starts
+        day_start = target_date.replace(hour=0, minute=0, second=0, microsecond=0)
+        offsets = np.arange(6 * 60, 23 * 60, slot_minutes)
+        hours = offsets // 60
+        start_times = [day_start + timedelta(minutes=int(m)) for m in offsets]
+        end_times = [t + timedelta(minutes=slot_duration_minutes) for t in start_times]
+
+        hour_stats = self._hour_statistics(target_date, features_df)
+        hour_counts = hour_stats["session_count"].reindex(hours, fill_value=0).to_numpy()
+
+        # 4. Predict performance for all slots at once
+        if self.is_trained:
+            X = self._create_feature_matrix(target_date, hours, features_df, hour_stats)
+            performance_scores = self._predict_performance_batch(X)
+            confidences = self._calculate_confidence_batch(features_df, hour_counts)
+        else:
+            # Use heuristics if not enough training data
+            performance_scores = self._heuristic_performance_scores(hours, hour_stats)
+            confidences = np.full(len(hours), min(0.6, len(features_df) / 20))
 
-        # 3. Predict performance for each hour
-        recommendations = []
+        # 5. Calendar conflicts (sorted interval sweep)
+        conflicts = self._sweep_calendar_conflicts(start_times, end_times, calendar_events)
+        has_conflict = np.array([c is not None for c in conflicts], dtype=bool)
 
-        for hour in range(6, 23):  # 6 AM to 10 PM
-            # Create feature vector for this hour
-            feature_vector = self._create_feature_vector(
-                target_date, hour, historical_sessions, user_profile
-            )
-
-            # Predict performance
-            if self.is_trained:
-                performance_score = self._predict_performance(feature_vector)
-                confidence = self._calculate_confidence(
-                    feature_vector, historical_sessions, hour
-                )
-            else:
-                # Use heuristics if not enough training data
-                performance_score = self._heuristic_performance_score(
-                    hour, historical_sessions
-                )
-                confidence = min(0.6, len(historical_sessions) / 20)
-
-            # Check calendar conflicts
-            start_time = target_date.replace(hour=hour, minute=0, second=0, microsecond=0)
-            end_time = start_time + timedelta(hours=1)
-            conflicts = self._check_calendar_conflicts(start_time, end_time, calendar_events)
-
-            # Build reasoning
-            reasoning = self._build_reasoning(
-                hour, performance_score, conflicts, historical_sessions, user_profile
-            )
+        # 6. Filter and rank
+        # Filter: confidence >= 0.5, no calendar conflicts (unless all slots conflict)
+        eligible = confidences >= 0.5
+        if (~has_conflict).sum() >= 3:
+            eligible &= ~has_conflict
+
+        candidates = np.flatnonzero(eligible)
+        order = np.argsort(-performance_scores[candidates], kind="stable")
+        top = self._select_non_overlapping(
+            offsets, candidates[order], slot_duration_minutes, k=5
+        )
 
-            # Get feature importance if model trained
-            feature_importance = {}
-            if self.is_trained:
-                feature_importance = dict(
-                    zip(self.feature_names, self.rf_model.feature_importances_)
-                )
+        feature_importance = (
+            dict(zip(self.feature_names, self.rf_model.feature_importances_))
+            if self.is_trained
+            else {}
+        )
 
-            recommendation = TimeSlotRecommendation(
-                start_time=start_time,
-                end_time=end_time,
-                duration_minutes=60,
-                performance_score=performance_score,
-                confidence=confidence,
-                reasoning=reasoning,
-                calendar_conflict=len(conflicts) > 0,
+        # Only the returned slots need reasoning / objects
+        return [
+            TimeSlotRecommendation(
+                start_time=start_times[i],
+                end_time=end_times[i],
+                duration_minutes=slot_duration_minutes,
+                performance_score=float(performance_scores[i]),
+                confidence=float(confidences[i]),
+                reasoning=self._build_reasoning(
+                    float(performance_scores[i]), int(hour_counts[i]), conflicts[i], user_profile
+                ),
+                calendar_conflict=bool(has_conflict[i]),
                 feature_importance=feature_importance,
             )
+            for i in top
+        ]
 
-            recommendations.append(recommendation)
-
-        # 4. Filter and rank
-        # Filter: confidence >= 0.5, no calendar conflicts (unless all slots conflict)
-        conflict_free = [r for r in recommendations if not r.calendar_conflict]
-
-        if len(conflict_free) >= 3:
-            filtered = [r for r in conflict_free if r.confidence >= 0.5]
-        else:
-            # If all slots have conflicts, keep best ones anyway
-            filtered = [r for r in recommendations if r.confidence >= 0.5]
+    def _select_non_overlapping(
+        self,
+        offsets: np.ndarray,
+        ranked: np.ndarray,
+        duration_minutes: int,
+        k: int,
+    ) -> List[int]:
+        """
+        Best-first pick of up to k slots that do not overlap each other
 
-        # Sort by performance score DESC
-        filtered.sort(key=lambda r: r.performance_score, reverse=True)
+        Features are per hour, so slots starting within the same hour score
+        the same; with slot_minutes < slot_duration_minutes this keeps them
+        from filling the top-k with overlapping copies of one window.
 
-        # Return top 3-5 recommendations
-        return filtered[:5]
+        Args:
+            offsets: Slot start (minutes after midnight) per slot
+            ranked: Candidate slot indices, best first
+        """
+        chosen: List[int] = []
+        for i in ranked:
+            if all(abs(offsets[i] - offsets[j]) >= duration_minutes for j in chosen):
+                chosen.append(int(i))
+                if len(chosen) == k:
+                    break
+        return chosen
 
     def _engineer_features(
         self,
@@ -234,9 +271,12 @@ class StudyTimeRecommender:
         - is_weekend: Binary weekend indicator
         - is_morning/afternoon/evening: Time-of-day indicators
         - recent_performance_trend: Moving average of last 5 sessions
-        - sessions_at_hour_last_7d: Recent sessions at this hour
-        - avg_performance_at_hour: Historical performance at this hour
+        - sessions_at_hour_last_7d: Earlier sessions at this hour in the prior 7 days
+        - avg_performance_at_hour: Mean performance of earlier sessions at this hour
         - time_since_last_session_hours: Recovery time
+
+        Hour statistics only use earlier sessions, matching what is known
+        when scoring a future slot.
         """
 
         if historical_sessions.empty:
@@ -276,80 +316,105 @@ class StudyTimeRecommender:
             historical_sessions["started_at"].diff().dt.total_seconds() / 3600
         ).fillna(24)
 
+        # Hour-specific history (earlier sessions only)
+        by_hour = historical_sessions.groupby("hour_of_day")
+        historical_sessions["avg_performance_at_hour"] = by_hour["performance_score"].transform(
+            lambda scores: scores.shift().expanding().mean()
+        ).fillna(75.0)
+        historical_sessions["sessions_at_hour_last_7d"] = (
+            historical_sessions.set_index("started_at")
+            .groupby("hour_of_day")["performance_score"]
+            .transform(lambda scores: scores.rolling("7D").count())
+            .to_numpy() - 1
+        )
+
         return historical_sessions
 
-    def _create_feature_vector(
+    def _hour_statistics(
+        self, target_date: datetime, historical_sessions: pd.DataFrame
+    ) -> pd.DataFrame:
+        """
+        Per-hour session statistics in a single groupby
+
+        Returns:
+            DataFrame indexed by hour_of_day with columns
+            [session_count, avg_performance, sessions_last_7d]
+        """
+        recent_cutoff = target_date - timedelta(days=7)
+        grouped = historical_sessions.assign(
+            is_recent=historical_sessions["started_at"] >= recent_cutoff
+        ).groupby("hour_of_day")
+
+        return pd.DataFrame({
+            "session_count": grouped.size(),
+            "avg_performance": grouped["performance_score"].mean(),
+            "sessions_last_7d": grouped["is_recent"].sum(),
+        })
+
+    def _create_feature_matrix(
         self,
         target_date: datetime,
-        hour: int,
+        hours: np.ndarray,
         historical_sessions: pd.DataFrame,
-        user_profile: Dict[str, Any],
+        hour_stats: pd.DataFrame,
     ) -> np.ndarray:
-        """Create feature vector for a specific hour on target date"""
+        """Create feature matrix (one row per candidate slot) on target date"""
 
         # Time-based features
         day_of_week = target_date.weekday()
         is_weekend = 1 if day_of_week >= 5 else 0
-        is_morning = 1 if 6 <= hour <= 11 else 0
-        is_afternoon = 1 if 12 <= hour <= 17 else 0
-        is_evening = 1 if 18 <= hour <= 22 else 0
-
-        # Historical performance at this hour
-        if not historical_sessions.empty:
-            hour_sessions = historical_sessions[
-                historical_sessions["hour_of_day"] == hour
-            ]
-            avg_performance_at_hour = (
-                hour_sessions["performance_score"].mean()
-                if len(hour_sessions) > 0
-                else 75.0
-            )
 
-            # Recent sessions at this hour (last 7 days)
-            recent_cutoff = target_date - timedelta(days=7)
-            recent_hour_sessions = hour_sessions[
-                hour_sessions["started_at"] >= recent_cutoff
-            ]
-            sessions_at_hour_last_7d = len(recent_hour_sessions)
-
-            # Recent performance trend
-            recent_performance_trend = (
-                historical_sessions["performance_score"]
-                .tail(5)
-                .mean()
-                if len(historical_sessions) >= 5
-                else 75.0
-            )
+        # Hour-independent history features
+        recent_performance_trend = (
+            historical_sessions["performance_score"].tail(5).mean()
+            if len(historical_sessions) >= 5
+            else 75.0
+        )
+        last_session = historical_sessions["started_at"].iloc[-1]
+        time_since_last_session_hours = (
+            target_date - last_session
+        ).total_seconds() / 3600
+
+        # Historical performance at each slot's hour
+        avg_performance_at_hour = (
+            hour_stats["avg_performance"].reindex(hours, fill_value=75.0).to_numpy()
+        )
+        sessions_at_hour_last_7d = (
+            hour_stats["sessions_last_7d"].reindex(hours, fill_value=0).to_numpy()
+        )
 
-            # Time since last session
-            if len(historical_sessions) > 0:
-                last_session = historical_sessions["started_at"].iloc[-1]
-                time_since_last_session_hours = (
-                    target_date - last_session
-                ).total_seconds() / 3600
-            else:
-                time_since_last_session_hours = 24.0
-        else:
-            avg_performance_at_hour = 75.0
-            sessions_at_hour_last_7d = 0
-            recent_performance_trend = 75.0
-            time_since_last_session_hours = 24.0
-
-        # Construct feature vector
-        features = np.array([
-            hour,
-            day_of_week,
-            is_weekend,
-            is_morning,
-            is_afternoon,
-            is_evening,
-            recent_performance_trend,
+        n = len(hours)
+        return np.column_stack([
+            hours,
+            np.full(n, day_of_week),
+            np.full(n, is_weekend),
+            (hours >= 6) & (hours <= 11),
+            (hours >= 12) & (hours <= 17),
+            (hours >= 18) & (hours <= 22),
+            np.full(n, recent_performance_trend),
             sessions_at_hour_last_7d,
             avg_performance_at_hour,
-            time_since_last_session_hours,
-        ])
+            np.full(n, time_since_last_session_hours),
+        ]).astype(float)
+
+    def train(self, historical_sessions: pd.DataFrame) -> bool:
+        """
+        Engineer features and fit the ensemble (off the request path)
+
+        Args:
+            historical_sessions: DataFrame with columns [started_at, performance_score, duration_ms]
+
+        Returns:
+            True if the models were trained
+        """
+        features_df = self._engineer_features(
+            datetime.now(), historical_sessions.copy(), {}
+        )
+        if len(features_df) < 10:
+            return False
 
-        return features
+        self._train_model(features_df)
+        return self.is_trained
 
     def _train_model(self, historical_sessions: pd.DataFrame) -> None:
         """
@@ -367,145 +432,165 @@ class StudyTimeRecommender:
             # Scale features
             X_scaled = self.scaler.fit_transform(X)
 
-            # Train Random Forest
+            # Train Random Forest and Gradient Boosting
             self.rf_model.fit(X_scaled, y)
-            rf_cv_score = cross_val_score(
-                self.rf_model, X_scaled, y, cv=5, scoring="r2"
-            ).mean()
-
-            # Train Gradient Boosting
             self.gb_model.fit(X_scaled, y)
-            gb_cv_score = cross_val_score(
-                self.gb_model, X_scaled, y, cv=5, scoring="r2"
-            ).mean()
-
             self.is_trained = True
 
+            # Cross-validate the served ensemble (one fit per fold, all metrics)
+            ensemble = VotingRegressor(
+                [("rf", self.rf_model), ("gb", self.gb_model)], weights=[0.6, 0.4]
+            )
+            cv_result = cross_validate_metrics(
+                ensemble, X_scaled, y,
+                scoring={"r2": "r2", "mae": "neg_mean_absolute_error"},
+                cv=5, n_jobs=self.cv_n_jobs,
+            )
+            self.cv_metrics = {
+                "r2_score": cv_result.mean("r2"),
+                "mae": -cv_result.mean("mae"),
+                **cv_result.timings(),
+            }
+
             logger.info(
-                f"Model trained - RF R²: {rf_cv_score:.3f}, GB R²: {gb_cv_score:.3f}"
+                f"Model trained - ensemble R²: {self.cv_metrics['r2_score']:.3f}, "
+                f"MAE: {self.cv_metrics['mae']:.2f}"
             )
 
         except Exception as e:
             logger.error(f"Model training failed: {e}")
             self.is_trained = False
 
-    def _predict_performance(self, feature_vector: np.ndarray) -> float:
+    def _predict_performance_batch(self, X: np.ndarray) -> np.ndarray:
         """
-        Predict performance score for a time slot (ensemble)
+        Predict performance scores for many time slots (ensemble)
 
         Uses weighted average of Random Forest and Gradient Boosting predictions
         """
 
         # Scale features
-        feature_vector_scaled = self.scaler.transform(feature_vector.reshape(1, -1))
-
-        # Get predictions from both models
-        rf_pred = self.rf_model.predict(feature_vector_scaled)[0]
-        gb_pred = self.gb_model.predict(feature_vector_scaled)[0]
+        X_scaled = self.scaler.transform(X)
 
         # Ensemble: weighted average (RF 0.6, GB 0.4)
-        ensemble_pred = 0.6 * rf_pred + 0.4 * gb_pred
+        ensemble_pred = 0.6 * self.rf_model.predict(X_scaled) + 0.4 * self.gb_model.predict(X_scaled)
 
         # Clip to valid range [0, 100]
-        return float(np.clip(ensemble_pred, 0, 100))
+        return np.clip(ensemble_pred, 0, 100)
 
-    def _calculate_confidence(
+    def _calculate_confidence_batch(
         self,
-        feature_vector: np.ndarray,
         historical_sessions: pd.DataFrame,
-        hour: int,
-    ) -> float:
+        hour_counts: np.ndarray,
+    ) -> np.ndarray:
         """
-        Calculate confidence score for prediction
+        Calculate confidence scores for predictions
 
         Factors:
         1. Sample size: More historical sessions = higher confidence
         2. Hour-specific data: More sessions at this hour = higher confidence
         3. Recent data: Recent sessions within 30 days boost confidence
-        4. Prediction consistency: Ensemble agreement boosts confidence
         """
 
         # Base confidence from sample size (max at 50 sessions)
         base_confidence = min(1.0, len(historical_sessions) / 50)
 
         # Hour-specific confidence boost
-        hour_sessions = historical_sessions[
-            historical_sessions["hour_of_day"] == hour
-        ]
-        hour_confidence = min(0.3, len(hour_sessions) / 10)
+        hour_confidence = np.minimum(0.3, hour_counts / 10)
 
         # Recency boost (last 30 days)
         recent_cutoff = datetime.now() - timedelta(days=30)
-        recent_sessions = historical_sessions[
-            historical_sessions["started_at"] >= recent_cutoff
-        ]
-        recency_confidence = min(0.2, len(recent_sessions) / 20)
+        recent_count = int((historical_sessions["started_at"] >= recent_cutoff).sum())
+        recency_confidence = min(0.2, recent_count / 20)
 
         # Total confidence
         confidence = base_confidence * 0.5 + hour_confidence + recency_confidence
 
-        return float(np.clip(confidence, 0.0, 1.0))
+        return np.clip(confidence, 0.0, 1.0)
 
-    def _heuristic_performance_score(
-        self, hour: int, historical_sessions: pd.DataFrame
-    ) -> float:
+    def _heuristic_performance_scores(
+        self, hours: np.ndarray, hour_stats: pd.DataFrame
+    ) -> np.ndarray:
         """
-        Heuristic performance score when not enough training data
+        Heuristic performance scores when not enough training data
 
         Based on:
         - General circadian rhythm research
-        - User's historical average at this hour
+        - User's historical average at each hour
         """
 
         # Default circadian curve (research-based)
-        circadian_scores = {
+        circadian_scores = pd.Series({
             6: 65, 7: 72, 8: 80, 9: 85, 10: 87, 11: 85,
             12: 80, 13: 75, 14: 72, 15: 70, 16: 75, 17: 80,
             18: 82, 19: 85, 20: 83, 21: 78, 22: 70,
-        }
+        }, dtype=float)
 
-        base_score = circadian_scores.get(hour, 75)
+        base_scores = circadian_scores.reindex(hours, fill_value=75.0).to_numpy()
 
-        # Adjust based on user's historical performance at this hour
-        if not historical_sessions.empty:
-            hour_sessions = historical_sessions[
-                historical_sessions["hour_of_day"] == hour
-            ]
-            if len(hour_sessions) > 0:
-                user_hour_avg = hour_sessions["performance_score"].mean()
-                # Blend: 70% user data, 30% general research
-                return 0.7 * user_hour_avg + 0.3 * base_score
+        # Blend: 70% user data, 30% general research (where user has data)
+        user_hour_avg = hour_stats["avg_performance"].reindex(hours).to_numpy()
+        return np.where(
+            np.isnan(user_hour_avg),
+            base_scores,
+            0.7 * user_hour_avg + 0.3 * base_scores,
+        )
 
-        return float(base_score)
+    def _sweep_calendar_conflicts(
+        self,
+        start_times: List[datetime],
+        end_times: List[datetime],
+        calendar_events: List[Dict],
+    ) -> List[Optional[Dict]]:
+        """
+        Find a conflicting calendar event for each time slot
 
-    def _check_calendar_conflicts(
-        self, start_time: datetime, end_time: datetime, calendar_events: List[Dict]
-    ) -> List[Dict]:
-        """Check if time slot conflicts with calendar events"""
+        Events are sorted by start once; for each slot, binary search finds
+        the events starting before the slot ends, and a running maximum of
+        event ends tells whether any of them is still ongoing at slot start.
+        O((slots + events) log events) instead of slots x events.
 
-        conflicts = []
+        Returns:
+            Per slot, one overlapping (non-cancelled) event or None
+        """
+
+        events = [e for e in calendar_events if e.get("status") != "cancelled"]
+        if not events:
+            return [None] * len(start_times)
+
+        event_starts = np.array([_to_epoch(e["start"]) for e in events])
+        event_ends = np.array([_to_epoch(e["end"]) for e in events])
+
+        order = np.argsort(event_starts, kind="stable")
+        sorted_starts = event_starts[order]
+        sorted_ends = event_ends[order]
+
+        # Running max of event end, and the latest event achieving it
+        running_max_end = np.maximum.accumulate(sorted_ends)
+        positions = np.arange(len(order))
+        running_argmax = np.maximum.accumulate(
+            np.where(sorted_ends == running_max_end, positions, 0)
+        )
 
-        for event in calendar_events:
-            event_start = datetime.fromisoformat(event["start"].replace("Z", "+00:00"))
-            event_end = datetime.fromisoformat(event["end"].replace("Z", "+00:00"))
+        slot_starts = np.array([_to_epoch(t) for t in start_times])
+        slot_ends = np.array([_to_epoch(t) for t in end_times])
 
-            # Check overlap
-            if (
-                (event_start >= start_time and event_start < end_time)
-                or (event_end > start_time and event_end <= end_time)
-                or (event_start <= start_time and event_end >= end_time)
-            ):
-                if event.get("status") != "cancelled":
-                    conflicts.append(event)
+        # Events with start < slot end
+        n_started = np.searchsorted(sorted_starts, slot_ends, side="left")
 
-        return conflicts
+        last = np.maximum(n_started - 1, 0)
+        overlaps = (n_started > 0) & (running_max_end[last] > slot_starts)
+        conflict_events = order[running_argmax[last]]
+
+        return [
+            events[event_idx] if overlap else None
+            for overlap, event_idx in zip(overlaps, conflict_events)
+        ]
 
     def _build_reasoning(
         self,
-        hour: int,
         performance_score: float,
-        conflicts: List[Dict],
-        historical_sessions: pd.DataFrame,
+        hour_session_count: int,
+        conflict: Optional[Dict],
         user_profile: Dict[str, Any],
     ) -> List[str]:
         """Build human-readable reasoning for recommendation"""
@@ -521,18 +606,14 @@ class StudyTimeRecommender:
             reasoning.append(f"Moderate performance predicted: {performance_score:.0f}%")
 
         # Historical data
-        if not historical_sessions.empty:
-            hour_sessions = historical_sessions[
-                historical_sessions["hour_of_day"] == hour
-            ]
-            if len(hour_sessions) > 0:
-                reasoning.append(
-                    f"Based on {len(hour_sessions)} historical sessions at this hour"
-                )
+        if hour_session_count > 0:
+            reasoning.append(
+                f"Based on {hour_session_count} historical sessions at this hour"
+            )
 
         # Calendar
-        if conflicts:
-            reasoning.append(f"Calendar conflict: {conflicts[0].get('summary', 'Busy')}")
+        if conflict:
+            reasoning.append(f"Calendar conflict: {conflict.get('summary', 'Busy')}")
         else:
             reasoning.append("Calendar available")
 
@@ -563,14 +644,18 @@ class StudyTimeRecommender:
             (18, 80, "Evening consolidation period (research-based)"),
         ]
 
-        recommendations = []
-
-        for hour, score, reason in defaults:
-            start_time = target_date.replace(hour=hour, minute=0, second=0, microsecond=0)
-            end_time = start_time + timedelta(hours=2)
+        start_times = [
+            target_date.replace(hour=hour, minute=0, second=0, microsecond=0)
+            for hour, _, _ in defaults
+        ]
+        end_times = [t + timedelta(hours=2) for t in start_times]
+        conflicts = self._sweep_calendar_conflicts(start_times, end_times, calendar_events)
 
-            conflicts = self._check_calendar_conflicts(start_time, end_time, calendar_events)
+        recommendations = []
 
+        for (hour, score, reason), start_time, end_time, conflict in zip(
+            defaults, start_times, end_times, conflicts
+        ):
             recommendation = TimeSlotRecommendation(
                 start_time=start_time,
                 end_time=end_time,
@@ -580,9 +665,9 @@ class StudyTimeRecommender:
                 reasoning=[
                     reason,
                     "Complete 6+ weeks of sessions to unlock personalized timing",
-                    "Calendar available" if not conflicts else f"Calendar conflict: {conflicts[0].get('summary')}",
+                    "Calendar available" if not conflict else f"Calendar conflict: {conflict.get('summary')}",
                 ],
-                calendar_conflict=len(conflicts) > 0,
+                calendar_conflict=conflict is not None,
             )
 
             recommendations.append(recommendation)
@@ -628,3 +713,12 @@ class StudyTimeRecommender:
             "mae": float(mae),
             "precision_at_3": float(precision_at_3),
         }
+
+
+def _to_epoch(value: Any) -> float:
+    """Convert ISO string / datetime to epoch seconds (naive values treated as UTC)"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
@@ -0,0 +1,120 @@
+"""
+Test chunked Arrow validation of behavioral events.
+
+ADR-006: Research Analytics Infrastructure
+"""
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from app.schemas import (
+    BehavioralEventSchema,
+    ChunkedEventValidator,
+    ChunkValidationError,
+    validate_with_report,
+)
+
+
+def make_events(n: int = 200) -> pd.DataFrame:
+    now = pd.Timestamp.now().floor("s")
+    return pd.DataFrame({
+        "id": [f"c{i:024d}" for i in range(n)],
+        "userId": [f"c{i % 7:024d}" for i in range(n)],
+        "eventType": ["CARD_REVIEWED"] * n,
+        "eventData": [{"cardId": i} for i in range(n)],
+        "timestamp": [now - pd.Timedelta(minutes=i) for i in range(n)],
+        "sessionPerformanceScore": [float(i % 100) for i in range(n)],
+        "experimentPhase": [None] * n,
+        "contextMetadataId": [None] * n,
+    })
+
+
+def make_invalid_events() -> pd.DataFrame:
+    df = make_events()
+    df.loc[3, "id"] = "not-a-cuid"
+    df.loc[50, "eventType"] = "UNKNOWN_EVENT"
+    df.loc[120, "sessionPerformanceScore"] = 150.0
+    df.loc[150, "experimentPhase"] = "baseline_1"
+    df.loc[199, "timestamp"] = pd.Timestamp.now() + pd.Timedelta(days=2)
+    return df
+
+
+def batches(df: pd.DataFrame, size: int = 64):
+    table = pa.Table.from_pandas(df.drop(columns="eventData"), preserve_index=False)
+    return table.to_batches(max_chunksize=size)
+
+
+class TestChunkedEventValidator:
+    """Verify Arrow checks agree with BehavioralEventSchema across chunks."""
+
+    def test_valid_events_pass(self):
+        """Test valid record batches produce no failures."""
+        validator = ChunkedEventValidator(strict=True)
+        for batch in batches(make_events()):
+            assert validator.validate(batch).true_count == batch.num_rows
+
+        assert validator.report.passed
+        assert validator.report.chunks == 4
+        assert validator.report.total_rows == 200
+
+    def test_failures_match_pandera(self):
+        """Test failing rows (with stream indexes) equal Pandera's failure cases."""
+        df = make_invalid_events()
+        validator = ChunkedEventValidator()
+        for batch in batches(df):
+            validator.validate(batch)
+
+        _, pandera_report = validate_with_report(df.copy())
+        pandera_rows = {error["index"] for error in pandera_report["errors"]}
+        arrow_rows = {error["index"] for error in validator.report.to_dict()["errors"]}
+
+        assert arrow_rows == pandera_rows == {3, 50, 120, 150, 199}
+        assert validator.report.invalid_rows == 5
+        assert validator.report.valid_rows == 195
+
+    def test_dataframe_chunks(self):
+        """Test DataFrame chunks (dict eventData) validate like Arrow batches."""
+        df = make_invalid_events()
+        df.loc[10, "eventData"] = None
+        validator = ChunkedEventValidator()
+        masks = [validator.validate(df.iloc[i:i + 64]) for i in range(0, len(df), 64)]
+
+        failures = {(c.column, c.check): c.failed_rows for c in validator.report.failures()}
+        assert failures[("eventData", "not_nullable")] == 1
+        assert failures[("eventType", "isin")] == 1
+        assert sum(mask.false_count for mask in masks) == 6
+
+    def test_sampling_limits_regex_checks(self):
+        """Test regex checks cover only the sampled rows; cheap checks cover all."""
+        validator = ChunkedEventValidator(sample_rate=0.25)
+        for batch in batches(make_events(4000), size=1000):
+            validator.validate(batch)
+
+        checks = validator.report.to_dict()["checks"]
+        assert 800 < checks["id:str_matches"]["checked_rows"] < 1200
+        assert checks["eventType:isin"]["checked_rows"] == 4000
+
+    def test_strict_raises_with_report(self):
+        """Test strict mode stops at the first failing chunk."""
+        validator = ChunkedEventValidator(strict=True)
+        with pytest.raises(ChunkValidationError) as exc_info:
+            for batch in batches(make_invalid_events()):
+                validator.validate(batch)
+
+        assert exc_info.value.report.chunks == 1
+        assert exc_info.value.report.failures()[0].examples == [(3, "not-a-cuid")]
+
+    def test_every_schema_check_has_arrow_equivalent(self):
+        """Test the validator covers every BehavioralEventSchema check."""
+        schema = BehavioralEventSchema.to_schema()
+        validator = ChunkedEventValidator()
+
+        expected = sum(len(column.checks) for column in schema.columns.values())
+        assert sum(len(rule.checks) for rule in validator.rules) == expected
+        assert len(validator.table_checks) == len(schema.checks)
+
+    def test_invalid_sample_rate(self):
+        """Test sample_rate outside (0, 1] is rejected."""
+        with pytest.raises(ValueError):
+            ChunkedEventValidator(sample_rate=0)
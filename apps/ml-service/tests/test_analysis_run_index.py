@@ -0,0 +1,79 @@
+"""
+Analysis Run Index Unit Tests
+
+Tests for the SQLite index behind the ITS/ABAB history endpoints:
+recording, per-user/type filtering and keyset pagination.
+"""
+
+import pytest
+
+from app.services.analysis_run_index import ABAB, ITS, AnalysisRunIndex
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = AnalysisRunIndex(str(tmp_path / "runs.db"))
+    for i in range(5):
+        index.record(
+            run_id=f"its-{i}",
+            analysis_type=ITS,
+            user_id="user-1",
+            start_time=1_000 + i,
+            end_time=2_000 + i,
+            params={"intervention_date": f"2025-10-0{i + 1}"},
+            metrics={"max_rhat": 1.0, "immediate_effect": float(i)},
+        )
+    index.record("abab-0", ABAB, "user-1", 1_000, None, {"protocol_id": "p1"}, {"p_value": 0.01},
+                 tags={"wwc_rating": "Meets Standards"})
+    index.record("its-other", ITS, "user-2", 5_000, None, {}, {})
+    return index
+
+
+@pytest.mark.unit
+class TestAnalysisRunIndex:
+    """Test AnalysisRunIndex behaviour."""
+
+    def test_newest_first_per_user_and_type(self, index):
+        """Test runs are filtered by user and type and sorted newest first."""
+        page = index.list_runs("user-1", ITS, limit=10)
+
+        assert [run.run_id for run in page.runs] == [f"its-{i}" for i in range(4, -1, -1)]
+        assert page.next_cursor is None
+        assert page.runs[0].metrics["immediate_effect"] == 4.0
+
+    def test_keyset_pagination(self, index):
+        """Test following next_cursor visits every run exactly once."""
+        seen, cursor = [], None
+        while True:
+            page = index.list_runs("user-1", ITS, limit=2, cursor=cursor)
+            seen.extend(run.run_id for run in page.runs)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        assert seen == [f"its-{i}" for i in range(4, -1, -1)]
+
+    def test_offset_pagination(self, index):
+        """Test offset is still supported without a cursor."""
+        page = index.list_runs("user-1", ITS, limit=2, offset=3)
+
+        assert [run.run_id for run in page.runs] == ["its-1", "its-0"]
+
+    def test_record_replaces_existing_run(self, index):
+        """Test re-recording a run (e.g. backfill) does not duplicate it."""
+        index.record("abab-0", ABAB, "user-1", 1_000, None, {}, {"p_value": 0.2})
+
+        runs = index.list_runs("user-1", ABAB).runs
+        assert len(runs) == 1
+        assert runs[0].metrics == {"p_value": 0.2}
+
+    def test_invalid_cursor(self, index):
+        """Test a malformed cursor raises ValueError."""
+        with pytest.raises(ValueError):
+            index.list_runs("user-1", ITS, cursor="not-a-cursor")
+
+    def test_delete_user(self, index):
+        """Test deleting a user's runs leaves other users untouched."""
+        assert index.delete_user("user-1") == 6
+        assert index.list_runs("user-1", ITS).runs == []
+        assert index.get("its-other") is not None
@@ -0,0 +1,172 @@
+"""
+Tests for Bandit Simulation Harness
+
+Covers:
+- Scenario construction and validation
+- Seeded reproducibility across in-process and process-pool runs
+- Regret curves, confidence bands and throughput reporting
+- Non-stationary and contextual scenarios
+
+Author: Americano ML Subsystem
+Story: 5.5 - Adaptive Personalization Engine (Task 9)
+"""
+
+import pytest
+import numpy as np
+
+from app.services.bandit_simulation import (
+    RewardScenario,
+    simulate_bandits,
+    run_single_replication,
+    POLICY_NAMES,
+)
+from app.services.multi_armed_bandit import StrategyType, outcome_feedback
+
+
+# ==================== FIXTURES ====================
+
+@pytest.fixture
+def scenario():
+    """Stationary scenario where BALANCED is clearly best."""
+    return RewardScenario.from_distributions({
+        StrategyType.PATTERN_HEAVY: (0.5, 0.1),
+        StrategyType.PREDICTION_HEAVY: (0.45, 0.1),
+        StrategyType.BALANCED: (0.85, 0.05),
+        StrategyType.CONSERVATIVE: 0.4,
+    })
+
+
+# ==================== SCENARIO TESTS ====================
+
+def test_from_distributions_names_and_defaults(scenario):
+    """Test enum keys are named by value and bare means get default std."""
+    assert scenario.arm_names == ['pattern_heavy', 'prediction_heavy', 'balanced', 'conservative']
+    assert scenario.stds[3] == pytest.approx(0.1)
+    assert scenario.is_stationary
+
+
+def test_scenario_validates_change_points():
+    """Test change points must provide one mean per arm."""
+    with pytest.raises(ValueError):
+        RewardScenario(
+            arm_names=['a', 'b'], means=[0.5, 0.6], stds=[0.1, 0.1],
+            change_points={10: [0.5]}
+        )
+
+
+def test_unknown_policy_rejected(scenario):
+    """Test unknown policy names raise ValueError."""
+    with pytest.raises(ValueError):
+        simulate_bandits(scenario, policies=['ucb1'], n_rounds=10, n_replications=2)
+
+
+# ==================== SIMULATION TESTS ====================
+
+def test_simulation_reports_regret_bands(scenario):
+    """Test results include regret curve, band and throughput per policy."""
+    results = simulate_bandits(scenario, n_rounds=200, n_replications=20, seed=1)
+
+    for name in POLICY_NAMES:
+        curve = results[name]['cumulative_regret']
+        assert len(curve['mean']) == 200
+        assert np.all(np.array(curve['lower']) <= np.array(curve['mean']))
+        assert np.all(np.array(curve['mean']) <= np.array(curve['upper']))
+        # Cumulative pseudo-regret never decreases
+        assert np.all(np.diff(curve['mean']) >= -1e-12)
+        assert results[name]['decisions_per_sec'] > 0
+
+    assert results['summary']['n_replications'] == 20
+
+
+def test_simulation_is_seeded(scenario):
+    """Test identical seeds reproduce identical regret curves."""
+    first = simulate_bandits(scenario, n_rounds=100, n_replications=8, seed=123)
+    second = simulate_bandits(scenario, n_rounds=100, n_replications=8, seed=123)
+
+    for name in POLICY_NAMES:
+        assert first[name]['cumulative_regret']['mean'] == second[name]['cumulative_regret']['mean']
+
+
+def test_process_pool_matches_replication_count(scenario):
+    """Test process pool runs split replications across workers."""
+    results = simulate_bandits(
+        scenario, policies=['thompson_sampling'], n_rounds=50,
+        n_replications=6, seed=5, n_jobs=2
+    )
+
+    assert results['summary']['n_jobs'] == 2
+    counts = results['thompson_sampling']['best_strategy_counts']
+    assert sum(counts.values()) == 6
+
+
+def test_policies_identify_best_strategy(scenario):
+    """Test learning policies find the best arm in most replications."""
+    results = simulate_bandits(scenario, n_rounds=300, n_replications=30, seed=9)
+
+    assert results['thompson_sampling']['best_strategy_rate'] >= 0.9
+    assert results['epsilon_greedy']['best_strategy_rate'] >= 0.8
+
+
+def test_abrupt_change_scenario(scenario):
+    """Test non-stationary scenarios accumulate regret after a change point."""
+    scenario.change_points = {100: np.array([0.9, 0.45, 0.3, 0.4])}
+    results = simulate_bandits(
+        scenario, policies=['epsilon_greedy'], n_rounds=200, n_replications=10, seed=3
+    )
+
+    curve = np.array(results['epsilon_greedy']['cumulative_regret']['mean'])
+    assert curve[-1] - curve[100] > curve[99] - curve[0]
+    assert results['epsilon_greedy']['best_strategy_rate'] is None
+
+
+def test_contextual_scenario_favours_linucb():
+    """Test LinUCB beats context-free policies when rewards depend on context."""
+    scenario = RewardScenario(
+        arm_names=['a', 'b'],
+        means=[0.5, 0.5],
+        stds=[0.05, 0.05],
+        context_weights=[[0.8], [-0.8]],
+    )
+    results = simulate_bandits(scenario, n_rounds=300, n_replications=10, seed=11)
+
+    assert results['summary']['ranking'][0] == 'linucb'
+
+
+def test_run_single_replication_shapes(scenario):
+    """Test single replication returns raw per-round arrays."""
+    runs = run_single_replication(scenario, ['epsilon_greedy'], n_rounds=50, seed=0)
+
+    assert runs['epsilon_greedy']['rewards'].shape == (50,)
+    assert runs['epsilon_greedy']['cumulative_regret'].shape == (50,)
+    assert 0 <= runs['epsilon_greedy']['best_arm'] < 4
+    assert runs['epsilon_greedy']['arms'].shape == (50,)
+
+
+def test_feedback_transforms_learning_signal(scenario):
+    """Test policies learn from feedback(observed) while raw rewards are reported."""
+    plain = run_single_replication(scenario, ['thompson_sampling'], n_rounds=200, seed=3)
+    inverted = run_single_replication(
+        scenario, ['thompson_sampling'], n_rounds=200, seed=3,
+        feedback=lambda rewards: 1.0 - rewards
+    )
+
+    # Rewarded for low rewards, the policy ends up preferring a worse arm
+    assert plain['thompson_sampling']['best_arm'] == 2
+    assert inverted['thompson_sampling']['rewards'].mean() < plain['thompson_sampling']['rewards'].mean()
+
+
+def test_simulate_bandits_passes_feedback_to_chunks(scenario):
+    """Test simulate_bandits feeds the transformed signal to every chunk, in-process or pooled."""
+    kwargs = dict(policies=['thompson_sampling'], n_rounds=100, n_replications=4, seed=5)
+    plain = simulate_bandits(scenario, **kwargs)
+    inverted = simulate_bandits(scenario, feedback=lambda rewards: 1.0 - rewards, **kwargs)
+
+    assert (inverted['thompson_sampling']['final_regret']['mean']
+            > plain['thompson_sampling']['final_regret']['mean'])
+    assert plain['summary']['feedback'] is None
+
+    in_process = simulate_bandits(scenario, feedback=outcome_feedback, n_jobs=1, **kwargs)
+    pooled = simulate_bandits(scenario, feedback=outcome_feedback, n_jobs=2, **kwargs)
+    assert pooled['summary']['feedback'] == 'outcome_feedback'
+    assert in_process['thompson_sampling']['avg_reward'] != plain['thompson_sampling']['avg_reward']
+    assert pooled['thompson_sampling']['final_regret']['mean'] > 0
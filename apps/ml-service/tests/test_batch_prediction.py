@@ -0,0 +1,90 @@
+"""
+Batch Prediction Unit Tests
+
+Tests that StrugglePredictionModel.predict_batch matches per-row predict()
+for both the rule-based and logistic regression paths.
+"""
+
+import pytest
+import numpy as np
+from datetime import datetime
+
+from app.services.struggle_prediction_model import (
+    StrugglePredictionModel,
+    TrainingExample,
+)
+from app.services.struggle_feature_extractor import FeatureVector
+
+
+def _feature_vector(row: np.ndarray, quality: float) -> FeatureVector:
+    values = dict(zip(FeatureVector.feature_names(), row.tolist()))
+    return FeatureVector(**values, data_quality=quality, extracted_at=datetime.utcnow())
+
+
+@pytest.fixture
+def feature_matrix():
+    """Random normalized features covering all risk branches."""
+    rng = np.random.default_rng(7)
+    X = rng.random((300, len(FeatureVector.feature_names())))
+    quality = rng.random(300)
+    return X, quality
+
+
+@pytest.mark.unit
+@pytest.mark.ml
+class TestPredictBatch:
+    """Test vectorized batch inference."""
+
+    def test_rule_based_matches_predict(self, feature_matrix):
+        """Test rule-based batch results equal per-row predictions."""
+        X, quality = feature_matrix
+        model = StrugglePredictionModel()
+
+        batch = model.predict_batch(X, data_quality=quality)
+
+        assert set(batch.risk_levels) == {"LOW", "MEDIUM", "HIGH"}
+        for i, result in enumerate(batch.to_results()):
+            expected = model.predict(_feature_vector(X[i], quality[i]))
+            assert result.probability == pytest.approx(expected.probability)
+            assert result.confidence == pytest.approx(expected.confidence)
+            assert result.risk_level == expected.risk_level
+            assert result.contributing_features == pytest.approx(expected.contributing_features)
+            assert result.reasoning == expected.reasoning
+
+    def test_ml_matches_predict(self, feature_matrix):
+        """Test logistic regression batch results equal per-row predictions."""
+        X, quality = feature_matrix
+        y = (X[:, 0] < 0.5) | (X[:, 5] > 0.7)
+        model = StrugglePredictionModel()
+        model.train([
+            TrainingExample(
+                features=_feature_vector(X[i], quality[i]), struggled=bool(y[i]),
+                user_id="user-1", objective_id=f"obj-{i}", recorded_at=datetime.utcnow(),
+            )
+            for i in range(len(X))
+        ], calibrate=False)
+
+        batch = model.predict_batch(X, data_quality=quality, top_k=3)
+
+        assert batch.top_feature_indices.shape == (300, 3)
+        for i in range(0, 300, 17):
+            expected = model.predict(_feature_vector(X[i], quality[i]))
+            assert batch.probabilities[i] == pytest.approx(expected.probability)
+            assert batch.confidences[i] == pytest.approx(expected.confidence)
+            assert batch.risk_levels[i] == expected.risk_level
+            top3 = dict(list(expected.contributing_features.items())[:3])
+            assert batch.contributing_features(i) == pytest.approx(top3)
+
+    def test_invalid_shape_rejected(self):
+        """Test feature matrices with the wrong width raise ValueError."""
+        with pytest.raises(ValueError):
+            StrugglePredictionModel().predict_batch(np.zeros((4, 3)))
+
+    def test_empty_batch(self):
+        """Test empty matrix yields empty results."""
+        batch = StrugglePredictionModel().predict_batch(
+            np.empty((0, len(FeatureVector.feature_names())))
+        )
+
+        assert len(batch) == 0
+        assert batch.to_results() == []
@@ -0,0 +1,176 @@
+"""
+Bulk Feature Extraction Unit Tests
+
+Tests for the set-based StruggleFeatureExtractor path using an in-memory
+stand-in for the Prisma client, so query counts can be asserted.
+"""
+
+import pytest
+import numpy as np
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+from app.services.struggle_feature_extractor import StruggleFeatureExtractor, FeatureVector
+from app.utils.feature_cache import FeatureCache
+
+
+class Record(SimpleNamespace):
+    """Prisma-like record with attribute access and model_dump()."""
+
+    def model_dump(self, **kwargs):
+        return dict(vars(self))
+
+
+def _utc(days: float) -> datetime:
+    return datetime.now(timezone.utc) + timedelta(days=days)
+
+
+def _objective(oid: str, course: str, complexity: str = "INTERMEDIATE",
+               mastery: str = "BEGINNER", text: str = "Explain renal physiology",
+               last_studied=None) -> Record:
+    return Record(
+        id=oid, objective=text, complexity=complexity, masteryLevel=mastery,
+        lastStudiedAt=last_studied, lecture=Record(courseId=course, userId="user-1"),
+    )
+
+
+def _fake_db(n_objectives: int = 200) -> SimpleNamespace:
+    """Build a fake Prisma client for one user with n objectives over two courses."""
+    objectives = [
+        _objective(f"obj-{i}", "course-a" if i % 2 == 0 else "course-b",
+                   complexity="ADVANCED" if i % 3 == 0 else "BASIC",
+                   last_studied=_utc(-6) if i % 2 == 0 else None)
+        for i in range(n_objectives)
+    ]
+    prereq_target = _objective("prereq-1", "course-a", mastery="MASTERED")
+    prereq_gap = _objective("prereq-2", "course-a", mastery="NOT_STARTED")
+
+    def find_objectives(where, include=None):
+        if "id" in where:
+            ids = set(where["id"]["in"])
+            return [o for o in objectives if o.id in ids]
+        return objectives + [prereq_target, prereq_gap]
+
+    reviews = [
+        Record(rating="AGAIN", card=Record(objectiveId="obj-0")),
+        Record(rating="GOOD", card=Record(objectiveId="obj-0")),
+        Record(rating="GOOD", card=Record(objectiveId="obj-1")),
+    ]
+    prerequisites = [
+        Record(objectiveId="obj-0", prerequisite=prereq_target),
+        Record(objectiveId="obj-0", prerequisite=prereq_gap),
+    ]
+    metrics = [
+        Record(learningObjectiveId="obj-0", retentionScore=0.8, date=_utc(-3)),
+        Record(learningObjectiveId="obj-2", retentionScore=0.6, date=_utc(-2)),
+        Record(learningObjectiveId="obj-4", retentionScore=0.4, date=_utc(-1)),
+    ]
+    exams = [Record(courseId="course-a", date=_utc(45))]
+    patterns = [
+        Record(patternType="STRUGGLE_TOPIC", patternData={"topicArea": "course-b"}, confidence=0.9),
+    ]
+    profile = Record(learningStyleProfile={"visual": 0.7, "kinesthetic": 0.1})
+
+    return SimpleNamespace(
+        learningobjective=SimpleNamespace(find_many=AsyncMock(side_effect=find_objectives)),
+        objectiveprerequisite=SimpleNamespace(find_many=AsyncMock(return_value=prerequisites)),
+        review=SimpleNamespace(find_many=AsyncMock(return_value=reviews)),
+        performancemetric=SimpleNamespace(find_many=AsyncMock(return_value=metrics)),
+        exam=SimpleNamespace(find_many=AsyncMock(return_value=exams)),
+        userlearningprofile=SimpleNamespace(find_unique=AsyncMock(return_value=profile)),
+        behavioralpattern=SimpleNamespace(find_many=AsyncMock(return_value=patterns)),
+        cognitiveloadmetric=SimpleNamespace(find_first=AsyncMock(return_value=Record(loadScore=80.0))),
+    )
+
+
+def _query_count(db: SimpleNamespace) -> int:
+    return sum(
+        method.await_count
+        for table in vars(db).values()
+        for method in vars(table).values()
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.ml
+class TestBulkFeatureExtraction:
+    """Test set-based feature extraction."""
+
+    @pytest.mark.asyncio
+    async def test_query_count_independent_of_batch_size(self):
+        """Test 200 objectives cost a fixed handful of queries."""
+        db = _fake_db(200)
+        extractor = StruggleFeatureExtractor(db, cache=FeatureCache())
+
+        ids, X, quality = await extractor.extract_feature_matrix(
+            "user-1", [f"obj-{i}" for i in range(200)]
+        )
+
+        assert len(ids) == 200
+        assert X.shape == (200, 15)
+        assert quality.shape == (200,)
+        assert _query_count(db) <= 10
+
+    @pytest.mark.asyncio
+    async def test_feature_values(self):
+        """Test bulk features follow the per-objective feature definitions."""
+        db = _fake_db(6)
+        extractor = StruggleFeatureExtractor(db, cache=FeatureCache())
+
+        vectors = await extractor.extract_features_for_objectives(
+            "user-1", ["obj-0", "obj-1", "missing"]
+        )
+
+        assert set(vectors) == {"obj-0", "obj-1"}
+        fv0, fv1 = vectors["obj-0"], vectors["obj-1"]
+
+        # Retention is the course-a average; scores decline 0.8 -> 0.4
+        assert fv0.retention_score == pytest.approx(0.6)
+        assert fv0.retention_decline_rate == pytest.approx(1.0)
+        assert fv1.retention_score == pytest.approx(0.5)  # No metrics for course-b
+
+        # 1 of 2 reviews lapsed; no reviews defaults to neutral
+        assert fv0.review_lapse_rate == pytest.approx(0.5)
+        assert fv1.review_lapse_rate == pytest.approx(0.0)
+
+        # One mastered, one not-started prerequisite
+        assert fv0.prerequisite_gap_count == pytest.approx(0.5)
+        assert fv0.prerequisite_mastery_gap == pytest.approx(0.5)
+        assert fv1.prerequisite_gap_count == 0.0
+
+        assert fv0.content_complexity == pytest.approx(0.9)
+        assert fv1.content_complexity == pytest.approx(0.3)
+
+        assert fv1.historical_struggle_score == pytest.approx(0.9)
+        assert fv0.content_type_mismatch == pytest.approx(0.6)  # text vs. visual
+        assert fv0.cognitive_load_indicator == pytest.approx(0.8)
+
+        assert fv0.days_until_exam == pytest.approx(1.0 - 44 / 90, abs=0.02)
+        assert fv1.days_until_exam == 0.5
+        assert fv0.days_since_last_study == pytest.approx(6 / 30, abs=0.04)
+        assert fv1.days_since_last_study == 0.5
+
+    @pytest.mark.asyncio
+    async def test_values_normalized(self):
+        """Test all bulk feature values are in [0, 1]."""
+        extractor = StruggleFeatureExtractor(_fake_db(50), cache=FeatureCache())
+
+        _, X, quality = await extractor.extract_feature_matrix(
+            "user-1", [f"obj-{i}" for i in range(50)]
+        )
+
+        assert np.all((X >= 0) & (X <= 1))
+        assert np.all((quality >= 0) & (quality <= 1))
+
+    @pytest.mark.asyncio
+    async def test_empty_batch(self):
+        """Test empty batch returns empty matrix without querying."""
+        db = _fake_db(4)
+        extractor = StruggleFeatureExtractor(db, cache=FeatureCache())
+
+        ids, X, _ = await extractor.extract_feature_matrix("user-1", [])
+
+        assert ids == []
+        assert X.shape == (0, len(FeatureVector.feature_names()))
+        assert _query_count(db) == 0
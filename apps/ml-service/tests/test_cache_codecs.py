@@ -0,0 +1,95 @@
+"""
+Cache Codec Unit Tests
+
+Tests for the RedisCache value codecs: round trips across serializers and
+compression, float buffer packing and legacy JSON values.
+"""
+
+import json
+import numpy as np
+import pytest
+from pydantic import BaseModel
+
+from app.utils.cache_codecs import CacheCodec, HAVE_ORJSON
+
+
+class Result(BaseModel):
+    user_id: str
+    p_value: float
+    distribution: list[float]
+
+
+@pytest.mark.unit
+class TestCacheCodec:
+    """Test CacheCodec encoding."""
+
+    @pytest.mark.parametrize("serializer", ["json"] + (["orjson"] if HAVE_ORJSON else []))
+    @pytest.mark.parametrize("compression", ["none", "zlib"])
+    def test_round_trip(self, serializer, compression):
+        """Test values survive every serializer/compression pair."""
+        codec = CacheCodec(serializer=serializer, compression=compression)
+        value = {
+            "scores": [0.5] * 200,
+            "counts": list(range(200)),
+            "nested": [{"mean": 1.5, "values": [1.0, 2.0]}],
+            "label": "treatment",
+            "missing": None,
+        }
+
+        data, _ = codec.encode(value)
+
+        assert CacheCodec().decode(data) == value
+
+    def test_float_lists_stored_as_buffers(self):
+        """Test long float lists are much smaller than their JSON text."""
+        codec = CacheCodec(compression="none")
+        result = Result(
+            user_id="user-1",
+            p_value=0.03,
+            distribution=np.random.default_rng(0).normal(size=5000).tolist(),
+        )
+
+        data, stats = codec.encode(result)
+
+        assert stats.stored_bytes < len(result.model_dump_json()) / 2
+        assert Result(**codec.decode(data)) == result
+
+    def test_numpy_arrays_decode_to_lists(self):
+        """Test float ndarrays are encoded and decoded as lists."""
+        codec = CacheCodec()
+        data, _ = codec.encode({"x": np.linspace(0, 1, 100)})
+
+        assert codec.decode(data) == {"x": np.linspace(0, 1, 100).tolist()}
+
+    def test_bytes_round_trip(self):
+        """Test bytes values (rendered plots) are stored raw and restored as bytes."""
+        codec = CacheCodec()
+        image = bytes(range(256)) * 8
+
+        data, stats = codec.encode(image)
+
+        assert codec.decode(data) == image
+        assert stats.raw_bytes < len(image) + 64
+
+    def test_compression_threshold(self):
+        """Test small payloads are stored uncompressed."""
+        codec = CacheCodec(compression="zlib", compress_min_bytes=1024)
+
+        _, small = codec.encode({"a": 1})
+        _, large = codec.encode({"text": "abc" * 1000})
+
+        assert not small.compressed
+        assert large.compressed
+        assert large.stored_bytes < large.raw_bytes
+
+    def test_legacy_json_values(self):
+        """Test JSON text cached before codecs is still readable."""
+        codec = CacheCodec()
+
+        assert codec.decode(json.dumps({"a": [1, 2]}).encode()) == {"a": [1, 2]}
+
+    def test_unavailable_backend_rejected(self):
+        """Test unknown compression raises."""
+        with pytest.raises(ValueError):
+            CacheCodec(compression="brotli")
+
@@ -0,0 +1,112 @@
+"""
+Cognitive Load Trend Unit Tests
+
+Tests for the single-pass daily trend in CognitiveLoadAnalyzer and the
+trend_days option of POST /api/v1/orchestration/cognitive-load.
+"""
+
+from datetime import date, datetime, timedelta
+
+import httpx
+import pandas as pd
+import pytest
+from fastapi import FastAPI
+
+from src.api import orchestration_routes
+from src.orchestration.cognitive_load_analyzer import CognitiveLoadAnalyzer
+
+
+END_DATE = date(2026, 3, 14)
+
+
+def make_sessions(days_ago: list, tz=None) -> pd.DataFrame:
+    """One 90-minute session at 10:00 on each of the given days before END_DATE."""
+    started = pd.to_datetime(
+        [datetime.combine(END_DATE - timedelta(days=d), datetime.min.time()) + timedelta(hours=10)
+         for d in days_ago]
+    )
+    if tz is not None:
+        started = started.tz_localize(tz)
+    return pd.DataFrame({
+        "session_id": [f"s{i}" for i in range(len(days_ago))],
+        "started_at": started,
+        "completed_at": started + pd.Timedelta(minutes=90),
+        "duration_ms": 90 * 60 * 1000,
+        "performance_score": 70.0,
+    })
+
+
+def make_events(sessions: pd.DataFrame) -> pd.DataFrame:
+    """One pause per session, at its start."""
+    return pd.DataFrame({
+        "event_type": "SESSION_PAUSED",
+        "timestamp": sessions["started_at"],
+        "session_id": sessions["session_id"],
+        "event_data": [{} for _ in range(len(sessions))],
+    })
+
+
+@pytest.mark.unit
+class TestCognitiveLoadTrend:
+    """Test daily trend features and the route's trend window."""
+
+    def test_tz_aware_timestamps_match_naive(self):
+        """Test tz-aware sessions and events are bucketed into the same days as naive ones."""
+        analyzer = CognitiveLoadAnalyzer()
+        naive = make_sessions([4, 3, 2, 1, 0])
+        aware = make_sessions([4, 3, 2, 1, 0], tz="UTC")
+
+        naive_features = analyzer._extract_daily_features(
+            naive, [], make_events(naive), {}, days=7, end_date=END_DATE
+        )
+        aware_features = analyzer._extract_daily_features(
+            aware, [], make_events(aware), {}, days=7, end_date=END_DATE
+        )
+
+        assert naive_features["session_count"].tolist() == [0, 0, 1, 1, 1, 1, 1]
+        pd.testing.assert_frame_equal(aware_features, naive_features)
+
+    def test_iso_z_strings(self):
+        """Test ISO strings with a Z suffix (JSON payloads) keep their calendar date."""
+        analyzer = CognitiveLoadAnalyzer()
+        sessions = make_sessions([1, 0])
+        sessions["started_at"] = sessions["started_at"].dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+        features = analyzer._extract_daily_features(
+            sessions, [], pd.DataFrame(), {}, days=3, end_date=END_DATE
+        )
+
+        assert features["session_count"].tolist() == [0, 1, 1]
+        assert features["consecutive_study_days"].tolist() == [0, 1, 2]
+
+    async def test_route_passes_trend_days(self, monkeypatch):
+        """Test trend_days sets the trend length and loads history for the longer window."""
+        today = datetime.now().date()
+        offset = (END_DATE - today).days
+        sessions = make_sessions([d + offset for d in (20, 10, 1)])
+        requested = []
+
+        class FakeHistory:
+            async def get_sessions(self, user_id, days=7):
+                requested.append(("sessions", days))
+                return sessions[sessions["started_at"] >= pd.Timestamp(today - timedelta(days=days))]
+
+            async def get_events(self, user_id, days=7):
+                requested.append(("events", days))
+                return pd.DataFrame()
+
+        monkeypatch.setattr(orchestration_routes, "get_session_history_store", FakeHistory)
+        app = FastAPI()
+        app.include_router(orchestration_routes.router)
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+        response = await client.post(
+            "/api/v1/orchestration/cognitive-load",
+            json={"user_id": "user-1", "recent_days": 7, "trend_days": 30},
+        )
+
+        assert response.status_code == 200, response.text
+        trend = response.json()["trend"]
+        assert len(trend) == 30
+        assert sum(score > 0 for score in trend) == 3
+        assert ("sessions", 30) in requested and ("events", 30) in requested
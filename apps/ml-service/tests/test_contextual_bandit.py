@@ -0,0 +1,222 @@
+"""
+Tests for Contextual Bandit (LinUCB / Linear Thompson Sampling)
+
+Covers:
+- Context construction from FeatureVector and learning profile
+- Sherman-Morrison inverse updates
+- Context-dependent strategy selection and convergence
+- Persistence and serialization
+
+Author: Americano ML Subsystem
+Story: 5.5 - Adaptive Personalization Engine (Task 9)
+"""
+
+import pytest
+import numpy as np
+from datetime import datetime
+import tempfile
+import os
+
+from app.services.contextual_bandit import (
+    ContextualBandit,
+    build_context,
+    CONTEXT_DIM,
+    CONTEXT_FEATURE_NAMES,
+)
+from app.services.multi_armed_bandit import StrategyType, StrategyOutcome
+from app.services.struggle_feature_extractor import FeatureVector
+
+
+# ==================== FIXTURES ====================
+
+def _feature_vector(retention: float) -> FeatureVector:
+    """Create a feature vector with the given retention score."""
+    return FeatureVector(
+        retention_score=retention,
+        retention_decline_rate=0.1,
+        review_lapse_rate=0.2,
+        session_performance_score=0.6,
+        validation_score=0.7,
+        prerequisite_gap_count=0.0,
+        prerequisite_mastery_gap=0.1,
+        content_complexity=0.6,
+        complexity_mismatch=0.0,
+        historical_struggle_score=0.0,
+        content_type_mismatch=0.0,
+        cognitive_load_indicator=0.4,
+        days_until_exam=0.5,
+        days_since_last_study=0.2,
+        workload_level=0.3,
+        extracted_at=datetime.utcnow(),
+        data_quality=0.8,
+    )
+
+
+@pytest.fixture
+def bandit():
+    """Create fresh contextual bandit with fixed seed."""
+    return ContextualBandit(alpha=1.0, random_state=42)
+
+
+@pytest.fixture
+def context():
+    """Create context for an average learner."""
+    profile = {
+        'learningStyleProfile': {'visual': 0.4, 'auditory': 0.1, 'kinesthetic': 0.3, 'reading': 0.2},
+        'optimalSessionDuration': 45,
+        'dataQualityScore': 0.7,
+    }
+    return build_context(_feature_vector(0.6), profile)
+
+
+# ==================== CONTEXT TESTS ====================
+
+def test_build_context_dimensions(context):
+    """Test context combines features, profile and bias term."""
+    assert context.shape == (CONTEXT_DIM,)
+    assert len(CONTEXT_FEATURE_NAMES) == CONTEXT_DIM
+    assert context[-1] == 1.0  # Bias
+    assert context[0] == pytest.approx(0.6)  # retention_score
+
+
+def test_build_context_without_profile():
+    """Test context falls back to neutral profile values."""
+    context = build_context(_feature_vector(0.6))
+
+    assert context.shape == (CONTEXT_DIM,)
+    assert np.all((context >= 0) & (context <= 1))
+
+
+def test_build_context_rejects_wrong_length():
+    """Test context construction validates feature length."""
+    with pytest.raises(ValueError):
+        build_context(np.zeros(10))
+
+
+# ==================== UPDATE TESTS ====================
+
+def test_sherman_morrison_matches_direct_inverse(bandit):
+    """Test incremental inverse matches explicit matrix inversion."""
+    rng = np.random.default_rng(0)
+    strategy = StrategyType.BALANCED
+    A = np.eye(CONTEXT_DIM) * bandit.ridge_lambda
+
+    for _ in range(30):
+        x = rng.random(CONTEXT_DIM)
+        A += np.outer(x, x)
+        bandit.update(strategy, rng.random(), x)
+
+    np.testing.assert_allclose(
+        bandit.arms[strategy].A_inv, np.linalg.inv(A), rtol=1e-6, atol=1e-9
+    )
+
+
+def test_update_accepts_strategy_outcome(bandit, context):
+    """Test update converts StrategyOutcome to reward."""
+    outcome = StrategyOutcome(
+        retention_improvement=0.2,
+        performance_improvement=0.1,
+        completion_rate=0.9
+    )
+    bandit.update(StrategyType.BALANCED, outcome, context)
+
+    arm = bandit.arms[StrategyType.BALANCED]
+    assert arm.total_pulls == 1
+    assert arm.avg_reward == pytest.approx(outcome.to_reward())
+    assert isinstance(arm.last_used_at, datetime)
+
+
+def test_update_rejects_wrong_context(bandit):
+    """Test update validates context dimension."""
+    with pytest.raises(ValueError):
+        bandit.update(StrategyType.BALANCED, 0.5, np.ones(3))
+
+
+# ==================== SELECTION TESTS ====================
+
+@pytest.mark.parametrize("algorithm", ["linucb", "linear_thompson"])
+def test_learns_context_dependent_strategy(algorithm):
+    """Test bandit learns different best strategies for different contexts."""
+    bandit = ContextualBandit(alpha=0.5, random_state=7)
+    rng = np.random.default_rng(7)
+
+    low_retention = build_context(_feature_vector(0.2))
+    high_retention = build_context(_feature_vector(0.9))
+
+    def reward(strategy: StrategyType, retention: float) -> float:
+        # CONSERVATIVE helps struggling learners, PREDICTION_HEAVY strong ones
+        if strategy == StrategyType.CONSERVATIVE:
+            mean = 0.9 - 0.6 * retention
+        elif strategy == StrategyType.PREDICTION_HEAVY:
+            mean = 0.2 + 0.7 * retention
+        else:
+            mean = 0.4
+        return float(np.clip(rng.normal(mean, 0.05), 0, 1))
+
+    for i in range(400):
+        retention = 0.2 if i % 2 == 0 else 0.9
+        context = low_retention if retention == 0.2 else high_retention
+        strategy = bandit.select_strategy(context, algorithm)
+        bandit.update(strategy, reward(strategy, retention), context)
+
+    assert bandit.get_strategy_ranking(low_retention)[0][0] == StrategyType.CONSERVATIVE
+    assert bandit.get_strategy_ranking(high_retention)[0][0] == StrategyType.PREDICTION_HEAVY
+
+
+def test_linucb_explores_untried_arms(bandit, context):
+    """Test LinUCB tries every arm before exploiting."""
+    selections = []
+    for _ in range(len(StrategyType)):
+        strategy = bandit.select_strategy(context, "linucb")
+        bandit.update(strategy, 0.5, context)
+        selections.append(strategy)
+
+    assert set(selections) == set(StrategyType)
+
+
+# ==================== STATISTICS TESTS ====================
+
+def test_get_statistics(bandit, context):
+    """Test statistics report pulls per strategy."""
+    bandit.update(StrategyType.BALANCED, 0.8, context)
+    stats = bandit.get_statistics()
+
+    assert stats['total_pulls'] == 1
+    assert stats['context_dim'] == CONTEXT_DIM
+    assert stats['strategies']['balanced']['total_pulls'] == 1
+
+
+def test_get_feature_weights(bandit, context):
+    """Test feature weights are keyed by context feature names."""
+    bandit.update(StrategyType.BALANCED, 0.8, context)
+    weights = bandit.get_feature_weights()
+
+    assert set(weights[StrategyType.BALANCED].keys()) == set(CONTEXT_FEATURE_NAMES)
+
+
+# ==================== PERSISTENCE TESTS ====================
+
+def test_save_and_load_json(bandit, context):
+    """Test bandit saves and loads from JSON correctly."""
+    for strategy in StrategyType:
+        bandit.update(strategy, 0.6, context)
+
+    with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.json') as f:
+        filepath = f.name
+
+    try:
+        bandit.save_json(filepath)
+        loaded = ContextualBandit.load_json(filepath)
+
+        assert loaded.alpha == bandit.alpha
+        for strategy in StrategyType:
+            np.testing.assert_allclose(loaded.arms[strategy].A_inv, bandit.arms[strategy].A_inv)
+            np.testing.assert_allclose(loaded.arms[strategy].b, bandit.arms[strategy].b)
+            assert loaded.arms[strategy].total_pulls == 1
+
+        assert loaded.get_expected_rewards(context) == pytest.approx(
+            bandit.get_expected_rewards(context)
+        )
+    finally:
+        if os.path.exists(filepath):
+            os.remove(filepath)
@@ -4,9 +4,11 @@ Detection Engine Unit Tests
 Tests for StruggleDetectionEngine core functionality.
 """
 
+import asyncio
 import pytest
 from unittest.mock import Mock, AsyncMock, patch
 from datetime import datetime, timedelta
+from types import SimpleNamespace
 from typing import Dict, Any
 
 # Import detection engine components from ml-service
@@ -295,3 +297,192 @@ class TestDetectionEngineEdgeCases:
         indicators = await engine.analyze_current_struggles(test_user["user_id"])
 
         assert isinstance(indicators, list)
+
+
+class Record(SimpleNamespace):
+    """Prisma-like record with attribute access and model_dump()."""
+
+    def model_dump(self, **kwargs):
+        return dict(vars(self))
+
+
+def _pipeline_db(n_objectives: int, bad_ids=()) -> SimpleNamespace:
+    """
+    Fake Prisma client for run_predictions: one mission listing n objectives
+    and an in-memory StrugglePrediction table (objectives in bad_ids have no
+    lecture, which breaks feature extraction).
+    """
+    objectives = [
+        Record(
+            id=f"obj-{i}", objective="Explain renal physiology", complexity="ADVANCED",
+            masteryLevel="NOT_STARTED", lastStudiedAt=None,
+            lecture=None if f"obj-{i}" in bad_ids else Record(courseId=f"course-{i % 2}", userId="user-1"),
+        )
+        for i in range(n_objectives)
+    ]
+    mission = Record(objectives=[{"objectiveId": o.id} for o in objectives])
+    stored = []
+
+    def find_objectives(where, include=None, **kwargs):
+        if "id" in where and "in" in where["id"]:
+            ids = set(where["id"]["in"])
+            return [o for o in objectives if o.id in ids]
+        if "id" in where:  # unscheduled objectives
+            return []
+        return [o for o in objectives if o.lecture is not None]
+
+    def create_many(data):
+        stored.extend(data)
+        return len(data)
+
+    def find_predictions(where, order=None):
+        return [
+            Record(**row) for row in stored
+            if row["predictedAt"] == where["predictedAt"]
+            and row["predictedStruggleProbability"] > where["predictedStruggleProbability"]["gt"]
+        ]
+
+    return SimpleNamespace(
+        stored=stored,
+        mission=SimpleNamespace(find_many=AsyncMock(return_value=[mission])),
+        learningobjective=SimpleNamespace(find_many=AsyncMock(side_effect=find_objectives)),
+        objectiveprerequisite=SimpleNamespace(find_many=AsyncMock(return_value=[])),
+        review=SimpleNamespace(find_many=AsyncMock(return_value=[])),
+        performancemetric=SimpleNamespace(find_many=AsyncMock(return_value=[])),
+        exam=SimpleNamespace(find_many=AsyncMock(return_value=[])),
+        userlearningprofile=SimpleNamespace(find_unique=AsyncMock(return_value=None)),
+        behavioralpattern=SimpleNamespace(find_many=AsyncMock(return_value=[])),
+        cognitiveloadmetric=SimpleNamespace(find_first=AsyncMock(return_value=Record(loadScore=90.0))),
+        struggleprediction=SimpleNamespace(
+            create_many=AsyncMock(side_effect=create_many),
+            create=AsyncMock(side_effect=lambda data: stored.append(data)),
+            find_many=AsyncMock(side_effect=find_predictions),
+        ),
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.ml
+class TestRunPredictionsPipeline:
+    """Test chunked scoring and inserts in run_predictions with a fake Prisma client."""
+
+    @pytest.mark.asyncio
+    async def test_chunks_written_and_read_back(self):
+        """Test every chunk is stored with a millisecond predictedAt that finds the rows again."""
+        db = _pipeline_db(25)
+        engine = StruggleDetectionEngine(db, chunk_size=10)
+
+        predictions = await engine.run_predictions("user-1")
+
+        assert len(db.stored) == 25
+        assert db.struggleprediction.create_many.await_count == 3
+        predicted_at = db.stored[0]["predictedAt"]
+        assert predicted_at.microsecond % 1000 == 0
+        assert {row["topicId"] for row in db.stored} == {"course-0", "course-1"}
+        assert len(predictions) == sum(
+            row["predictedStruggleProbability"] > 0.5 for row in db.stored
+        )
+
+    @pytest.mark.asyncio
+    async def test_objectives_fetched_once_per_chunk(self):
+        """Test topic IDs come from feature extraction rather than a second objective query."""
+        db = _pipeline_db(10)
+        engine = StruggleDetectionEngine(db, chunk_size=10)
+
+        await engine.run_predictions("user-1")
+
+        by_id_queries = [
+            call for call in db.learningobjective.find_many.await_args_list
+            if "in" in call.kwargs["where"].get("id", {})
+        ]
+        assert len(by_id_queries) == 1
+
+    @pytest.mark.asyncio
+    async def test_failing_objective_isolated(self):
+        """Test an objective that breaks scoring only drops its own prediction."""
+        db = _pipeline_db(10, bad_ids={"obj-3"})
+        engine = StruggleDetectionEngine(db, chunk_size=10)
+
+        await engine.run_predictions("user-1")
+
+        stored_ids = {row["learningObjectiveId"] for row in db.stored}
+        assert len(stored_ids) == 9
+        assert "obj-3" not in stored_ids
+
+    @pytest.mark.asyncio
+    async def test_failing_chunk_bisected(self):
+        """Test a failing chunk is bisected instead of re-scored one objective at a time."""
+        db = _pipeline_db(16, bad_ids={"obj-5"})
+        engine = StruggleDetectionEngine(db, chunk_size=16)
+        extract = engine.feature_extractor.extract_feature_matrix
+        calls = []
+
+        async def counting_extract(user_id, objective_ids, **kwargs):
+            calls.append(list(objective_ids))
+            return await extract(user_id, objective_ids, **kwargs)
+
+        engine.feature_extractor.extract_feature_matrix = counting_extract
+        await engine.run_predictions("user-1")
+
+        # Whole chunk, then both halves at each of log2(16) levels
+        assert len(calls) == 1 + 2 * 4
+        assert len(db.stored) == 15
+
+    @pytest.mark.asyncio
+    async def test_extracted_at_is_extraction_time(self):
+        """Test featureVector.extracted_at records when features were extracted."""
+        db = _pipeline_db(3)
+        engine = StruggleDetectionEngine(db)
+        extract = engine.feature_extractor.extract_feature_matrix
+
+        async def slow_extract(user_id, objective_ids, **kwargs):
+            await asyncio.sleep(0.02)
+            return await extract(user_id, objective_ids, **kwargs)
+
+        engine.feature_extractor.extract_feature_matrix = slow_extract
+        await engine.run_predictions("user-1")
+
+        row = db.stored[0]
+        extracted_at = datetime.fromisoformat(row["featureVector"]["extracted_at"])
+        assert extracted_at - row["predictedAt"] >= timedelta(milliseconds=20)
+
+    @pytest.mark.asyncio
+    async def test_failed_bulk_insert_falls_back_to_rows(self):
+        """Test a rejected create_many is retried row by row."""
+        db = _pipeline_db(5)
+        db.struggleprediction.create_many.side_effect = RuntimeError("constraint violation")
+        engine = StruggleDetectionEngine(db)
+
+        await engine.run_predictions("user-1")
+
+        assert db.struggleprediction.create.await_count == 5
+        assert len(db.stored) == 5
+
+    @pytest.mark.asyncio
+    async def test_pending_insert_awaited_when_scoring_raises(self):
+        """Test the insert in flight finishes before a scoring error propagates."""
+        db = _pipeline_db(20)
+        insert_finished = []
+
+        async def slow_create_many(data):
+            await asyncio.sleep(0.05)
+            insert_finished.append(len(data))
+            return len(data)
+
+        db.struggleprediction.create_many.side_effect = slow_create_many
+        engine = StruggleDetectionEngine(db, chunk_size=10)
+        score_chunk = engine._score_chunk
+        calls = []
+
+        async def failing_second_chunk(*args):
+            calls.append(args)
+            if len(calls) == 2:
+                raise RuntimeError("model unavailable")
+            return await score_chunk(*args)
+
+        engine._score_chunk = failing_second_chunk
+
+        with pytest.raises(RuntimeError, match="model unavailable"):
+            await engine.run_predictions("user-1")
+
+        assert insert_finished == [10]
@@ -0,0 +1,291 @@
+"""
+Event Ingestion Unit Tests
+
+Tests for POST /events/ingest: validation, micro-batch flushes to the event
+lake and DuckDB, and backpressure when the queue is full.
+"""
+
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta
+
+import duckdb
+import httpx
+import pandas as pd
+import pytest
+from fastapi import FastAPI
+
+from app.routes import ingestion
+from app.services import event_ingestion
+from app.services.event_ingestion import EventIngestor
+from app.services.event_lake import EventLake
+from app.services.outcome_rollups import ROLLUP_TABLE
+from app.utils.file_lock import file_lock, lock_path
+
+
+def make_events(n: int, offset: int = 0) -> list:
+    now = datetime.utcnow().replace(microsecond=0)
+    return [
+        {
+            "id": f"c{offset + i:024d}",
+            "userId": f"c{i % 3:024d}",
+            "eventType": "SESSION_ENDED",
+            "eventData": {"sessionId": f"s{i}"},
+            "timestamp": (now - timedelta(minutes=i)).isoformat() + "Z",
+            "sessionPerformanceScore": i % 100,
+        }
+        for i in range(n)
+    ]
+
+
+@pytest.fixture
+def make_ingestor(tmp_path, monkeypatch):
+    def make(**kwargs) -> EventIngestor:
+        ingestor = EventIngestor(
+            lake=EventLake(str(tmp_path / "lake"), user_buckets=4),
+            duckdb_path=str(tmp_path / "analytics.duckdb"),
+            **kwargs,
+        )
+        monkeypatch.setattr(event_ingestion, "event_ingestor", ingestor)
+        return ingestor
+
+    return make
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(ingestion.router)
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.fixture
+def local_timezone(monkeypatch):
+    """Run the test with the process time zone set to the given TZ name."""
+    def set_tz(name: str) -> None:
+        monkeypatch.setenv("TZ", name)
+        time.tzset()
+
+    yield set_tz
+    monkeypatch.undo()
+    time.tzset()
+
+
+async def wait_for_flushes(ingestor: EventIngestor, flushes: int, timeout: float = 10.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while ingestor.stats()["flushes"] < flushes:
+        assert asyncio.get_running_loop().time() < deadline, ingestor.stats()
+        await asyncio.sleep(0.02)
+
+
+def count_rows(path: str, table: str) -> int:
+    conn = duckdb.connect(path, read_only=True)
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+@pytest.mark.unit
+class TestEventIngestion:
+    """Test the ingestion endpoint and micro-batch flushing."""
+
+    async def test_flush_on_row_threshold(self, make_ingestor, client):
+        """Test a full micro-batch is written to the lake, DuckDB and rollups."""
+        ingestor = make_ingestor(flush_rows=100, flush_ms=60_000)
+        await ingestor.start()
+        try:
+            response = await client.post("/events/ingest", json={"events": make_events(60)})
+            assert response.status_code == 202
+            assert response.json() == {"accepted": 60, "pending_rows": 60}
+
+            await client.post("/events/ingest", json={"events": make_events(60, offset=60)})
+            await wait_for_flushes(ingestor, 1)
+        finally:
+            await ingestor.stop()
+
+        assert ingestor.stats()["flushed_rows"] == 120
+        assert ingestor.stats()["pending_rows"] == 0
+        assert count_rows(ingestor.duckdb_path, "research.behavioral_events") == 120
+        assert count_rows(ingestor.duckdb_path, ROLLUP_TABLE) >= 3
+        relation, params = ingestor.lake.scan_sql()
+        assert duckdb.connect().execute(f"SELECT COUNT(*) FROM {relation}", params).fetchone()[0] == 120
+
+    async def test_flush_on_interval(self, make_ingestor, client):
+        """Test queued rows are flushed after flush_ms without reaching flush_rows."""
+        ingestor = make_ingestor(flush_rows=10_000, flush_ms=50)
+        await ingestor.start()
+        try:
+            await client.post("/events/ingest", json={"events": make_events(5)})
+            await wait_for_flushes(ingestor, 1)
+        finally:
+            await ingestor.stop()
+
+        assert count_rows(ingestor.duckdb_path, "research.behavioral_events") == 5
+
+    async def test_backpressure_when_queue_full(self, make_ingestor, client):
+        """Test batches beyond max_queued_rows get 429 with Retry-After."""
+        ingestor = make_ingestor(flush_rows=10_000, flush_ms=60_000, max_queued_rows=100)
+        await ingestor.start()
+        try:
+            accepted = await client.post("/events/ingest", json={"events": make_events(80)})
+            rejected = await client.post("/events/ingest", json={"events": make_events(30, offset=80)})
+        finally:
+            await ingestor.stop()
+
+        assert accepted.status_code == 202
+        assert rejected.status_code == 429
+        assert rejected.headers["Retry-After"] == "60"
+        assert ingestor.stats()["rejected_rows"] == 30
+        # stop() drains the queue
+        assert count_rows(ingestor.duckdb_path, "research.behavioral_events") == 80
+
+    async def test_invalid_events_rejected(self, make_ingestor, client):
+        """Test enum and schema violations return 422 and queue nothing."""
+        ingestor = make_ingestor(flush_ms=60_000)
+        await ingestor.start()
+        try:
+            bad_type = make_events(2)
+            bad_type[1]["eventType"] = "NOT_AN_EVENT"
+            no_metadata = make_events(2)
+            no_metadata[0]["experimentPhase"] = "baseline_1"
+
+            enum_response = await client.post("/events/ingest", json={"events": bad_type})
+            schema_response = await client.post("/events/ingest", json={"events": no_metadata})
+        finally:
+            await ingestor.stop()
+
+        assert enum_response.status_code == 422
+        assert schema_response.status_code == 422
+        assert schema_response.json()["detail"][0]["check"] == "experiment_phase_requires_metadata"
+        assert ingestor.stats()["accepted_rows"] == 0
+
+    @pytest.mark.parametrize("tz", ["UTC", "America/Los_Angeles", "Asia/Tokyo"])
+    async def test_recent_events_accepted_in_any_server_time_zone(
+        self, make_ingestor, client, local_timezone, tz
+    ):
+        """Test the timestamp bounds compare naive UTC events against UTC now."""
+        local_timezone(tz)
+        ingestor = make_ingestor(flush_ms=60_000)
+        await ingestor.start()
+        try:
+            events = make_events(1)
+            events[0]["timestamp"] = (datetime.utcnow() - timedelta(minutes=5)).isoformat() + "Z"
+            response = await client.post("/events/ingest", json={"events": events})
+        finally:
+            await ingestor.stop()
+
+        assert response.status_code == 202, response.text
+
+    @pytest.mark.parametrize("age,check", [
+        (timedelta(days=6 * 365), "timestamp_reasonable"),
+        (timedelta(hours=-2), "timestamp_not_future"),
+    ])
+    async def test_out_of_range_timestamps_rejected(
+        self, make_ingestor, client, local_timezone, age, check
+    ):
+        """Test too old and future timestamps are a 422 with a JSON failure case."""
+        local_timezone("UTC")
+        ingestor = make_ingestor(flush_ms=60_000)
+        await ingestor.start()
+        try:
+            events = make_events(1)
+            timestamp = (datetime.utcnow() - age).replace(microsecond=0)
+            events[0]["timestamp"] = timestamp.isoformat() + "Z"
+            response = await client.post("/events/ingest", json={"events": events})
+        finally:
+            await ingestor.stop()
+
+        assert response.status_code == 422
+        error = response.json()["detail"][0]
+        assert error["check"] == check
+        assert error["failure_case"] == timestamp.isoformat()
+
+    async def test_not_running(self, make_ingestor, client):
+        """Test 503 when the flush task has not been started."""
+        make_ingestor()
+        response = await client.post("/events/ingest", json={"events": make_events(1)})
+        assert response.status_code == 503
+
+    async def test_duplicate_ids_in_batch_written_once(self, make_ingestor):
+        """Test a retried event in the same micro-batch is written once."""
+        ingestor = make_ingestor(flush_ms=60_000)
+        await ingestor.start()
+        events = make_events(10)
+        ingestor.submit(pd.DataFrame(events[:6]))
+        ingestor.submit(pd.DataFrame(events[4:]))
+        await ingestor.stop()
+
+        assert count_rows(ingestor.duckdb_path, "research.behavioral_events") == 10
+
+    async def test_retry_after_duckdb_failure_is_idempotent(self, make_ingestor, monkeypatch):
+        """Test a flush whose DuckDB step fails is retried without duplicating lake rows."""
+        ingestor = make_ingestor(flush_ms=60_000)
+        await ingestor.start()
+        ingestor.submit(pd.DataFrame(make_events(10)))
+
+        connect = event_ingestion.duckdb.connect
+        calls = {"n": 0}
+
+        def flaky_connect(*args, **kwargs):
+            calls["n"] += 1
+            if calls["n"] == 1:
+                raise duckdb.IOException("database is locked")
+            return connect(*args, **kwargs)
+
+        monkeypatch.setattr(event_ingestion.duckdb, "connect", flaky_connect)
+        assert await ingestor.flush() == 0
+        assert ingestor.stats()["flush_errors"] == 1
+        assert await ingestor.flush() == 10
+        monkeypatch.setattr(event_ingestion.duckdb, "connect", connect)
+        await ingestor.stop()
+
+        relation, params = ingestor.lake.scan_sql()
+        lake_rows, lake_ids = duckdb.connect().execute(
+            f"SELECT COUNT(*), COUNT(DISTINCT id) FROM {relation}", params
+        ).fetchone()
+        assert (lake_rows, lake_ids) == (10, 10)
+        assert count_rows(ingestor.duckdb_path, "research.behavioral_events") == 10
+        assert ingestor.stats()["pending_rows"] == 0
+
+    async def test_insert_skips_existing_ids(self, make_ingestor):
+        """Test events already in DuckDB (e.g. from the export sync) are not inserted again."""
+        ingestor = make_ingestor(flush_ms=60_000)
+        await ingestor.start()
+        ingestor.submit(pd.DataFrame(make_events(10)))
+        await ingestor.flush()
+        ingestor.submit(pd.DataFrame(make_events(15)))
+        await ingestor.stop()
+
+        assert count_rows(ingestor.duckdb_path, "research.behavioral_events") == 15
+
+    async def test_reposted_batch_not_duplicated_in_lake(self, make_ingestor):
+        """Test a client re-posting events in a later batch adds no lake rows for them."""
+        ingestor = make_ingestor(flush_ms=60_000)
+        await ingestor.start()
+        ingestor.submit(pd.DataFrame(make_events(10)))
+        await ingestor.flush()
+        ingestor.submit(pd.DataFrame(make_events(15)))
+        await ingestor.stop()
+
+        relation, params = ingestor.lake.scan_sql()
+        lake_rows, lake_ids = duckdb.connect().execute(
+            f"SELECT COUNT(*), COUNT(DISTINCT id) FROM {relation}", params
+        ).fetchone()
+        assert (lake_rows, lake_ids) == (15, 15)
+
+    async def test_waits_for_other_writer(self, make_ingestor):
+        """Test a flush backs off while another process holds the DuckDB write lock."""
+        ingestor = make_ingestor(flush_ms=60_000)
+        ingestor.lock_timeout = 0.1
+        await ingestor.start()
+        ingestor.submit(pd.DataFrame(make_events(5)))
+
+        with file_lock(lock_path(ingestor.duckdb_path)):
+            assert await ingestor.flush() == 0
+        assert await ingestor.flush() == 5
+        await ingestor.stop()
+
+        assert ingestor.stats()["flush_errors"] == 1
+        assert count_rows(ingestor.duckdb_path, "research.behavioral_events") == 5
@@ -0,0 +1,107 @@
+"""
+Event Lake Unit Tests
+
+Tests for the Hive-partitioned Parquet event lake: partitioned appends,
+id de-duplication, compaction and partition-pruned reads.
+"""
+
+from datetime import datetime, timedelta
+
+import duckdb
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from app.services.event_lake import EventLake, user_bucket
+
+START = datetime(2025, 9, 1)
+
+
+def make_events(n: int = 600, offset: int = 0, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "id": [f"c{offset + i:024d}" for i in range(n)],
+        "userId": [f"cuser{i % 6:020d}" for i in range(n)],
+        "eventType": rng.choice(["SESSION_ENDED", "CARD_REVIEWED"], n),
+        "eventData": [{"sessionId": f"s{i % 10}"} for i in range(n)],
+        "timestamp": [START + timedelta(minutes=int(m)) for m in rng.integers(0, 5 * 24 * 60, n)],
+        "sessionPerformanceScore": rng.integers(0, 100, n).astype(float),
+    })
+
+
+@pytest.fixture
+def lake(tmp_path):
+    return EventLake(str(tmp_path / "lake"), user_buckets=4)
+
+
+@pytest.mark.unit
+class TestEventLake:
+    """Test EventLake storage and reads."""
+
+    def test_append_partitions_and_sorts(self, lake):
+        """Test rows land in date/user_bucket directories, sorted by user and time."""
+        events = make_events()
+        written = lake.append(events)
+
+        assert written.num_rows == len(events)
+        files = sorted(lake.path.glob("date=*/user_bucket=*/*.parquet"))
+        assert {f.parent.parent.name for f in files} == {f"date=2025-09-0{d}" for d in range(1, 6)}
+
+        table = pq.read_table(files[0])
+        keys = list(zip(table["userId"].to_pylist(), table["timestamp"].to_pylist()))
+        assert keys == sorted(keys)
+        assert pq.ParquetFile(files[0]).metadata.row_group(0).column(1).statistics.has_min_max
+
+        bucket = int(files[0].parent.name.split("=")[1])
+        assert all(user_bucket(u, 4) == bucket for u in table["userId"].to_pylist())
+
+    def test_append_skips_existing_ids(self, lake):
+        """Test overlapping appends are idempotent."""
+        lake.append(make_events(600))
+        written = lake.append(make_events(900))
+
+        relation, params = lake.scan_sql()
+        count = duckdb.connect().execute(f"SELECT COUNT(*) FROM {relation}", params).fetchone()[0]
+        assert written.num_rows == 300
+        assert count == 900
+
+    def test_compact_merges_small_files(self, lake):
+        """Test compaction leaves one file per partition and keeps every row."""
+        lake.append(make_events(300))
+        lake.append(make_events(300, offset=300, seed=1))
+        partitions = {f.parent for f in lake.path.glob("date=*/user_bucket=*/*.parquet")}
+
+        lake.compact()
+
+        files = list(lake.path.glob("date=*/user_bucket=*/*.parquet"))
+        assert len(files) == len(partitions)
+        assert sum(pq.read_metadata(f).num_rows for f in files) == 600
+
+    def test_scan_reads_one_user_and_range(self, lake):
+        """Test scan_sql returns only the user's rows within the date range."""
+        events = make_events()
+        lake.append(events)
+        user = events["userId"].iloc[0]
+
+        relation, params = lake.scan_sql(user, START + timedelta(days=1), START + timedelta(days=2))
+        df = duckdb.connect().execute(f"SELECT userId, timestamp FROM {relation}", params).fetchdf()
+
+        expected = events[
+            (events["userId"] == user)
+            & (events["timestamp"] >= START + timedelta(days=1))
+            & (events["timestamp"] < START + timedelta(days=3))
+        ]
+        assert len(df) == len(expected)
+        assert set(df["userId"]) == {user}
+
+    def test_watermark(self, lake):
+        """Test the watermark is the newest timestamp (None for an empty lake)."""
+        assert lake.watermark() is None
+        with pytest.raises(ValueError):
+            lake.scan_sql()
+
+        events = make_events()
+        lake.append(events)
+
+        assert lake.watermark() == events["timestamp"].max()
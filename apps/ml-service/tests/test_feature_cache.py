@@ -0,0 +1,211 @@
+"""
+Feature Cache Unit Tests
+
+Tests for the process-wide LRU + TTL feature cache: eviction, per-namespace
+expiry, request coalescing, error propagation, counters and invalidation of
+the Redis tier.
+"""
+
+import asyncio
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+from app.utils.feature_cache import FeatureCache
+from app.utils.redis_cache import RedisCache
+from app.services.struggle_feature_extractor import StruggleFeatureExtractor
+from tests.test_redis_cache import FakeRedis
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.unit
+class TestFeatureCache:
+    """Test FeatureCache behaviour."""
+
+    def test_lru_eviction(self):
+        """Test least recently used entry is evicted first."""
+        cache = FeatureCache(max_entries=2)
+        cache.set("profile", "a", 1)
+        cache.set("profile", "b", 2)
+        cache.get("profile", "a")  # a is now most recent
+        cache.set("profile", "c", 3)
+
+        assert cache.get("profile", "b") == (False, None)
+        assert cache.get("profile", "a") == (True, 1)
+        assert cache.stats()["evictions"] == 1
+
+    def test_namespace_ttls(self):
+        """Test entries expire according to their namespace TTL."""
+        clock = FakeClock()
+        cache = FeatureCache(clock=clock)
+        cache.set("metrics", "u1", 0.4)
+        cache.set("patterns", "u1", [])
+
+        clock.now = 1801
+        assert cache.get("metrics", "u1") == (False, None)
+        assert cache.get("patterns", "u1") == (True, [])
+        assert cache.stats()["expirations"] == 1
+
+    def test_unknown_namespace_rejected(self):
+        """Test unknown namespaces raise ValueError."""
+        with pytest.raises(ValueError):
+            FeatureCache().set("sessions", "u1", 1)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_coalesced(self):
+        """Test concurrent loads of one key call the loader once."""
+        cache = FeatureCache()
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"visual": 0.7}
+
+        results = await asyncio.gather(
+            *[cache.get_or_load("profile", "u1", loader) for _ in range(10)]
+        )
+
+        assert calls == 1
+        assert all(r == {"visual": 0.7} for r in results)
+        stats = cache.stats()
+        assert stats["misses"] == 1
+        assert stats["coalesced"] == 9
+
+        await cache.get_or_load("profile", "u1", loader)
+        assert cache.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_loader_errors_propagate_and_are_not_cached(self):
+        """Test loader failures reach all waiters and the next call retries."""
+        cache = FeatureCache()
+
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("db down")
+
+        results = await asyncio.gather(
+            cache.get_or_load("profile", "u1", failing),
+            cache.get_or_load("profile", "u1", failing),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert cache.stats()["load_errors"] == 1
+        assert cache.stats()["inflight"] == 0
+
+        loader = AsyncMock(return_value=None)
+        assert await cache.get_or_load("profile", "u1", loader) is None
+        loader.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_redis_tier(self):
+        """Test L1 misses fall through to Redis and loads are written back."""
+        redis = SimpleNamespace(get=AsyncMock(return_value=None), set=AsyncMock())
+        cache = FeatureCache(redis=redis)
+
+        await cache.get_or_load("metrics", "u1", AsyncMock(return_value=0.8))
+
+        redis.set.assert_awaited_once_with("features:metrics:u1", 0.8, ttl=1800, tags=None)
+
+        redis.get.return_value = 0.6
+        loader = AsyncMock()
+        assert await cache.get_or_load("metrics", "u2", loader) == 0.6
+        loader.assert_not_awaited()
+        assert cache.stats()["redis_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_extractors_share_cache(self):
+        """Test per-request extractors reuse the same cached profile."""
+        db = SimpleNamespace(
+            userlearningprofile=SimpleNamespace(find_unique=AsyncMock(return_value=None))
+        )
+        cache = FeatureCache()
+
+        for _ in range(3):
+            await StruggleFeatureExtractor(db, cache=cache)._get_user_learning_profile("u1")
+
+        db.userlearningprofile.find_unique.assert_awaited_once()
+
+        await StruggleFeatureExtractor(db, cache=cache).clear_cache("u1")
+        await StruggleFeatureExtractor(db, cache=cache)._get_user_learning_profile("u1")
+        assert db.userlearningprofile.find_unique.await_count == 2
+
+
+@pytest.mark.unit
+class TestFeatureCacheRedisTier:
+    """Test the shared Redis tier across worker processes."""
+
+    @pytest.fixture
+    def redis(self):
+        cache = RedisCache()
+        cache._client = FakeRedis()
+        return cache
+
+    @staticmethod
+    def profile_db(profile=None):
+        return SimpleNamespace(
+            userlearningprofile=SimpleNamespace(find_unique=AsyncMock(return_value=profile))
+        )
+
+    @pytest.mark.asyncio
+    async def test_missing_profile_cached_in_redis(self, redis):
+        """Test a cold user's missing profile is served from Redis by other workers."""
+        db = self.profile_db()
+
+        for _ in range(3):
+            worker = FeatureCache(redis=redis)
+            assert await StruggleFeatureExtractor(db, cache=worker)._get_user_learning_profile("u1") is None
+
+        db.userlearningprofile.find_unique.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_clear_cache_invalidates_other_workers(self, redis):
+        """Test clear_cache(user_id) drops the user's Redis entries, not just this worker's L1."""
+        db = self.profile_db(SimpleNamespace(model_dump=lambda mode: {"userId": "u1"}))
+        db.cognitiveloadmetric = SimpleNamespace(
+            find_first=AsyncMock(return_value=SimpleNamespace(loadScore=40.0))
+        )
+        worker_a, worker_b = FeatureCache(redis=redis), FeatureCache(redis=redis)
+
+        for user_id in ("u1", "u2"):
+            extractor = StruggleFeatureExtractor(db, cache=worker_a)
+            await extractor._get_user_learning_profile(user_id)
+            await extractor._get_cognitive_load_indicator(user_id)
+        await StruggleFeatureExtractor(db, cache=worker_b).clear_cache("u1")
+        # Worker A's own L1 entries only live until their TTL; drop them to read Redis
+        worker_a._entries.clear()
+
+        for user_id in ("u1", "u2"):
+            extractor = StruggleFeatureExtractor(db, cache=worker_a)
+            await extractor._get_user_learning_profile(user_id)
+            await extractor._get_cognitive_load_indicator(user_id)
+
+        # Only u1 is reloaded from the database
+        assert db.userlearningprofile.find_unique.await_count == 3
+        assert db.cognitiveloadmetric.find_first.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_invalidate_and_clear_reach_redis(self, redis):
+        """Test invalidate() and clear() delete Redis keys as well as L1 entries."""
+        cache = FeatureCache(redis=redis)
+        await cache.get_or_load("metrics", "a", AsyncMock(return_value=0.1))
+        await cache.get_or_load("metrics", "b", AsyncMock(return_value=0.2))
+
+        await cache.invalidate("metrics", "a")
+        assert await redis.get("features:metrics:a") is None
+        assert await redis.get("features:metrics:b") == 0.2
+
+        await cache.clear()
+        assert redis._client.values == {}
+        assert cache.stats()["size"] == 0
@@ -0,0 +1,122 @@
+"""
+ITS Plot Rendering Unit Tests
+
+Tests for on-demand rendering of ITS plots from posterior summaries and
+the plot service cache.
+"""
+
+import numpy as np
+import pytest
+
+from app.services import its_plot_service as plot_service_module
+from app.services.its_plot_service import ITSPlotService
+from app.utils.its_plots import PLOT_KINDS, render_plot
+
+
+def make_summary(with_ppc: bool = True):
+    """Small posterior summary shaped like summarize_for_plots() output."""
+    rng = np.random.default_rng(0)
+    pre_time = list(range(30))
+    post_time = list(range(30, 60))
+    effect = {
+        "point_estimate": 0.1,
+        "ci_lower": 0.02,
+        "ci_upper": 0.18,
+        "probability_positive": 0.97,
+    }
+    edges = np.linspace(0, 1, 11)
+    return {
+        "observed": {
+            "pre_time": [float(t) for t in pre_time],
+            "pre_outcome": rng.uniform(0.4, 0.6, 30).tolist(),
+            "post_time": [float(t) for t in post_time],
+            "post_outcome": rng.uniform(0.5, 0.7, 30).tolist(),
+        },
+        "counterfactual": {
+            "mean": [0.5] * 30,
+            "lower": [0.45] * 30,
+            "upper": [0.55] * 30,
+            "label": "94% HDI",
+        },
+        "ppc": {
+            "edges": edges.tolist(),
+            "observed": [1.0] * 10,
+            "lower": [0.8] * 10,
+            "median": [1.0] * 10,
+            "upper": [1.2] * 10,
+        } if with_ppc else None,
+        "effects": {"immediate_effect": effect, "counterfactual_effect": effect},
+        "traces": {"sigma": rng.normal(0.1, 0.01, (2, 50)).tolist()},
+        "r_hat": {"sigma": 1.001},
+        "effective_sample_size": {"sigma": 1800.0},
+    }
+
+
+@pytest.mark.unit
+class TestRenderPlot:
+    """Test render_plot()."""
+
+    @pytest.mark.parametrize("kind", PLOT_KINDS)
+    def test_renders_svg(self, kind):
+        """Test every kind renders to SVG text."""
+        image = render_plot(kind, make_summary(), fmt="svg")
+
+        assert image.lstrip().startswith(b"<?xml")
+        assert b"<svg" in image
+
+    def test_png_width(self):
+        """Test PNG output is scaled to the requested width."""
+        import struct
+
+        image = render_plot("observed_vs_counterfactual", make_summary(), fmt="png", width=400)
+
+        assert image[:8] == b"\x89PNG\r\n\x1a\n"
+        png_width = struct.unpack(">I", image[16:20])[0]
+        assert 300 <= png_width <= 450
+
+    def test_unknown_kind_and_format(self):
+        """Test unknown kinds and formats raise ValueError."""
+        with pytest.raises(ValueError):
+            render_plot("forest", make_summary())
+        with pytest.raises(ValueError):
+            render_plot("effect_distribution", make_summary(), fmt="gif")
+
+    def test_missing_ppc(self):
+        """Test a summary without posterior predictive data raises ValueError."""
+        with pytest.raises(ValueError):
+            render_plot("posterior_predictive_check", make_summary(with_ppc=False))
+
+
+@pytest.mark.unit
+class TestITSPlotServiceLocalCache:
+    """Test the in-process LRU used when Redis is unavailable."""
+
+    @pytest.fixture
+    def service(self, monkeypatch):
+        monkeypatch.setattr(plot_service_module, "get_redis_cache", lambda: None)
+        service = ITSPlotService(max_cached=2)
+        service.renders = []
+
+        async def fake_render(run_id, kind, fmt, width):
+            service.renders.append((run_id, kind, fmt, width))
+            return f"{run_id}:{kind}:{fmt}:{width}".encode()
+
+        monkeypatch.setattr(service, "_render", fake_render)
+        return service
+
+    async def test_repeat_requests_render_once(self, service):
+        """Test the same plot is rendered once; SVG ignores width, PNG does not."""
+        await service.render("run-1", "effect_distribution", fmt="svg", width=400)
+        image = await service.render("run-1", "effect_distribution", fmt="svg", width=800)
+        await service.render("run-1", "effect_distribution", fmt="png", width=400)
+        await service.render("run-1", "effect_distribution", fmt="png", width=800)
+
+        assert image == b"run-1:effect_distribution:svg:400"
+        assert len(service.renders) == 3
+
+    async def test_lru_eviction(self, service):
+        """Test only max_cached images are kept, least recently used first out."""
+        for run_id in ("run-1", "run-2", "run-1", "run-3", "run-1", "run-2"):
+            await service.render(run_id, "effect_distribution")
+
+        assert [r[0] for r in service.renders] == ["run-1", "run-2", "run-3", "run-2"]
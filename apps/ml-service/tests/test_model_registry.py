@@ -0,0 +1,192 @@
+"""
+Model Registry Unit Tests
+
+Tests for the orchestration ModelRegistry: versioned registration, the
+in-memory latest-version and model LRUs, and background training.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.orchestration.cognitive_load_analyzer import CognitiveLoadAnalyzer
+from src.orchestration.model_registry import GLOBAL_OWNER, ModelRegistry
+from src.orchestration.study_time_recommender import StudyTimeRecommender
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_sessions(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    start = datetime(2026, 1, 1)
+    return pd.DataFrame({
+        "started_at": [start + timedelta(hours=int(h)) for h in np.sort(rng.integers(0, 60 * 24, n))],
+        "performance_score": rng.uniform(50, 95, n),
+        "duration_ms": 45 * 60 * 1000,
+    })
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def registry(tmp_path, clock):
+    return ModelRegistry(
+        model_dir=tmp_path / "models",
+        max_loaded=2,
+        retrain_threshold=5,
+        min_sessions=10,
+        max_versions=2,
+        executor=ThreadPoolExecutor(max_workers=1),
+        clock=clock,
+    )
+
+
+def count_manifest_reads(registry, monkeypatch) -> list:
+    reads = []
+    read_manifest = registry._read_manifest
+
+    def counting(kind, owner):
+        reads.append((kind, owner))
+        return read_manifest(kind, owner)
+
+    monkeypatch.setattr(registry, "_read_manifest", counting)
+    return reads
+
+
+@pytest.mark.unit
+class TestModelRegistry:
+    """Test model versioning, caching and background training."""
+
+    def test_register_versions_and_prunes(self, registry):
+        """Test each registration adds a version and only max_versions files are kept."""
+        for n in (10, 20, 30):
+            registry.register("cognitive_load", GLOBAL_OWNER, CognitiveLoadAnalyzer(), n)
+
+        latest = registry.latest_version("cognitive_load")
+        files = sorted(p.name for p in registry._model_path("cognitive_load", GLOBAL_OWNER).glob("*.joblib"))
+
+        assert (latest.version, latest.n_sessions) == (3, 30)
+        assert files == ["v2.joblib", "v3.joblib"]
+        assert [v.version for v in registry._read_manifest("cognitive_load", GLOBAL_OWNER)] == [2, 3]
+
+        # A fresh registry (new process) loads the latest version from disk
+        reloaded = ModelRegistry(model_dir=registry.model_dir)
+        assert isinstance(reloaded.get("cognitive_load"), CognitiveLoadAnalyzer)
+        assert reloaded.latest_version("cognitive_load").version == 3
+
+    def test_latest_version_cached_until_register(self, registry, monkeypatch):
+        """Test manifest.json is read once, and register updates the cached version."""
+        reads = count_manifest_reads(registry, monkeypatch)
+        sessions = make_sessions(17)
+
+        for _ in range(5):
+            assert registry.needs_training("study_time", "user-1", sessions[:12])
+            registry.get_or_default("cognitive_load")
+        assert reads == [("study_time", "user-1"), ("cognitive_load", GLOBAL_OWNER)]
+
+        registry.register(
+            "study_time", "user-1", StudyTimeRecommender(train_on_request=False), 12,
+            data_until=sessions["started_at"].iloc[11],
+        )
+        reads.clear()
+
+        assert not registry.needs_training("study_time", "user-1", sessions[:14])
+        assert registry.needs_training("study_time", "user-1", sessions)
+        assert registry.latest_version("study_time", "user-1").version == 1
+        assert reads.count(("study_time", "user-1")) == 0
+
+    def test_retrains_when_history_window_slides(self, registry):
+        """Test new sessions trigger retraining even when the windowed session count stays flat."""
+        sessions = make_sessions(40)
+        registry.register(
+            "study_time", "user-1", StudyTimeRecommender(train_on_request=False), 30,
+            data_until=sessions["started_at"].iloc[29],
+        )
+
+        assert not registry.needs_training("study_time", "user-1", sessions[2:32])
+        assert registry.needs_training("study_time", "user-1", sessions[10:40])
+        assert not registry.needs_training("study_time", "user-1", sessions[:0])
+
+        # Uploaded histories with UTC offsets compare in UTC
+        uploaded = sessions[10:40].assign(
+            started_at=sessions["started_at"][10:40].dt.tz_localize("UTC").dt.tz_convert("America/New_York")
+        )
+        assert registry.needs_training("study_time", "user-1", uploaded)
+
+        # The cutoff survives a reload from manifest.json
+        reloaded = ModelRegistry(model_dir=registry.model_dir, retrain_threshold=5)
+        assert reloaded.needs_training("study_time", "user-1", sessions[10:40])
+
+    def test_latest_version_rechecked_after_ttl(self, registry, clock):
+        """Test versions registered by another process show up after manifest_ttl."""
+        assert registry.get("cognitive_load") is None
+
+        other_process = ModelRegistry(model_dir=registry.model_dir)
+        other_process.register("cognitive_load", GLOBAL_OWNER, CognitiveLoadAnalyzer(), 50)
+
+        assert registry.get("cognitive_load") is None
+        clock.now += registry.manifest_ttl
+        assert isinstance(registry.get("cognitive_load"), CognitiveLoadAnalyzer)
+
+    def test_lru_eviction(self, registry, monkeypatch):
+        """Test only max_loaded models stay in memory; evicted ones reload from disk."""
+        for user in ("user-1", "user-2", "user-3"):
+            registry.register("study_time", user, StudyTimeRecommender(train_on_request=False), 10)
+
+        assert list(registry._loaded) == [("study_time", "user-2"), ("study_time", "user-3")]
+
+        loads = []
+        load = joblib.load
+        monkeypatch.setattr(joblib, "load", lambda path: loads.append(path) or load(path))
+        registry.get("study_time", "user-2")
+        registry.get("study_time", "user-1")
+
+        assert len(loads) == 1
+        assert list(registry._loaded) == [("study_time", "user-2"), ("study_time", "user-1")]
+
+    def test_default_models_shared(self, registry):
+        """Test untrained kinds share one default instance per kind."""
+        first = registry.get_or_default("session_duration")
+        assert registry.get_or_default("session_duration") is first
+
+        with pytest.raises(ValueError):
+            registry.schedule_training("cognitive_load", GLOBAL_OWNER, make_sessions(20))
+
+    async def test_background_training(self, registry):
+        """Test enough sessions schedule one background job that registers a trained model."""
+        sessions = make_sessions(30)
+
+        model = await registry.get_study_time_recommender("user-1", sessions)
+        assert not model.is_trained
+
+        # A second request while training is running joins the same job
+        future = registry._training[("study_time", "user-1")]
+        assert registry.schedule_training("study_time", "user-1", sessions) is future
+
+        version = await asyncio.wait_for(future, timeout=60)
+        trained = await registry.get_study_time_recommender("user-1", sessions)
+
+        assert version.version == 1 and version.n_sessions == 30
+        assert pd.Timestamp(version.data_until) == sessions["started_at"].max()
+        assert not registry.needs_training("study_time", "user-1", sessions)
+        assert trained.is_trained
+        assert ("study_time", "user-1") not in registry._training
+
+    async def test_too_few_sessions_not_trained(self, registry):
+        """Test users below min_sessions are served heuristics without scheduling training."""
+        await registry.get_study_time_recommender("user-1", make_sessions(5))
+        assert registry._training == {}
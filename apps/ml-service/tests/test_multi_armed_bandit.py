@@ -549,6 +549,44 @@ def test_compare_algorithms_identifies_best():
     assert results['summary']['thompson_sampling']['best_strategy'] == 'balanced'
 
 
+def test_compare_algorithms_reports_realized_regret():
+    """Test regret curves are MultiArmedBandit.calculate_regret of the outcome rewards."""
+    results = compare_algorithms(n_rounds=200, random_state=7)
+    optimal = results['summary']['optimal_reward']
+
+    for algorithm in ('epsilon_greedy', 'thompson_sampling'):
+        rewards = np.array(results[algorithm]['rewards'])
+        outcome_rewards = [
+            StrategyOutcome(r * 2 - 1, r * 2 - 1, r).to_reward() for r in rewards
+        ]
+        expected = np.cumsum(optimal - np.array(outcome_rewards))
+
+        np.testing.assert_allclose(results[algorithm]['regrets'], expected)
+
+    assert compare_algorithms(n_rounds=200, random_state=7) == results
+
+
+def test_compare_algorithms_thompson_uses_outcome_threshold():
+    """Test simulated rewards count as successes when to_reward() > 0.5, as in update()."""
+    # Raw reward 0.45 maps to an outcome reward of 0.51
+    mab = MultiArmedBandit(user_id="test_user")
+    mab.update(StrategyType.BALANCED, StrategyOutcome(-0.1, -0.1, 0.45))
+    assert mab.strategies[StrategyType.BALANCED].alpha == 2.0
+
+    # An arm that always pays 0.45 is a success every round, so Thompson
+    # sampling settles on it over an arm that always pays 0.40
+    results = compare_algorithms(
+        n_rounds=300,
+        reward_distributions={
+            StrategyType.PATTERN_HEAVY: (0.40, 0.0),
+            StrategyType.BALANCED: (0.45, 0.0),
+        },
+        random_state=0,
+    )
+    rewards = np.array(results['thompson_sampling']['rewards'])
+    assert np.mean(rewards[-100:] == 0.45) > 0.9
+
+
 # ==================== EDGE CASE TESTS ====================
 
 def test_zero_epsilon_pure_exploitation(mab_with_data):
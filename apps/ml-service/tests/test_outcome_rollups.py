@@ -0,0 +1,185 @@
+"""
+Daily Outcome Rollup Unit Tests
+
+Tests for research.daily_outcomes: full and incremental refreshes, and the
+ITS/ABAB engines reading the rollup instead of raw behavioral events.
+"""
+
+from datetime import datetime, timedelta
+
+import duckdb
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.abab_engine import ABABRandomizationEngine
+from app.services.its_engine import BayesianITSEngine
+from app.services.outcome_rollups import (
+    ROLLUP_TABLE,
+    compact_daily_outcomes,
+    refresh_daily_outcomes,
+)
+
+START = datetime(2025, 9, 1)
+PHASES = ["baseline_1", "intervention_A_1", "baseline_2", "intervention_A_2"]
+
+
+def make_events(user_id: str, days: int = 40, seed: int = 0) -> pd.DataFrame:
+    """Several scored and unscored events per day, ABAB phases in 10-day blocks."""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for day in range(days):
+        phase = PHASES[day // 10] if day < 40 else None
+        for i, event_type in enumerate(["session_completed", "session_performance", "card_review"]):
+            rows.append({
+                "userId": user_id,
+                "eventType": event_type,
+                "timestamp": START + timedelta(days=day, hours=8 + 3 * i + int(rng.integers(0, 3))),
+                "sessionPerformanceScore": float(rng.uniform(40, 90)) if i < 2 or day % 2 else None,
+                "experimentPhase": phase,
+            })
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "analytics.duckdb")
+    events = pd.concat([make_events("user-1"), make_events("user-2", seed=1)], ignore_index=True)
+    conn = duckdb.connect(path)
+    conn.execute("CREATE SCHEMA research")
+    conn.execute("CREATE TABLE research.behavioral_events AS SELECT * FROM events ORDER BY timestamp")
+    conn.execute("CREATE VIEW behavioral_events AS SELECT * FROM research.behavioral_events")
+    refresh_daily_outcomes(conn)
+    conn.close()
+    return path
+
+
+@pytest.mark.unit
+class TestDailyOutcomeRollups:
+    """Test rollup maintenance and rollup-backed reads."""
+
+    def test_its_rollup_matches_raw_events(self, db_path):
+        """Test ITS daily data from the rollup equals re-aggregated events."""
+        engine = BayesianITSEngine(duckdb_path=db_path)
+        window = dict(start_date=START, end_date=START + timedelta(days=39))
+
+        rollup = engine.fetch_user_data("user-1", source="rollup", **window)
+        events = engine.fetch_user_data("user-1", source="events", **window)
+
+        assert len(rollup) == 40
+        pd.testing.assert_frame_equal(rollup, events, check_dtype=False)
+        assert set(rollup["day_of_week"]) == set(range(7))
+
+    def test_incremental_refresh(self, db_path):
+        """Test only the touched (user, day) pairs are recomputed."""
+        conn = duckdb.connect(db_path)
+        before = conn.execute(f"SELECT * FROM {ROLLUP_TABLE} WHERE user_id = 'user-2'").fetchdf()
+
+        new = pd.DataFrame([{
+            "userId": "user-1",
+            "eventType": "session_completed",
+            "timestamp": START + timedelta(days=5, hours=20),
+            "sessionPerformanceScore": 100.0,
+            "experimentPhase": "baseline_1",
+        }])
+        conn.execute("INSERT INTO research.behavioral_events SELECT * FROM new")
+        conn.register("new_events", new)
+        written = refresh_daily_outcomes(conn, changed="new_events")
+
+        day = conn.execute(
+            f"SELECT session_count, event_count FROM {ROLLUP_TABLE} WHERE user_id = 'user-1' AND date = ?",
+            [(START + timedelta(days=5)).date()],
+        ).fetchone()
+        after = conn.execute(f"SELECT * FROM {ROLLUP_TABLE} WHERE user_id = 'user-2'").fetchdf()
+        conn.close()
+
+        assert written == 1
+        assert day == (3, 4)
+        pd.testing.assert_frame_equal(before, after)
+
+    def test_incremental_refresh_leaves_other_rows_and_compaction_resorts(self, db_path):
+        """Test an incremental refresh rewrites only its keys and compaction restores the sort."""
+        conn = duckdb.connect(db_path)
+        ordered = f"SELECT rowid, user_id, date, phase FROM {ROLLUP_TABLE} ORDER BY rowid"
+        before = conn.execute(ordered).fetchdf()
+
+        new = pd.DataFrame([{
+            "userId": "user-1",
+            "eventType": "card_review",
+            "timestamp": START + timedelta(days=2, hours=12),
+            "sessionPerformanceScore": 50.0,
+            "experimentPhase": "baseline_1",
+        }])
+        conn.execute("INSERT INTO research.behavioral_events SELECT * FROM new")
+        conn.register("new_events", new)
+        refresh_daily_outcomes(conn, changed="new_events")
+        after = conn.execute(ordered).fetchdf()
+
+        # Untouched rows keep their row ids; the refreshed day moves to the end
+        touched = (before["user_id"] == "user-1") & (before["date"] == pd.Timestamp(START + timedelta(days=2)))
+        pd.testing.assert_frame_equal(before[~touched].reset_index(drop=True), after.iloc[:-1])
+        assert after.iloc[-1]["user_id"] == "user-1"
+
+        compact_daily_outcomes(conn)
+        compacted = conn.execute(ordered).fetchdf()
+        conn.close()
+
+        keys = compacted[["user_id", "date", "phase"]]
+        pd.testing.assert_frame_equal(keys, keys.sort_values(["user_id", "date", "phase"]))
+        assert len(compacted) == len(before)
+
+    def test_user_refresh_drops_deleted_days(self, db_path):
+        """Test refreshing a user removes days whose events were deleted."""
+        conn = duckdb.connect(db_path)
+        conn.execute("DELETE FROM research.behavioral_events WHERE userId = 'user-1' AND timestamp >= ?",
+                     [START + timedelta(days=20)])
+        refresh_daily_outcomes(conn, user_ids=["user-1"])
+        days = conn.execute(
+            f"SELECT COUNT(DISTINCT date) FROM {ROLLUP_TABLE} WHERE user_id = 'user-1'"
+        ).fetchone()[0]
+        conn.close()
+
+        assert days == 20
+
+    def test_abab_reads_daily_phase_means(self, db_path):
+        """Test unit="day" ABAB observations are daily phase means, from the rollup or events."""
+        engine = ABABRandomizationEngine(db_path=db_path)
+
+        rollup = engine.fetch_abab_data("user-1", "p1", source="rollup", unit="day")
+        daily = engine.fetch_abab_data("user-1", "p1", unit="day")
+        events = engine.fetch_abab_data("user-1", "p1")
+
+        assert len(rollup) == 40
+        assert len(events) > 40
+        assert list(rollup["experimentPhase"].unique()) == PHASES
+        means = events.groupby(events["timestamp"].dt.date)["outcome"].mean().to_numpy()
+        np.testing.assert_allclose(rollup["outcome"].to_numpy(), means)
+        pd.testing.assert_frame_equal(rollup, daily, check_dtype=False)
+
+        with pytest.raises(ValueError):
+            engine.fetch_abab_data("user-1", "p1", source="rollup")
+
+    def test_abab_defaults_to_main_events_beside_rollup(self, tmp_path):
+        """Test ABAB reads main.behavioral_events per event even when a rollup of other users exists."""
+        path = str(tmp_path / "mixed.duckdb")
+        abab_events = make_events("u1")
+        ingested = make_events("user-2", seed=1)
+        conn = duckdb.connect(path)
+        conn.execute("CREATE SCHEMA research")
+        conn.execute("CREATE TABLE research.behavioral_events AS SELECT * FROM ingested")
+        conn.execute("CREATE TABLE main.behavioral_events AS SELECT * FROM abab_events")
+        refresh_daily_outcomes(conn)
+        conn.close()
+
+        engine = ABABRandomizationEngine(db_path=path)
+        events = engine.fetch_abab_data("u1", "p1")
+        daily = engine.fetch_abab_data("u1", "p1", unit="day")
+
+        assert len(events) == abab_events["sessionPerformanceScore"].notna().sum()
+        assert len(daily) == 40
+        assert list(daily["experimentPhase"].unique()) == PHASES
+
+    def test_unknown_source(self, db_path):
+        """Test an unknown source raises ValueError."""
+        with pytest.raises(ValueError):
+            BayesianITSEngine(duckdb_path=db_path).fetch_user_data("user-1", source="parquet")
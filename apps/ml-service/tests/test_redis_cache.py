@@ -0,0 +1,244 @@
+"""
+Redis Cache Unit Tests
+
+Tests for RedisCache behaviour that does not need a Redis server:
+graceful degradation, in-process single-flight coalescing, and per-user
+tag invalidation against an in-memory client.
+"""
+
+import asyncio
+import fnmatch
+import pytest
+
+from app.utils.redis_cache import RedisCache, cached
+
+
+class FakeRedis:
+    """In-memory stand-in for the redis.asyncio commands RedisCache uses."""
+
+    def __init__(self):
+        self.values = {}
+        self.sets = {}
+
+    @staticmethod
+    def _key(key):
+        return key.decode() if isinstance(key, bytes) else key
+
+    async def get(self, key):
+        return self.values.get(self._key(key))
+
+    async def mget(self, keys):
+        return [self.values.get(self._key(key)) for key in keys]
+
+    async def setex(self, key, ttl, data):
+        self.values[self._key(key)] = data
+
+    async def sadd(self, key, *members):
+        self.sets.setdefault(self._key(key), set()).update(m.encode() for m in members)
+
+    async def expire(self, key, ttl):
+        return True
+
+    async def smembers(self, key):
+        return set(self.sets.get(self._key(key), ()))
+
+    async def pttl(self, key):
+        return -1 if self._key(key) in self.values else -2
+
+    async def exists(self, key):
+        return int(self._key(key) in self.values)
+
+    async def delete(self, *keys):
+        return await self.unlink(*keys)
+
+    async def scan_iter(self, match=None, count=None):
+        for key in list(self.values) + list(self.sets):
+            if match is None or fnmatch.fnmatchcase(key, match):
+                yield key
+
+    async def unlink(self, *keys):
+        removed = 0
+        for key in map(self._key, keys):
+            removed += (self.values.pop(key, None) is not None) + (self.sets.pop(key, None) is not None)
+        return removed
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def lock(self, name, timeout=None, thread_local=True):
+        return FakeLock()
+
+
+class FakePipeline:
+    """Queues commands and runs them in order on execute()."""
+
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        command = getattr(self.client, name)
+        return lambda *args: self.commands.append((command, args))
+
+    async def execute(self):
+        results = [await command(*args) for command, args in self.commands]
+        self.commands = []
+        return results
+
+
+class FakeLock:
+    async def acquire(self, blocking=True):
+        return True
+
+    async def reacquire(self):
+        return True
+
+    async def release(self):
+        return None
+
+
+@pytest.fixture
+def fake_cache():
+    cache = RedisCache()
+    cache._client = FakeRedis()
+    return cache
+
+
+@pytest.mark.unit
+class TestRedisCacheWithoutRedis:
+    """Test RedisCache when Redis is unavailable."""
+
+    def test_mget_returns_misses(self):
+        """Test mget degrades to misses without a Redis connection."""
+        cache = RedisCache()
+
+        assert asyncio.run(cache.mget(["a", "b"])) == [None, None]
+        assert cache.stats() == {}
+
+    def test_concurrent_calls_share_one_computation(self):
+        """Test identical concurrent calls await a single computation."""
+        cache = RedisCache()
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return {"calls": calls}
+
+        async def run():
+            return await asyncio.gather(
+                *[cache.get_or_compute("its:analyze:u:user-1:abc", compute) for _ in range(5)]
+            )
+
+        results = asyncio.run(run())
+
+        assert calls == 1
+        assert results == [{"calls": 1}] * 5
+        assert cache.stats()["its:analyze"]["coalesced"] == 4
+
+    def test_errors_propagate_to_all_waiters(self):
+        """Test a failed computation raises for every waiter and is retried later."""
+        cache = RedisCache()
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            raise ValueError("insufficient data")
+
+        async def run():
+            return await asyncio.gather(
+                *[cache.get_or_compute("k:1", compute) for _ in range(3)],
+                return_exceptions=True,
+            )
+
+        results = asyncio.run(run())
+
+        assert calls == 1
+        assert all(isinstance(r, ValueError) for r in results)
+        assert asyncio.run(run()) and calls == 2
+
+    def test_cached_decorator_coalesces(self):
+        """Test the cached decorator shares in-flight calls per key."""
+        cache = RedisCache()
+        calls = []
+
+        @cached(cache, prefix="abab:analyze")
+        async def analyze(user_id: str, protocol_id: str):
+            calls.append((user_id, protocol_id))
+            await asyncio.sleep(0.05)
+            return f"{user_id}:{protocol_id}"
+
+        async def run():
+            return await asyncio.gather(
+                analyze(user_id="u1", protocol_id="p1"),
+                analyze(user_id="u1", protocol_id="p1"),
+                analyze(user_id="u2", protocol_id="p1"),
+            )
+
+        assert asyncio.run(run()) == ["u1:p1", "u1:p1", "u2:p1"]
+        assert len(calls) == 2
+
+
+@pytest.mark.unit
+class TestTagInvalidation:
+    """Test per-user tag sets only evict the refreshed user's keys."""
+
+    def test_invalidate_user_keeps_other_users(self, fake_cache):
+        """Test one user's refresh removes only that user's keys under the prefix."""
+        cache = fake_cache
+        prefix = "its:analyze"
+        keys = {
+            user: [cache.generate_key(prefix, user_id=user, window=w) for w in (7, 30)]
+            for user in ("user-1", "user-2")
+        }
+
+        async def run():
+            for user, user_keys in keys.items():
+                await cache.mset(
+                    {key: {"user": user} for key in user_keys},
+                    tags=[cache.user_tag(prefix, user)],
+                )
+            await cache.set("abab:analyze:u:user-1:abc", {"user": "user-1"},
+                            tags=[cache.user_tag("abab:analyze", "user-1")])
+
+            removed = await cache.invalidate_user(prefix, "user-1")
+            return removed, await cache.mget(keys["user-1"] + keys["user-2"])
+
+        removed, values = asyncio.run(run())
+
+        assert removed == 2
+        assert values == [None, None, {"user": "user-2"}, {"user": "user-2"}]
+        # Other users' tag sets and the same user's other prefixes are untouched
+        assert cache.user_tag(prefix, "user-1") not in cache._client.sets
+        assert len(cache._client.sets[cache.user_tag(prefix, "user-2")]) == 2
+        assert "abab:analyze:u:user-1:abc" in cache._client.values
+
+    def test_cached_decorator_recomputes_only_invalidated_user(self, fake_cache):
+        """Test after invalidation only the refreshed user's call is recomputed."""
+        cache = fake_cache
+        calls = []
+
+        @cached(cache, prefix="its:analyze")
+        async def analyze(user_id: str, intervention_date: str):
+            calls.append(user_id)
+            return {"user": user_id, "date": intervention_date}
+
+        async def run():
+            for user in ("user-1", "user-2"):
+                await analyze(user_id=user, intervention_date="2026-01-01")
+            await cache.invalidate_user("its:analyze", "user-1")
+            for user in ("user-1", "user-2"):
+                await analyze(user_id=user, intervention_date="2026-01-01")
+
+        asyncio.run(run())
+
+        assert calls == ["user-1", "user-2", "user-1"]
@@ -0,0 +1,166 @@
+"""
+Session History Store Unit Tests
+
+Tests for SessionHistoryStore: sessions derived from lifecycle events in the
+event lake, incremental refreshes, and serving cached history while a DuckDB
+writer holds the database.
+"""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import duckdb
+import pandas as pd
+import pytest
+
+from app.services.event_lake import EventLake
+from app.utils.file_lock import file_lock, lock_path, reader_lock
+from src.orchestration.session_history import SessionHistoryStore, _window_start
+
+USER = "c" + "1" * 24
+NOW = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def lifecycle(session_id: str, started: datetime, minutes: int = None, score: float = None,
+              offset: int = 0) -> list:
+    """SESSION_STARTED (and SESSION_ENDED when minutes is given) events for one session."""
+    events = [{
+        "id": f"c{offset:024d}",
+        "userId": USER,
+        "eventType": "SESSION_STARTED",
+        "eventData": {"sessionId": session_id},
+        "timestamp": started,
+    }]
+    if minutes is not None:
+        events.append({
+            "id": f"c{offset + 1:024d}",
+            "userId": USER,
+            "eventType": "SESSION_ENDED",
+            "eventData": {"sessionId": session_id, "duration": minutes * 60_000},
+            "timestamp": started + timedelta(minutes=minutes),
+            "sessionPerformanceScore": score,
+        })
+    return events
+
+
+@pytest.fixture
+def lake(tmp_path):
+    return EventLake(str(tmp_path / "lake"), user_buckets=4)
+
+
+@pytest.mark.unit
+class TestSessionHistoryStore:
+    """Test server-side session history lookup."""
+
+    async def test_lake_is_default_source(self, lake, monkeypatch):
+        """Test the store reads the event lake unless configured otherwise."""
+        monkeypatch.delenv("SESSION_HISTORY_SOURCE", raising=False)
+        lake.append(pd.DataFrame(lifecycle("s1", NOW - timedelta(days=2), 30, 80.0)))
+        store = SessionHistoryStore(lake=lake, duckdb_path="/nonexistent/analytics.duckdb")
+
+        sessions = await store.get_sessions(USER, days=7)
+
+        assert store.source == "lake"
+        assert sessions["session_id"].tolist() == ["s1"]
+        assert sessions["duration_ms"].iloc[0] == 30 * 60_000
+        assert sessions["performance_score"].iloc[0] == 80.0
+
+    async def test_incremental_refresh_updates_affected_sessions(self, lake):
+        """Test new lifecycle events complete an open session and add new ones."""
+        clock = FakeClock()
+        lake.append(pd.DataFrame(
+            lifecycle("s1", NOW - timedelta(days=3), 45, 70.0, offset=0)
+            + lifecycle("s2", NOW - timedelta(hours=5), offset=10)
+        ))
+        store = SessionHistoryStore(source="lake", lake=lake, clock=clock, refresh_interval=30)
+
+        before = await store.get_sessions(USER, days=7)
+        assert before["completed_at"].isna().tolist() == [False, True]
+
+        ended = lifecycle("s2", NOW - timedelta(hours=5), 50, 90.0, offset=10)[1:]
+        lake.append(pd.DataFrame(ended + lifecycle("s3", NOW - timedelta(hours=1), 20, 60.0, offset=20)))
+
+        # Within the refresh interval the cached window is served
+        assert len(await store.get_sessions(USER, days=7)) == 2
+
+        clock.now = 31
+        after = await store.get_sessions(USER, days=7)
+
+        assert after["session_id"].tolist() == ["s1", "s2", "s3"]
+        assert after["performance_score"].tolist() == [70.0, 90.0, 60.0]
+        assert after["completed_at"].notna().all()
+        pd.testing.assert_frame_equal(after.iloc[:1], before.iloc[:1])
+        assert store.stats()["full_loads"] == 1
+        assert store.stats()["incremental_loads"] == 1
+
+    async def test_refresh_picks_up_late_events_once(self, lake):
+        """Test events landing just below the watermark are loaded, without duplicating cached rows."""
+        clock = FakeClock()
+        lake.append(pd.DataFrame(lifecycle("s1", NOW - timedelta(hours=1), 30, 80.0, offset=0)))
+        store = SessionHistoryStore(
+            source="lake", lake=lake, clock=clock, refresh_interval=30,
+            refresh_overlap=timedelta(hours=2),
+        )
+        assert len(await store.get_events(USER, days=7)) == 2
+
+        # Flushed after the first read, but timestamped before its watermark
+        lake.append(pd.DataFrame(lifecycle("s0", NOW - timedelta(minutes=100), 20, 65.0, offset=10)))
+
+        clock.now = 31
+        events = await store.get_events(USER, days=7)
+        sessions = await store.get_sessions(USER, days=7)
+
+        assert len(events) == 4
+        assert events["timestamp"].is_monotonic_increasing
+        assert "event_id" not in events.columns
+        assert sessions["session_id"].tolist() == ["s0", "s1"]
+
+        clock.now = 62
+        assert len(await store.get_events(USER, days=7)) == 4
+
+    async def test_lake_source_requires_lake(self):
+        """Test the lake is injected rather than imported from the API service."""
+        store = SessionHistoryStore(source="lake")
+        with pytest.raises(RuntimeError):
+            await store.get_events(USER, days=7)
+
+    async def test_serves_cached_history_while_writer_holds_duckdb(self, tmp_path):
+        """Test a refresh blocked by a DuckDB writer keeps serving the cached window."""
+        db_path = str(tmp_path / "analytics.duckdb")
+        events = pd.DataFrame(lifecycle("s1", NOW - timedelta(days=1), 30, 75.0))
+        events["eventData"] = events["eventData"].map(json.dumps)
+        conn = duckdb.connect(db_path)
+        conn.execute("CREATE SCHEMA research")
+        conn.execute("CREATE TABLE research.behavioral_events AS SELECT * FROM events")
+        conn.close()
+
+        clock = FakeClock()
+        store = SessionHistoryStore(
+            source="events", duckdb_path=db_path, clock=clock, lock_timeout=0.05,
+            read_lock=reader_lock,
+        )
+        cached = await store.get_events(USER, days=7)
+
+        clock.now = 60
+        with file_lock(lock_path(db_path)):
+            during = await store.get_events(USER, days=7)
+
+            # Nothing cached yet for this user: the error surfaces
+            with pytest.raises(TimeoutError):
+                await store.get_events("c" + "2" * 24, days=7)
+
+        pd.testing.assert_frame_equal(during, cached)
+        assert store.stats()["stale_reads"] == 1
+
+    def test_window_start_is_utc(self):
+        """Test windows are measured in UTC, like stored event timestamps."""
+        expected = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=7)
+        assert abs((_window_start(7) - expected).total_seconds()) < 5
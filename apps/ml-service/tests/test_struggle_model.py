@@ -0,0 +1,190 @@
+"""
+Struggle Model Training Unit Tests
+
+Tests for the XGBoost StrugglePredictionModel training pipeline: the
+best-configuration cache and warm-start retraining.
+"""
+
+import numpy as np
+import pytest
+
+from app.ml.struggle_model import FEATURE_NAMES, StrugglePredictionModel
+
+PARAMS = dict(
+    max_depth=3,
+    learning_rate=0.1,
+    n_estimators=30,
+    subsample=0.8,
+    colsample_bytree=0.8,
+    min_child_weight=1,
+)
+
+
+def make_dataset(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    X = rng.uniform(0, 1, (n, len(FEATURE_NAMES)))
+    y = (X[:, 0] + 0.3 * rng.normal(size=n) < 0.5).astype(int)
+    return X, y
+
+
+@pytest.fixture
+def model(tmp_path, monkeypatch):
+    """Model whose hyperparameter search is recorded instead of run."""
+    model = StrugglePredictionModel(model_dir=tmp_path)
+    model.searches = []
+
+    def fake_search(X_train, y_train, scale_pos_weight, cv_folds, search):
+        model.searches.append(len(X_train))
+        return dict(PARAMS), 0.8
+
+    monkeypatch.setattr(model, "_hyperparameter_search", fake_search)
+    return model
+
+
+@pytest.mark.unit
+class TestBestParamsCache:
+    """Test reuse of cached hyperparameter searches."""
+
+    def test_same_data_version_hits(self, model):
+        """Test retraining on the same dataset reuses the cached search."""
+        X, y = make_dataset(300)
+
+        model.train(X, y)
+        model.train(X, y)
+
+        assert len(model.searches) == 1
+        assert model.metadata.data_version is not None
+
+    def test_small_growth_same_lineage_hits(self, model):
+        """Test a slightly larger dataset of the same lineage reuses the latest search."""
+        X, y = make_dataset(330)
+
+        model.train(X[:300], y[:300], lineage="struggle_predictions")
+        model.train(X, y, lineage="struggle_predictions")
+
+        assert len(model.searches) == 1
+
+    def test_large_growth_misses(self, model):
+        """Test growth beyond retune_growth triggers a new search."""
+        X, y = make_dataset(400)
+
+        model.train(X[:300], y[:300], lineage="struggle_predictions")
+        model.train(X, y, lineage="struggle_predictions")
+
+        assert len(model.searches) == 2
+
+    def test_other_lineage_misses(self, model):
+        """Test a similar-sized dataset from another lineage is searched again."""
+        X, y = make_dataset(300, seed=0)
+        X_other, y_other = make_dataset(300, seed=1)
+        X_unnamed, y_unnamed = make_dataset(300, seed=2)
+
+        model.train(X, y, lineage="struggle_predictions")
+        model.train(X_other, y_other, lineage="synthetic")
+        model.train(X_unnamed, y_unnamed)
+        assert len(model.searches) == 3
+
+        # An exact data version match is reused whatever the lineage
+        model.train(X_other, y_other)
+        assert len(model.searches) == 3
+
+    def test_other_feature_set_misses(self, model):
+        """Test configurations are never reused across feature sets, even on a version hit."""
+        model._store_best_params("v1", PARAMS, 0.8, "halving_random", 200, lineage="a")
+        assert model._cached_best_params("v1", 200, 0.2, lineage="a") == PARAMS
+        assert model._cached_best_params("v2", 220, 0.2, lineage="a") == PARAMS
+
+        model.feature_names = FEATURE_NAMES[:-1]
+
+        assert model._cached_best_params("v1", 200, 0.2, lineage="a") is None
+        assert model._cached_best_params("v2", 220, 0.2, lineage="a") is None
+
+
+@pytest.mark.unit
+class TestWarmStart:
+    """Test warm-start updates and scheduled retraining."""
+
+    def test_update_adds_rounds(self, model):
+        """Test update() continues boosting the current model on new samples."""
+        X, y = make_dataset(400)
+        model.train(X[:300], y[:300], hyperparameter_tuning=False)
+        rounds = model.model.get_booster().num_boosted_rounds()
+        n_samples = model.metadata.n_training_samples
+
+        model.update(X[300:], y[300:], additional_rounds=10)
+
+        assert model.model.get_booster().num_boosted_rounds() == rounds + 10
+        assert model.metadata.n_training_samples == n_samples + 100
+        assert model.metadata.n_warm_start_updates == 1
+        assert model.predict(X[:5])[1].shape == (5,)
+
+    def test_update_requires_model(self, model):
+        """Test update() without a trained model raises."""
+        X, y = make_dataset(10)
+        with pytest.raises(ValueError):
+            model.update(X, y)
+
+    def test_retrain_warm_starts_until_growth(self, model):
+        """Test retrain() updates on few new outcomes and fully retrains past retune_growth."""
+        X, y = make_dataset(500)
+        model.train(X[:300], y[:300])
+        n_full = model.metadata.n_training_samples
+        rounds = model.model.get_booster().num_boosted_rounds()
+
+        is_new = np.zeros(320, dtype=bool)
+        is_new[300:] = True
+        assert model.retrain(X[:320], y[:320], is_new, additional_rounds=5, eval_fraction=0) is None
+        assert model.model.get_booster().num_boosted_rounds() == rounds + 5
+        # Replayed older samples are not counted as new
+        assert model.metadata.n_warm_start_samples == 20
+        assert model.metadata.n_training_samples == n_full + 20
+
+        is_new = np.zeros(500, dtype=bool)
+        is_new[320:] = True
+        performance = model.retrain(X, y, is_new)
+
+        assert performance is not None
+        assert model.metadata.n_warm_start_samples == 0
+        assert model.metadata.n_training_samples > n_full
+
+    def test_retrain_holds_out_eval_set(self, model, monkeypatch):
+        """Test a warm-start update early-stops on held-out new and replayed rows."""
+        X, y = make_dataset(400)
+        model.train(X[:300], y[:300])
+        rounds = model.model.get_booster().num_boosted_rounds()
+        update = model.update
+        eval_sets = []
+
+        def recording_update(X_new, y_new, eval_set=None, **kwargs):
+            eval_sets.append(eval_set)
+            return update(X_new, y_new, eval_set=eval_set, **kwargs)
+
+        monkeypatch.setattr(model, "update", recording_update)
+        is_new = np.zeros(340, dtype=bool)
+        is_new[300:] = True
+        model.retrain(X[:340], y[:340], is_new, additional_rounds=500)
+
+        X_eval, y_eval = eval_sets[0]
+        assert len(X_eval) == 16 and set(y_eval) == {0, 1}
+        assert model.model.get_booster().num_boosted_rounds() < rounds + 500
+        # Held-out rows are not counted as training samples
+        assert model.metadata.n_warm_start_samples < 40
+
+    def test_retrain_without_model_trains(self, model):
+        """Test retrain() runs a full train when nothing is loaded."""
+        X, y = make_dataset(300)
+        assert model.retrain(X, y, np.ones(300, dtype=bool)) is not None
+        assert model.model is not None
+
+    def test_saved_metadata_round_trips(self, model, tmp_path):
+        """Test load_model() restores metadata so a later retrain can warm-start."""
+        X, y = make_dataset(300)
+        model.train(X, y, lineage="struggle_predictions")
+        path = model.save_model("struggle_model_test")
+
+        loaded = StrugglePredictionModel(model_dir=tmp_path)
+        loaded.load_model(path)
+
+        assert loaded.metadata.lineage == "struggle_predictions"
+        assert loaded.metadata.n_training_samples == model.metadata.n_training_samples
+        assert loaded.metadata.training_date == model.metadata.training_date
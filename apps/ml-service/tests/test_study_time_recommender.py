@@ -0,0 +1,138 @@
+"""
+Study Time Recommender Unit Tests
+
+Tests for vectorized slot scoring in StudyTimeRecommender and the sorted
+calendar conflict sweep.
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.orchestration.study_time_recommender import StudyTimeRecommender, _to_epoch
+
+TARGET_DATE = datetime(2026, 3, 16, 9, 30)
+
+
+def make_sessions(n: int, seed: int = 0) -> pd.DataFrame:
+    """n sessions over the previous 60 days, better in the morning."""
+    rng = np.random.default_rng(seed)
+    started = [
+        TARGET_DATE.replace(hour=0, minute=0) - timedelta(days=int(rng.integers(1, 60)))
+        + timedelta(hours=int(rng.integers(6, 22)), minutes=int(rng.integers(0, 60)))
+        for _ in range(n)
+    ]
+    hours = np.array([t.hour for t in started])
+    return pd.DataFrame({
+        "started_at": started,
+        "performance_score": np.clip(95 - 2 * np.abs(hours - 9) + rng.normal(0, 3, n), 0, 100),
+        "duration_ms": 45 * 60 * 1000,
+    })
+
+
+def brute_force_conflicts(start_times, end_times, events):
+    """Whether each slot overlaps any non-cancelled event (pairwise check)."""
+    active = [e for e in events if e.get("status") != "cancelled"]
+    return [
+        any(_to_epoch(e["start"]) < _to_epoch(end) and _to_epoch(e["end"]) > _to_epoch(start)
+            for e in active)
+        for start, end in zip(start_times, end_times)
+    ]
+
+
+@pytest.mark.unit
+class TestStudyTimeRecommender:
+    """Test batch slot scoring, ranking and calendar conflicts."""
+
+    def test_sweep_matches_pairwise_overlap(self):
+        """Test the interval sweep finds exactly the slots a pairwise check finds."""
+        recommender = StudyTimeRecommender()
+        rng = np.random.default_rng(1)
+        day = TARGET_DATE.replace(hour=0, minute=0)
+        events = []
+        for i in range(40):
+            start = day + timedelta(minutes=int(rng.integers(5 * 60, 23 * 60)))
+            events.append({
+                "start": (start.isoformat() + "Z") if i % 2 else start,
+                "end": start + timedelta(minutes=int(rng.integers(10, 180))),
+                "summary": f"event {i}",
+                "status": "cancelled" if i % 7 == 0 else "confirmed",
+            })
+        start_times = [day + timedelta(minutes=m) for m in range(6 * 60, 23 * 60, 15)]
+        end_times = [t + timedelta(minutes=45) for t in start_times]
+
+        conflicts = recommender._sweep_calendar_conflicts(start_times, end_times, events)
+
+        assert [c is not None for c in conflicts] == brute_force_conflicts(start_times, end_times, events)
+        for start, end, event in zip(start_times, end_times, conflicts):
+            if event is not None:
+                assert event["status"] != "cancelled"
+                assert _to_epoch(event["start"]) < _to_epoch(end)
+                assert _to_epoch(event["end"]) > _to_epoch(start)
+
+    def test_sweep_without_events(self):
+        """Test every slot is free when there are no (active) events."""
+        recommender = StudyTimeRecommender()
+        starts = [TARGET_DATE, TARGET_DATE + timedelta(hours=1)]
+        ends = [t + timedelta(hours=1) for t in starts]
+        cancelled = [{"start": TARGET_DATE, "end": TARGET_DATE + timedelta(hours=3), "status": "cancelled"}]
+
+        assert recommender._sweep_calendar_conflicts(starts, ends, []) == [None, None]
+        assert recommender._sweep_calendar_conflicts(starts, ends, cancelled) == [None, None]
+
+    def test_batch_scores_match_per_slot_scores(self):
+        """Test one batched predict equals scoring each slot's feature row on its own."""
+        recommender = StudyTimeRecommender(cv_n_jobs=1)
+        assert recommender.train(make_sessions(80))
+
+        features = recommender._engineer_features(TARGET_DATE, make_sessions(80), {})
+        hour_stats = recommender._hour_statistics(TARGET_DATE, features)
+        hours = np.arange(6, 23)
+        X = recommender._create_feature_matrix(TARGET_DATE, hours, features, hour_stats)
+        batch = recommender._predict_performance_batch(X)
+        single = [recommender._predict_performance_batch(X[i:i + 1])[0] for i in range(len(hours))]
+
+        assert X.shape == (len(hours), len(recommender.feature_names))
+        np.testing.assert_allclose(batch, single)
+
+    @pytest.mark.parametrize("train", [False, True])
+    async def test_sub_hour_slots_do_not_overlap(self, train):
+        """Test 15-minute slot spacing still returns five non-overlapping slots."""
+        recommender = StudyTimeRecommender(train_on_request=train, cv_n_jobs=1)
+
+        recommendations = await recommender.generate_recommendations(
+            user_id="user-1",
+            target_date=TARGET_DATE,
+            historical_sessions=make_sessions(80),
+            calendar_events=[],
+            user_profile={},
+            slot_minutes=15,
+            slot_duration_minutes=60,
+        )
+
+        assert len(recommendations) == 5
+        starts = sorted(r.start_time for r in recommendations)
+        assert all(later - earlier >= timedelta(minutes=60) for earlier, later in zip(starts, starts[1:]))
+        scores = [r.performance_score for r in recommendations]
+        assert scores == sorted(scores, reverse=True)
+
+    async def test_conflicting_slots_skipped(self):
+        """Test slots overlapping a calendar event are not recommended."""
+        recommender = StudyTimeRecommender(train_on_request=False)
+        day = TARGET_DATE.replace(hour=0, minute=0)
+        busy = [{"start": day + timedelta(hours=8), "end": day + timedelta(hours=12), "summary": "Lecture"}]
+
+        recommendations = await recommender.generate_recommendations(
+            user_id="user-1",
+            target_date=TARGET_DATE,
+            historical_sessions=make_sessions(80),
+            calendar_events=busy,
+            user_profile={},
+        )
+
+        assert recommendations
+        for r in recommendations:
+            assert not r.calendar_conflict
+            assert r.end_time <= busy[0]["start"] or r.start_time >= busy[0]["end"]
@@ -0,0 +1,184 @@
+"""
+Table Payload Unit Tests
+
+Tests for columnar session/event payloads on the orchestration endpoints:
+column arrays, base64 Arrow/Parquet inside JSON, and raw Arrow/Parquet
+request bodies.
+"""
+
+import base64
+import io
+from datetime import datetime, timedelta
+
+import httpx
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from fastapi import FastAPI
+from pydantic import ValidationError
+
+from src.api import orchestration_routes
+from src.api.table_payloads import ColumnarTable
+
+NOW = datetime.now().replace(microsecond=0)
+
+
+def make_sessions(n: int = 6) -> pd.DataFrame:
+    started = [NOW - timedelta(days=i, hours=2) for i in range(n)]
+    return pd.DataFrame({
+        "started_at": started,
+        "completed_at": [t + timedelta(minutes=50) for t in started],
+        "duration_ms": [50 * 60 * 1000] * n,
+        "performance_score": [70.0 + i for i in range(n)],
+    })
+
+
+def arrow_stream(df: pd.DataFrame) -> bytes:
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def arrow_file(df: pd.DataFrame) -> bytes:
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def parquet_file(df: pd.DataFrame) -> bytes:
+    buffer = io.BytesIO()
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), buffer)
+    return buffer.getvalue()
+
+
+class UnusedHistory:
+    """Session history store that fails the test if the service falls back to it."""
+
+    async def get_sessions(self, *args, **kwargs):
+        raise AssertionError("uploaded sessions should be used")
+
+    async def get_events(self, user_id, days=7):
+        return pd.DataFrame()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(orchestration_routes, "get_session_history_store", UnusedHistory)
+    app = FastAPI()
+    app.include_router(orchestration_routes.router)
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.mark.unit
+class TestColumnarTable:
+    """Test decoding of columnar payloads."""
+
+    @pytest.mark.parametrize("table_format,encode", [
+        ("arrow", arrow_stream),
+        ("arrow", arrow_file),
+        ("parquet", parquet_file),
+    ])
+    def test_base64_tables(self, table_format, encode):
+        """Test base64 Arrow stream/file and Parquet payloads decode to the same frame."""
+        sessions = make_sessions()
+        payload = ColumnarTable(format=table_format, data=base64.b64encode(encode(sessions)).decode())
+
+        pd.testing.assert_frame_equal(payload.to_dataframe(), sessions, check_dtype=False)
+        assert payload.data is None
+
+    def test_columns(self):
+        """Test column arrays build the frame directly."""
+        payload = ColumnarTable(format="columns", columns={"duration_ms": [1, 2], "performance_score": [80, 90]})
+        assert payload.to_dataframe()["duration_ms"].tolist() == [1, 2]
+
+    @pytest.mark.parametrize("fields", [
+        {"format": "columns", "columns": {"a": [1, 2], "b": [1]}},
+        {"format": "arrow", "data": "not base64!"},
+        {"format": "parquet", "data": base64.b64encode(b"not parquet").decode()},
+    ])
+    def test_invalid_payloads(self, fields):
+        """Test malformed payloads fail validation."""
+        with pytest.raises(ValidationError):
+            ColumnarTable(**fields)
+
+
+@pytest.mark.unit
+class TestRawTableBodies:
+    """Test raw Arrow/Parquet request bodies on the orchestration endpoints."""
+
+    async def test_cognitive_load_arrow_stream_body(self, client):
+        """Test an Arrow stream body is used as recent_sessions with fields from the query."""
+        response = await client.post(
+            "/api/v1/orchestration/cognitive-load",
+            params={"user_id": "user-1", "validation_scores": "[80, 90]", "trend_days": "7"},
+            content=arrow_stream(make_sessions()),
+            headers={"Content-Type": "application/vnd.apache.arrow.stream"},
+        )
+
+        assert response.status_code == 200, response.text
+        assert len(response.json()["trend"]) == 7
+        assert sum(score > 0 for score in response.json()["trend"]) >= 5
+
+    async def test_raw_body_matches_json_rows(self, client):
+        """Test a raw Parquet body gives the same result as row-oriented JSON."""
+        sessions = make_sessions()
+        rows = sessions.assign(
+            started_at=sessions["started_at"].map(datetime.isoformat),
+            completed_at=sessions["completed_at"].map(datetime.isoformat),
+        ).to_dict("records")
+        fields = {
+            "user_id": "user-1",
+            "mission_complexity": "INTERMEDIATE",
+            "time_of_day_hour": 9,
+            "user_profile": {"preferredSessionDuration": 45},
+            "cognitive_load": 40.0,
+        }
+
+        as_json = await client.post(
+            "/api/v1/orchestration/session-duration", json={**fields, "recent_sessions": rows}
+        )
+        as_parquet = await client.post(
+            "/api/v1/orchestration/session-duration",
+            params={**fields, "user_profile": '{"preferredSessionDuration": 45}'},
+            content=parquet_file(sessions),
+            headers={"Content-Type": "application/vnd.apache.parquet"},
+        )
+
+        assert as_json.status_code == 200, as_json.text
+        assert as_parquet.status_code == 200, as_parquet.text
+        assert as_parquet.json() == as_json.json()
+
+    async def test_invalid_raw_body(self, client):
+        """Test a body that is not the declared format is a 422."""
+        response = await client.post(
+            "/api/v1/orchestration/cognitive-load",
+            params={"user_id": "user-1"},
+            content=b"definitely not arrow",
+            headers={"Content-Type": "application/vnd.apache.arrow.stream"},
+        )
+        assert response.status_code == 422
+
+    async def test_invalid_query_field(self, client):
+        """Test invalid query fields are reported like body fields."""
+        response = await client.post(
+            "/api/v1/orchestration/cognitive-load",
+            params={"user_id": "user-1", "trend_days": "1000"},
+            content=arrow_stream(make_sessions()),
+            headers={"Content-Type": "application/vnd.apache.arrow.stream"},
+        )
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"] == ["body", "trend_days"]
+
+    async def test_unsupported_content_type(self, client):
+        """Test other content types are rejected with 415."""
+        response = await client.post(
+            "/api/v1/orchestration/cognitive-load",
+            content=b"user_id=user-1",
+            headers={"Content-Type": "text/csv"},
+        )
+        assert response.status_code == 415
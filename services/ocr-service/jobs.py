@@ -0,0 +1,226 @@
+"""
+OCR Job Module
+In-process job queue for asynchronous PDF extraction with per-page progress
+"""
+
+import asyncio
+import os
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, List, Optional
+import logging
+
+from ocr_processor import (
+    _validate_pdf,
+    build_ocr_result,
+    get_page_count,
+    iter_pdf_pages,
+)
+
+logger = logging.getLogger(__name__)
+
+# Queue settings
+OCR_MAX_QUEUED_JOBS = int(os.getenv("OCR_MAX_QUEUED_JOBS", "16"))
+OCR_MAX_CONCURRENT_JOBS = int(os.getenv("OCR_MAX_CONCURRENT_JOBS", "2"))
+OCR_JOB_RETENTION = int(os.getenv("OCR_JOB_RETENTION", "100"))
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue is at capacity"""
+
+
+@dataclass
+class OCRJob:
+    """State of one extraction job"""
+    job_id: str
+    file_path: str
+    status: str = "queued"  # queued, running, completed, failed
+    total_pages: Optional[int] = None
+    pages: List[Dict] = field(default_factory=list)
+    error: Optional[str] = None
+    exception: Optional[Exception] = field(default=None, repr=False)
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    finished_at: Optional[datetime] = None
+    updated: asyncio.Condition = field(default_factory=asyncio.Condition, repr=False)
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    def to_status(self) -> Dict:
+        """Status payload (without page text)"""
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "pages_done": len(self.pages),
+            "total_pages": self.total_pages,
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+class JobManager:
+    """
+    Bounded job queue served by a fixed number of async workers
+
+    submit() fails fast with QueueFullError when OCR_MAX_QUEUED_JOBS jobs
+    are waiting, so callers can retry later instead of piling work onto
+    the OCR worker pool. Finished jobs are kept for OCR_JOB_RETENTION
+    submissions so results can still be fetched.
+    """
+
+    def __init__(
+        self,
+        max_queued_jobs: int = OCR_MAX_QUEUED_JOBS,
+        max_concurrent_jobs: int = OCR_MAX_CONCURRENT_JOBS,
+        retention: int = OCR_JOB_RETENTION
+    ):
+        self.max_concurrent_jobs = max_concurrent_jobs
+        self.retention = retention
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queued_jobs)
+        self._jobs: "OrderedDict[str, OCRJob]" = OrderedDict()
+        self._workers: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        """Start worker tasks (call from the running event loop)"""
+        if not self._workers:
+            self._workers = [
+                asyncio.create_task(self._worker(), name=f"ocr-job-worker-{i}")
+                for i in range(self.max_concurrent_jobs)
+            ]
+
+    async def stop(self) -> None:
+        """Cancel worker tasks"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def submit(self, file_path: str) -> OCRJob:
+        """
+        Queue a PDF for extraction
+
+        Raises:
+            FileNotFoundError: If PDF file doesn't exist
+            ValueError: If file is not a PDF
+            QueueFullError: If the queue is at capacity
+        """
+        _validate_pdf(file_path)
+
+        job = OCRJob(job_id=uuid.uuid4().hex, file_path=file_path)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFullError(
+                f"OCR queue is full ({self._queue.maxsize} jobs waiting)"
+            )
+
+        self._jobs[job.job_id] = job
+        self._evict_finished()
+        logger.info(f"Queued OCR job {job.job_id} for {file_path}")
+        return job
+
+    def get(self, job_id: str) -> Optional[OCRJob]:
+        """Look up a job by ID"""
+        return self._jobs.get(job_id)
+
+    @property
+    def queued(self) -> int:
+        return self._queue.qsize()
+
+    async def stream_pages(self, job: OCRJob) -> AsyncIterator[Dict]:
+        """
+        Yield page results as they complete (including already finished pages)
+
+        Returns once the job has finished and every page was yielded.
+        """
+        sent = 0
+        while True:
+            async with job.updated:
+                await job.updated.wait_for(
+                    lambda: len(job.pages) > sent or job.is_finished
+                )
+                new_pages = job.pages[sent:]
+                finished = job.is_finished
+
+            for page in new_pages:
+                yield page
+            sent += len(new_pages)
+
+            if finished and sent == len(job.pages):
+                return
+
+    def result(self, job: OCRJob) -> Dict:
+        """Combined result for a completed job (same shape as /extract)"""
+        return build_ocr_result(job.pages)
+
+    async def wait(self, job: OCRJob) -> Dict:
+        """
+        Wait for a job to finish and return its combined result
+
+        Raises:
+            The exception the job failed with (RuntimeError if it was cancelled)
+        """
+        async with job.updated:
+            await job.updated.wait_for(lambda: job.is_finished)
+
+        if job.status == "failed":
+            raise job.exception or RuntimeError(job.error)
+        return self.result(job)
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: OCRJob) -> None:
+        loop = asyncio.get_running_loop()
+
+        async with job.updated:
+            job.status = "running"
+            job.updated.notify_all()
+
+        status, error = "failed", "OCR processing failed"
+        try:
+            job.total_pages = await loop.run_in_executor(None, get_page_count, job.file_path)
+
+            async for page in iter_pdf_pages(job.file_path, page_count=job.total_pages):
+                async with job.updated:
+                    job.pages.append(page)
+                    job.updated.notify_all()
+
+            status, error = "completed", None
+        except asyncio.CancelledError:
+            error = "Service shutting down"
+            raise
+        except Exception as e:
+            logger.exception(f"OCR job {job.job_id} failed: {str(e)}")
+            error = str(e)
+            job.exception = e
+        finally:
+            async with job.updated:
+                job.status = status
+                job.error = error
+                job.finished_at = datetime.now(timezone.utc)
+                job.updated.notify_all()
+
+        logger.info(f"OCR job {job.job_id} {job.status}: {len(job.pages)}/{job.total_pages} pages")
+
+    def _evict_finished(self) -> None:
+        """Drop the oldest finished jobs beyond the retention limit"""
+        excess = len(self._jobs) - self.retention
+        for job_id in [jid for jid, job in self._jobs.items() if job.is_finished]:
+            if excess <= 0:
+                break
+            del self._jobs[job_id]
+            excess -= 1
+
+
+# Global job manager (workers started in FastAPI lifespan)
+job_manager = JobManager()
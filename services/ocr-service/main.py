@@ -3,17 +3,34 @@ PaddleOCR Service - FastAPI Server
 Provides PDF text extraction endpoint for Americano platform
 """
 
+import json
+from contextlib import asynccontextmanager
+from typing import Optional
+
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 import uvicorn
 
-from ocr_processor import extract_text_from_pdf
+from jobs import QueueFullError, job_manager
+from ocr_processor import shutdown_process_pool
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start job queue workers; stop them and OCR worker processes on shutdown"""
+    job_manager.start()
+    yield
+    await job_manager.stop()
+    shutdown_process_pool()
+
 
 app = FastAPI(
     title="Americano OCR Service",
     description="PDF text extraction using PaddleOCR",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware for Next.js API communication
@@ -38,6 +55,17 @@ class OCRResponse(BaseModel):
     pages: list[dict]
 
 
+class JobStatusResponse(BaseModel):
+    """Response model for OCR job status"""
+    job_id: str
+    status: str
+    pages_done: int
+    total_pages: Optional[int] = None
+    error: Optional[str] = None
+    created_at: str
+    finished_at: Optional[str] = None
+
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
@@ -54,7 +82,8 @@ async def health_check():
     return {
         "status": "healthy",
         "ocr_engine": "PaddleOCR",
-        "ready": True
+        "ready": True,
+        "queued_jobs": job_manager.queued
     }
 
 
@@ -63,6 +92,9 @@ async def extract_text(request: OCRRequest):
     """
     Extract text from PDF using PaddleOCR
 
+    Runs as a job on the same bounded queue as POST /jobs and waits for it,
+    so synchronous callers cannot bypass backpressure.
+
     Args:
         request: OCRRequest with file_path
 
@@ -70,11 +102,12 @@ async def extract_text(request: OCRRequest):
         OCRResponse with extracted text, confidence, and page-by-page results
 
     Raises:
-        HTTPException: If file not found or OCR fails
+        HTTPException: If file not found or OCR fails,
+            503 (with Retry-After) if the job queue is full
     """
     try:
-        result = await extract_text_from_pdf(request.file_path)
-        return result
+        job = job_manager.submit(request.file_path)
+        return await job_manager.wait(job)
     except FileNotFoundError:
         raise HTTPException(
             status_code=404,
@@ -85,6 +118,12 @@ async def extract_text(request: OCRRequest):
             status_code=400,
             detail=f"Invalid file: {str(e)}"
         )
+    except QueueFullError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": "30"}
+        )
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -92,6 +131,103 @@ async def extract_text(request: OCRRequest):
         )
 
 
+@app.post("/jobs", response_model=JobStatusResponse, status_code=202)
+async def submit_job(request: OCRRequest):
+    """
+    Queue a PDF for asynchronous extraction
+
+    Returns immediately with a job ID. Poll GET /jobs/{job_id}, stream
+    GET /jobs/{job_id}/events, then fetch GET /jobs/{job_id}/result.
+
+    Raises:
+        HTTPException: 404 if file not found, 400 if not a PDF,
+            503 (with Retry-After) if the job queue is full
+    """
+    try:
+        job = job_manager.submit(request.file_path)
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=404,
+            detail=f"File not found: {request.file_path}"
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid file: {str(e)}"
+        )
+    except QueueFullError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": "30"}
+        )
+
+    return job.to_status()
+
+
+@app.get("/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_job_status(job_id: str):
+    """Job status with pages_done / total_pages progress"""
+    return _get_job_or_404(job_id).to_status()
+
+
+@app.get("/jobs/{job_id}/result", response_model=OCRResponse)
+async def get_job_result(job_id: str):
+    """
+    Combined extraction result of a completed job
+
+    Raises:
+        HTTPException: 409 if the job is still running, 500 if it failed
+    """
+    job = _get_job_or_404(job_id)
+
+    if job.status == "failed":
+        raise HTTPException(
+            status_code=500,
+            detail=f"OCR processing failed: {job.error}"
+        )
+    if job.status != "completed":
+        raise HTTPException(
+            status_code=409,
+            detail=f"Job is {job.status} ({len(job.pages)}/{job.total_pages or '?'} pages)"
+        )
+
+    return job_manager.result(job)
+
+
+@app.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str):
+    """
+    Server-Sent Events stream of per-page results
+
+    Emits one `page` event per page as it completes (pages finished before
+    the client connected are replayed first), then a final `done` event
+    with the job status.
+    """
+    job = _get_job_or_404(job_id)
+
+    async def events():
+        async for page in job_manager.stream_pages(job):
+            yield f"event: page\ndata: {json.dumps(page)}\n\n"
+        yield f"event: done\ndata: {json.dumps(job.to_status())}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def _get_job_or_404(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Job not found: {job_id}"
+        )
+    return job
+
+
 if __name__ == "__main__":
     uvicorn.run(
         "main:app",
@@ -1,23 +1,54 @@
 """
 OCR Processing Module
-Handles PDF text extraction using PaddleOCR with medical terminology preservation
+Handles PDF text extraction using PaddleOCR with medical terminology preservation.
+Pages with an embedded text layer skip OCR; per-page results are cached by content hash.
 """
 
+import asyncio
 import os
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import Dict, List
+from typing import AsyncIterator, Dict, List, Optional
 from paddleocr import PaddleOCR
-from pdf2image import convert_from_path
+from pdf2image import convert_from_path, pdfinfo_from_path
 import numpy as np
 import logging
 
+import page_cache
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize PaddleOCR (lazy loading on first use)
+# Pipeline settings
+OCR_MAX_WORKERS = int(os.getenv("OCR_MAX_WORKERS", os.cpu_count() or 1))
+OCR_PAGES_PER_TASK = int(os.getenv("OCR_PAGES_PER_TASK", "1"))
+OCR_DPI = int(os.getenv("OCR_DPI", "200"))
+
+# Pages whose embedded text layer has at least this many characters skip OCR
+OCR_MIN_TEXT_CHARS = int(os.getenv("OCR_MIN_TEXT_CHARS", "50"))
+
+# PaddleOCR engine settings (part of every page cache key)
+PADDLE_OCR_SETTINGS = dict(
+    use_angle_cls=True,  # Enable text angle classification
+    lang='en',           # English language
+    use_gpu=False,       # CPU mode for local development
+    show_log=False,      # Reduce console noise
+    # Medical terminology preservation settings
+    rec_char_dict_path=None,  # Use default English dictionary
+    det_db_thresh=0.3,         # Detection threshold (lower = more sensitive)
+    det_db_box_thresh=0.5,     # Box threshold
+    rec_batch_num=6,           # Batch size for recognition
+)
+
+# Initialize PaddleOCR (lazy loading on first use, one per worker process)
 _ocr_instance = None
 
+# Shared worker pool (created on first use)
+_process_pool: Optional[ProcessPoolExecutor] = None
+
 
 def get_ocr_instance() -> PaddleOCR:
     """
@@ -28,22 +59,301 @@ def get_ocr_instance() -> PaddleOCR:
 
     if _ocr_instance is None:
         logger.info("Initializing PaddleOCR engine...")
-        _ocr_instance = PaddleOCR(
-            use_angle_cls=True,  # Enable text angle classification
-            lang='en',           # English language
-            use_gpu=False,       # CPU mode for local development
-            show_log=False,      # Reduce console noise
-            # Medical terminology preservation settings
-            rec_char_dict_path=None,  # Use default English dictionary
-            det_db_thresh=0.3,         # Detection threshold (lower = more sensitive)
-            det_db_box_thresh=0.5,     # Box threshold
-            rec_batch_num=6,           # Batch size for recognition
-        )
+        _ocr_instance = PaddleOCR(**PADDLE_OCR_SETTINGS)
         logger.info("PaddleOCR engine initialized successfully")
 
     return _ocr_instance
 
 
+def get_process_pool() -> ProcessPoolExecutor:
+    """
+    Get or create the OCR worker pool
+
+    Each worker process loads its own PaddleOCR instance once (in the
+    initializer) and reuses it for every page it processes.
+    """
+    global _process_pool
+
+    if _process_pool is None:
+        logger.info(f"Starting OCR worker pool with {OCR_MAX_WORKERS} processes")
+        _process_pool = ProcessPoolExecutor(
+            max_workers=OCR_MAX_WORKERS,
+            initializer=get_ocr_instance,
+        )
+
+    return _process_pool
+
+
+def _discard_broken_pool(pool: ProcessPoolExecutor) -> None:
+    """
+    Drop a pool whose worker died (e.g. OOM-killed on a huge page)
+
+    A broken ProcessPoolExecutor rejects every later submission, so the
+    next get_process_pool() call starts a fresh one.
+    """
+    global _process_pool
+
+    if _process_pool is pool:
+        logger.error("OCR worker pool is broken; it will be restarted on next use")
+        _process_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_process_pool() -> None:
+    """Stop the OCR worker pool (called on service shutdown)"""
+    global _process_pool
+
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+
+
+def _parse_ocr_result(result, page_num: int) -> Dict:
+    """Convert raw PaddleOCR output for one page into a page result dict"""
+    page_text_lines = []
+    page_confidence_sum = 0.0
+
+    if result and result[0]:
+        for line in result[0]:
+            # line format: [box, (text, confidence)]
+            if line and len(line) >= 2:
+                text, confidence = line[1]
+                page_text_lines.append(text)
+                page_confidence_sum += confidence
+
+    page_confidence = (
+        page_confidence_sum / len(page_text_lines)
+        if page_text_lines
+        else 0.0
+    )
+
+    return {
+        "page_number": page_num,
+        "text": " ".join(page_text_lines),
+        "confidence": round(page_confidence, 4),
+        "line_count": len(page_text_lines)
+    }
+
+
+def _extract_text_layer(pdf_path: str, first_page: int, last_page: int) -> List[str]:
+    """
+    Read the embedded text layer for a page range with poppler's pdftotext
+
+    Returns:
+        One string per page (empty list if pdftotext is unavailable or fails)
+    """
+    try:
+        completed = subprocess.run(
+            ["pdftotext", "-f", str(first_page), "-l", str(last_page),
+             "-layout", "-enc", "UTF-8", pdf_path, "-"],
+            capture_output=True, timeout=60, check=True,
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.warning(f"Text layer extraction failed, falling back to OCR: {e}")
+        return []
+
+    # Pages are separated by form feeds
+    return completed.stdout.decode("utf-8", errors="replace").split("\f")[:last_page - first_page + 1]
+
+
+def _has_usable_text(text: str) -> bool:
+    """Check a text layer has enough real content to skip OCR"""
+    content = "".join(text.split())
+    if len(content) < OCR_MIN_TEXT_CHARS:
+        return False
+
+    # Broken font encodings come out as mostly symbols
+    alnum_ratio = sum(ch.isalnum() for ch in content) / len(content)
+    return alnum_ratio >= 0.5
+
+
+def _text_layer_result(text: str, page_num: int) -> Dict:
+    """Build a page result from embedded text (same shape as OCR results)"""
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    return {
+        "page_number": page_num,
+        "text": " ".join(lines),
+        "confidence": 1.0,
+        "line_count": len(lines),
+        "source": "text_layer"
+    }
+
+
+def _cache_settings_tag() -> str:
+    """Settings tag for page cache keys (results change with any of these)"""
+    return page_cache.settings_tag({
+        "dpi": OCR_DPI,
+        "min_text_chars": OCR_MIN_TEXT_CHARS,
+        "engine": PADDLE_OCR_SETTINGS,
+    })
+
+
+def _ocr_page_range(
+    pdf_path: str,
+    first_page: int,
+    last_page: int,
+    document_hash: Optional[str] = None
+) -> List[Dict]:
+    """
+    Extract text for a page range (runs inside a worker process)
+
+    Per page, cheapest source first:
+    1. Cached result for this exact file and page
+    2. Embedded text layer (no rasterization)
+    3. Cached result for identical rendered page bytes
+    4. PaddleOCR on the rendered page
+
+    Only pages that need OCR are rasterized, one at a time.
+    """
+    text_layer = _extract_text_layer(pdf_path, first_page, last_page)
+    settings = _cache_settings_tag()
+
+    results = []
+    for offset, page_num in enumerate(range(first_page, last_page + 1)):
+        doc_key = (
+            page_cache.document_page_key(document_hash, page_num, settings)
+            if document_hash else None
+        )
+
+        cached = page_cache.get_page_result(doc_key) if doc_key else None
+        if cached is not None:
+            results.append(cached)
+            continue
+
+        if offset < len(text_layer) and _has_usable_text(text_layer[offset]):
+            page_result = _text_layer_result(text_layer[offset], page_num)
+        else:
+            page_result = _ocr_single_page(pdf_path, page_num, settings)
+
+        if doc_key:
+            page_cache.set_page_result(doc_key, page_result)
+        results.append(page_result)
+
+    return results
+
+
+def _ocr_single_page(pdf_path: str, page_num: int, settings: str) -> Dict:
+    """Rasterize one page and OCR it, reusing results for identical page images"""
+    images = convert_from_path(
+        pdf_path, dpi=OCR_DPI, first_page=page_num, last_page=page_num
+    )
+    if not images:
+        raise ValueError(f"PDF page {page_num} could not be rendered")
+
+    image = images[0]
+    img_key = page_cache.image_key(page_cache.hash_bytes(image.tobytes()), settings)
+
+    cached = page_cache.get_page_result(img_key)
+    if cached is not None:
+        image.close()
+        return {**cached, "page_number": page_num}
+
+    # Convert PIL Image to numpy array for PaddleOCR
+    result = get_ocr_instance().ocr(np.array(image), cls=True)
+    image.close()
+
+    page_result = {**_parse_ocr_result(result, page_num), "source": "ocr"}
+    page_cache.set_page_result(img_key, page_result)
+    return page_result
+
+
+def _validate_pdf(file_path: str) -> Path:
+    """Check the file exists and has a .pdf extension"""
+    pdf_path = Path(file_path)
+    if not pdf_path.exists():
+        raise FileNotFoundError(f"PDF file not found: {file_path}")
+
+    if pdf_path.suffix.lower() != '.pdf':
+        raise ValueError(f"File must be a PDF, got: {pdf_path.suffix}")
+
+    return pdf_path
+
+
+def get_page_count(file_path: str) -> int:
+    """
+    Read the page count from PDF metadata without rendering pages
+
+    Raises:
+        ValueError: If file is corrupted or contains no pages
+    """
+    try:
+        page_count = int(pdfinfo_from_path(file_path)["Pages"])
+    except Exception as e:
+        raise ValueError(f"Corrupted or invalid PDF file: {str(e)}")
+
+    if page_count < 1:
+        raise ValueError("PDF contains no pages")
+
+    return page_count
+
+
+async def iter_pdf_pages(
+    file_path: str,
+    pages_per_task: int = OCR_PAGES_PER_TASK,
+    page_count: Optional[int] = None
+) -> AsyncIterator[Dict]:
+    """
+    Stream per-page OCR results in page order
+
+    Pages with an embedded text layer or a cached result skip OCR; the
+    rest are rasterized lazily and OCR'd in the worker pool. At most
+    2 x OCR_MAX_WORKERS ranges are in flight, so memory stays proportional
+    to the number of workers rather than the number of pages.
+
+    Args:
+        file_path: Absolute or relative path to PDF file
+        pages_per_task: Pages rendered and OCR'd per worker task
+        page_count: Known page count (read from PDF metadata if omitted)
+
+    Yields:
+        dict: page result (page_number, text, confidence, line_count, source)
+
+    Raises:
+        FileNotFoundError: If PDF file doesn't exist
+        ValueError: If file is corrupted or not a valid PDF
+    """
+    pdf_path = _validate_pdf(file_path)
+    loop = asyncio.get_running_loop()
+    if page_count is None:
+        page_count = await loop.run_in_executor(None, get_page_count, str(pdf_path))
+    document_hash = (
+        await loop.run_in_executor(None, page_cache.hash_file, str(pdf_path))
+        if page_cache.OCR_CACHE_ENABLED else None
+    )
+
+    logger.info(f"Processing {page_count} pages of {pdf_path.name}...")
+
+    pool = get_process_pool()
+    ranges = [
+        (first, min(first + pages_per_task - 1, page_count))
+        for first in range(1, page_count + 1, pages_per_task)
+    ]
+    max_in_flight = 2 * OCR_MAX_WORKERS
+    pending: List[asyncio.Future] = []
+    next_range = 0
+
+    try:
+        while next_range < len(ranges) or pending:
+            # Keep the pool busy without queueing the whole document
+            while next_range < len(ranges) and len(pending) < max_in_flight:
+                first, last = ranges[next_range]
+                pending.append(loop.run_in_executor(
+                    pool, _ocr_page_range, str(pdf_path), first, last, document_hash
+                ))
+                next_range += 1
+
+            # Yield in order: wait for the oldest range
+            for page_result in await pending.pop(0):
+                logger.info(f"Processed page {page_result['page_number']}/{page_count}")
+                yield page_result
+    except BrokenProcessPool:
+        _discard_broken_pool(pool)
+        raise
+    finally:
+        for future in pending:
+            future.cancel()
+
+
 async def extract_text_from_pdf(file_path: str) -> Dict:
     """
     Extract text from PDF file using PaddleOCR
@@ -62,96 +372,16 @@ async def extract_text_from_pdf(file_path: str) -> Dict:
         FileNotFoundError: If PDF file doesn't exist
         ValueError: If file is corrupted or not a valid PDF
     """
-    # Validate file exists
-    pdf_path = Path(file_path)
-    if not pdf_path.exists():
-        raise FileNotFoundError(f"PDF file not found: {file_path}")
-
-    # Validate file extension
-    if pdf_path.suffix.lower() != '.pdf':
-        raise ValueError(f"File must be a PDF, got: {pdf_path.suffix}")
-
     try:
-        logger.info(f"Converting PDF to images: {pdf_path.name}")
-
-        # Convert PDF to images (one per page)
-        images = convert_from_path(str(pdf_path))
-
-        if not images:
-            raise ValueError("PDF contains no pages")
-
-        logger.info(f"Processing {len(images)} pages...")
-
-        # Get OCR instance
-        ocr = get_ocr_instance()
-
-        # Process each page
-        all_pages_text = []
-        all_pages_results = []
-        total_confidence = 0.0
-        confidence_count = 0
-
-        for page_num, image in enumerate(images, start=1):
-            logger.info(f"Processing page {page_num}/{len(images)}")
-
-            # Convert PIL Image to numpy array for PaddleOCR
-            image_array = np.array(image)
-
-            # Run OCR on page image
-            result = ocr.ocr(image_array, cls=True)
-
-            # Extract text and confidence from result
-            page_text_lines = []
-            page_confidence_sum = 0.0
-            page_confidence_count = 0
-
-            if result and result[0]:
-                for line in result[0]:
-                    # line format: [box, (text, confidence)]
-                    if line and len(line) >= 2:
-                        text, confidence = line[1]
-                        page_text_lines.append(text)
-                        page_confidence_sum += confidence
-                        page_confidence_count += 1
-
-            # Combine page text
-            page_text = " ".join(page_text_lines)
-            page_confidence = (
-                page_confidence_sum / page_confidence_count
-                if page_confidence_count > 0
-                else 0.0
-            )
-
-            # Store page results
-            all_pages_text.append(page_text)
-            all_pages_results.append({
-                "page_number": page_num,
-                "text": page_text,
-                "confidence": round(page_confidence, 4),
-                "line_count": len(page_text_lines)
-            })
-
-            # Update total confidence
-            total_confidence += page_confidence_sum
-            confidence_count += page_confidence_count
-
-        # Combine all text
-        complete_text = "\n\n".join(all_pages_text)
-
-        # Calculate average confidence
-        average_confidence = (
-            total_confidence / confidence_count
-            if confidence_count > 0
-            else 0.0
-        )
+        all_pages_results = [page async for page in iter_pdf_pages(file_path)]
+        result = build_ocr_result(all_pages_results)
 
-        logger.info(f"OCR complete. Extracted {len(complete_text)} characters with {average_confidence:.2%} confidence")
+        logger.info(f"OCR complete. Extracted {len(result['text'])} characters with {result['confidence']:.2%} confidence")
 
-        return {
-            "text": complete_text,
-            "confidence": round(average_confidence, 4),
-            "pages": all_pages_results
-        }
+        return result
+
+    except (FileNotFoundError, ValueError):
+        raise
 
     except Exception as e:
         # Log full stack trace for debugging
@@ -163,3 +393,38 @@ async def extract_text_from_pdf(file_path: str) -> Dict:
 
         # Re-raise other errors with full context
         raise
+
+
+def build_ocr_result(pages: List[Dict]) -> Dict:
+    """
+    Combine per-page results into the /extract response shape
+
+    Args:
+        pages: Page results in page order
+
+    Returns:
+        dict: {"text", "confidence", "pages"}
+    """
+    # Combine all text
+    complete_text = "\n\n".join(page["text"] for page in pages)
+
+    # Average OCR confidence (weighted by recognized lines). Text-layer
+    # pages are exact rather than recognized, so they don't inflate it;
+    # a document read entirely from its text layer reports 1.0
+    ocr_pages = [page for page in pages if page.get("source") != "text_layer"]
+    confidence_count = sum(page["line_count"] for page in ocr_pages)
+    if confidence_count > 0:
+        average_confidence = (
+            sum(page["confidence"] * page["line_count"] for page in ocr_pages)
+            / confidence_count
+        )
+    elif len(ocr_pages) < len(pages):
+        average_confidence = 1.0
+    else:
+        average_confidence = 0.0
+
+    return {
+        "text": complete_text,
+        "confidence": round(average_confidence, 4),
+        "pages": pages
+    }
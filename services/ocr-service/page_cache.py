@@ -0,0 +1,173 @@
+"""
+Page Result Cache Module
+Content-addressed on-disk cache of per-page OCR results, shared by all worker processes.
+Keys include a tag of the settings that produced the result; the directory is
+kept under OCR_CACHE_MAX_BYTES by evicting the least recently used entries.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+OCR_CACHE_DIR = Path(os.getenv("OCR_CACHE_DIR", ".ocr_cache"))
+OCR_CACHE_ENABLED = os.getenv("OCR_CACHE_ENABLED", "true").lower() == "true"
+OCR_CACHE_MAX_BYTES = int(os.getenv("OCR_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+
+# Eviction trims the cache to this fraction of OCR_CACHE_MAX_BYTES
+_EVICT_TARGET_RATIO = 0.9
+
+# Bytes this process wrote since it last checked the cache size (None = never checked)
+_bytes_since_check: Optional[int] = None
+
+
+def hash_file(file_path: str, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of a file's bytes (identifies re-uploads of the same deck)"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_bytes(data: bytes) -> str:
+    """SHA-256 of rendered page bytes (identifies identical pages across decks)"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def settings_tag(settings: Dict) -> str:
+    """Short hash of the settings that affect page results (DPI, thresholds, engine)"""
+    encoded = json.dumps(settings, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()[:12]
+
+
+def document_page_key(document_hash: str, page_number: int, settings: str) -> str:
+    """Cache key for a page of a specific PDF file processed with the given settings tag"""
+    return f"doc-{document_hash}-p{page_number}-s{settings}"
+
+
+def image_key(image_hash: str, settings: str) -> str:
+    """Cache key for a rendered page image processed with the given settings tag"""
+    return f"img-{image_hash}-s{settings}"
+
+
+def get_page_result(key: str) -> Optional[Dict]:
+    """
+    Look up a cached page result
+
+    Returns:
+        Cached result dict, or None on miss (or if caching is disabled)
+    """
+    if not OCR_CACHE_ENABLED:
+        return None
+
+    path = OCR_CACHE_DIR / f"{key}.json"
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            result = json.load(f)
+        # Mark as recently used for eviction
+        os.utime(path)
+        return result
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable cache entry {path.name}: {e}")
+        return None
+
+
+def set_page_result(key: str, result: Dict) -> None:
+    """
+    Store a page result
+
+    Writes go to a temp file and are renamed into place, so concurrent
+    workers never observe a partially written entry.
+    """
+    if not OCR_CACHE_ENABLED:
+        return
+
+    try:
+        OCR_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=OCR_CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(result, f)
+            size = f.tell()
+        os.replace(tmp_path, OCR_CACHE_DIR / f"{key}.json")
+    except OSError as e:
+        logger.warning(f"Failed to write cache entry {key}: {e}")
+        return
+
+    _maybe_evict(size)
+
+
+def _maybe_evict(written: int) -> None:
+    """
+    Check the cache size on this process's first write and then after every
+    ~10% of OCR_CACHE_MAX_BYTES it writes, so directory scans stay rare
+    """
+    global _bytes_since_check
+
+    if _bytes_since_check is not None:
+        _bytes_since_check += written
+        if _bytes_since_check < OCR_CACHE_MAX_BYTES * (1 - _EVICT_TARGET_RATIO):
+            return
+
+    _bytes_since_check = 0
+    evict()
+
+
+def _list_entries() -> List[Tuple[float, int, Path]]:
+    """(mtime, size, path) of every cache entry"""
+    entries = []
+    try:
+        with os.scandir(OCR_CACHE_DIR) as it:
+            for entry in it:
+                if not entry.name.endswith(".json"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue  # Evicted by another worker
+                entries.append((stat.st_mtime, stat.st_size, Path(entry.path)))
+    except FileNotFoundError:
+        pass
+    return entries
+
+
+def evict(max_bytes: Optional[int] = None) -> int:
+    """
+    Remove least recently used entries while the cache exceeds max_bytes
+
+    Trims to 90% of the limit so the next few writes don't trigger
+    another scan.
+
+    Returns:
+        Number of entries removed
+    """
+    max_bytes = OCR_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    entries = _list_entries()
+    total = sum(size for _, size, _ in entries)
+    if total <= max_bytes:
+        return 0
+
+    target = max_bytes * _EVICT_TARGET_RATIO
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= target:
+            break
+        try:
+            path.unlink()
+            removed += 1
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Failed to evict cache entry {path.name}: {e}")
+            continue
+        total -= size
+
+    logger.info(f"Evicted {removed} OCR cache entries ({total} bytes remain)")
+    return removed
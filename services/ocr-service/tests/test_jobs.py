@@ -0,0 +1,125 @@
+"""Tests for the OCR job queue: lifecycle, progress streaming and backpressure on /jobs and /extract."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import asyncio
+import sys
+
+import pytest
+
+pytest.importorskip("paddleocr")
+pytest.importorskip("pdf2image")
+
+import httpx
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import jobs
+import main
+from jobs import JobManager, QueueFullError
+
+
+@pytest.fixture
+def pdf_file(tmp_path):
+    path = tmp_path / "deck.pdf"
+    path.write_bytes(b"%PDF-1.4")
+    return str(path)
+
+
+@pytest.fixture
+def fake_pages(monkeypatch):
+    """Three-page documents OCR'd without PaddleOCR; 'bad.pdf' is corrupted."""
+    monkeypatch.setattr(jobs, "get_page_count", lambda file_path: 3)
+
+    async def fake_iter(file_path, page_count=None):
+        if file_path.endswith("bad.pdf"):
+            raise ValueError("Corrupted or invalid PDF file")
+        for n in range(1, page_count + 1):
+            await asyncio.sleep(0.01)
+            yield {"page_number": n, "text": f"page {n}", "confidence": 0.9, "line_count": 1, "source": "ocr"}
+
+    monkeypatch.setattr(jobs, "iter_pdf_pages", fake_iter)
+
+
+def test_job_lifecycle_and_progress_stream(pdf_file, fake_pages):
+    async def run():
+        manager = JobManager(max_queued_jobs=2, max_concurrent_jobs=1)
+        manager.start()
+        try:
+            job = manager.submit(pdf_file)
+            assert job.to_status()["status"] == "queued"
+
+            streamed = [page["page_number"] async for page in manager.stream_pages(job)]
+            result = await manager.wait(job)
+        finally:
+            await manager.stop()
+        return job, streamed, result
+
+    job, streamed, result = asyncio.run(run())
+
+    assert streamed == [1, 2, 3]
+    assert job.to_status()["status"] == "completed"
+    assert job.to_status()["pages_done"] == job.total_pages == 3
+    assert result["text"] == "page 1\n\npage 2\n\npage 3"
+
+
+def test_failed_job_reraises(tmp_path, fake_pages):
+    bad = tmp_path / "bad.pdf"
+    bad.write_bytes(b"")
+
+    async def run():
+        manager = JobManager()
+        manager.start()
+        try:
+            job = manager.submit(str(bad))
+            with pytest.raises(ValueError):
+                await manager.wait(job)
+        finally:
+            await manager.stop()
+        return job
+
+    assert asyncio.run(run()).status == "failed"
+
+
+def test_full_queue_rejects_submissions(pdf_file):
+    manager = JobManager(max_queued_jobs=1)
+
+    manager.submit(pdf_file)
+
+    with pytest.raises(QueueFullError):
+        manager.submit(pdf_file)
+    assert manager.queued == 1
+
+
+def test_extract_goes_through_job_queue(pdf_file, tmp_path, fake_pages, monkeypatch):
+    bad = tmp_path / "bad.pdf"
+    bad.write_bytes(b"")
+
+    async def run():
+        manager = JobManager(max_queued_jobs=1, max_concurrent_jobs=1)
+        monkeypatch.setattr(main, "job_manager", manager)
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            # Queue full and no workers yet: /extract is rejected like /jobs
+            queued = manager.submit(pdf_file)
+            rejected = await client.post("/extract", json={"file_path": pdf_file})
+
+            manager.start()
+            try:
+                await manager.wait(queued)
+                extracted = await client.post("/extract", json={"file_path": pdf_file})
+                invalid = await client.post("/extract", json={"file_path": str(bad)})
+            finally:
+                await manager.stop()
+        return rejected, extracted, invalid
+
+    rejected, extracted, invalid = asyncio.run(run())
+
+    assert rejected.status_code == 503
+    assert rejected.headers["Retry-After"] == "30"
+    assert extracted.status_code == 200
+    assert [page["page_number"] for page in extracted.json()["pages"]] == [1, 2, 3]
+    assert invalid.status_code == 400
@@ -0,0 +1,187 @@
+"""Tests for the page-streaming OCR pipeline (PaddleOCR and poppler are faked)."""
+
+from __future__ import annotations
+
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+import asyncio
+import random
+import sys
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("paddleocr")
+pytest.importorskip("pdf2image")
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import ocr_processor
+import page_cache
+
+
+@pytest.fixture
+def pdf_file(tmp_path):
+    path = tmp_path / "deck.pdf"
+    path.write_bytes(b"%PDF-1.4")
+    return str(path)
+
+
+@pytest.fixture
+def thread_pool(monkeypatch):
+    """Run page ranges in threads instead of worker processes."""
+    pool = ThreadPoolExecutor(max_workers=8)
+    monkeypatch.setattr(ocr_processor, "get_process_pool", lambda: pool)
+    monkeypatch.setattr(ocr_processor, "OCR_MAX_WORKERS", 2)
+    monkeypatch.setattr(page_cache, "OCR_CACHE_ENABLED", False)
+    yield pool
+    pool.shutdown()
+
+
+class BrokenPool(Executor):
+    def __init__(self):
+        self.shut_down = False
+
+    def submit(self, fn, *args, **kwargs):
+        raise BrokenProcessPool("a worker process died")
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        self.shut_down = True
+
+
+def collect(file_path, **kwargs):
+    async def run():
+        return [page async for page in ocr_processor.iter_pdf_pages(file_path, **kwargs)]
+
+    return asyncio.run(run())
+
+
+def test_pages_streamed_in_order_with_bounded_ranges(pdf_file, thread_pool, monkeypatch):
+    lock = threading.Lock()
+    running, peak, rendered = 0, 0, []
+
+    def fake_range(pdf_path, first, last, document_hash=None):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+            rendered.append((first, last))
+        # Later ranges often finish first
+        time.sleep(random.uniform(0, 0.02))
+        with lock:
+            running -= 1
+        return [{"page_number": n, "text": f"p{n}", "confidence": 0.9, "line_count": 1, "source": "ocr"}
+                for n in range(first, last + 1)]
+
+    monkeypatch.setattr(ocr_processor, "_ocr_page_range", fake_range)
+
+    pages = collect(pdf_file, pages_per_task=3, page_count=20)
+
+    assert [page["page_number"] for page in pages] == list(range(1, 21))
+    assert sorted(rendered)[:2] == [(1, 3), (4, 6)] and sorted(rendered)[-1] == (19, 20)
+    assert peak <= 2 * ocr_processor.OCR_MAX_WORKERS
+
+
+def test_broken_pool_is_replaced(pdf_file, monkeypatch):
+    broken = BrokenPool()
+    monkeypatch.setattr(ocr_processor, "_process_pool", broken)
+    monkeypatch.setattr(page_cache, "OCR_CACHE_ENABLED", False)
+
+    with pytest.raises(BrokenProcessPool):
+        collect(pdf_file, page_count=3)
+
+    assert broken.shut_down
+    assert ocr_processor._process_pool is None
+
+
+LAYER_TEXT = "Cardiac output equals stroke volume times heart rate in healthy adults"
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(page_cache, "OCR_CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(page_cache, "OCR_CACHE_ENABLED", True)
+    return tmp_path / "cache"
+
+
+@pytest.fixture
+def fake_ocr(monkeypatch):
+    """Record OCR'd pages; page 1 has a text layer, the others do not."""
+    calls = {"text_layer": 0, "ocr": []}
+
+    def fake_text_layer(pdf_path, first, last):
+        calls["text_layer"] += 1
+        return [LAYER_TEXT if n == 1 else "  12 \n" for n in range(first, last + 1)]
+
+    def fake_single_page(pdf_path, page_num, settings):
+        calls["ocr"].append(page_num)
+        return {"page_number": page_num, "text": "scan", "confidence": 0.8, "line_count": 2, "source": "ocr"}
+
+    monkeypatch.setattr(ocr_processor, "_extract_text_layer", fake_text_layer)
+    monkeypatch.setattr(ocr_processor, "_ocr_single_page", fake_single_page)
+    return calls
+
+
+def test_text_layer_pages_skip_ocr(pdf_file, fake_ocr, monkeypatch):
+    monkeypatch.setattr(page_cache, "OCR_CACHE_ENABLED", False)
+
+    pages = ocr_processor._ocr_page_range(pdf_file, 1, 3)
+
+    assert fake_ocr["ocr"] == [2, 3]
+    assert [page["source"] for page in pages] == ["text_layer", "ocr", "ocr"]
+    assert pages[0]["text"] == LAYER_TEXT
+
+
+def test_document_cache_hit_and_settings_miss(pdf_file, cache_dir, fake_ocr, monkeypatch):
+    document_hash = page_cache.hash_file(pdf_file)
+
+    first = ocr_processor._ocr_page_range(pdf_file, 1, 3, document_hash)
+    again = ocr_processor._ocr_page_range(pdf_file, 1, 3, document_hash)
+
+    assert again == first
+    assert fake_ocr["ocr"] == [2, 3]
+
+    # Results produced at another DPI are not reused
+    monkeypatch.setattr(ocr_processor, "OCR_DPI", 300)
+    ocr_processor._ocr_page_range(pdf_file, 1, 3, document_hash)
+    assert fake_ocr["ocr"] == [2, 3, 2, 3]
+
+
+def test_identical_page_images_reuse_ocr(pdf_file, cache_dir, monkeypatch):
+    class FakeImage:
+        def tobytes(self):
+            return b"same slide"
+
+        def close(self):
+            pass
+
+    class FakeEngine:
+        calls = 0
+
+        def ocr(self, image, cls=True):
+            FakeEngine.calls += 1
+            return [[[None, ("Myocardium", 0.9)]]]
+
+    monkeypatch.setattr(ocr_processor, "convert_from_path", lambda *args, **kwargs: [FakeImage()])
+    monkeypatch.setattr(ocr_processor, "get_ocr_instance", FakeEngine)
+    settings = ocr_processor._cache_settings_tag()
+
+    first = ocr_processor._ocr_single_page(pdf_file, 4, settings)
+    second = ocr_processor._ocr_single_page(pdf_file, 9, settings)
+
+    assert FakeEngine.calls == 1
+    assert (first["page_number"], second["page_number"]) == (4, 9)
+    assert second["text"] == first["text"] == "Myocardium"
+
+
+def test_confidence_ignores_text_layer_lines():
+    ocr_page = {"page_number": 2, "text": "scan", "confidence": 0.6, "line_count": 4, "source": "ocr"}
+    layer_page = {"page_number": 1, "text": "x", "confidence": 1.0, "line_count": 80, "source": "text_layer"}
+
+    assert ocr_processor.build_ocr_result([layer_page, ocr_page])["confidence"] == 0.6
+    assert ocr_processor.build_ocr_result([layer_page])["confidence"] == 1.0
+    assert ocr_processor.build_ocr_result([])["confidence"] == 0.0
@@ -0,0 +1,72 @@
+"""Tests for the on-disk page result cache: settings-tagged keys and LRU size eviction."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import os
+import sys
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import page_cache
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(page_cache, "OCR_CACHE_DIR", tmp_path)
+    monkeypatch.setattr(page_cache, "OCR_CACHE_ENABLED", True)
+    monkeypatch.setattr(page_cache, "_bytes_since_check", None)
+    return tmp_path
+
+
+def store(key: str, mtime: float) -> None:
+    page_cache.set_page_result(key, {"page_number": 1, "text": "x" * 200})
+    os.utime(page_cache.OCR_CACHE_DIR / f"{key}.json", (mtime, mtime))
+
+
+def test_keys_include_settings():
+    dpi_200 = page_cache.settings_tag({"dpi": 200, "min_text_chars": 50})
+    dpi_300 = page_cache.settings_tag({"dpi": 300, "min_text_chars": 50})
+
+    assert dpi_200 == page_cache.settings_tag({"min_text_chars": 50, "dpi": 200})
+    assert page_cache.document_page_key("abc", 3, dpi_200) != page_cache.document_page_key("abc", 3, dpi_300)
+    assert page_cache.image_key("abc", dpi_200) != page_cache.image_key("abc", dpi_300)
+
+
+def test_hit_and_miss(cache_dir):
+    assert page_cache.get_page_result("doc-a-p1-sx") is None
+
+    page_cache.set_page_result("doc-a-p1-sx", {"page_number": 1, "text": "Aorta"})
+
+    assert page_cache.get_page_result("doc-a-p1-sx") == {"page_number": 1, "text": "Aorta"}
+
+
+def test_evicts_least_recently_used(cache_dir):
+    for i in range(5):
+        store(f"img-{i}", mtime=1000 + i)
+    entry_size = (cache_dir / "img-0.json").stat().st_size
+
+    # Reading an entry marks it as recently used
+    assert page_cache.get_page_result("img-0") is not None
+
+    removed = page_cache.evict(max_bytes=3 * entry_size)
+
+    assert removed == 3
+    assert sorted(p.stem for p in cache_dir.glob("*.json")) == ["img-0", "img-4"]
+
+
+def test_writes_trigger_eviction(cache_dir, monkeypatch):
+    store("img-0", mtime=1000)
+    entry_size = (cache_dir / "img-0.json").stat().st_size
+    monkeypatch.setattr(page_cache, "OCR_CACHE_MAX_BYTES", 4 * entry_size)
+
+    for i in range(1, 20):
+        store(f"img-{i}", mtime=1000 + i)
+
+    assert sum(p.stat().st_size for p in cache_dir.glob("*.json")) <= 5 * entry_size
+    assert (cache_dir / "img-19.json").exists()
+    assert not (cache_dir / "img-0.json").exists()